@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+PAYLASILAN ANALIZ NESNELERI
+===========================
+DrugAnalyzer ve PregnancyChecker Excel okudugu icin pahalidir; GUI her
+kuyruk/TC icin yeni HYPAutomation olusturur. Bu modul ikisini process
+genelinde tek kez, ilk kullanimda yukler ve tum HYPAutomation nesneleri
+ayni ornegi kullanir.
+
+- Ilk get(): senkron yukleme (ayni anda gelen diger thread'ler bekler)
+- Sonraki get(): kaynak dosyanin boyut/mtime'i degistiyse yeni ornek arka
+  planda olusturulur, hazir olana kadar eskisi kullanilmaya devam eder
+- warm_up(): ikisini arka planda onceden yukler (giris beklenirken)
+
+ElderlyAssessmentHelper hasta bazli durum tuttugu icin paylasilmaz.
+"""
+
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+
+class SharedAnalyzer:
+    """Tek bir paylasilan analiz nesnesi (thread-safe)"""
+
+    def __init__(self, name: str, factory: Callable[[Optional[str]], object],
+                 locate: Callable[[], Optional[str]]):
+        self.name = name
+        self._factory = factory
+        self._locate = locate
+        self._lock = threading.Lock()
+        self._instance = None
+        self._loaded = False
+        self._signature = None
+        self._reloading = False
+        # replace() ile kullanicinin sectigi dosya (varsayilan yol yerine)
+        self._pinned_path: Optional[str] = None
+
+    @staticmethod
+    def _signature_of(path: Optional[str]) -> Optional[Tuple]:
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+            return (path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            return (path, None, None)
+
+    def _source(self) -> Optional[str]:
+        return self._pinned_path or self._locate()
+
+    def _build(self, path: Optional[str]):
+        try:
+            return self._factory(path)
+        except Exception as e:
+            print(f"[!] {self.name} yuklenemedi: {e}")
+            return None
+
+    def get(self):
+        """Paylasilan ornek (yuklenemediyse None)"""
+        with self._lock:
+            if not self._loaded:
+                path = self._source()
+                self._instance = self._build(path)
+                self._signature = self._signature_of(path)
+                self._loaded = True
+                return self._instance
+            instance = self._instance
+        self._reload_if_changed()
+        return instance
+
+    def _reload_if_changed(self):
+        path = self._source()
+        signature = self._signature_of(path)
+        with self._lock:
+            if signature == self._signature or self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(path, signature), daemon=True).start()
+
+    def _reload(self, path: Optional[str], signature):
+        instance = self._build(path)
+        with self._lock:
+            if instance is not None:
+                self._instance = instance
+            # Basarisiz olsa da ayni dosya icin tekrar denenmez
+            self._signature = signature
+            self._reloading = False
+
+    def replace(self, path: str):
+        """Belirtilen dosyadan senkron yukle ve bundan sonra onu izle"""
+        instance = self._build(path)
+        with self._lock:
+            self._pinned_path = path
+            self._instance = instance
+            self._signature = self._signature_of(path)
+            self._loaded = True
+        return instance
+
+    def warm_up(self):
+        """Henuz yuklenmediyse arka planda yukle"""
+        if not self._loaded:
+            threading.Thread(target=self.get, daemon=True).start()
+
+
+def _make_drug_analyzer(path: Optional[str]):
+    from drug_analyzer import DrugAnalyzer
+    return DrugAnalyzer(path)
+
+
+def _make_pregnancy_checker(path: Optional[str]):
+    from drug_analyzer import PregnancyChecker
+    return PregnancyChecker(path)
+
+
+def _drug_list_path() -> Optional[str]:
+    from drug_analyzer import default_drug_list_path
+    return default_drug_list_path()
+
+
+def _pregnancy_list_path() -> Optional[str]:
+    from drug_analyzer import default_pregnancy_list_path
+    return default_pregnancy_list_path()
+
+
+DRUG_ANALYZER = SharedAnalyzer("Ilac analiz modulu", _make_drug_analyzer, _drug_list_path)
+PREGNANCY_CHECKER = SharedAnalyzer("Gebe listesi", _make_pregnancy_checker, _pregnancy_list_path)
+
+
+def get_drug_analyzer():
+    return DRUG_ANALYZER.get()
+
+
+def get_pregnancy_checker():
+    return PREGNANCY_CHECKER.get()
+
+
+def replace_pregnancy_list(path: str):
+    """Kullanicinin sectigi gebe listesini tum HYPAutomation'lar icin yukle"""
+    return PREGNANCY_CHECKER.replace(path)
+
+
+def warm_up():
+    """Iki analiz nesnesini arka planda onceden yukle"""
+    DRUG_ANALYZER.warm_up()
+    PREGNANCY_CHECKER.warm_up()
@@ -98,6 +98,84 @@ WAIT_TIMES = {
     "login": 10.0,
 }
 
+# ============================================================
+# OLAY TABANLI BEKLEMELER (page_waits.py)
+# ============================================================
+# False yapılırsa eski sabit time.sleep() süreleri kullanılır
+EVENT_WAITS_ENABLED = True
+
+# Koşul başına zaman aşımı / yoklama aralığı / sessizlik süresi (saniye)
+WAIT_CONDITIONS = {
+    "url_change": {"timeout": 5.0, "poll": 0.05, "quiet": 0.25},
+    "angular_stable": {"timeout": 5.0, "poll": 0.05},
+    "network_idle": {"timeout": 8.0, "poll": 0.05, "quiet": 0.15},
+    "dom_settled": {"timeout": 5.0, "poll": 0.05, "quiet": 0.15},
+    "element": {"timeout": 5.0, "poll": 0.05},
+}
+
+# ============================================================
+# OTURUM KAYDI (session_capture.py / replay_benchmark.py)
+# ============================================================
+# Bir klasör verilirse her bekleme noktasında sayfa (URL + DOM) anonim olarak
+# kaydedilir. HYP_CAPTURE_DIR ortam değişkeni de kullanılabilir.
+SESSION_CAPTURE_DIR = None
+
+# ============================================================
+# WEBDRIVER PROFİLİ (webdriver_profiler.py)
+# ============================================================
+# True ise her WebDriver komutu ve time.sleep süresiyle ve çağıran metotla
+# kaydedilir; oturum sonunda flame graph dosyası (.folded) yazılır ve özet
+# popup'ında en pahalı metotlar gösterilir. HYP_PROFILE=1 ile de açılabilir.
+WEBDRIVER_PROFILE = False
+# None = uygulama klasöründe "profiles"
+WEBDRIVER_PROFILE_DIR = None
+
+# ============================================================
+# OLAY KAYDI (event_log.py / event_query.py)
+# ============================================================
+# Her hasta, kart ve protokol adımı için bir JSONL satırı yazılır (ad/TC yazılmaz).
+# Dosya EVENT_LOG_MAX_BYTES'ı aşınca sıkıştırılıp ayrılır.
+EVENT_LOG_ENABLED = True
+# None = uygulama klasöründe "event_logs"
+EVENT_LOG_DIR = None
+EVENT_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+# ============================================================
+# HEMŞİRE KUYRUĞU (nurse_queue.py)
+# ============================================================
+# "folder": paylaşımlı klasörde .tc/.bildirim dosyaları (hemşire paneli varsayılanı)
+# "sqlite": klasördeki hyp_queue.db (yalnızca yerel/hızlı klasörler için)
+# İki uygulamada da aynı seçilmelidir (hemşire: hemsire_ayarlar.json "queue_backend").
+NURSE_QUEUE_BACKEND = "folder"
+# Hemşire TC'leri arasında girişli Chrome açık tutulur (warm_session.py);
+# bu kadar dakika yeni TC gelmezse Chrome kapatılır
+NURSE_WARM_IDLE_MINUTES = 30
+
+# ============================================================
+# HASTA ÖN TARAMASI (work_plan.py)
+# ============================================================
+# İşlemeden önce cache ve kalan hedefe göre işi olmayan hastalar elenir.
+# "auto": kalan hedef toplamı hasta sayısından azsa kartlar da önceden okunur
+#         ve hastalar kalan hedefi en çok kapatandan başlayarak sıralanır
+# "on": kart taraması her zaman, "off": sadece tarayıcısız eleme
+PRESCREEN_MODE = "auto"
+# Dakika verilirse (ör. ay sonu 120) hastalar bu süreye sığan en çok hedefi
+# kapatacak şekilde seçilir (scheduler.py); None = sınırsız
+SCHEDULE_TIME_BUDGET_MINUTES = None
+
+# ============================================================
+# PROTOKOL ADIM SÜRE BÜTÇELERİ (page_flow.py)
+# ============================================================
+# Bir adım bütçeyi aşarsa uyarı loglanır ve özet raporda sayılır.
+# Anahtar: "Akis.SAYFA" (ör. "KVR.TETKIK"), "SAYFA" veya "default"
+PAGE_TIME_BUDGETS = {
+    "default": 15.0,
+    "ANAMNEZ": 20.0,
+    "TETKIK": 45.0,
+    "ILAC": 25.0,
+    "GERIATRIK": 20.0,
+}
+
 # ============================================================
 # XPATH SELECTOR'LER
 # ============================================================
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+CHROMEDRIVER COZUMLEYICI (onbellekli, internetsiz)
+==================================================
+Eskiden her Chrome baslatmada ChromeDriverManager().install() cagriliyordu:
+surum sorgusu her seferinde internete cikiyor, internet yoksa basarisiz
+oluyordu.
+
+Simdi:
+- Kurulu Chrome surumu setup_checker.get_chrome_version() ile (registry,
+  internet yok) okunur
+- Ana surum (ornek "131") icin daha once indirilmis chromedriver
+  ~/.hyp_chromedriver/<ana_surum>/ altinda saklanir ve driver_cache.json'a
+  yazilir; ana surum eslesiyorsa dogrudan bu dosya kullanilir
+- Chrome guncellenip ana surum degistiyse yeni surucu bir kez indirilir;
+  baslangic kontrolleri bunu arka planda baslatir (start_background_refresh),
+  otomasyon baslarken indirme bitmediyse beklenir
+- Hicbiri olmazsa (internet yok, onbellek yok) None doner; Selenium'un kendi
+  surucu yoneticisi (Selenium Manager) denenir
+"""
+
+import os
+import json
+import time
+import shutil
+import subprocess
+import threading
+from typing import Callable, Dict, Optional
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".hyp_chromedriver")
+CACHE_FILE = os.path.join(CACHE_DIR, "driver_cache.json")
+
+_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+# Son cozumlemenin durumu (baslangic kontrolunde gosterilir)
+last_status: Dict = {}
+
+
+def _major(version: Optional[str]) -> Optional[str]:
+    if not version or not version[0].isdigit():
+        return None
+    return version.split('.')[0]
+
+
+def installed_chrome_version() -> Optional[str]:
+    """Kurulu Chrome surumu (bulunamazsa None) - internet kullanmaz"""
+    try:
+        from setup_checker import get_chrome_version
+        return get_chrome_version()
+    except Exception:
+        return None
+
+
+def _load_cache() -> Dict:
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: Dict):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def cached_driver(chrome_version: Optional[str]) -> Optional[str]:
+    """Bu Chrome ana surumu icin onbellekteki chromedriver yolu (yoksa None)"""
+    major = _major(chrome_version)
+    if major is None:
+        return None
+    entry = _load_cache().get(major)
+    if not entry or not os.path.isfile(entry.get("path", "")):
+        return None
+    # Surucunun kendi bildirdigi ana surum de eslesmeli
+    if _major(entry.get("driver_version")) not in (None, major):
+        return None
+    return entry["path"]
+
+
+def driver_version(path: str) -> Optional[str]:
+    """chromedriver --version ciktisindan surum (yerel calistirma, internet yok)"""
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        # "ChromeDriver 131.0.6778.85 (...)"
+        parts = out.split()
+        return parts[1] if len(parts) > 1 else None
+    except Exception:
+        return None
+
+
+def _download_driver(chrome_version: Optional[str]) -> str:
+    """webdriver_manager ile indir, ana surum klasorune kopyala ve kaydet"""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    downloaded = ChromeDriverManager().install()
+    major = _major(chrome_version)
+    if major is None:
+        return downloaded
+
+    target_dir = os.path.join(CACHE_DIR, major)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(downloaded))
+    shutil.copy2(downloaded, target)
+
+    cache = _load_cache()
+    cache[major] = {
+        "path": target,
+        "chrome_version": chrome_version,
+        "driver_version": driver_version(target),
+        "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    _save_cache(cache)
+    return target
+
+
+def resolve_chromedriver(log: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """
+    Kullanilacak chromedriver yolu. Onbellekte varsa internete cikmaz.
+    Indirme gerekir ve basarisiz olursa None (Selenium Manager'a birakilir).
+    """
+    started = time.perf_counter()
+    chrome_version = installed_chrome_version()
+
+    # Arka planda indirme suruyorsa onu bekle (ayni surucuyu iki kez indirme)
+    thread = _refresh_thread
+    if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+        if log:
+            log("⏳ ChromeDriver indirmesi bekleniyor...")
+        thread.join()
+
+    with _lock:
+        path = cached_driver(chrome_version)
+        source = "onbellek"
+        if path is None:
+            try:
+                if log:
+                    log(f"⬇️ ChromeDriver indiriliyor (Chrome {chrome_version or '?'})...")
+                path = _download_driver(chrome_version)
+                source = "indirildi"
+            except Exception as e:
+                if log:
+                    log(f"⚠️ ChromeDriver indirilemedi, Selenium Manager denenecek: {str(e)[:80]}")
+                path, source = None, "selenium"
+
+    last_status.update({
+        "chrome_version": chrome_version,
+        "path": path,
+        "source": source,
+        "seconds": time.perf_counter() - started,
+    })
+    return path
+
+
+def start_background_refresh(on_done: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Baslangic kontrolu: Chrome surumune uygun surucu onbellekte mi?
+    Degilse (Chrome guncellenmis / ilk kurulum) arka planda indirmeyi baslat.
+    Hemen doner: {"chrome_version", "cached", "seconds"}; indirme bitince on_done(last_status).
+    """
+    global _refresh_thread
+    started = time.perf_counter()
+    chrome_version = installed_chrome_version()
+    cached = cached_driver(chrome_version) is not None
+    result = {
+        "chrome_version": chrome_version,
+        "cached": cached,
+        "seconds": time.perf_counter() - started,
+    }
+    if cached or _major(chrome_version) is None:
+        return result
+
+    def refresh():
+        resolve_chromedriver()
+        if on_done:
+            on_done(dict(last_status))
+
+    with _lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = threading.Thread(target=refresh, name="ChromeDriverRefresh", daemon=True)
+            _refresh_thread.start()
+    return result
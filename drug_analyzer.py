@@ -23,15 +23,88 @@ ATC Kodlari Rehberi:
 
 import os
 import re
+import pickle
+import hashlib
+from bisect import bisect_left
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 
-# Excel icin opsiyonel import
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+from tr_text import normalize_tr_words
+
+
+def _import_pandas():
+    """
+    Excel icin opsiyonel pandas (yoksa None). Modul yuklenirken degil, ilk
+    Excel okumasinda import edilir: ilac cache'i gecerliyse pandas hic yuklenmez.
+    """
+    try:
+        import pandas as pd
+        return pd
+    except ImportError:
+        return None
+
+
+# Ilac listesi cache formati degisirse artir (eski cache'ler yeniden olusturulur)
+DRUG_CACHE_VERSION = 1
+
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def default_drug_list_path() -> Optional[str]:
+    """Uygulama klasorundeki ilac listesi (yoksa None)"""
+    for name in ('Ilac Listesi.xlsx', 'İlaç Listesi.xlsx'):
+        full_path = os.path.join(os.path.dirname(__file__), name)
+        if os.path.exists(full_path):
+            return full_path
+    return None
+
+
+class AtcPrefixTrie:
+    """
+    ATC on ek tablolari icin tek trie.
+
+    Bir kod tek yuruyuste tum tablolara gore siniflandirilir. Her tabloda,
+    eski dongulerle ayni sekilde, koda uyan on eklerden tablo sirasinda ilk
+    gelen kazanir (en uzun eslesme degil).
+    """
+
+    def __init__(self, tables: List[Dict[str, str]]):
+        self.table_count = len(tables)
+        self._root: Dict = {}
+        for kind, table in enumerate(tables):
+            for order, (prefix, label) in enumerate(table.items()):
+                node = self._root
+                for ch in prefix.upper():
+                    node = node.setdefault(ch, {})
+                # None anahtari: bu dugumde biten on ekler {tablo: (sira, etiket)}
+                node.setdefault(None, {}).setdefault(kind, (order, label))
+        self._memo: Dict[str, Tuple[str, ...]] = {}
+
+    def classify(self, atc_code: str) -> Tuple[str, ...]:
+        """Her tablo icin eslesen etiket ('' = eslesme yok)"""
+        cached = self._memo.get(atc_code)
+        if cached is not None:
+            return cached
+
+        best = [None] * self.table_count
+        node = self._root
+        for ch in atc_code:
+            node = node.get(ch)
+            if node is None:
+                break
+            for kind, hit in node.get(None, {}).items():
+                if best[kind] is None or hit[0] < best[kind][0]:
+                    best[kind] = hit
+
+        result = tuple(hit[1] if hit else '' for hit in best)
+        self._memo[atc_code] = result
+        return result
 
 
 class DrugAnalyzer:
@@ -151,35 +224,130 @@ class DrugAnalyzer:
         self.excel_path = excel_path
         self.drug_database = {}
 
+        # ATC siniflandirma: kronik / kisa sureli / uygunsuz tek yuruyuste
+        self._atc_trie = AtcPrefixTrie([
+            self.CHRONIC_ATC_PREFIXES,
+            self.SHORT_TERM_ATC_PREFIXES,
+            self.POTENTIALLY_INAPPROPRIATE_DRUGS,
+        ])
+
+        # Ilac adi on ek indeksi (sirali adlar + Excel sirasi, bisect ile arama)
+        self._sorted_names: List[str] = []
+        self._sorted_ranks: List[int] = []
+        self._names_by_rank: List[str] = []
+        self._prefix_memo: Dict[str, str] = {}
+
         if excel_path and os.path.exists(excel_path):
             self._load_drug_database()
 
+    def _cache_path(self) -> str:
+        """Excel'in yanindaki derlenmis cache dosyasi"""
+        return os.path.splitext(self.excel_path)[0] + '.cache.pkl'
+
     def _load_drug_database(self):
-        """Excel'den ilac veritabanini yukle"""
-        if not PANDAS_AVAILABLE:
+        """Ilac veritabanini yukle (derlenmis cache varsa Excel okunmaz)"""
+        stat = os.stat(self.excel_path)
+        cache_path = self._cache_path()
+
+        cached = self._read_cache(cache_path, stat)
+        if cached is not None:
+            self.drug_database = cached
+        else:
+            database = self._read_excel()
+            if database is None:
+                return
+            self.drug_database = database
+            print(f"[OK] {len(self.drug_database)} ilac yuklendi")
+            self._write_cache(cache_path, stat)
+
+        self._build_name_index()
+
+    def _read_cache(self, cache_path: str, stat) -> Optional[Dict]:
+        """
+        Cache gecerliyse ilac sozlugunu dondur.
+        Boyut + mtime ayniysa hash hesaplanmaz; mtime degismis ama icerik
+        ayniysa (kopyalama vb.) hash ile dogrulanir.
+        """
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = pickle.load(f)
+            if payload.get('version') != DRUG_CACHE_VERSION or payload.get('size') != stat.st_size:
+                return None
+            if payload.get('mtime_ns') != stat.st_mtime_ns:
+                if payload.get('sha1') != _file_sha1(self.excel_path):
+                    return None
+            return payload['drug_database']
+        except Exception as e:
+            print(f"[!] Ilac cache okunamadi, Excel'den yuklenecek: {e}")
+            return None
+
+    def _write_cache(self, cache_path: str, stat):
+        """Cache'i temp dosyaya yaz, atomik olarak degistir"""
+        tmp_path = cache_path + '.tmp'
+        try:
+            payload = {
+                'version': DRUG_CACHE_VERSION,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha1': _file_sha1(self.excel_path),
+                'drug_database': self.drug_database,
+            }
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"[!] Ilac cache yazilamadi: {e}")
+
+    def _read_excel(self) -> Optional[Dict]:
+        """Excel'den ilac veritabanini olustur (sutun bazli, satir dongusu yok)"""
+        pd = _import_pandas()
+        if pd is None:
             print("[!] Pandas yuklu degil, Excel okunamiyor")
-            return
+            return None
 
         try:
-            df = pd.read_excel(self.excel_path, header=1)
+            df = pd.read_excel(self.excel_path, header=1, dtype=str)
             # Sutun isimlerini duzelt
             df.columns = ['ilac_adi', 'barkod', 'atc_kodu', 'atc_adi', 'firma',
                          'recete_turu', 'durum', 'aciklama', 'temel_ilac',
                          'cocuk_temel', 'yenidogan_temel', 'aktif_tarih']
 
-            # Veritabanini olustur (ilac adi -> bilgiler)
-            for _, row in df.iterrows():
-                ilac_adi = str(row['ilac_adi']).upper().strip()
-                if ilac_adi and ilac_adi != 'NAN':
-                    self.drug_database[ilac_adi] = {
-                        'atc_kodu': str(row['atc_kodu']).strip() if pd.notna(row['atc_kodu']) else '',
-                        'atc_adi': str(row['atc_adi']).strip() if pd.notna(row['atc_adi']) else '',
-                        'barkod': str(row['barkod']).strip() if pd.notna(row['barkod']) else '',
-                    }
+            names = df['ilac_adi'].astype(str).str.upper().str.strip()
+            keep = (names != '') & (names != 'NAN')
+            columns = [df[c].fillna('').astype(str).str.strip()[keep]
+                       for c in ('atc_kodu', 'atc_adi', 'barkod')]
 
-            print(f"[OK] {len(self.drug_database)} ilac yuklendi")
+            # Veritabanini olustur (ilac adi -> bilgiler)
+            # Ayni ad tekrar ederse son satir gecerli, sira ilk gorulme (eskisi gibi)
+            return {
+                name: {'atc_kodu': atc, 'atc_adi': atc_adi, 'barkod': barkod}
+                for name, atc, atc_adi, barkod in zip(names[keep].tolist(),
+                                                      *(c.tolist() for c in columns))
+            }
         except Exception as e:
             print(f"[!] Excel okuma hatasi: {e}")
+            return None
+
+    def _build_name_index(self):
+        """drug_database icin sirali ad indeksini olustur"""
+        self._names_by_rank = list(self.drug_database)
+        order = sorted(range(len(self._names_by_rank)), key=self._names_by_rank.__getitem__)
+        self._sorted_names = [self._names_by_rank[i] for i in order]
+        self._sorted_ranks = order
+        self._prefix_memo = {}
+
+    def _first_with_prefix(self, prefix: str) -> Optional[str]:
+        """Bu on ekle baslayan, Excel sirasinda ilk ilac adi"""
+        if len(self._names_by_rank) != len(self.drug_database):
+            # drug_database disaridan degistirildiyse indeksi yenile
+            self._build_name_index()
+        lo = bisect_left(self._sorted_names, prefix)
+        hi = bisect_left(self._sorted_names, prefix + '\U0010ffff', lo)
+        if lo == hi:
+            return None
+        return self._names_by_rank[min(self._sorted_ranks[lo:hi])]
 
     def get_atc_code(self, drug_name: str) -> str:
         """Ilac adindan ATC kodunu bul"""
@@ -189,12 +357,30 @@ class DrugAnalyzer:
         if drug_name_upper in self.drug_database:
             return self.drug_database[drug_name_upper].get('atc_kodu', '')
 
+        words = drug_name_upper.split()
+        if not words:
+            return ''
+
         # Kismi esleme (ilac adi baslangici)
-        for db_name, info in self.drug_database.items():
-            if db_name.startswith(drug_name_upper.split()[0]):
-                return info.get('atc_kodu', '')
+        first_word = words[0]
+        cached = self._prefix_memo.get(first_word)
+        if cached is not None:
+            return cached
+        db_name = self._first_with_prefix(first_word)
+        atc = self.drug_database[db_name].get('atc_kodu', '') if db_name else ''
+        self._prefix_memo[first_word] = atc
+        return atc
+
+    def classify_atc(self, atc_code: str) -> Tuple[str, str, str]:
+        """
+        ATC kodunu tek seferde siniflandir.
 
-        return ''
+        Returns:
+            (kronik_kategori, kisa_sureli_kategori, uygunsuz_uyarisi) - eslesmeyen ''
+        """
+        if not atc_code:
+            return '', '', ''
+        return self._atc_trie.classify(atc_code.upper().strip())
 
     def is_chronic_drug(self, atc_code: str) -> Tuple[bool, str]:
         """
@@ -203,17 +389,8 @@ class DrugAnalyzer:
         Returns:
             (is_chronic, category_name)
         """
-        if not atc_code:
-            return False, ''
-
-        atc_code = atc_code.upper().strip()
-
-        # Kronik ilac kontrolu
-        for prefix, category in self.CHRONIC_ATC_PREFIXES.items():
-            if atc_code.startswith(prefix):
-                return True, category
-
-        return False, ''
+        category = self.classify_atc(atc_code)[0]
+        return bool(category), category
 
     def is_short_term_drug(self, atc_code: str) -> Tuple[bool, str]:
         """
@@ -222,16 +399,8 @@ class DrugAnalyzer:
         Returns:
             (is_short_term, category_name)
         """
-        if not atc_code:
-            return False, ''
-
-        atc_code = atc_code.upper().strip()
-
-        for prefix, category in self.SHORT_TERM_ATC_PREFIXES.items():
-            if atc_code.startswith(prefix):
-                return True, category
-
-        return False, ''
+        category = self.classify_atc(atc_code)[1]
+        return bool(category), category
 
     def is_potentially_inappropriate(self, atc_code: str) -> Tuple[bool, str]:
         """
@@ -240,16 +409,8 @@ class DrugAnalyzer:
         Returns:
             (is_inappropriate, warning_message)
         """
-        if not atc_code:
-            return False, ''
-
-        atc_code = atc_code.upper().strip()
-
-        for prefix, warning in self.POTENTIALLY_INAPPROPRIATE_DRUGS.items():
-            if atc_code.startswith(prefix):
-                return True, warning
-
-        return False, ''
+        warning = self.classify_atc(atc_code)[2]
+        return bool(warning), warning
 
     def analyze_drug_list(self, drugs: List[Dict]) -> Dict:
         """
@@ -283,11 +444,10 @@ class DrugAnalyzer:
         for drug in drugs:
             drug_name = drug.get('name', '')
             atc_code = drug.get('atc', '') or self.get_atc_code(drug_name)
+            chronic_category, short_category, warning = self.classify_atc(atc_code)
 
             # Kronik ilac mi?
-            is_chronic, chronic_category = self.is_chronic_drug(atc_code)
-
-            if is_chronic:
+            if chronic_category:
                 result['chronic_count'] += 1
                 result['chronic_drugs'].append({
                     'name': drug_name,
@@ -296,8 +456,7 @@ class DrugAnalyzer:
                 })
             else:
                 # Kisa sureli mi?
-                is_short, short_category = self.is_short_term_drug(atc_code)
-                if is_short:
+                if short_category:
                     result['short_term_drugs'].append({
                         'name': drug_name,
                         'atc': atc_code,
@@ -305,8 +464,7 @@ class DrugAnalyzer:
                     })
 
             # Yasli icin uygunsuz mu?
-            is_inappropriate, warning = self.is_potentially_inappropriate(atc_code)
-            if is_inappropriate:
+            if warning:
                 result['inappropriate_drugs'].append({
                     'name': drug_name,
                     'atc': atc_code,
@@ -683,30 +841,44 @@ if __name__ == '__main__':
     test_drug_analyzer()
 
 
+def default_pregnancy_list_path() -> Optional[str]:
+    """Uygulama klasorundeki varsayilan gebe listesi (yoksa None)"""
+    default_paths = [
+        'Gebe Listesi (27.11.2025).xls',
+        'Gebe Listesi.xls',
+        'Gebe Listesi.xlsx',
+    ]
+    for path in default_paths:
+        full_path = os.path.join(os.path.dirname(__file__), path)
+        if os.path.exists(full_path):
+            return full_path
+    return None
+
+
 class PregnancyChecker:
     """Gebe listesi kontrolu"""
     
     def __init__(self, excel_path: str = None):
         self.pregnant_patients = {}  # TC -> hasta bilgileri
+        self.source_path = None
+
+        # Ad indeksleri (_build_name_index)
+        self._indexed_count = -1
+        self._names: List[str] = []              # normalize ad soyad
+        self._exact_names: set = set()
+        self._token_index: Dict[str, List[int]] = {}  # kelime -> _names sirasi
         
-        if excel_path and os.path.exists(excel_path):
-            self._load_pregnancy_list(excel_path)
-        else:
+        if not (excel_path and os.path.exists(excel_path)):
             # Varsayilan yol
-            default_paths = [
-                'Gebe Listesi (27.11.2025).xls',
-                'Gebe Listesi.xls',
-                'Gebe Listesi.xlsx',
-            ]
-            for path in default_paths:
-                full_path = os.path.join(os.path.dirname(__file__), path)
-                if os.path.exists(full_path):
-                    self._load_pregnancy_list(full_path)
-                    break
+            excel_path = default_pregnancy_list_path()
+        if excel_path:
+            self._load_pregnancy_list(excel_path)
     
     def _load_pregnancy_list(self, excel_path: str):
         """Excel'den gebe listesini yukle"""
-        if not PANDAS_AVAILABLE:
+        self.source_path = excel_path
+        pd = _import_pandas()
+        if pd is None:
             print('[!] Pandas yuklu degil, gebe listesi okunamiyor')
             return
 
@@ -761,6 +933,52 @@ class PregnancyChecker:
             print(f'[OK] {len(self.pregnant_patients)} gebe yuklendi')
         except Exception as e:
             print(f'[!] Gebe listesi okuma hatasi: {e}')
+
+        self._build_name_index()
+
+    def _build_name_index(self):
+        """Normalize ad kumesi + kelime indeksi"""
+        self._names = []
+        self._exact_names = set()
+        self._token_index = {}
+        for patient in self.pregnant_patients.values():
+            name = normalize_tr_words(patient.get('ad_soyad', ''))
+            if not name or name in self._exact_names:
+                continue
+            idx = len(self._names)
+            self._names.append(name)
+            self._exact_names.add(name)
+            for token in set(name.split()):
+                self._token_index.setdefault(token, []).append(idx)
+        self._indexed_count = len(self.pregnant_patients)
+
+    def _name_matches(self, ad_soyad: str) -> bool:
+        """
+        Ad soyad listede var mi?
+        Eski davranis gibi biri digerinin icinde geciyorsa eslesir
+        (ornegin kisaltilmis 'AYSE YIL' -> 'AYSE YILMAZ'); adaylar yalnizca
+        en az bir tam kelimesi ortak olan kayitlardir.
+        """
+        if self._indexed_count != len(self.pregnant_patients):
+            # pregnant_patients disaridan degistirildiyse indeksi yenile
+            self._build_name_index()
+
+        query = normalize_tr_words(ad_soyad)
+        if not query:
+            return False
+        if query in self._exact_names:
+            return True
+
+        seen = set()
+        for token in query.split():
+            for idx in self._token_index.get(token, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                name = self._names[idx]
+                if name in query or query in name:
+                    return True
+        return False
     
     def is_pregnant(self, tc: str = None, ad_soyad: str = None) -> bool:
         """
@@ -784,15 +1002,27 @@ class PregnancyChecker:
         
         # Ad soyad ile kontrol
         if ad_soyad:
-            ad_soyad_upper = ad_soyad.upper().strip()
-            for patient in self.pregnant_patients.values():
-                patient_name = patient.get('ad_soyad', '').upper()
-                if patient_name and patient_name in ad_soyad_upper:
-                    return True
-                if patient_name and ad_soyad_upper in patient_name:
-                    return True
+            return self._name_matches(ad_soyad)
         
         return False
+
+    def is_pregnant_many(self, patients: List) -> List[bool]:
+        """
+        Gunun hasta listesini topluca tara.
+
+        Args:
+            patients: ad soyad string'leri veya {'tc', 'ad_soyad'} sozlukleri
+
+        Returns:
+            Ayni sirada True/False listesi
+        """
+        results = []
+        for patient in patients:
+            if isinstance(patient, dict):
+                results.append(self.is_pregnant(tc=patient.get('tc'), ad_soyad=patient.get('ad_soyad')))
+            else:
+                results.append(self.is_pregnant(ad_soyad=patient))
+        return results
     
     def get_pregnancy_answer(self, tc: str = None, ad_soyad: str = None) -> str:
         """
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+OTURUM OLAY KAYDI
+=================
+Her oturum, hasta, kart ve protokol adimi icin bir satir JSON (JSONL),
+yalnizca sona eklenir. Dosya config.EVENT_LOG_MAX_BYTES'i asinca
+events_YYYYMMDD_HHMMSS.jsonl.gz olarak sikistirilip ayrilir.
+
+Olay tipleri ve alanlari (hepsinde: ts, session, type):
+    session_start  - mode
+    session_end    - basarili, basarisiz, atlanan, seconds
+    patient        - patient (hasta anahtari), outcome, seconds, cards_ok, cards_fail
+    card           - patient, hyp, outcome (ok/fail/sms_skip), seconds, page
+    step           - flow, page, result (NEXT/RETRY/DONE/FAIL/STUCK/MAX_STEPS), seconds
+
+Hasta adi/TC yazilmaz; ayni hastanin olaylari kisa bir anahtarla baglanir
+(HMAC-SHA256, kuruluma ozel rastgele sir ~/.hyp_event_key'de, kayit klasoru
+disinda; TC uzayi kucuk oldugu icin tuzsuz hash kaba kuvvetle cozulebilirdi).
+Analiz: python event_query.py
+"""
+
+import os
+import json
+import gzip
+import time
+import uuid
+import atexit
+import hmac
+import hashlib
+import threading
+from typing import Dict, Iterator, Optional
+
+import config
+
+
+ACTIVE_FILE = "events.jsonl"
+# Hasta anahtari sirri (kayitlarla birlikte paylasilmamasi icin log klasoru disinda)
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".hyp_event_key")
+
+_key: Optional[bytes] = None
+_key_lock = threading.Lock()
+
+
+def default_log_dir() -> str:
+    return getattr(config, "EVENT_LOG_DIR", None) or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "event_logs")
+
+
+def _secret() -> bytes:
+    """Kuruluma ozel sir; ilk kullanimda olusturulur"""
+    global _key
+    with _key_lock:
+        if _key is None:
+            try:
+                fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    f.write(os.urandom(32).hex())
+            except FileExistsError:
+                pass
+            # Baska bir surec olusturuyorsa yazmasi bitene kadar bekle
+            for _ in range(50):
+                with open(KEY_FILE, 'r') as f:
+                    text = f.read().strip()
+                if len(text) == 64:
+                    break
+                time.sleep(0.02)
+            _key = bytes.fromhex(text)
+        return _key
+
+
+def patient_key(name: Optional[str]) -> str:
+    """Hasta adi/TC yerine yazilan kisa anahtar (sir olmadan geri cozulemez)"""
+    if not name:
+        return ""
+    digest = hmac.new(_secret(), name.strip().upper().encode('utf-8'), hashlib.sha256)
+    return digest.hexdigest()[:16]
+
+
+def new_session_id() -> str:
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+class EventLog:
+    """Tek bir klasore yazan, thread-safe, dondurulen JSONL kaydi"""
+
+    def __init__(self, log_dir: str, max_bytes: int = 5 * 1024 * 1024):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.path = os.path.join(log_dir, ACTIVE_FILE)
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+
+    def _open(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def write(self, event: Dict):
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open()
+                self._file.write(line)
+                self._file.flush()
+                self._size += len(line.encode('utf-8'))
+                if self._size >= self.max_bytes:
+                    self._rotate()
+            except Exception as e:
+                print(f"[!] Olay kaydi yazilamadi: {e}")
+
+    def _rotate(self):
+        """Aktif dosyayi ayir, arka planda sikistir"""
+        self._file.close()
+        self._file = None
+        rotated = os.path.join(self.log_dir, f"events_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + '.gz'):
+            rotated = os.path.join(self.log_dir, f"events_{time.strftime('%Y%m%d_%H%M%S')}_{suffix}.jsonl")
+            suffix += 1
+        os.replace(self.path, rotated)
+        threading.Thread(target=_compress, args=(rotated,), daemon=True).start()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _compress(path: str):
+    try:
+        with open(path, 'rb') as src, gzip.open(path + '.gz.tmp', 'wb') as dst:
+            for chunk in iter(lambda: src.read(1 << 20), b''):
+                dst.write(chunk)
+        os.replace(path + '.gz.tmp', path + '.gz')
+        os.remove(path)
+    except Exception as e:
+        print(f"[!] Olay kaydi sikistirilamadi ({path}): {e}")
+
+
+_logs: Dict[str, EventLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_event_log(log_dir: Optional[str] = None) -> Optional[EventLog]:
+    """
+    Ayni klasor icin process genelinde tek yazici
+    (GUI ve paralel worker'lar ayni dosyaya yazar). Kapaliysa None.
+    """
+    if not getattr(config, "EVENT_LOG_ENABLED", True):
+        return None
+    key = os.path.abspath(log_dir or default_log_dir())
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = EventLog(key, getattr(config, "EVENT_LOG_MAX_BYTES", 5 * 1024 * 1024))
+            _logs[key] = log
+            atexit.register(log.close)
+        return log
+
+
+# ============================================================
+# OKUMA (akis halinde, dosya dosya)
+# ============================================================
+def log_files(log_dir: Optional[str] = None) -> list:
+    """
+    Eskiden yeniye: donmus dosyalar, sonra aktif dosya. Sikistirma
+    sirasinda .jsonl ve .jsonl.gz kisa sure birlikte bulunur; o durumda
+    sadece .gz alinir (ayni donem iki kez okunmasin).
+    """
+    log_dir = log_dir or default_log_dir()
+    if not os.path.isdir(log_dir):
+        return []
+    names = set(os.listdir(log_dir))
+    rotated = sorted(
+        os.path.join(log_dir, f) for f in names
+        if f.startswith("events_") and (
+            f.endswith(".jsonl.gz") or (f.endswith(".jsonl") and f + ".gz" not in names)
+        )
+    )
+    active = os.path.join(log_dir, ACTIVE_FILE)
+    return rotated + ([active] if os.path.exists(active) else [])
+
+
+def iter_events(log_dir: Optional[str] = None, since: float = 0) -> Iterator[Dict]:
+    """Tum olaylari sirayla, satir satir oku (bozuk satirlar atlanir)"""
+    for path in log_files(log_dir):
+        if not os.path.exists(path) and os.path.exists(path + '.gz'):
+            path += '.gz'  # listelendikten sonra sikistirildi
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event.get("ts", 0) >= since:
+                        yield event
+        except OSError as e:
+            print(f"[!] Olay dosyasi okunamadi ({path}): {e}")
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+OLAY KAYDI ANALIZI
+==================
+event_log.py kayitlarini akis halinde (satir satir, tum dosyalari bellege
+almadan) okuyup ozet cikarir:
+
+- Saatlik verim: aktif saat basina tamamlanan HYP (ve gunun saatine gore)
+- HYP tipine gore ortalama kart suresi ve basari orani
+- Hata noktalari: FAIL / STUCK / MAX_STEPS adimlarinin akis/sayfa dagilimi
+  ve basarisiz kartlarin kaldigi son sayfa
+- Aylik egilim: hasta, basarili/basarisiz kart, ortalama sure
+
+Kullanim:
+    python event_query.py [--dir event_logs] [--days 30] [--json]
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable
+
+from event_log import iter_events, default_log_dir
+
+
+FAIL_RESULTS = ("FAIL", "STUCK", "MAX_STEPS")
+
+
+class _Mean:
+    __slots__ = ("count", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value or 0
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def analyze(events: Iterable[Dict]) -> Dict:
+    """Tek geciste tum ozetleri hesapla (olaylar sirayla akar)"""
+    ok_by_hour = Counter()            # "2025-01-14 09" -> basarili kart
+    ok_by_hour_of_day = Counter()     # 9 -> basarili kart
+    card_time = defaultdict(_Mean)    # hyp -> sure
+    card_outcomes = defaultdict(Counter)
+    step_fail = Counter()             # "KVR/TETKIK|STUCK" -> adet
+    step_time = defaultdict(_Mean)    # "KVR/TETKIK" -> sure
+    fail_last_page = Counter()
+    monthly = defaultdict(lambda: {"patients": 0, "ok": 0, "fail": 0, "patient_time": _Mean()})
+    sessions = set()
+
+    for e in events:
+        ts = e.get("ts", 0)
+        kind = e.get("type")
+        moment = datetime.fromtimestamp(ts)
+        month = moment.strftime("%Y-%m")
+        sessions.add(e.get("session"))
+
+        if kind == "card":
+            hyp = e.get("hyp", "?")
+            outcome = e.get("outcome", "?")
+            card_outcomes[hyp][outcome] += 1
+            if outcome == "ok":
+                card_time[hyp].add(e.get("seconds"))
+                ok_by_hour[moment.strftime("%Y-%m-%d %H")] += 1
+                ok_by_hour_of_day[moment.hour] += 1
+                monthly[month]["ok"] += 1
+            elif outcome == "fail":
+                monthly[month]["fail"] += 1
+                fail_last_page[e.get("page") or "?"] += 1
+        elif kind == "step":
+            key = f"{e.get('flow')}/{e.get('page')}"
+            step_time[key].add(e.get("seconds"))
+            if e.get("result") in FAIL_RESULTS:
+                step_fail[f"{key}|{e.get('result')}"] += 1
+        elif kind == "patient":
+            monthly[month]["patients"] += 1
+            monthly[month]["patient_time"].add(e.get("seconds"))
+
+    active_hours = len(ok_by_hour)
+    return {
+        "sessions": len(sessions - {None}),
+        "throughput": {
+            "active_hours": active_hours,
+            "hyp_per_active_hour": round(sum(ok_by_hour.values()) / active_hours, 1) if active_hours else 0,
+            "by_hour_of_day": {h: ok_by_hour_of_day[h] for h in sorted(ok_by_hour_of_day)},
+        },
+        "hyp_types": {
+            hyp: {
+                "ok": outcomes.get("ok", 0),
+                "fail": outcomes.get("fail", 0),
+                "sms_skip": outcomes.get("sms_skip", 0),
+                "avg_seconds": round(card_time[hyp].avg, 1),
+            }
+            for hyp, outcomes in sorted(card_outcomes.items())
+        },
+        "failure_hotspots": [
+            {"page": key.split('|')[0], "result": key.split('|')[1], "count": n}
+            for key, n in step_fail.most_common(15)
+        ],
+        "failed_card_last_page": dict(fail_last_page.most_common(10)),
+        "slowest_steps": [
+            {"page": key, "count": m.count, "avg_seconds": round(m.avg, 1)}
+            for key, m in sorted(step_time.items(), key=lambda kv: kv[1].avg, reverse=True)[:10]
+        ],
+        "monthly": {
+            month: {
+                "patients": m["patients"], "ok": m["ok"], "fail": m["fail"],
+                "avg_patient_seconds": round(m["patient_time"].avg, 1),
+            }
+            for month, m in sorted(monthly.items())
+        },
+    }
+
+
+def print_report(result: Dict):
+    print("=" * 60)
+    print(f"OLAY KAYDI OZETI ({result['sessions']} oturum)")
+    print("=" * 60)
+
+    t = result["throughput"]
+    print(f"Verim: aktif saat basina {t['hyp_per_active_hour']} HYP ({t['active_hours']} aktif saat)")
+    for hour, count in t["by_hour_of_day"].items():
+        print(f"   {hour:02d}:00  {count}")
+
+    print("-" * 60)
+    print("HYP tipine gore:")
+    for hyp, s in result["hyp_types"].items():
+        print(f"   {hyp:<12} ok {s['ok']:>4}  hata {s['fail']:>3}  sms {s['sms_skip']:>3}  ort {s['avg_seconds']}sn")
+
+    print("-" * 60)
+    print("Hata noktalari (adim):")
+    for h in result["failure_hotspots"]:
+        print(f"   {h['page']:<28} {h['result']:<10} {h['count']}")
+    if result["failed_card_last_page"]:
+        print("Basarisiz kartlarin son sayfasi:")
+        for page, count in result["failed_card_last_page"].items():
+            print(f"   {page:<28} {count}")
+
+    print("-" * 60)
+    print("En yavas adimlar:")
+    for s in result["slowest_steps"]:
+        print(f"   {s['page']:<28} {s['count']:>5}x  ort {s['avg_seconds']}sn")
+
+    print("-" * 60)
+    print("Aylik egilim:")
+    for month, m in result["monthly"].items():
+        print(f"   {month}  hasta {m['patients']:>4}  ok {m['ok']:>4}  hata {m['fail']:>3}  "
+              f"hasta basina {m['avg_patient_seconds']}sn")
+    print("=" * 60)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HYP olay kaydi analizi")
+    parser.add_argument("--dir", default=None, help=f"Kayit klasoru (varsayilan: {default_log_dir()})")
+    parser.add_argument("--days", type=int, default=0, help="Sadece son N gun (0 = hepsi)")
+    parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yazdir")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * 86400 if args.days else 0
+    result = analyze(iter_events(args.dir, since=since))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
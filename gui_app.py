@@ -23,12 +23,15 @@ else:
 import customtkinter as ctk
 from tkinter import scrolledtext
 import threading
-import json
 from datetime import datetime, timedelta
 from infi.systray import SysTrayIcon
 from PIL import Image, ImageDraw
 from config import *
-from hyp_automation import HYPAutomation
+# hyp_automation (Selenium), hyp_calculator ve guncelleme indirme fonksiyonlari
+# ilk kullanildiklari yerde import edilir; pencere acilisini yavaslatmasinlar
+from log_pipeline import (
+    LogQueue, classify_log, detailed_log_buffer, DRAIN_INTERVAL_MS, WIDGET_MAX_LINES,
+)
 from login_manager import (
     LoginWindow, SettingsManager, SettingsWindow,
     MonthWarningDialog,
@@ -36,10 +39,10 @@ from login_manager import (
     ILAC_LISTESI_FILE, GEBE_LISTESI_FILE,
     check_ilac_listesi, check_gebe_listesi
 )
-from update_checker import (
-    check_for_updates_async, get_current_version, CURRENT_VERSION,
-    download_update_async, apply_update
-)
+from history_store import MONTH_PAGE_SIZE, SESSION_PAGE_SIZE
+from nurse_queue import get_transport
+from warm_session import WarmBrowserSession
+from update_checker import CURRENT_VERSION
 import threading
 
 # Hemsire Entegrasyonu - Paylasimli Klasor
@@ -142,10 +145,8 @@ def send_nurse_notification(shared_folder, tc, status, message, hasta_adi="", ek
             "okundu": False
         }
 
-        # Bildirim dosyası oluştur
-        notification_file = os.path.join(shared_folder, f"{tc}_{datetime.now().strftime('%H%M%S')}.bildirim")
-        with open(notification_file, 'w', encoding='utf-8') as f:
-            json.dump(notification, f, ensure_ascii=False, indent=2)
+        # Bildirimi kuyruk taşıyıcısıyla gönder (.bildirim dosyası veya hyp_queue.db)
+        get_transport(shared_folder, NURSE_QUEUE_BACKEND).send_notification(tc, notification)
 
         print(f"[NOTIFICATION] Sent to nurse: {status} - {tc}")
         return True
@@ -473,6 +474,9 @@ class HYPApp(ctk.CTk):
     def __init__(self):
         super().__init__()
 
+        # Worker thread'lerden gelen loglar (Tk timer'ı ile boşaltılır)
+        self._log_queue = LogQueue()
+
         self.settings_manager = SettingsManager()
         self.pin_code = None
         self.debug_mode = ctk.BooleanVar(value=False)
@@ -523,6 +527,8 @@ class HYPApp(ctk.CTk):
         self.shared_folder = SHARED_FOLDER
         self.tc_queue = []  # Bekleyen TC'ler
         self.nurse_tc_history = []  # Tamamlanan TC'ler [(tc, tarih, durum), ...]
+        # Hemşire TC'leri için girişli Chrome gruplar arasında açık tutulur
+        self.warm_session = WarmBrowserSession(self._create_queue_automation, self.log_message)
 
         # Minimize/Restore düzeltmesi - Windows'ta görev çubuğundan geri getirme
         self._is_minimized = False
@@ -668,6 +674,25 @@ class HYPApp(ctk.CTk):
         if self.is_running and self.automation:
             self.automation.stop()
 
+        # Bekleyen ayar yazmasını tamamla (os._exit atexit'i çalıştırmaz)
+        try:
+            self.settings_manager.flush()
+        except:
+            pass
+
+        # Oturum kaydındaki hasta adlarını anonimleştir (atexit de çalışmaz)
+        try:
+            from session_capture import finalize_all
+            finalize_all()
+        except:
+            pass
+
+        # Hemşire kuyruğunun açık tuttuğu Chrome'u kapat (chromedriver sahipsiz kalmasın)
+        try:
+            self.warm_session.shutdown()
+        except:
+            pass
+
         # Systray zaten shutdown oldu (on_quit callback'i çağrıldığında)
         try:
             self.destroy()
@@ -1084,8 +1109,8 @@ class HYPApp(ctk.CTk):
         # Tab 1: Islem Kayitlari
         self.log_tab = self.right_tabview.add("📋 Kayıtlar")
 
-        # Detaylı logları saklayacak liste
-        self.detailed_logs = []
+        # Detaylı logları saklayacak halka tampon (en eski satırlar düşer)
+        self.detailed_logs = detailed_log_buffer()
         self.minimal_log_mode = True  # Varsayılan: minimal mod
 
         # Log text widget
@@ -1132,6 +1157,7 @@ class HYPApp(ctk.CTk):
         self.log_mode_switch.pack(side="right", padx=5)
 
         self._setup_log_tags()
+        self.after(DRAIN_INTERVAL_MS, self._drain_log_queue)
 
         # Tab 2: Gecmis Aylar
         self.history_tab = self.right_tabview.add("📊 Geçmiş")
@@ -1200,6 +1226,15 @@ class HYPApp(ctk.CTk):
         )
         self.summary_button.pack(side="left")
 
+        # Tahmini bitis (scheduler.project, her hastadan sonra guncellenir)
+        self.eta_label = ctk.CTkLabel(
+            self.perf_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=self.COLORS["text_dark"]
+        )
+        self.eta_label.pack(side="left", padx=(10, 0))
+
         # Progress bar
         self.progress = ctk.CTkProgressBar(
             self.control_frame,
@@ -1717,6 +1752,15 @@ class HYPApp(ctk.CTk):
         text = f"📊 Bu oturum: {stats.get('basarili', 0)} başarılı | {stats.get('basarisiz', 0)} başarısız | {stats.get('atlanan', 0)} atlanan"
         self.perf_label.configure(text=text)
 
+    def on_schedule_updated(self, projection: dict):
+        """Kalan plan için tahmini bitişi göster (thread-safe)"""
+        if projection["complete"]:
+            text = f"🕒 Tahmini bitiş {projection['finish']:%H:%M} · hedefler tamamlanıyor"
+        else:
+            text = (f"🕒 Tahmini bitiş {projection['finish']:%H:%M} · "
+                    f"{projection['closes']}/{projection['remaining']} hedef")
+        self.after(0, lambda: self.eta_label.configure(text=text))
+
     def show_session_summary(self):
         """
         Mevcut oturum ozetini popup olarak goster.
@@ -1733,9 +1777,10 @@ class HYPApp(ctk.CTk):
         cancelled = self.automation.get_cancelled_hyps() if hasattr(self.automation, 'get_cancelled_hyps') else []
         skipped = self.automation.get_skipped_notifications() if hasattr(self.automation, 'get_skipped_notifications') else []
         failed = self.automation.get_failed_hyps() if hasattr(self.automation, 'get_failed_hyps') else []
+        profile = self.automation.get_profile_summary() if hasattr(self.automation, 'get_profile_summary') else []
         
         # Popup'i goster (gecmise kaydetme - zaten mevcut oturum)
-        self.show_completion_popup(stats, cancelled, skipped, failed, save_to_history=False)
+        self.show_completion_popup(stats, cancelled, skipped, failed, save_to_history=False, profile_lines=profile)
 
     def on_hyp_completed(self, hyp_tip: str, hasta_adi: str):
         """
@@ -1928,8 +1973,25 @@ class HYPApp(ctk.CTk):
         else:
             self.log_message("🔧 Debug modu kapatıldı.")
 
+    def _check_chromedriver(self) -> dict:
+        """ChromeDriver önbellek kontrolü; gerekiyorsa arka planda indirmeyi başlat"""
+        from driver_resolver import start_background_refresh
+
+        def on_done(status):
+            if status.get("path"):
+                msg = f"✅ ChromeDriver hazır (Chrome {status.get('chrome_version')}, {status.get('seconds', 0):.1f} sn)"
+            else:
+                msg = "⚠️ ChromeDriver indirilemedi - otomasyon başlarken tekrar denenecek"
+            self.log_message(msg)
+
+        try:
+            return start_background_refresh(on_done)
+        except Exception as e:
+            print(f"[STARTUP] ChromeDriver kontrol hatasi: {e}")
+            return {"chrome_version": None, "cached": False, "seconds": 0}
+
     def perform_startup_checks(self):
-        """Uygulama başlangıcında 4 temel kontrolü yap ve logla"""
+        """Uygulama başlangıcında 5 temel kontrolü yap ve logla"""
         # Başlık - belirgin kutu
         self.log_message("")
         self.log_message("╔══════════════════════════════════════════════════╗")
@@ -1940,10 +2002,10 @@ class HYPApp(ctk.CTk):
         saved_pin = self.settings_manager.get_pin_code()
         if saved_pin:
             self.pin_code = saved_pin
-            self.log_message("║  ✅ [1/4] e-İmza Şifresi    → Kayıtlı            ║")
+            self.log_message("║  ✅ [1/5] e-İmza Şifresi    → Kayıtlı            ║")
         else:
             self.pin_code = None
-            self.log_message("║  ❌ [1/4] e-İmza Şifresi    → Kayıtlı değil      ║")
+            self.log_message("║  ❌ [1/5] e-İmza Şifresi    → Kayıtlı değil      ║")
 
         # 2. İlaç Listesi Kontrolü
         ilac_ok, ilac_count, ilac_path = check_ilac_listesi()
@@ -1952,9 +2014,9 @@ class HYPApp(ctk.CTk):
             # Dosya adını kısalt
             if len(ilac_name) > 20:
                 ilac_name = ilac_name[:17] + "..."
-            self.log_message(f"║  ✅ [2/4] İlaç Listesi      → {ilac_name:<18} ║")
+            self.log_message(f"║  ✅ [2/5] İlaç Listesi      → {ilac_name:<18} ║")
         else:
-            self.log_message("║  ❌ [2/4] İlaç Listesi      → Bulunamadı         ║")
+            self.log_message("║  ❌ [2/5] İlaç Listesi      → Bulunamadı         ║")
 
         # 3. Gebe Listesi Kontrolü
         gebe_ok, gebe_count, gebe_path = check_gebe_listesi()
@@ -1962,9 +2024,9 @@ class HYPApp(ctk.CTk):
             gebe_name = os.path.basename(gebe_path) if gebe_path else ""
             if len(gebe_name) > 20:
                 gebe_name = gebe_name[:17] + "..."
-            self.log_message(f"║  ✅ [3/4] Gebe Listesi      → {gebe_name:<18} ║")
+            self.log_message(f"║  ✅ [3/5] Gebe Listesi      → {gebe_name:<18} ║")
         else:
-            self.log_message("║  ❌ [3/4] Gebe Listesi      → Bulunamadı         ║")
+            self.log_message("║  ❌ [3/5] Gebe Listesi      → Bulunamadı         ║")
 
         # 4. Aylık Hedef Veriler Kontrolü
         self.settings_manager.migrate_current_to_month()
@@ -1972,9 +2034,19 @@ class HYPApp(ctk.CTk):
         month_name = get_month_display_name(current_month)
 
         if self.settings_manager.is_current_month_configured():
-            self.log_message(f"║  ✅ [4/4] Aylık Hedefler    → {month_name:<18} ║")
+            self.log_message(f"║  ✅ [4/5] Aylık Hedefler    → {month_name:<18} ║")
         else:
-            self.log_message(f"║  ❌ [4/4] Aylık Hedefler    → Eksik              ║")
+            self.log_message(f"║  ❌ [4/5] Aylık Hedefler    → Eksik              ║")
+
+        # 5. ChromeDriver (internetsiz önbellek; Chrome güncellendiyse arka planda indirilir)
+        driver_check = self._check_chromedriver()
+        if driver_check["cached"]:
+            driver_text = f"Hazır ({driver_check['seconds'] * 1000:.0f} ms)"
+            self.log_message(f"║  ✅ [5/5] ChromeDriver      → {driver_text:<18} ║")
+        elif driver_check["chrome_version"] in (None, "Bilinmiyor"):
+            self.log_message("║  ⚠️ [5/5] ChromeDriver      → Chrome sürümü yok  ║")
+        else:
+            self.log_message("║  ⏳ [5/5] ChromeDriver      → İndiriliyor...     ║")
 
         self.log_message("╠══════════════════════════════════════════════════╣")
 
@@ -2082,9 +2154,12 @@ class HYPApp(ctk.CTk):
         for widget in self.history_scroll.winfo_children():
             widget.destroy()
 
-        history = self.settings_manager.get_monthly_history()
+        # Ayları sayfa sayfa yükle (yeniden eskiye)
+        self._history_total = self.settings_manager.count_monthly_history()
+        self._history_loaded = 0
+        self._history_more_btn = None
 
-        if not history:
+        if not self._history_total:
             ctk.CTkLabel(
                 self.history_scroll,
                 text="Henüz geçmiş ay verisi yok.\nOtomasyon çalıştıkça veriler burada görünecek.",
@@ -2094,9 +2169,35 @@ class HYPApp(ctk.CTk):
             ).pack(pady=50, expand=True)
             return
 
-        # Tarihe göre sırala (yeniden eskiye)
-        sorted_months = sorted(history.keys(), reverse=True)
+        self._load_more_history_months()
+
+    def _load_more_history_months(self):
+        """Geçmiş aylar sekmesine sonraki sayfayı ekle"""
+        if self._history_more_btn is not None:
+            self._history_more_btn.destroy()
+            self._history_more_btn = None
+
+        page = self.settings_manager.get_monthly_history_page(MONTH_PAGE_SIZE, self._history_loaded)
+        self._history_loaded += len(page)
+        for month_key, month_data in page:
+            perf = self.settings_manager.calculate_month_performance(month_key, month_data)
+            if perf:
+                self._create_history_month_card(perf)
 
+        if page and self._history_loaded < self._history_total:
+            self._history_more_btn = ctk.CTkButton(
+                self.history_scroll,
+                text=f"Daha fazla göster ({self._history_total - self._history_loaded})",
+                command=self._load_more_history_months,
+                height=28,
+                font=ctk.CTkFont(size=11),
+                fg_color="#5d6d7e",
+                hover_color="#4a5a6a"
+            )
+            self._history_more_btn.pack(pady=10)
+
+    def _create_history_month_card(self, perf):
+        """Geçmiş aylar sekmesi için tek ay kartı"""
         tarama_isimleri = {
             "HT_TARAMA": "HT Tarama", "HT_IZLEM": "HT İzlem",
             "DIY_TARAMA": "DIY Tarama", "DIY_IZLEM": "DIY İzlem",
@@ -2105,84 +2206,79 @@ class HYPApp(ctk.CTk):
             "YAS_IZLEM": "YAŞ İzlem"
         }
 
-        for month_key in sorted_months:
-            perf = self.settings_manager.calculate_month_performance(month_key)
-            if not perf:
-                continue
+        # Ay kartı
+        card = ctk.CTkFrame(self.history_scroll, corner_radius=10)
+        card.pack(fill="x", padx=5, pady=8)
 
-            # Ay kartı
-            card = ctk.CTkFrame(self.history_scroll, corner_radius=10)
-            card.pack(fill="x", padx=5, pady=8)
+        # Başlık satırı
+        header = ctk.CTkFrame(card, fg_color="transparent")
+        header.pack(fill="x", padx=15, pady=(10, 5))
 
-            # Başlık satırı
-            header = ctk.CTkFrame(card, fg_color="transparent")
-            header.pack(fill="x", padx=15, pady=(10, 5))
+        # Ay adı
+        ctk.CTkLabel(
+            header,
+            text=f"📅 {perf['display_name']}",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(side="left")
 
-            # Ay adı
-            ctk.CTkLabel(
-                header,
-                text=f"📅 {perf['display_name']}",
-                font=ctk.CTkFont(size=16, weight="bold")
-            ).pack(side="left")
+        # Yüzde
+        percentage = perf['percentage']
+        if percentage >= 100:
+            pct_color = "#2ecc71"
+            pct_text = f"✅ %{percentage:.0f}"
+        elif percentage >= 70:
+            pct_color = "#f39c12"
+            pct_text = f"⚠️ %{percentage:.0f}"
+        else:
+            pct_color = "#e74c3c"
+            pct_text = f"❌ %{percentage:.0f}"
 
-            # Yüzde
-            percentage = perf['percentage']
-            if percentage >= 100:
-                pct_color = "#2ecc71"
-                pct_text = f"✅ %{percentage:.0f}"
-            elif percentage >= 70:
-                pct_color = "#f39c12"
-                pct_text = f"⚠️ %{percentage:.0f}"
-            else:
-                pct_color = "#e74c3c"
-                pct_text = f"❌ %{percentage:.0f}"
+        ctk.CTkLabel(
+            header,
+            text=pct_text,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=pct_color
+        ).pack(side="right")
 
-            ctk.CTkLabel(
-                header,
-                text=pct_text,
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color=pct_color
-            ).pack(side="right")
+        # Özet satırı
+        ctk.CTkLabel(
+            card,
+            text=f"Toplam: {perf['total_done']} / {perf['total_target']} hedef tamamlandı",
+            font=ctk.CTkFont(size=12),
+            text_color="#bdc3c7"
+        ).pack(padx=15, pady=(0, 5))
 
-            # Özet satırı
-            ctk.CTkLabel(
-                card,
-                text=f"Toplam: {perf['total_done']} / {perf['total_target']} hedef tamamlandı",
-                font=ctk.CTkFont(size=12),
-                text_color="#bdc3c7"
-            ).pack(padx=15, pady=(0, 5))
-
-            # Progress bar
-            progress = ctk.CTkProgressBar(card, width=400)
-            progress.pack(padx=15, pady=(0, 5))
-            progress.set(min(percentage / 100, 1.0))
-
-            # Detay frame (genişletilebilir)
-            detail_frame = ctk.CTkFrame(card, fg_color="#1a252f", corner_radius=5)
-            detail_frame.pack(fill="x", padx=15, pady=(5, 10))
-
-            # Detay grid
-            for i, (kod, isim) in enumerate(tarama_isimleri.items()):
-                row_frame = ctk.CTkFrame(detail_frame, fg_color="transparent")
-                row_frame.pack(fill="x", padx=10, pady=2)
-
-                target = perf['targets'].get(kod, 0)
-                current = perf['current_counts'].get(kod, 0)
-                deferred = perf['deferred_counts'].get(kod, 0)
-                total = current + deferred
-                pct = (total / target * 100) if target > 0 else 0
-
-                # Renk
-                if pct >= 100:
-                    color = "#2ecc71"
-                elif pct >= 70:
-                    color = "#f39c12"
-                else:
-                    color = "#e74c3c"
+        # Progress bar
+        progress = ctk.CTkProgressBar(card, width=400)
+        progress.pack(padx=15, pady=(0, 5))
+        progress.set(min(percentage / 100, 1.0))
+
+        # Detay frame (genişletilebilir)
+        detail_frame = ctk.CTkFrame(card, fg_color="#1a252f", corner_radius=5)
+        detail_frame.pack(fill="x", padx=15, pady=(5, 10))
+
+        # Detay grid
+        for i, (kod, isim) in enumerate(tarama_isimleri.items()):
+            row_frame = ctk.CTkFrame(detail_frame, fg_color="transparent")
+            row_frame.pack(fill="x", padx=10, pady=2)
+
+            target = perf['targets'].get(kod, 0)
+            current = perf['current_counts'].get(kod, 0)
+            deferred = perf['deferred_counts'].get(kod, 0)
+            total = current + deferred
+            pct = (total / target * 100) if target > 0 else 0
+
+            # Renk
+            if pct >= 100:
+                color = "#2ecc71"
+            elif pct >= 70:
+                color = "#f39c12"
+            else:
+                color = "#e74c3c"
 
-                ctk.CTkLabel(row_frame, text=isim, width=100, anchor="w", font=ctk.CTkFont(size=11)).pack(side="left")
-                ctk.CTkLabel(row_frame, text=f"{total}/{target}", width=60, font=ctk.CTkFont(size=11)).pack(side="left")
-                ctk.CTkLabel(row_frame, text=f"%{pct:.0f}", width=50, text_color=color, font=ctk.CTkFont(size=11, weight="bold")).pack(side="left")
+            ctk.CTkLabel(row_frame, text=isim, width=100, anchor="w", font=ctk.CTkFont(size=11)).pack(side="left")
+            ctk.CTkLabel(row_frame, text=f"{total}/{target}", width=60, font=ctk.CTkFont(size=11)).pack(side="left")
+            ctk.CTkLabel(row_frame, text=f"%{pct:.0f}", width=50, text_color=color, font=ctk.CTkFont(size=11, weight="bold")).pack(side="left")
 
     def show_login_window(self):
         def on_login_success(pin, remember):
@@ -2258,90 +2354,57 @@ class HYPApp(ctk.CTk):
         except:
             pass  # Tag ayarlanamazsa sessizce devam et
 
-    def log_message(self, message):
+    def log_message(self, message, level=None):
         """
-        Log mesajı yaz - minimal ve detaylı mod desteği
+        Log mesajını kuyruğa ekle (her thread'den çağrılabilir).
 
+        Widget'a yazma Tk thread'inde _drain_log_queue ile toplu yapılır.
         Minimal modda sadece önemli mesajlar gösterilir:
         - Hasta başlangıç/bitiş
         - HYP tamamlandı/başarısız
         - Hatalar ve uyarılar
         """
-        # Her zaman detaylı loga kaydet
-        if hasattr(self, 'detailed_logs'):
-            self.detailed_logs.append(message)
+        self._log_queue.put(message, level)
 
-        # Minimal modda filtreleme yap
-        show_message = True
-        if hasattr(self, 'minimal_log_mode') and self.minimal_log_mode:
-            # Minimal modda gösterilecek mesajlar
-            important_patterns = [
-                "HASTA", "ISLENIYOR:", "İŞLENİYOR:",  # Hasta başlangıcı
-                "tamamlandı", "TAMAMLANDI",  # Başarılı
-                "başarısız", "BASARISIZ", "HATA", "hata",  # Hata
-                "✅", "❌", "⚠️",  # Emoji ile işaretli önemli mesajlar
-                "OTOMASYON", "OTURUM",  # Özet mesajları
-                "==", "──",  # Ayraçlar
-                "iptal", "İPTAL", "atlanan", "ATLANAN",  # İptal/atlama
-                "Eksik", "eksik",  # Eksik tetkik
-                "protokolü başladı", "protokolü tamamlandı",  # Protokol
-                "🎯", "📊", "📋", "🏁",  # Önemli emojiler
-            ]
-
-            # Debug mesajları her zaman gizle
-            if "🔧" in message or "[DEBUG]" in message:
-                show_message = False
-            # Teknik detaylar gizle
-            elif "Adım" in message and "Sayfa=" in message:
-                show_message = False
-            elif "Bulunan butonlar" in message:
-                show_message = False
-            elif "xpath" in message.lower() or "element" in message.lower():
-                show_message = False
-            elif "tiklan" in message.lower() and "buton" not in message.lower():
-                show_message = False
-            else:
-                # Önemli pattern içeriyorsa göster
-                show_message = any(p in message for p in important_patterns)
+    def _drain_log_queue(self):
+        """Kuyruktaki mesajları toplu olarak widget'a yaz (Tk timer'ı)"""
+        try:
+            batch = self._log_queue.drain()
+            if batch:
+                self._write_log_batch(batch)
+        except Exception as e:
+            print(f"Log yazma hatası: {e}")
+        finally:
+            # Kuyruk dolu ise hemen, değilse normal aralıkla tekrar
+            delay = 1 if len(self._log_queue) else DRAIN_INTERVAL_MS
+            self.after(delay, self._drain_log_queue)
+
+    def _write_log_batch(self, batch):
+        minimal = getattr(self, 'minimal_log_mode', False)
+        inner_text = self.log_text._textbox
+        chunks = []
+        for message, level in batch:
+            entry = classify_log(message, level)
+            # Her zaman detaylı loga kaydet
+            self.detailed_logs.append(message)
+            if minimal and not entry.minimal:
+                continue
+            chunks.append(entry.message + "\n")
+            chunks.append(entry.tag or ())
 
-        if not show_message:
+        if not chunks:
             return
 
-        try:
-            inner_text = self.log_text._textbox
-            start_index = inner_text.index("end-1c")
-
-            # Mesajı ekle
-            self.log_text.insert("end", message + "\n")
-
-            # Etiket belirle
-            tag = None
-            if "✅" in message:
-                tag = "success"
-                if "tamamlandı" in message.lower():
-                    tag = "hyp_complete"
-            elif "❌" in message:
-                tag = "error"
-            elif "⚠️" in message:
-                tag = "warning"
-            elif "🔧" in message:
-                tag = "debug"
-            elif "ISLENIYOR:" in message or "İŞLENİYOR:" in message:
-                tag = "patient"
-            elif "═" in message or "╔" in message or "╠" in message or "╚" in message or "==" in message:
-                tag = "header"
-
-            # Tag uygula
-            if tag:
-                end_index = inner_text.index("end-1c")
-                inner_text.tag_add(tag, start_index, end_index)
+        # Tek insert çağrısı: metin, etiket, metin, etiket...
+        inner_text.insert("end", *chunks)
 
-        except:
-            self.log_text.insert("end", message + "\n")
+        # Widget uzunluğunu sınırla
+        line_count = int(inner_text.index("end-1c").split('.')[0])
+        if line_count > WIDGET_MAX_LINES:
+            inner_text.delete("1.0", f"{line_count - WIDGET_MAX_LINES + 1}.0")
 
         self.log_text.see("end")
-        self.update_idletasks()
-    
+
     def clear_logs(self):
         self.log_text.delete("1.0", "end")
         if hasattr(self, 'detailed_logs'):
@@ -2403,8 +2466,7 @@ class HYPApp(ctk.CTk):
 
         # Logları ekle
         if hasattr(self, 'detailed_logs') and self.detailed_logs:
-            for log in self.detailed_logs:
-                detail_text.insert("end", log + "\n")
+            detail_text.insert("end", "\n".join(self.detailed_logs) + "\n")
         else:
             detail_text.insert("end", "Henüz log kaydı yok.")
 
@@ -2480,7 +2542,7 @@ class HYPApp(ctk.CTk):
             self.log_message(f"Log kaydetme hatası: {e}", "ERROR")
 
     # ============================================================
-    # HEMSIRE DINLEYICI (Dosya Tabanli - Hizli)
+    # HEMSIRE DINLEYICI (nurse_queue tasiyicisi - olay tabanli)
     # ============================================================
     def toggle_queue_listener(self):
         """Hemsire dinleyiciyi ac/kapat"""
@@ -2733,47 +2795,53 @@ class HYPApp(ctk.CTk):
         self.show_nurse_queue_dialog()  # Dialogu yeniden aç
 
     def _nurse_listener_loop(self):
-        """Hemsire TC dosyalarini dinle (her 200ms)"""
+        """
+        Hemsire TC kuyrugunu dinle.
+        Klasor her turda listelenmez: tasiyici (nurse_queue) degisiklik
+        olabilecegini bildirdiginde listelenir.
+        """
         import time
-        import os
+
+        transport = get_transport(self.shared_folder, NURSE_QUEUE_BACKEND)
+        changed = True
 
         while self.queue_listener_active:
             try:
-                # Klasor var mi?
-                if not os.path.exists(self.shared_folder):
-                    time.sleep(1)
-                    continue
-
-                # Önce kuyrukta bekleyen TC'leri topla
-                pending_tcs = []
-                for filename in os.listdir(self.shared_folder):
-                    if filename.endswith('.tc'):
-                        tc = filename[:-3]
-                        if len(tc) == 11 and tc.isdigit():
-                            pending_tcs.append(tc)
-
-                # Kuyruk değiştiyse GUI'yi güncelle
-                if pending_tcs != self.tc_queue:
-                    self.tc_queue = pending_tcs.copy()
-                    self.after(0, self._update_queue_display)
-
-                # Otomasyon çalışmıyorsa ve kuyrukta TC varsa - KUYRUK OTOMASYONU BASLAT
-                if pending_tcs and not self.is_running:
-                    # Kuyruk otomasyonunu başlat (tek Chrome oturumunda tüm kuyruğu işler)
-                    self.after(0, self._start_queue_automation)
-
-                    # İşlem bitene kadar bekle
-                    time.sleep(1)  # İşlemin başlamasını bekle
-                    while self.automation_thread and self.automation_thread.is_alive():
-                        time.sleep(0.5)
-                        if not self.queue_listener_active:
-                            break
+                if changed:
+                    # Önce kuyrukta bekleyen TC'leri topla
+                    pending_tcs = transport.pending_tcs()
 
-            except Exception as e:
-                pass  # Sessizce devam et
+                    # Kuyruk değiştiyse GUI'yi güncelle
+                    if pending_tcs != self.tc_queue:
+                        self.tc_queue = pending_tcs.copy()
+                        self.after(0, self._update_queue_display)
 
-            # 200ms bekle (hizli polling)
-            time.sleep(0.2)
+                    # Otomasyon çalışmıyorsa ve kuyrukta TC varsa - KUYRUK OTOMASYONU BASLAT
+                    if pending_tcs and not self.is_running:
+                        # Kuyruk otomasyonunu başlat (tek Chrome oturumunda tüm kuyruğu işler)
+                        self.after(0, self._start_queue_automation)
+
+                        # İşlem bitene kadar bekle
+                        time.sleep(1)  # İşlemin başlamasını bekle
+                        while self.automation_thread and self.automation_thread.is_alive():
+                            time.sleep(0.5)
+                            if not self.queue_listener_active:
+                                break
+                        # Bu sürede gelen TC'ler için tekrar listele
+                        continue
+
+                    if pending_tcs:
+                        # Manuel otomasyon sürüyor: bitince beklemeden başlamak için
+                        # kısa aralıkla tekrar bak (changed True kalır)
+                        transport.wait(0.2)
+                        continue
+
+                # Değişiklik olana kadar bekle (en fazla 1 sn, durdurma kontrolü için)
+                changed = transport.wait(1.0)
+
+            except Exception as e:
+                changed = True
+                time.sleep(1)  # Klasör erişilemiyor olabilir, sessizce devam et
 
     def _update_queue_display(self):
         """Kuyruk gösterimini güncelle"""
@@ -2799,6 +2867,19 @@ class HYPApp(ctk.CTk):
         except Exception as e:
             print(f"[QUEUE] Display update error: {e}")
 
+    def _create_queue_automation(self):
+        """Hemşire kuyruğu için otomasyon nesnesi (warm_session oluşturur)"""
+        from hyp_automation import HYPAutomation
+        automation = HYPAutomation(
+            log_callback=self.log_message,
+            stats_callback=self.update_all_quota_cards
+        )
+        # Canli ilerleme callback
+        automation.on_hyp_success_callback = self.on_hyp_completed
+        automation.on_counts_fetched_callback = self.on_counts_fetched
+        automation.on_schedule_callback = self.on_schedule_updated
+        return automation
+
     def _start_queue_automation(self):
         """Kuyruk otomasyonunu baslat - TEK CHROME OTURUMUNDA TUM KUYRUGU ISLE"""
         if self.is_running:
@@ -2815,32 +2896,14 @@ class HYPApp(ctk.CTk):
                 import config as cfg
                 cfg.PIN_CODE = self.pin_code
 
-                # Otomasyon nesnesi olustur
-                self.automation = HYPAutomation(
-                    log_callback=self.log_message,
-                    stats_callback=self.update_all_quota_cards
-                )
-
-                # Canli ilerleme callback
-                self.automation.on_hyp_success_callback = self.on_hyp_completed
-                self.automation.on_counts_fetched_callback = self.on_counts_fetched
-
-                # Driver baslat
-                self.log_message("🌐 Chrome başlatılıyor...")
-                if not self.automation.setup_driver(debug_mode=self.debug_mode.get()):
-                    self.log_message("❌ Chrome başlatılamadı!")
-                    return
-
-                # Login
-                self.log_message("🔐 HYP'ye giriş yapılıyor...")
+                # Girişli Chrome'u al (açık oturum varsa başlatma/giriş atlanır)
                 has_saved_pin = self.pin_code is not None and len(self.pin_code) > 0
-
-                if not self.automation.login(auto_pin=has_saved_pin):
-                    self.log_message("❌ Login başarısız! Lütfen manuel giriş yapın.")
+                self.automation = self.warm_session.acquire(
+                    debug_mode=self.debug_mode.get(), auto_pin=has_saved_pin
+                )
+                if self.automation is None:
                     return
 
-                self.log_message("✅ HYP'ye giriş başarılı!")
-
                 # ============================================================
                 # KUYRUK DONGUSU - Kuyruk bosalana kadar devam et
                 # ============================================================
@@ -2921,28 +2984,17 @@ class HYPApp(ctk.CTk):
                                 hasta_adi=hasta_adi
                             )
 
-                # Kuyruk bitti
+                # Kuyruk bitti - Chrome açık kalır, sonraki TC'ler beklemeden işlenir
                 self.log_message(f"🏁 Kuyruk tamamlandı! ({processed_count} hasta işlendi)")
-
-                # Chrome'u kapat
-                try:
-                    if self.automation and self.automation.driver:
-                        self.automation.driver.quit()
-                        self.log_message("🔒 Chrome kapatıldı")
-                except Exception as e:
-                    print(f"Chrome kapatma hatasi (normal): {e}")
+                self.warm_session.release()
 
             except Exception as e:
                 self.log_message(f"❌ Hata: {e}")
                 import traceback
                 traceback.print_exc()
 
-                # Hata durumunda Chrome'u kapat
-                try:
-                    if self.automation and self.automation.driver:
-                        self.automation.driver.quit()
-                except Exception as e:
-                    print(f"Chrome kapatma hatasi (hata durumu): {e}")
+                # Hata durumunda Chrome'u kapat (sonraki grup yeniden başlatır)
+                self.warm_session.discard()
 
             finally:
                 self.is_running = False
@@ -2955,31 +3007,17 @@ class HYPApp(ctk.CTk):
         self.automation_thread.start()
 
     def _get_next_tc_from_queue(self):
-        """Kuyruktan siradaki TC'yi al ve dosyasini sil"""
-        import os
+        """Kuyruktan siradaki TC'yi al ve kuyruktan sil"""
         try:
-            if not os.path.exists(self.shared_folder):
-                return None
-
-            for filename in os.listdir(self.shared_folder):
-                if filename.endswith('.tc'):
-                    tc = filename[:-3]
-                    if len(tc) == 11 and tc.isdigit():
-                        # Dosyayi sil
-                        tc_file = os.path.join(self.shared_folder, filename)
-                        try:
-                            os.remove(tc_file)
-                        except:
-                            continue
-
-                        # Kuyruktan cikar ve GUI guncelle
-                        if tc in self.tc_queue:
-                            self.tc_queue.remove(tc)
-                        self.after(0, self._update_queue_display)
-                        return tc
-        except:
-            pass
-        return None
+            tc = get_transport(self.shared_folder, NURSE_QUEUE_BACKEND).take_tc()
+        except Exception:
+            return None
+        if tc:
+            # Kuyruktan cikar ve GUI guncelle
+            if tc in self.tc_queue:
+                self.tc_queue.remove(tc)
+            self.after(0, self._update_queue_display)
+        return tc
 
     def _process_nurse_tc(self, tc):
         """Hemsireden gelen TC'yi isle"""
@@ -3002,11 +3040,9 @@ class HYPApp(ctk.CTk):
         # Otomasyon zaten çalışıyor mu?
         if self.is_running:
             self.log_message(f"⏳ Otomasyon çalışıyor, TC kuyruğa alındı: {tc}")
-            # Dosyayı tekrar oluştur (kuyrukta kalsın)
+            # Kuyruğa geri koy (kuyrukta kalsın)
             try:
-                tc_file = os.path.join(self.shared_folder, f"{tc}.tc")
-                with open(tc_file, 'w') as f:
-                    f.write("")
+                get_transport(self.shared_folder, NURSE_QUEUE_BACKEND).submit_tc(tc)
             except:
                 pass
             return
@@ -3022,31 +3058,14 @@ class HYPApp(ctk.CTk):
                 import config as cfg
                 cfg.PIN_CODE = self.pin_code
 
-                # Otomasyon nesnesi oluştur
-                self.automation = HYPAutomation(
-                    log_callback=self.log_message,
-                    stats_callback=self.update_all_quota_cards
-                )
-
-                # Canlı ilerleme callback
-                self.automation.on_hyp_success_callback = self.on_hyp_completed
-                self.automation.on_counts_fetched_callback = self.on_counts_fetched
-
-                # Driver başlat (debug modda açık Chrome'a bağlan veya yeni aç)
-                self.log_message("🌐 Chrome başlatılıyor...")
-                if not self.automation.setup_driver(debug_mode=self.debug_mode.get()):
-                    self.log_message("❌ Chrome başlatılamadı!")
-                    return
-
-                # Login kontrolü ve login işlemi
-                self.log_message("🔐 HYP'ye giriş yapılıyor...")
+                # Girişli Chrome'u al (debug modda açık Chrome'a bağlanır; açık oturum varsa tekrar kullanılır)
                 has_saved_pin = self.pin_code is not None and len(self.pin_code) > 0
-
-                if not self.automation.login(auto_pin=has_saved_pin):
-                    self.log_message("❌ Login başarısız! Lütfen manuel giriş yapın.")
+                self.automation = self.warm_session.acquire(
+                    debug_mode=self.debug_mode.get(), auto_pin=has_saved_pin
+                )
+                if self.automation is None:
                     return
 
-                self.log_message("✅ HYP'ye giriş başarılı!")
                 self.log_message(f"🔍 Hasta aranıyor: TC {tc}")
 
                 # TC ile hasta işle
@@ -3115,13 +3134,8 @@ class HYPApp(ctk.CTk):
 
                 self.log_message("🏁 Hemşire TC işlemi tamamlandı!")
 
-                # Chrome'u kapat (hemşire TC'leri için)
-                try:
-                    if self.automation and self.automation.driver:
-                        self.automation.driver.quit()
-                        self.log_message("🔒 Chrome kapatıldı")
-                except Exception as e:
-                    print(f"Chrome kapatma hatasi (hemsire TC): {e}")
+                # Chrome açık kalır (sıcak oturum), sonraki TC beklemeden işlenir
+                self.warm_session.release()
 
             except Exception as e:
                 self.log_message(f"❌ Hata: {e}")
@@ -3138,12 +3152,8 @@ class HYPApp(ctk.CTk):
                     hasta_adi=tc
                 )
 
-                # Hata durumunda da Chrome'u kapat
-                try:
-                    if self.automation and self.automation.driver:
-                        self.automation.driver.quit()
-                except Exception as e:
-                    print(f"Chrome kapatma hatasi (hemsire TC hata): {e}")
+                # Hata durumunda Chrome'u kapat (sonraki TC yeniden başlatır)
+                self.warm_session.discard()
 
             finally:
                 self.is_running = False
@@ -3468,11 +3478,27 @@ class HYPApp(ctk.CTk):
                 import config as cfg
                 cfg.PIN_CODE = self.pin_code
 
-                self.automation = HYPAutomation(
-                    log_callback=self.log_message,
-                    date_picker_callback=self.show_date_picker,
-                    stats_callback=self.update_all_quota_cards
-                )
+                # Hemşire kuyruğunun açık tuttuğu Chrome aynı profili kullanır; önce kapat
+                if self.warm_session.shutdown():
+                    self.log_message("🔒 Hemşire kuyruğunun Chrome oturumu kapatıldı")
+
+                # Paralel tarayıcı ayarı (Ayarlar > Otomasyon Ayarları)
+                worker_count = self.settings_manager.get_parallel_workers()
+                if worker_count > 1 and not self.debug_mode.get():
+                    from worker_pool import ParallelAutomationPool
+                    self.log_message(f"🧩 Paralel mod: {worker_count} tarayıcı")
+                    self.automation = ParallelAutomationPool(
+                        worker_count=worker_count,
+                        log_callback=self.log_message,
+                        stats_callback=self.update_all_quota_cards
+                    )
+                else:
+                    from hyp_automation import HYPAutomation
+                    self.automation = HYPAutomation(
+                        log_callback=self.log_message,
+                        date_picker_callback=self.show_date_picker,
+                        stats_callback=self.update_all_quota_cards
+                    )
 
                 # Eğer GEÇMİŞ butonundan seçilmiş TARİHLER varsa ayarla
                 if hasattr(self, 'pre_selected_dates') and self.pre_selected_dates:
@@ -3494,6 +3520,9 @@ class HYPApp(ctk.CTk):
                 # HYP'den sayılar çekildiğinde GUI güncelleme callback
                 self.automation.on_counts_fetched_callback = self.on_counts_fetched
 
+                # Plan sonrası ve her hastadan sonra tahmini bitiş
+                self.automation.on_schedule_callback = self.on_schedule_updated
+
                 # KVR otomatik silme ayarı callback'i (Ayarlar > Otomasyon Ayarları'ndan kontrol edilir)
                 self.automation.get_kvr_decision_callback = self.settings_manager.get_auto_delete_kvr
 
@@ -3529,7 +3558,8 @@ class HYPApp(ctk.CTk):
                 skipped = self.automation.get_skipped_notifications() if hasattr(self.automation, 'get_skipped_notifications') else []
                 failed = self.automation.get_failed_hyps() if hasattr(self.automation, 'get_failed_hyps') else []
                 stats = self.automation.session_stats.copy() if hasattr(self.automation, 'session_stats') else {}
-                self.after(0, lambda: self.show_completion_popup(stats, cancelled, skipped, failed))
+                profile = self.automation.get_profile_summary() if hasattr(self.automation, 'get_profile_summary') else []
+                self.after(0, lambda: self.show_completion_popup(stats, cancelled, skipped, failed, profile_lines=profile))
 
             except Exception as e:
                 self.log_message(f"❌ HATA: {str(e)}")
@@ -3574,7 +3604,7 @@ class HYPApp(ctk.CTk):
         self.history_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
 
-    def show_completion_popup(self, stats: dict, cancelled_list: list, skipped_list: list = None, failed_list: list = None, save_to_history: bool = True):
+    def show_completion_popup(self, stats: dict, cancelled_list: list, skipped_list: list = None, failed_list: list = None, save_to_history: bool = True, profile_lines: list = None):
         """
         Otomasyon ozet popup goster - Sekmeli tasarim.
         Mevcut oturum ve gecmis oturumlari gosterir.
@@ -3616,6 +3646,10 @@ class HYPApp(ctk.CTk):
         # ========== GECMIS OTURUMLAR SEKMESI ==========
         self._build_history_tab(tab_history, popup)
 
+        # ========== PROFIL SEKMESI (config.WEBDRIVER_PROFILE) ==========
+        if profile_lines:
+            self._build_profile_tab(tabview.add("Profil"), profile_lines)
+
         # Tamam butonu (altta)
         ctk.CTkButton(
             popup,
@@ -3731,11 +3765,32 @@ class HYPApp(ctk.CTk):
                 hover_color="#c0392b"
             ).pack(side="left", padx=3)
 
+    def _build_profile_tab(self, parent, profile_lines: list):
+        """WebDriver profil ozeti: en pahali metotlar"""
+        ctk.CTkLabel(
+            parent,
+            text="En pahali metotlar (WebDriver + sleep)",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color="#ecf0f1"
+        ).pack(pady=(5, 5))
+
+        profile_text = ctk.CTkTextbox(
+            parent,
+            wrap="none",
+            font=ctk.CTkFont(size=10, family="Consolas"),
+            corner_radius=8,
+            fg_color="#0d1117",
+            text_color="#c9d1d9"
+        )
+        profile_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        profile_text.insert("end", "\n".join(profile_lines))
+        profile_text.configure(state="disabled")
+
     def _build_history_tab(self, parent, popup):
-        """Gecmis oturumlar sekmesini olustur"""
-        history = self.settings_manager.get_session_history()
+        """Gecmis oturumlar sekmesini olustur (sayfa sayfa yuklenir)"""
+        total = self.settings_manager.count_session_history()
 
-        if not history:
+        if not total:
             ctk.CTkLabel(
                 parent,
                 text="Henuz kayitli oturum gecmisi yok.",
@@ -3747,7 +3802,7 @@ class HYPApp(ctk.CTk):
         # Ust bilgi
         ctk.CTkLabel(
             parent,
-            text=f"Son {len(history)} oturum kayitli",
+            text=f"Son {total} oturum kayitli",
             font=ctk.CTkFont(size=12),
             text_color="#bdc3c7"
         ).pack(pady=(5, 10))
@@ -3756,53 +3811,30 @@ class HYPApp(ctk.CTk):
         list_frame = ctk.CTkScrollableFrame(parent, fg_color="#2c3e50", corner_radius=10, height=280)
         list_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-        for idx, session in enumerate(history):
-            tarih = session.get('tarih', 'Bilinmiyor')
-            basarili = session.get('basarili', 0)
-            basarisiz = session.get('basarisiz', 0)
-            atlanan = session.get('atlanan', 0)
-
-            # Tarih formati: sadece gun ve saat
-            try:
-                from datetime import datetime
-                dt = datetime.strptime(tarih, "%Y-%m-%d %H:%M:%S")
-                tarih_kisa = dt.strftime("%d.%m %H:%M")
-            except:
-                tarih_kisa = tarih[:16] if len(tarih) > 16 else tarih
-
-            item_frame = ctk.CTkFrame(list_frame, fg_color="#34495e", corner_radius=8)
-            item_frame.pack(fill="x", padx=5, pady=3)
-
-            # Sol: Tarih ve ozet
-            left = ctk.CTkFrame(item_frame, fg_color="transparent")
-            left.pack(side="left", fill="x", expand=True, padx=10, pady=8)
-
-            ctk.CTkLabel(
-                left,
-                text=tarih_kisa,
-                font=ctk.CTkFont(size=12, weight="bold"),
-                text_color="#ecf0f1"
-            ).pack(anchor="w")
-
-            ozet = f"B:{basarili}  X:{basarisiz}  A:{atlanan}"
-            ctk.CTkLabel(
-                left,
-                text=ozet,
-                font=ctk.CTkFont(size=11),
-                text_color="#bdc3c7"
-            ).pack(anchor="w")
+        state = {"loaded": 0, "more": None}
+
+        def load_more():
+            if state["more"] is not None:
+                state["more"].destroy()
+                state["more"] = None
+            # Liste icin sadece ozet sutunlari; hasta listeleri Detay'da okunur
+            page = self.settings_manager.get_session_history(SESSION_PAGE_SIZE, state["loaded"], details=False)
+            state["loaded"] += len(page)
+            for session in page:
+                self._add_history_session_row(list_frame, session)
+            if page and state["loaded"] < total:
+                state["more"] = ctk.CTkButton(
+                    list_frame,
+                    text=f"Daha fazla goster ({total - state['loaded']})",
+                    command=load_more,
+                    height=28,
+                    font=ctk.CTkFont(size=11),
+                    fg_color="#636e72",
+                    hover_color="#535c5f"
+                )
+                state["more"].pack(pady=8)
 
-            # Sag: Detay butonu
-            ctk.CTkButton(
-                item_frame,
-                text="Detay",
-                command=lambda s=session: self._show_history_detail(s),
-                width=60,
-                height=28,
-                font=ctk.CTkFont(size=11),
-                fg_color="#6c5ce7",
-                hover_color="#5b4cdb"
-            ).pack(side="right", padx=10, pady=8)
+        load_more()
 
         # Gecmisi temizle butonu
         ctk.CTkButton(
@@ -3816,8 +3848,61 @@ class HYPApp(ctk.CTk):
             hover_color="#535c5f"
         ).pack(pady=(10, 5))
 
+    def _add_history_session_row(self, list_frame, session):
+        """Gecmis oturum listesine tek satir ekle"""
+        tarih = session.get('tarih', 'Bilinmiyor')
+        basarili = session.get('basarili', 0)
+        basarisiz = session.get('basarisiz', 0)
+        atlanan = session.get('atlanan', 0)
+
+        # Tarih formati: sadece gun ve saat
+        try:
+            from datetime import datetime
+            dt = datetime.strptime(tarih, "%Y-%m-%d %H:%M:%S")
+            tarih_kisa = dt.strftime("%d.%m %H:%M")
+        except:
+            tarih_kisa = tarih[:16] if len(tarih) > 16 else tarih
+
+        item_frame = ctk.CTkFrame(list_frame, fg_color="#34495e", corner_radius=8)
+        item_frame.pack(fill="x", padx=5, pady=3)
+
+        # Sol: Tarih ve ozet
+        left = ctk.CTkFrame(item_frame, fg_color="transparent")
+        left.pack(side="left", fill="x", expand=True, padx=10, pady=8)
+
+        ctk.CTkLabel(
+            left,
+            text=tarih_kisa,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color="#ecf0f1"
+        ).pack(anchor="w")
+
+        ozet = f"B:{basarili}  X:{basarisiz}  A:{atlanan}"
+        ctk.CTkLabel(
+            left,
+            text=ozet,
+            font=ctk.CTkFont(size=11),
+            text_color="#bdc3c7"
+        ).pack(anchor="w")
+
+        # Sag: Detay butonu
+        ctk.CTkButton(
+            item_frame,
+            text="Detay",
+            command=lambda s=session: self._show_history_detail(s),
+            width=60,
+            height=28,
+            font=ctk.CTkFont(size=11),
+            fg_color="#6c5ce7",
+            hover_color="#5b4cdb"
+        ).pack(side="right", padx=10, pady=8)
+
     def _show_history_detail(self, session):
         """Gecmis oturum detayini yeni popup'ta goster"""
+        # Liste satirlari ozet icerir; hasta listelerini veritabanindan al
+        if 'id' in session and 'iptal_edilenler' not in session:
+            session = self.settings_manager.get_session(session['id']) or session
+
         stats = {
             'basarili': session.get('basarili', 0),
             'basarisiz': session.get('basarisiz', 0),
@@ -4266,6 +4351,7 @@ class HYPApp(ctk.CTk):
             self.main_container.configure(fg_color="#dcdde1")
             self.title_label.configure(text_color="#ffffff")
             self.perf_label.configure(text_color="#bdc3c7")
+            self.eta_label.configure(text_color="#bdc3c7")
 
         else:
             # DARK MODE
@@ -4284,6 +4370,7 @@ class HYPApp(ctk.CTk):
             self.main_container.configure(fg_color="#16213e")
             self.title_label.configure(text_color="#e0e0e0")
             self.perf_label.configure(text_color="#a0a0a0")
+            self.eta_label.configure(text_color="#a0a0a0")
 
         # Ayarı kaydet
         self.settings_manager.settings["theme"] = self.current_theme
@@ -5407,6 +5494,7 @@ class HYPApp(ctk.CTk):
 
             self.after(0, update_ui)
 
+        from update_checker import check_for_updates_async
         check_for_updates_async(on_update_result)
 
     def check_for_app_updates(self):
@@ -5423,6 +5511,7 @@ class HYPApp(ctk.CTk):
 
             self.after(0, show_update)
 
+        from update_checker import check_for_updates_async
         check_for_updates_async(on_startup_update_result)
 
     def show_update_available_popup(self, update_info: dict):
@@ -5542,6 +5631,7 @@ class HYPApp(ctk.CTk):
                         popup.update()
 
                         # Güncellemeyi uygula
+                        from update_checker import apply_update
                         if apply_update(zip_path):
                             status_label.configure(text="🔄 Uygulama yeniden başlatılıyor...")
                             popup.after(1000, lambda: self.quit())
@@ -5564,6 +5654,7 @@ class HYPApp(ctk.CTk):
                 popup.after(0, apply)
 
             # Arka planda indir
+            from update_checker import download_update_async
             download_update_async(download_url, on_progress, on_download_complete)
 
         update_btn = ctk.CTkButton(
@@ -5693,6 +5784,25 @@ class HYPApp(ctk.CTk):
         except:
             pass
 
+        # Bekleyen ayar yazmasını tamamla (os._exit atexit'i çalıştırmaz)
+        try:
+            self.settings_manager.flush()
+        except:
+            pass
+
+        # Oturum kaydındaki hasta adlarını anonimleştir (atexit de çalışmaz)
+        try:
+            from session_capture import finalize_all
+            finalize_all()
+        except:
+            pass
+
+        # Hemşire kuyruğunun açık tuttuğu Chrome'u kapat (chromedriver sahipsiz kalmasın)
+        try:
+            self.warm_session.shutdown()
+        except:
+            pass
+
         # GUI'yi kapat ve Python process'i sonlandır
         try:
             self.quit()
@@ -8,14 +8,17 @@ TC gonder, bildirim al, gecmisi gor.
 import customtkinter as ctk
 import os
 import json
-from datetime import datetime
 import threading
 import time
 
+from nurse_queue import get_transport, drop_transport
+
 # ============================================================
 # YAPILANDIRMA
 # ============================================================
 SHARED_FOLDER = r"Z:\Dr Osman"
+# "folder" (.tc/.bildirim dosyalari) veya "sqlite" (hyp_queue.db) - doktor tarafiyla ayni olmali
+QUEUE_BACKEND = "folder"
 SETTINGS_FILE = "hemsire_ayarlar.json"
 NOTIFICATIONS_FILE = "hemsire_bildirimler.json"
 
@@ -65,6 +68,7 @@ class HemsireApp(ctk.CTk):
     def load_settings(self):
         """Ayarlari yukle"""
         self.shared_folder = SHARED_FOLDER
+        self.queue_backend = QUEUE_BACKEND
         settings_path = os.path.join(os.path.dirname(__file__), SETTINGS_FILE)
 
         if os.path.exists(settings_path):
@@ -72,6 +76,7 @@ class HemsireApp(ctk.CTk):
                 with open(settings_path, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                     self.shared_folder = settings.get('shared_folder', SHARED_FOLDER)
+                    self.queue_backend = settings.get('queue_backend', QUEUE_BACKEND)
             except:
                 pass
 
@@ -80,7 +85,7 @@ class HemsireApp(ctk.CTk):
         settings_path = os.path.join(os.path.dirname(__file__), SETTINGS_FILE)
         try:
             with open(settings_path, 'w', encoding='utf-8') as f:
-                json.dump({'shared_folder': self.shared_folder}, f, ensure_ascii=False)
+                json.dump({'shared_folder': self.shared_folder, 'queue_backend': self.queue_backend}, f, ensure_ascii=False)
         except:
             pass
 
@@ -239,19 +244,13 @@ class HemsireApp(ctk.CTk):
                 self.show_status("Paylaşım klasörü bulunamadı!", "error")
                 return
 
-        # TC dosyasi olustur
+        # TC'yi kuyruga ekle
         try:
-            tc_file = os.path.join(self.shared_folder, f"{tc}.tc")
-
             # Zaten varsa uyar
-            if os.path.exists(tc_file):
+            if not self.transport().submit_tc(tc):
                 self.show_status("Bu TC zaten kuyrukta!", "warning")
                 return
 
-            # Dosya olustur
-            with open(tc_file, 'w', encoding='utf-8') as f:
-                f.write(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
             self.show_status("✓ Gönderildi!", "success")
             self.tc_entry.delete(0, 'end')
             self.tc_entry.focus()
@@ -273,15 +272,25 @@ class HemsireApp(ctk.CTk):
         color = colors.get(status_type, "#888888")
         self.status_label.configure(text=message, text_color=color)
 
+    def transport(self):
+        """Kuyruk tasiyicisi (nurse_queue)"""
+        return get_transport(self.shared_folder, self.queue_backend)
+
     def start_notification_listener(self):
-        """Bildirim dinleyiciyi baslat"""
+        """
+        Bildirim dinleyiciyi baslat.
+        Klasor her saniye listelenmez; tasiyici degisiklik bildirince okunur.
+        """
         def listen():
             while self.notification_listener_active:
                 try:
-                    self.check_new_notifications()
+                    if not os.path.exists(self.shared_folder):
+                        time.sleep(1)
+                        continue
+                    if self.transport().wait(1.0):
+                        self.check_new_notifications()
                 except:
-                    pass
-                time.sleep(1)  # Her saniye kontrol et
+                    time.sleep(1)
 
         thread = threading.Thread(target=listen, daemon=True)
         thread.start()
@@ -292,35 +301,20 @@ class HemsireApp(ctk.CTk):
             return
 
         try:
-            # .bildirim dosyalarini ara
-            for filename in os.listdir(self.shared_folder):
-                if filename.endswith('.bildirim'):
-                    filepath = os.path.join(self.shared_folder, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            notification = json.load(f)
-
-                        # Listeye ekle
-                        notification['okundu'] = False
-                        self.notifications.insert(0, notification)  # En basa ekle
-                        self.unread_count += 1
-
-                        # Dosyayi sil
-                        os.remove(filepath)
-
-                        # GUI'yi guncelle
-                        self.after(0, self.update_notification_ui)
-                        self.after(0, lambda n=notification: self.show_notification_popup(n))
-
-                    except Exception as e:
-                        print(f"Bildirim okuma hatasi: {e}")
-                        try:
-                            os.remove(filepath)  # Bozuk dosyayi sil
-                        except:
-                            pass
-
-            # Bildirimleri kaydet
-            self.save_notifications()
+            notifications = self.transport().take_notifications()
+            for notification in notifications:
+                # Listeye ekle
+                notification['okundu'] = False
+                self.notifications.insert(0, notification)  # En basa ekle
+                self.unread_count += 1
+
+                # GUI'yi guncelle
+                self.after(0, self.update_notification_ui)
+                self.after(0, lambda n=notification: self.show_notification_popup(n))
+
+            # Bildirimleri kaydet (sadece yeni bildirim geldiyse)
+            if notifications:
+                self.save_notifications()
 
         except Exception as e:
             print(f"Bildirim kontrol hatasi: {e}")
@@ -566,6 +560,7 @@ class HemsireApp(ctk.CTk):
         result = dialog.get_input()
 
         if result and result.strip():
+            drop_transport(self.shared_folder, self.queue_backend)
             self.shared_folder = result.strip()
             self.save_settings()
             self.show_status("Ayarlar kaydedildi", "success")
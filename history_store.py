@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+GECMIS KAYITLARI (SQLite)
+=========================
+Oturum gecmisi ve aylik hedef/sayac gecmisi hyp_settings.json yerine
+ayri bir SQLite dosyasinda (WAL modu) tutulur. Boylece:
+
+- Ayar dosyasi sadece sik degisen kucuk ayarlari icerir
+- Her kayit sadece degisen satiri yazar (tum dosya yeniden yazilmaz)
+- Pencereler gecmisi sayfa sayfa okur (LIMIT/OFFSET, indeksli siralama)
+
+Eski hyp_settings.json icindeki "session_history" ve "monthly_history"
+ilk acilista bir kez bu dosyaya tasinir (migrate_from_settings).
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+HISTORY_DB_FILE = "hyp_history.db"
+# Saklanacak en fazla oturum (eskiler silinir)
+SESSION_HISTORY_LIMIT = 500
+# Pencerelerde bir seferde gosterilen kayit sayisi ("Daha fazla" ile devam)
+SESSION_PAGE_SIZE = 20
+MONTH_PAGE_SIZE = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tarih TEXT NOT NULL,
+    basarili INTEGER NOT NULL DEFAULT 0,
+    basarisiz INTEGER NOT NULL DEFAULT 0,
+    atlanan INTEGER NOT NULL DEFAULT 0,
+    toplam_sure REAL NOT NULL DEFAULT 0,
+    iptal_edilenler TEXT NOT NULL DEFAULT '[]',
+    atlananlar TEXT NOT NULL DEFAULT '[]',
+    basarisizlar TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_tarih ON sessions (tarih);
+CREATE TABLE IF NOT EXISTS months (
+    month_key TEXT PRIMARY KEY,
+    targets TEXT NOT NULL DEFAULT '{}',
+    current_counts TEXT NOT NULL DEFAULT '{}',
+    deferred_counts TEXT NOT NULL DEFAULT '{}',
+    last_updated TEXT
+);
+"""
+
+_SUMMARY_COLUMNS = "id, tarih, basarili, basarisiz, atlanan, toplam_sure"
+_LIST_COLUMNS = ("iptal_edilenler", "atlananlar", "basarisizlar")
+_COUNT_COLUMNS = ("targets", "current_counts", "deferred_counts")
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class HistoryStore:
+    """Oturum ve aylik gecmis deposu (thread-safe, tek baglanti)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = self._connect(db_path)
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ============================================================
+    # OTURUMLAR
+    # ============================================================
+
+    def add_session(self, session: Dict) -> int:
+        """Oturum ekle, limit asildiysa en eskileri sil. Yeni kaydin id'si doner."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                cur = self._conn.execute(
+                    "INSERT INTO sessions (tarih, basarili, basarisiz, atlanan, toplam_sure,"
+                    " iptal_edilenler, atlananlar, basarisizlar) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        session.get("tarih") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        session.get("basarili", 0) or 0,
+                        session.get("basarisiz", 0) or 0,
+                        session.get("atlanan", 0) or 0,
+                        session.get("toplam_sure", 0) or 0,
+                        *(_dumps(session.get(col) or []) for col in _LIST_COLUMNS),
+                    ),
+                )
+                self._conn.execute(
+                    "DELETE FROM sessions WHERE id <= ?",
+                    (cur.lastrowid - SESSION_HISTORY_LIMIT,),
+                )
+                return cur.lastrowid
+
+    def count_sessions(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def get_sessions(self, limit: Optional[int] = None, offset: int = 0, details: bool = False) -> List[Dict]:
+        """
+        En yeniden eskiye oturumlar. details=False iken iptal/atlanan/basarisiz
+        listeleri okunmaz (liste gorunumu icin); gerekirse get_session(id).
+        """
+        columns = "*" if details else _SUMMARY_COLUMNS
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM sessions ORDER BY id DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [self._session_dict(row) for row in rows]
+
+    def get_session(self, session_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return self._session_dict(row) if row else None
+
+    @staticmethod
+    def _session_dict(row: sqlite3.Row) -> Dict:
+        data = dict(row)
+        for col in _LIST_COLUMNS:
+            if col in data:
+                data[col] = json.loads(data[col])
+        return data
+
+    def clear_sessions(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions")
+
+    # ============================================================
+    # AYLIK GECMIS
+    # ============================================================
+
+    def put_month(self, month_key: str, targets: Dict, current_counts: Dict, deferred_counts: Dict):
+        """Ay kaydini tamamen yaz (yoksa olustur)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO months (month_key, targets, current_counts, deferred_counts, last_updated)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (month_key, _dumps(targets), _dumps(current_counts), _dumps(deferred_counts), _now()),
+            )
+
+    def update_month(self, month_key: str, **counts) -> bool:
+        """
+        Var olan ay kaydinin verilen alanlarini guncelle
+        (targets / current_counts / deferred_counts). Kayit yoksa False.
+        """
+        fields = [col for col in _COUNT_COLUMNS if col in counts]
+        assignments = ", ".join(f"{col} = ?" for col in fields + ["last_updated"])
+        with self._lock:
+            cur = self._conn.execute(
+                f"UPDATE months SET {assignments} WHERE month_key = ?",
+                [_dumps(counts[col]) for col in fields] + [_now(), month_key],
+            )
+        return cur.rowcount > 0
+
+    def get_month(self, month_key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM months WHERE month_key = ?", (month_key,)).fetchone()
+        return self._month_dict(row) if row else None
+
+    def count_months(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM months").fetchone()[0]
+
+    def get_months(self, limit: Optional[int] = None, offset: int = 0) -> List[Tuple[str, Dict]]:
+        """En yeniden eskiye (ay anahtari, ay verisi) ciftleri"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM months ORDER BY month_key DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [(row["month_key"], self._month_dict(row)) for row in rows]
+
+    def latest_month_key(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(month_key) FROM months").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _month_dict(row: sqlite3.Row) -> Dict:
+        data = {col: json.loads(row[col]) for col in _COUNT_COLUMNS}
+        data["last_updated"] = row["last_updated"]
+        return data
+
+    def clear_months(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM months")
+
+    # ============================================================
+    # ESKI AYAR DOSYASINDAN TASIMA
+    # ============================================================
+
+    def migrate_from_settings(self, settings: Dict) -> bool:
+        """
+        settings icindeki session_history / monthly_history anahtarlarini
+        tasiyip settings'ten cikarir. Bir sey tasindiysa True.
+        """
+        sessions = settings.pop("session_history", None) or []
+        months = settings.pop("monthly_history", None) or {}
+        if not sessions and not months:
+            return False
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                # Yarim kalmis bir tasimadan sonra oturumlar ikinci kez eklenmesin
+                if self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]:
+                    sessions = []
+                # Eski liste en yeni basta; eskiden yeniye ekle ki id sirasi korunsun
+                for session in reversed(sessions[:SESSION_HISTORY_LIMIT]):
+                    self._conn.execute(
+                        "INSERT INTO sessions (tarih, basarili, basarisiz, atlanan, toplam_sure,"
+                        " iptal_edilenler, atlananlar, basarisizlar) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            session.get("tarih") or "",
+                            session.get("basarili", 0) or 0,
+                            session.get("basarisiz", 0) or 0,
+                            session.get("atlanan", 0) or 0,
+                            session.get("toplam_sure", 0) or 0,
+                            *(_dumps(session.get(col) or []) for col in _LIST_COLUMNS),
+                        ),
+                    )
+                for month_key, data in months.items():
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO months (month_key, targets, current_counts, deferred_counts, last_updated)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (
+                            month_key,
+                            *(_dumps(data.get(col) or {}) for col in _COUNT_COLUMNS),
+                            data.get("last_updated"),
+                        ),
+                    )
+        print(f"BILGI: {len(sessions)} oturum ve {len(months)} ay gecmisi {self.db_path} dosyasina tasindi")
+        return True
+
+
+def open_history_store(settings_file: str, backup_dir: str) -> HistoryStore:
+    """
+    Ayar dosyasinin yanindaki hyp_history.db'yi ac; yazilamiyorsa
+    yedek klasore, o da olmazsa bellege (sadece bu oturum) dus.
+    """
+    candidates = [
+        os.path.join(os.path.dirname(os.path.abspath(settings_file)), HISTORY_DB_FILE),
+        os.path.join(backup_dir, "hyp_history_backup.db"),
+    ]
+    for path in candidates:
+        try:
+            return HistoryStore(path)
+        except sqlite3.Error as e:
+            print(f"UYARI: Gecmis veritabani acilamadi ({path}): {e}")
+    print("Gecmis bu oturum icin sadece bellekte tutulacak.")
+    return HistoryStore(":memory:")
@@ -21,7 +21,7 @@ import os
 import time
 import traceback
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
 
 # Selenium imports
 from selenium import webdriver
@@ -31,41 +31,42 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 import config
 from config import *
+from processed_cache import ProcessedPatientCache, get_processed_cache
+from page_waits import PageWaiter
+from page_snapshot import (
+    SNAPSHOT_JS, PageSnapshot, classify_login_state, classify_diy, classify_ht,
+    classify_obe, classify_yasli, classify_kvr, has_killable_popup, has_tamam_dialog, is_error_page,
+)
+from tetkik_scanner import (
+    TetkikScan, scan_tetkik_panel, checkbox_rows, collect_test_values, parse_old_values,
+    resolve_remaining_name, resolve_label_name, TEST_MATCHER, same_test, hdl_compatible,
+)
+from session_capture import SessionCapture
+from webdriver_profiler import DriverProfiler
+from tr_text import normalize_tr
+from patient_list import read_patient_list, filter_by_dates
+from work_plan import (
+    CARD_SCAN_JS, TARGETS_DONE, PlanEntry, WorkPlanner, cache_key, sidebar_hyp_type,
+)
+from scheduler import TimingModel, project, time_budget_seconds
+from event_log import get_event_log, new_session_id, patient_key
+from page_flow import (
+    FlowSpec, FlowRun, PageRule, PageFlow, FlowTelemetry,
+    NEXT as FLOW_NEXT, RETRY as FLOW_RETRY, DONE as FLOW_DONE, FAIL as FLOW_FAIL,
+)
 
 # Ilac Analiz Modulu (Polifarmasi ve Yasli Izlem icin)
 try:
-    from drug_analyzer import DrugAnalyzer, ElderlyAssessmentHelper, PregnancyChecker
+    from drug_analyzer import ElderlyAssessmentHelper
+    import analyzer_registry
     DRUG_ANALYZER_AVAILABLE = True
 except ImportError:
     DRUG_ANALYZER_AVAILABLE = False
 
 
-# ============================================================
-# TÜRKÇE KARAKTER NORMALİZASYONU
-# ============================================================
-def normalize_tr(text: str) -> str:
-    """Türkçe karakterleri normalize et"""
-    if not text:
-        return ""
-    mapping = {
-        'İ': 'I', 'ı': 'I', 'I': 'I', 'i': 'I',
-        'Ş': 'S', 'ş': 'S', 'Ğ': 'G', 'ğ': 'G',
-        'Ü': 'U', 'ü': 'U', 'Ö': 'O', 'ö': 'O',
-        'Ç': 'C', 'ç': 'C',
-        # Bozuk encoding
-        'Ä°': 'I', 'Ä±': 'I', 'Åž': 'S', 'ÅŸ': 'S',
-        'Äž': 'G', 'ÄŸ': 'G', 'Ãœ': 'U', 'Ã¼': 'U',
-        'Ã–': 'O', 'Ã¶': 'O', 'Ã‡': 'C', 'Ã§': 'C',
-    }
-    for tr, en in mapping.items():
-        text = text.replace(tr, en)
-    return text.upper().strip()
-
-
 # ============================================================
 # ANA OTOMASYON SINIFI
 # ============================================================
@@ -111,35 +112,52 @@ class HYPAutomation:
             "KANSER_SERVIKS": 0, "KANSER_MAMO": 0
         }
 
+        # Paralel mod (worker_pool): tarayıcılar arası ortak hedef sayacı
+        # None = tek tarayıcı, session_completed doğrudan kullanılır
+        self.target_ledger = None
+
+        # Chrome profil klasörü (None = ~/.hyp_chrome_profile)
+        # Paralel modda her tarayıcı kendi profilini kullanır
+        self.chrome_profile_dir = None
+
+        # Olay tabanlı bekleme (sabit time.sleep yerine koşul bazlı)
+        self.waiter = PageWaiter(lambda: self.driver, log_callback=self.log)
+        # Protokol adim sureleri (page_flow)
+        self.flow_stats = FlowTelemetry()
+        # Oturum kaydi (replay/benchmark icin, config.SESSION_CAPTURE_DIR)
+        self.capture = SessionCapture.from_config(log_callback=self.log)
+        if self.capture is not None:
+            self.waiter.on_wait = lambda name: self.capture.record(self.driver, name)
+        # True ise Chrome pencere acmadan calisir (replay_benchmark)
+        self.headless = False
+        # WebDriver/sleep profili (config.WEBDRIVER_PROFILE, kapaliysa None)
+        self.profiler = DriverProfiler.from_config()
+        # Olay kaydi (event_log.py, process genelinde ortak dosya)
+        self.events = get_event_log()
+        self.session_id = new_session_id()
+        self._session_started = time.time()
+
+        # İşlenmiş hasta cache'i (ilk kullanımda yüklenir, process genelinde paylaşılır)
+        self._processed_cache = None
+
         # Checkbox cache - "Tumunu kaldir" oncesi bilgileri sakla
         self._cached_checkbox_data = {}
 
-        # Ilac analiz modulu (Polifarmasi ve Yasli Izlem icin)
-        self.drug_analyzer = None
-        self.elderly_helper = None
-        if DRUG_ANALYZER_AVAILABLE:
-            try:
-                import os
-                excel_path = os.path.join(os.path.dirname(__file__), 'Ilac Listesi.xlsx')
-                self.drug_analyzer = DrugAnalyzer(excel_path if os.path.exists(excel_path) else None)
-                self.elderly_helper = ElderlyAssessmentHelper()
-            except Exception as e:
-                self.log(f'Ilac analiz modulu yuklenemedi: {e}', 'WARNING')
+        # Ilac analiz modulu ve gebe listesi: analyzer_registry uzerinden
+        # ilk kullanimda yuklenir, tum HYPAutomation nesneleri paylasir.
+        # Yasli degerlendirme yardimcisi hasta bazli oldugu icin nesneye ozel.
+        self._elderly_helper = None
 
         # Mevcut hasta ilac listesi (HYP'den cekilecek)
         self.current_patient_drugs = []
         
-        # Gebe listesi kontrolu
-        self.pregnancy_checker = None
-        if DRUG_ANALYZER_AVAILABLE:
-            try:
-                self.pregnancy_checker = PregnancyChecker()
-            except Exception as e:
-                self.log(f'Gebe listesi yuklenemedi: {e}', 'WARNING')
-        
         # Mevcut hasta bilgileri
         self.current_patient_name = None
         self.current_patient_tc = None
+        # Olay kaydinda hastanin anahtari: listedeki ad (on tarama ile ayni)
+        self.current_patient_key = ""
+        # Son ana kart icinde sol panel zincirinin harcadigi sure (kart olayi icin)
+        self._chain_seconds = 0.0
         
         # OBE_IZLEM pas gecildi bildirimi icin
         self.skipped_hyp_notifications = []
@@ -152,11 +170,14 @@ class HYPAutomation:
 
         # Mevcut işlenen HYP tipi
         self._current_hyp_type = None
+        # Son protokol akışında görülen sayfa ("KVR/TETKIK"), olay kaydı için
+        self._flow_last_page = ""
 
         # Çoklu tarih desteği
         self.selected_dates = None  # Liste olarak birden fazla tarih
 
         # SMS onayı kapalı hastalar (bu hastalar her zaman atlanır)
+        self.sms_kapali_file = os.path.join(os.path.dirname(__file__), 'sms_kapali_hastalar.json')
         self.sms_kapali_hastalar = self._load_sms_kapali_hastalar()
 
         # Başarılı HYP callback (GUI güncelleme için)
@@ -165,6 +186,10 @@ class HYPAutomation:
         # HYP'den sayılar çekildiğinde GUI güncelleme callback
         self.on_counts_fetched_callback = None
 
+        # Tahmini bitiş (scheduler.project sonucu) GUI callback
+        self.on_schedule_callback = None
+        self._timing_model = None
+
         # KVR hedef aşımı onay callback (kullanıcıya popup sorar)
         self.on_kvr_overflow_callback = None
 
@@ -261,9 +286,8 @@ class HYPAutomation:
                 if new_path and os.path.exists(new_path):
                     # Yeni dosyayi yukle
                     try:
-                        from drug_analyzer import PregnancyChecker
-                        self.pregnancy_checker = PregnancyChecker(new_path)
-                        self.log(f"[OK] Gebe listesi guncellendi: {len(self.pregnancy_checker.pregnant_patients)} gebe")
+                        checker = analyzer_registry.replace_pregnancy_list(new_path)
+                        self.log(f"[OK] Gebe listesi guncellendi: {len(checker.pregnant_patients) if checker else 0} gebe")
                     except Exception as e:
                         self.log(f"[!] Gebe listesi yuklenemedi: {e}", "WARNING")
                 elif new_path:
@@ -282,9 +306,8 @@ class HYPAutomation:
                 )
                 if new_path and os.path.exists(new_path):
                     try:
-                        from drug_analyzer import PregnancyChecker
-                        self.pregnancy_checker = PregnancyChecker(new_path)
-                        self.log(f"[OK] Gebe listesi yuklendi: {len(self.pregnancy_checker.pregnant_patients)} gebe")
+                        checker = analyzer_registry.replace_pregnancy_list(new_path)
+                        self.log(f"[OK] Gebe listesi yuklendi: {len(checker.pregnant_patients) if checker else 0} gebe")
                     except Exception as e:
                         self.log(f"[!] Gebe listesi yuklenemedi: {e}", "WARNING")
                 elif new_path:
@@ -407,111 +430,44 @@ class HYPAutomation:
         import os
         return os.path.join(os.path.dirname(__file__), 'processed_patients.json')
 
-    def _load_processed_cache(self) -> dict:
-        """Cache'i dosyadan yükle"""
-        import os
-        import json
-        cache_path = self._get_cache_path()
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+    def _get_processed_cache(self) -> ProcessedPatientCache:
+        """Process genelinde paylaşılan cache nesnesi (ilk çağrıda diskten yüklenir)"""
+        if self._processed_cache is None:
+            self._processed_cache = get_processed_cache(self._get_cache_path(), log_callback=self.log)
+        return self._processed_cache
 
-    def _save_processed_cache(self, cache: dict):
-        """Cache'i dosyaya kaydet"""
-        import json
-        cache_path = self._get_cache_path()
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.log(f"Cache kaydetme hatasi: {e}", "WARNING")
+    def _load_processed_cache(self) -> dict:
+        """Cache'in kopyasını döndür (bellekten, dosya okunmaz)"""
+        return self._get_processed_cache().snapshot()
 
     def _cleanup_old_cache(self):
         """1 aydan eski cache kayıtlarını temizle"""
-        from datetime import datetime, timedelta
-        cache = self._load_processed_cache()
-        if not cache:
-            return
-
-        one_month_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        cleaned = {}
-        removed_count = 0
-
-        for tc, data in cache.items():
-            hypler = data.get("hypler", {})
-            valid_hypler = {}
-            for hyp_tipi, hyp_data in hypler.items():
-                if hyp_data.get("tarih", "2099-01-01") >= one_month_ago:
-                    valid_hypler[hyp_tipi] = hyp_data
-                else:
-                    removed_count += 1
-
-            if valid_hypler:
-                cleaned[tc] = {
-                    "ad_soyad": data.get("ad_soyad", ""),
-                    "hypler": valid_hypler
-                }
-
+        removed_count = self._get_processed_cache().cleanup_older_than(days=30)
         if removed_count > 0:
-            self._save_processed_cache(cleaned)
             self.log(f"Cache temizlendi: {removed_count} eski kayit silindi", "DEBUG")
 
     def is_hyp_already_processed(self, tc: str, hyp_tipi: str) -> bool:
         """Bu hasta için bu HYP tipi daha önce işlenmiş mi kontrol et"""
         if not tc:
             return False
-        cache = self._load_processed_cache()
-        patient_data = cache.get(tc, {})
-        hypler = patient_data.get("hypler", {})
-        return hyp_tipi in hypler
+        return self._get_processed_cache().contains(tc, hyp_tipi)
 
     def mark_hyp_as_processed(self, tc: str, ad_soyad: str, hyp_tipi: str, durum: str = "BASARILI"):
         """HYP'yi işlenmiş olarak işaretle"""
         if not tc:
             return
-        from datetime import datetime
-        cache = self._load_processed_cache()
-
-        if tc not in cache:
-            cache[tc] = {"ad_soyad": ad_soyad, "hypler": {}}
-
-        cache[tc]["ad_soyad"] = ad_soyad  # Güncelle
-        cache[tc]["hypler"][hyp_tipi] = {
-            "durum": durum,
-            "tarih": datetime.now().strftime("%Y-%m-%d"),
-            "saat": datetime.now().strftime("%H:%M")
-        }
-
-        self._save_processed_cache(cache)
+        self._get_processed_cache().mark(tc, ad_soyad, hyp_tipi, durum)
         self.log(f"Cache guncellendi: {ad_soyad} - {hyp_tipi} = {durum}", "DEBUG")
 
     def remove_from_cache(self, tc: str, hyp_tipi: str = None):
         """Cache'den hasta veya belirli HYP'yi sil"""
         if not tc:
             return
-        cache = self._load_processed_cache()
-
-        if tc not in cache:
-            return
-
-        if hyp_tipi:
-            # Sadece belirli HYP'yi sil
-            if hyp_tipi in cache[tc].get("hypler", {}):
-                del cache[tc]["hypler"][hyp_tipi]
+        if self._get_processed_cache().remove(tc, hyp_tipi):
+            if hyp_tipi:
                 self.log(f"Cache'den silindi: {tc} - {hyp_tipi}", "DEBUG")
-                # Eğer hiç HYP kalmadıysa hastayı da sil
-                if not cache[tc]["hypler"]:
-                    del cache[tc]
-        else:
-            # Tüm hastayı sil
-            del cache[tc]
-            self.log(f"Cache'den silindi: {tc} (tum kayitlar)", "DEBUG")
-
-        self._save_processed_cache(cache)
+            else:
+                self.log(f"Cache'den silindi: {tc} (tum kayitlar)", "DEBUG")
 
     def get_processed_cache_info(self) -> dict:
         """Cache bilgilerini döndür (GUI için)"""
@@ -527,6 +483,16 @@ class HYPAutomation:
     # ============================================================
     # HEDEF BAZLI HYP SEÇİM SİSTEMİ
     # ============================================================
+    def _target_limit(self, hyp_tip: str) -> int:
+        """Bu oturumda yapılabilecek toplam HYP sayısı: (Hedef * Yüzde/100) - Yapılan - Devreden"""
+        base_target = MONTHLY_TARGETS.get(hyp_tip, 0)
+        # Hedef yüzdesini uygula (varsayılan %100)
+        target = int(base_target * self.target_percentage / 100)
+
+        current = CURRENT_COUNTS.get(hyp_tip, 0)
+        deferred = DEFERRED_COUNTS.get(hyp_tip, 0)
+        return target - current - deferred
+
     def get_remaining_target(self, hyp_tip: str) -> int:
         """
         Belirli bir HYP tipi için kalan hedef sayısını hesapla
@@ -535,17 +501,28 @@ class HYPAutomation:
 
         target_percentage: 70 veya 100 (GUI'den seçilen)
         """
-        base_target = MONTHLY_TARGETS.get(hyp_tip, 0)
-        # Hedef yüzdesini uygula (varsayılan %100)
-        target = int(base_target * self.target_percentage / 100)
-
-        current = CURRENT_COUNTS.get(hyp_tip, 0)
-        deferred = DEFERRED_COUNTS.get(hyp_tip, 0)
         session_done = self.session_completed.get(hyp_tip, 0)
-
-        remaining = target - current - deferred - session_done
+        remaining = self._target_limit(hyp_tip) - session_done
         return max(0, remaining)  # Negatif olmasın
 
+    def _reserve_target(self, hyp_tip: str) -> bool:
+        """
+        Paralel modda kart başlamadan önce hedeften bir slot ayır.
+        Böylece iki tarayıcı aynı son slot için aynı anda HYP başlatamaz.
+        Tek tarayıcı modunda her zaman True.
+        """
+        if self.target_ledger is None:
+            return True
+        if self.target_ledger.reserve(hyp_tip, self._target_limit(hyp_tip)):
+            return True
+        self.log(f"   🎯 {hyp_tip} kalan hedefi diğer tarayıcılarda işleniyor, ATLANIYOR", "WARNING")
+        return False
+
+    def _release_target(self, hyp_tip: str):
+        """Başarısız/atlanan kart için ayrılan hedef slotunu geri bırak"""
+        if self.target_ledger is not None:
+            self.target_ledger.release(hyp_tip)
+
     def should_process_hyp_type(self, hyp_tip: str) -> bool:
         """
         Belirli bir HYP tipinin işlenip işlenmeyeceğini kontrol et
@@ -572,7 +549,10 @@ class HYPAutomation:
     def increment_completed(self, hyp_tip: str):
         """Başarıyla tamamlanan HYP için sayacı artır"""
         if hyp_tip in self.session_completed:
-            self.session_completed[hyp_tip] += 1
+            if self.target_ledger is not None:
+                self.target_ledger.commit(hyp_tip)
+            else:
+                self.session_completed[hyp_tip] += 1
             remaining = self.get_remaining_target(hyp_tip)
             self.log(f"   🎯 {hyp_tip} +1 tamamlandı (Session: {self.session_completed[hyp_tip]}, Kalan hedef: {remaining})", "SUCCESS")
 
@@ -651,7 +631,9 @@ class HYPAutomation:
                 self.log("   ✅ Fazla KVR_IZLEM silindi!", "SUCCESS")
 
                 # Session sayacını düşür (silindi çünkü)
-                if self.session_completed.get("KVR_IZLEM", 0) > 0:
+                if self.target_ledger is not None:
+                    self.target_ledger.decrement("KVR_IZLEM")
+                elif self.session_completed.get("KVR_IZLEM", 0) > 0:
                     self.session_completed["KVR_IZLEM"] -= 1
 
                 return True
@@ -758,8 +740,8 @@ class HYPAutomation:
 
         try:
             # 1. Dashboard'a git
-            self.driver.get("https://hyp.saglik.gov.tr/dashboard")
-            time.sleep(0.5)  # OPTIMIZE
+            self.driver.get(self._hyp_url("dashboard"))
+            self.waiter.settled("dashboard", legacy=0.5)
 
             # 2. "Takip İşlemi İstatistikleri" linkine tıkla
             stats_xpaths = [
@@ -779,7 +761,7 @@ class HYPAutomation:
                 self.log("⚠️ Takip İşlemi İstatistikleri linki bulunamadı!", "WARNING")
                 return counts
 
-            time.sleep(1.5)  # OPTIMIZE: 3 -> 1.5
+            self.waiter.settled("istatistik_sayfasi", legacy=1.5)
 
             # 3. Sayfadaki body text'i parse et
             # Format: HYP_ADI\nSAYI\nHYP_ADI\nSAYI...
@@ -868,9 +850,11 @@ class HYPAutomation:
                     options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
 
                     # ÖNEMLİ: ChromeDriver service'i de gerekli!
-                    service = Service(ChromeDriverManager().install())
+                    service = self._chrome_service()
                     self.driver = webdriver.Chrome(service=service, options=options)
 
+                    self._install_profiler()
+
                     # Bağlantı başarılı - test et
                     current_url = self.driver.current_url
                     self.log(f"✅ Mevcut Chrome'a bağlanıldı! URL: {current_url}", "SUCCESS")
@@ -887,13 +871,16 @@ class HYPAutomation:
             options = Options()
             options.add_argument('--start-maximized')
             options.add_argument('--disable-blink-features=AutomationControlled')
+            if self.headless:
+                options.add_argument('--headless=new')
+                options.add_argument('--window-size=1920,1080')
 
             # ============================================================
             # KALICI CHROME PROFİLİ - İzinler hatırlanır
             # İlk seferde "İzin ver" dedikten sonra Chrome bunu hatırlar
             # ============================================================
             import os
-            user_data_dir = os.path.join(os.path.expanduser("~"), ".hyp_chrome_profile")
+            user_data_dir = self.chrome_profile_dir or os.path.join(os.path.expanduser("~"), ".hyp_chrome_profile")
             if not os.path.exists(user_data_dir):
                 os.makedirs(user_data_dir)
             options.add_argument(f'--user-data-dir={user_data_dir}')
@@ -919,10 +906,11 @@ class HYPAutomation:
             }
             options.add_experimental_option("prefs", prefs)
 
-            service = Service(ChromeDriverManager().install())
+            service = self._chrome_service()
             self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.implicitly_wait(5)
-            
+            self._install_profiler()
+
             self.log("✅ Chrome hazır!", "SUCCESS")
             return True
             
@@ -930,6 +918,51 @@ class HYPAutomation:
             self.log(f"❌ Chrome başlatılamadı: {e}", "ERROR")
             return False
 
+    def _chrome_service(self) -> Service:
+        """
+        ChromeDriver servisi - sürücü Chrome sürümüne göre önbellekten alınır
+        (driver_resolver); internete sadece Chrome güncellendiğinde çıkılır.
+        """
+        from driver_resolver import resolve_chromedriver, last_status
+        path = resolve_chromedriver(self.log)
+        self.log(f"🔧 ChromeDriver: {last_status.get('source')} ({last_status.get('seconds', 0) * 1000:.0f} ms)", "DEBUG")
+        # Önbellek yoksa ve indirilemediyse Selenium Manager kendi bulsun
+        return Service(executable_path=path) if path else Service()
+
+    def _install_profiler(self):
+        """Profil açıksa yeni driver'ı sar (setup_driver'ın çağırdığı thread için)"""
+        if self.profiler is not None:
+            self.profiler.install(self.driver)
+            self.log("🔬 WebDriver profili açık", "DEBUG")
+
+    # ============================================================
+    # ANALİZ MODÜLLERİ (ilk kullanımda yüklenir, paylaşılır)
+    # ============================================================
+    @property
+    def drug_analyzer(self):
+        """Paylaşılan DrugAnalyzer (yüklenemediyse None)"""
+        return analyzer_registry.get_drug_analyzer() if DRUG_ANALYZER_AVAILABLE else None
+
+    @property
+    def pregnancy_checker(self):
+        """Paylaşılan PregnancyChecker (yüklenemediyse None)"""
+        return analyzer_registry.get_pregnancy_checker() if DRUG_ANALYZER_AVAILABLE else None
+
+    @property
+    def elderly_helper(self):
+        if self._elderly_helper is None and DRUG_ANALYZER_AVAILABLE:
+            self._elderly_helper = ElderlyAssessmentHelper()
+        return self._elderly_helper
+
+    def _hyp_url(self, path: str = "") -> str:
+        """config.HYP_URL tabanlı adres (test için yerel mock sunucuya yönlendirilebilir)"""
+        return config.HYP_URL.rstrip('/') + '/' + path.lstrip('/')
+
+    def _hyp_host(self) -> str:
+        """config.HYP_URL'deki sunucu adı (küçük harf)"""
+        from urllib.parse import urlparse
+        return urlparse(config.HYP_URL).netloc.lower()
+
     # ============================================================
     # TEMEL ELEMENT İŞLEMLERİ
     # ============================================================
@@ -996,6 +1029,27 @@ class HYPAutomation:
         except:
             return ""
 
+    def take_snapshot(self) -> PageSnapshot:
+        """
+        Sayfanın kompakt özetini TEK execute_script ile al.
+        URL, görünür metin, butonlar, checkbox'lar, dialoglar - sorgular Python'da.
+        """
+        try:
+            return PageSnapshot(self.driver.execute_script(SNAPSHOT_JS))
+        except Exception as e:
+            self.log(f"Snapshot alınamadı: {str(e)[:60]}", "DEBUG")
+            return PageSnapshot()
+
+    def _begin_step(self) -> PageSnapshot:
+        """
+        Protokol adımı başı: tek snapshot ile hata sayfası ve dialog kontrolü.
+        Sayfa değiştiyse (yenileme / dialog kapatma) yeni snapshot döner.
+        """
+        snap = self.take_snapshot()
+        if self.check_error_page(snap) or self._close_dialogs(snap):
+            snap = self.take_snapshot()
+        return snap
+
     # ============================================================
     # SATIR SAYISI AYARLAMA (ROWS PER PAGE)
     # ============================================================
@@ -1055,7 +1109,7 @@ class HYPAutomation:
         import json
         import os
 
-        sms_file = os.path.join(os.path.dirname(__file__), 'sms_kapali_hastalar.json')
+        sms_file = self.sms_kapali_file
         if os.path.exists(sms_file):
             try:
                 with open(sms_file, 'r', encoding='utf-8') as f:
@@ -1072,7 +1126,7 @@ class HYPAutomation:
         import os
         from datetime import datetime
 
-        sms_file = os.path.join(os.path.dirname(__file__), 'sms_kapali_hastalar.json')
+        sms_file = self.sms_kapali_file
 
         # Mevcut listeyi oku
         data = []
@@ -1125,7 +1179,7 @@ class HYPAutomation:
         """Hasta SMS onayi kapali mi kontrol et"""
         return tc in self.sms_kapali_hastalar
 
-    def _check_sms_onay_popup(self) -> bool:
+    def _check_sms_onay_popup(self, snap: PageSnapshot = None) -> bool:
         """
         SMS onayı popup'u var mı kontrol et.
         Görüntüle butonuna tıkladıktan sonra çağrılır.
@@ -1138,6 +1192,13 @@ class HYPAutomation:
             # SMS onayı popup metinleri
             sms_keywords = ['SMS', 'ONAY', 'DOĞRULAMA', 'DOGRULAMA', 'TELEFON', 'CEP', 'MOBİL', 'MOBIL']
 
+            # Snapshot varsa görünür dialog metinleri üzerinden karar ver
+            if snap is not None and snap.ok:
+                if snap.dialog_has(*sms_keywords):
+                    self.log("   [!] SMS ONAYI POPUP'U TESPİT EDİLDİ!", "WARNING")
+                    return True
+                return False
+
             # Popup içeriğini kontrol et
             popup_selectors = [
                 '.ui-dialog',
@@ -1193,8 +1254,13 @@ class HYPAutomation:
     # ============================================================
     # POPUP VE HATA YÖNETİMİ
     # ============================================================
-    def kill_popups(self) -> bool:
-        """Popup'ları kapat"""
+    def kill_popups(self, snap: PageSnapshot = None) -> bool:
+        """Popup'ları kapat (snapshot'ta kapatılacak buton yoksa hiç arama yapılmaz)"""
+        if snap is None:
+            snap = self.take_snapshot()
+        if snap.ok and not has_killable_popup(snap):
+            return False
+
         popup_xpaths = [
             "//button[.//span[normalize-space(text())='Hayır']]",
             "//button[contains(text(), 'Hayır')]",
@@ -1209,12 +1275,16 @@ class HYPAutomation:
                 return True
         return False
 
-    def check_error_page(self) -> bool:
+    def check_error_page(self, snap: PageSnapshot = None) -> bool:
         """Hata sayfası kontrolü ve düzeltme - HIZLI JS KONTROL"""
         try:
-            # OPTIMIZE: page_source yerine JS ile hizli kontrol
-            page_text = self.driver.execute_script("return document.body.innerText.toUpperCase().slice(0, 500);")
-            if "INVALID-API-RESP" in page_text or "HATA KODU" in page_text:
+            if snap is not None and snap.ok:
+                error_found = is_error_page(snap)
+            else:
+                # OPTIMIZE: page_source yerine JS ile hizli kontrol
+                page_text = self.driver.execute_script("return document.body.innerText.toUpperCase().slice(0, 500);")
+                error_found = "INVALID-API-RESP" in page_text or "HATA KODU" in page_text
+            if error_found:
                 self.log("Hata sayfası! Yenileniyor...", "WARNING")
                 self.driver.refresh()
                 time.sleep(5)
@@ -1248,39 +1318,10 @@ class HYPAutomation:
             "other" - HYP dışı sayfa veya boş
         """
         try:
-            current_url = self.driver.current_url.lower()
-
-            # 1. HYP dışı bir site mi?
-            if "hyp.saglik.gov.tr" not in current_url:
+            snap = self.take_snapshot()
+            if not snap.ok:
                 return "other"
-
-            # 2. Dashboard sayfası mı?
-            if "dashboard" in current_url:
-                return "dashboard"
-
-            # 3. HYP içi başka bir sayfa mı? (giriş yapılmış demek)
-            # Hasta Listesi, Fizik Muayene vs. menü linkleri varsa giriş yapılmış
-            if self.check_exists("//a[contains(., 'Hasta Listesi')]", timeout=1):
-                return "hyp_loggedin"
-            if self.check_exists("//a[contains(., 'Fizik Muayene')]", timeout=0.5):
-                return "hyp_loggedin"
-            if self.check_exists("//span[contains(@class, 'user-name')]", timeout=0.5):
-                return "hyp_loggedin"
-
-            # 4. PIN popup açık mı?
-            if self.check_exists("//input[@id='popupPinCode_Password']", timeout=0.5):
-                return "pin_popup"
-
-            # 5. Giriş butonu var mı? (ana sayfa, giriş yapılmamış)
-            if self.check_exists("//*[@id='header']/div/div/button", timeout=0.5):
-                return "login_page"
-
-            # 6. e-İmza sekmesi veya login modal açık mı?
-            if self.check_exists("//a[@href='#e-imza']", timeout=0.5):
-                return "login_page"
-
-            return "other"
-
+            return classify_login_state(snap, self._hyp_host())
         except Exception:
             return "other"
 
@@ -1309,7 +1350,7 @@ class HYPAutomation:
                 # Dashboard'da değilse, dashboard'a git
                 if page_state != "dashboard":
                     try:
-                        self.driver.get("https://hyp.saglik.gov.tr/dashboard")
+                        self.driver.get(self._hyp_url("dashboard"))
                         time.sleep(1)
                     except:
                         pass
@@ -1327,7 +1368,7 @@ class HYPAutomation:
 
             # DURUM D: HYP dışı sayfa veya boş - HYP'ye git
             self.log("🌐 HYP'ye yönlendiriliyor...")
-            self.driver.get(HYP_URL)
+            self.driver.get(self._hyp_url())
             time.sleep(1)
 
             # Tekrar kontrol et
@@ -1446,11 +1487,12 @@ class HYPAutomation:
             self.log("Fizik Muayene sayfasına gidiliyor...")
 
             # Menüye git
+            url_before = self.driver.current_url
             if not self.click_element("//a[contains(., 'Fizik Muayene')]", timeout=5):
                 self.log("Fizik Muayene menüsü bulunamadı!", "ERROR")
                 return []
 
-            time.sleep(2)  # OPTIMIZE: 3 -> 2
+            self.waiter.after_navigation("fizik_muayene", url_before, legacy=2)
             self.check_error_page()
 
             # Sayfa boyutunu 100'e ayarla (varsayılan 10)
@@ -1474,42 +1516,33 @@ class HYPAutomation:
             except:
                 pass
 
-            # Hastaları topla
-            patients = []
-            rows = self.driver.find_elements(By.CSS_SELECTOR, ".list-item.ng-star-inserted")
-
-            for row in rows:
-                try:
-                    text = row.text
-                    if date_str in text:
-                        parts = text.split('\n')
-                        if parts and "Adı" not in parts[0]:
-                            patients.append({
-                                "ad_soyad": parts[0].strip(),
-                                "tarih": date_str
-                            })
-                except:
-                    continue
+            # Hastaları topla - tüm sayfalar, sayfa başına tek execute_script (patient_list)
+            rows = read_patient_list(self.driver, log=self.log)
+            patients = filter_by_dates(rows, {date_str})
 
             self.log(f"Bulunan hasta: {len(patients)}")
+            self._capture_names(patients)
             return patients
 
         except Exception as e:
             self.log(f"Hasta listesi hatası: {e}", "ERROR")
             return []
 
+    def _capture_names(self, patients: List[Dict]):
+        """Oturum kaydi aciksa hasta adlarini anonimlestirme listesine ekle"""
+        if self.capture is not None:
+            for patient in patients:
+                self.capture.add_name(patient.get("ad_soyad", ""))
+
     def get_patients_for_dates(self, dates: List[datetime]) -> List[Dict]:
         """
         Birden fazla tarih için hastaları SÜPER HIZLI al.
-        Sayfayı 1 kere açar, 100 satır alır, bellekte filtreler.
+        Sayfayı 1 kere açar, tüm sayfaları toplu okur (patient_list), bellekte filtreler.
         Tarih sorgusu YAPMAZ - tüm listeyi okur ve seçilen tarihlere göre filtreler.
         """
         if not dates:
             return []
 
-        all_patients = []
-        existing_names = set()
-
         # Seçilen tarihleri string formatına çevir
         date_strings = set(d.strftime("%d.%m.%Y") for d in dates)
         self.log(f"📅 {len(dates)} tarih için hastalar alınıyor (hızlı mod)...")
@@ -1518,48 +1551,29 @@ class HYPAutomation:
             self.log("Fizik Muayene sayfasına gidiliyor...")
 
             # Menüye git - SADECE 1 KEZ
+            url_before = self.driver.current_url
             if not self.click_element("//a[contains(., 'Fizik Muayene')]", timeout=5):
                 self.log("Fizik Muayene menüsü bulunamadı!", "ERROR")
                 return []
 
-            time.sleep(2)
+            self.waiter.after_navigation("fizik_muayene", url_before, legacy=2)
             self.check_error_page()
 
             # Sayfa boyutunu 100'e ayarla
             self.set_page_size(100)
             time.sleep(0.5)
 
-            # TÜM satırları oku - tarih filtresi YAPMADAN
-            rows = self.driver.find_elements(By.CSS_SELECTOR, ".list-item.ng-star-inserted")
-            self.log(f"   📋 Sayfada {len(rows)} satır bulundu")
+            # TÜM sayfaların satırlarını oku - tarih filtresi YAPMADAN
+            rows = read_patient_list(self.driver, log=self.log)
+            self.log(f"   📋 Listede {len(rows)} satır bulundu")
+
+            # Seçilen tarihlere göre filtrele (set araması, aynı isim bir kez)
+            all_patients = filter_by_dates(rows, date_strings, unique_names=True)
 
             # Tarih bazlı sayaçlar
             date_counts = {d: 0 for d in date_strings}
-
-            for row in rows:
-                try:
-                    text = row.text
-                    parts = text.split('\n')
-                    if not parts or "Adı" in parts[0]:
-                        continue
-
-                    name = parts[0].strip()
-                    if name in existing_names:
-                        continue
-
-                    # Bu satırın tarihi seçilen tarihlerden biri mi?
-                    for date_str in date_strings:
-                        if date_str in text:
-                            all_patients.append({
-                                "ad_soyad": name,
-                                "tarih": date_str
-                            })
-                            existing_names.add(name)
-                            date_counts[date_str] += 1
-                            break  # Bir tarihle eşleşti, sonrakine geç
-
-                except:
-                    continue
+            for patient in all_patients:
+                date_counts[patient["tarih"]] += 1
 
             # Sonuçları logla
             for date_str in sorted(date_strings):
@@ -1568,6 +1582,7 @@ class HYPAutomation:
                     self.log(f"   📆 {date_str}: ✅ {count} hasta")
 
             self.log(f"📊 Toplam: {len(all_patients)} benzersiz hasta")
+            self._capture_names(all_patients)
             return all_patients
 
         except Exception as e:
@@ -1646,8 +1661,8 @@ class HYPAutomation:
         """Metin icinden tarih cikar"""
         import re
         # Normalize
-        text_n = text.upper().replace('İ', 'I').replace('Ş', 'S').replace('Ğ', 'G').replace('Ü', 'U').replace('Ö', 'O').replace('Ç', 'C')
-        label_n = label.upper().replace('İ', 'I').replace('Ş', 'S').replace('Ğ', 'G').replace('Ü', 'U').replace('Ö', 'O').replace('Ç', 'C')
+        text_n = normalize_tr(text)
+        label_n = normalize_tr(label)
         
         # Pattern: label + herhangi karakter + tarih (dd.mm.yyyy)
         pattern = label_n + r'.*?(\d{2}[./]\d{2}[./]\d{4})'
@@ -1769,139 +1784,190 @@ class HYPAutomation:
     # ============================================================
     # HASTA İŞLEME (ANA FONKSİYON)
     # ============================================================
-    def process_patient(self, patient_name: str) -> bool:
-        """Tek bir hastayi isle"""
-        start_time = time.time()
+    def _event(self, event_type: str, **fields):
+        """Olay kaydına bir satır yaz (kayıt kapalıysa hiçbir şey yapmaz)"""
+        if self.events is None:
+            return
+        event = {"ts": round(time.time(), 3), "session": self.session_id, "type": event_type}
+        event.update(fields)
+        self.events.write(event)
 
-        # Hasta bilgilerini kaydet (gebelik kontrolu ve bildirimler icin)
-        self.current_patient_name = patient_name
-        self.current_patient_tc = None
+    def _card_event(self, hyp_tip: str, outcome: str, seconds: float):
+        """Kart olayı (ana kart döngüsü ve sol panel zinciri aynı alanlarla yazar)"""
+        self._event(
+            "card", patient=self.current_patient_key, hyp=hyp_tip, outcome=outcome,
+            seconds=round(seconds, 2), page=self._flow_last_page,
+        )
 
+    def process_patient(self, patient_name: str) -> bool:
+        """Tek bir hastayi isle ve sonucu olay kaydına yaz"""
+        before = dict(self.session_stats)
+        start = time.time()
+        # Sayfada okunan TC/ad degisse de tum olaylar listedeki adla baglanir
+        self.current_patient_key = patient_key(patient_name)
+        ok = False
         try:
-            # TC mi yoksa isim mi?
-            is_tc_input = len(patient_name) == 11 and patient_name.isdigit()
-            self.keep_alive()
+            ok = self._process_patient(patient_name)
+            return ok
+        finally:
+            delta = {k: self.session_stats.get(k, 0) - before.get(k, 0) for k in ("basarili", "basarisiz", "atlanan")}
+            if not ok:
+                outcome = "error"
+            elif delta["basarili"] or delta["basarisiz"]:
+                outcome = "processed"
+            elif delta["atlanan"]:
+                outcome = "skipped"
+            else:
+                outcome = "no_cards"
+            self._event(
+                "patient", patient=self.current_patient_key, outcome=outcome,
+                seconds=round(time.time() - start, 2),
+                cards_ok=delta["basarili"], cards_fail=delta["basarisiz"],
+            )
 
-            # 1. Hasta Listesine Git
-            # Önce ana sayfaya dönmeyi dene
-            if "dashboard" not in self.driver.current_url.lower():
-                try:
-                    self.driver.get("https://hyp.saglik.gov.tr/dashboard")
-                    time.sleep(1.5)
-                except:
-                    pass
+    def _open_patient(self, patient_name: str) -> bool:
+        """Hasta listesinde ara ve hastayı aç (isim veya TC ile)"""
+        self.keep_alive()
 
-            # Hasta Listesi menüsünü bul ve tıkla
-            menu_found = False
-            menu_xpaths = [
-                "//a[contains(., 'Hasta Listesi')]",
-                "//a[contains(text(), 'Hasta Listesi')]",
-                "//span[contains(text(), 'Hasta Listesi')]/parent::a",
-                "//a[@href='/patient-list']",
-            ]
-            for xpath in menu_xpaths:
-                if self.click_element(xpath, timeout=3):
-                    menu_found = True
-                    break
+        # 1. Hasta Listesine Git
+        # Önce ana sayfaya dönmeyi dene
+        if "dashboard" not in self.driver.current_url.lower():
+            try:
+                self.driver.get(self._hyp_url("dashboard"))
+                self.waiter.settled("dashboard", legacy=1.5)
+            except:
+                pass
 
-            if not menu_found:
-                self.log("Hasta listesi menüsü bulunamadı!", "WARNING")
-                return False
+        # Hasta Listesi menüsünü bul ve tıkla
+        url_before = self.driver.current_url
+        menu_found = False
+        menu_xpaths = [
+            "//a[contains(., 'Hasta Listesi')]",
+            "//a[contains(text(), 'Hasta Listesi')]",
+            "//span[contains(text(), 'Hasta Listesi')]/parent::a",
+            "//a[@href='/patient-list']",
+        ]
+        for xpath in menu_xpaths:
+            if self.click_element(xpath, timeout=3):
+                menu_found = True
+                break
 
-            time.sleep(2)
-            self.check_error_page()
+        if not menu_found:
+            self.log("Hasta listesi menüsü bulunamadı!", "WARNING")
+            return False
 
-            # 2. Hastayı Ara
-            try:
-                # Arama kutusunu bul
-                search_input = None
-                inputs = self.driver.find_elements(By.TAG_NAME, 'input')
-                for inp in inputs:
-                    ph = (inp.get_attribute('placeholder') or '').lower()
-                    if 'hasta ara' in ph or 'search patient' in ph or 'ara' in ph:
-                        search_input = inp
-                        break
+        self.waiter.after_navigation("hasta_listesi", url_before, legacy=2)
+        self.check_error_page()
 
-                if not search_input:
-                    self.log("Arama kutusu bulunamadı!", "WARNING")
-                    return False
+        # 2. Hastayı Ara
+        try:
+            # Arama kutusunu bul
+            search_input = None
+            inputs = self.driver.find_elements(By.TAG_NAME, 'input')
+            for inp in inputs:
+                ph = (inp.get_attribute('placeholder') or '').lower()
+                if 'hasta ara' in ph or 'search patient' in ph or 'ara' in ph:
+                    search_input = inp
+                    break
 
-                search_input.clear()
-                search_input.send_keys(patient_name)
-                search_input.send_keys(Keys.ENTER)
-                time.sleep(2)  # Arama sonuçları yüklensin
-            except Exception as e:
-                self.log(f"Arama kutusu hatası: {str(e)[:50]}", "WARNING")
+            if not search_input:
+                self.log("Arama kutusu bulunamadı!", "WARNING")
                 return False
 
-            # 3. Hasta İsmine Tıkla
-            name_clicked = False
-            # TC mi yoksa isim mi kontrol et
-            is_tc_search = len(patient_name) == 11 and patient_name.isdigit()
-            # Türkçe karakter normalizasyonu ile karşılaştır
-            patient_name_normalized = normalize_tr(patient_name)
-
-            # Arama sonuçlarını bekle
-            list_items = []
-            for attempt in range(5):
-                list_items = self.driver.find_elements(By.CSS_SELECTOR, ".list-item.ng-star-inserted, .list-item")
-                if len(list_items) > 0:
-                    break
-                time.sleep(0.5)
+            search_input.clear()
+            search_input.send_keys(patient_name)
+            search_input.send_keys(Keys.ENTER)
+            # Arama sonuçları yüklensin (istek bitip liste durulaşana kadar)
+            self.waiter.settled("hasta_arama", legacy=2)
+        except Exception as e:
+            self.log(f"Arama kutusu hatası: {str(e)[:50]}", "WARNING")
+            return False
 
-            # TC ile arama yapildiysa ve tek sonuc varsa direkt tikla
-            if is_tc_search and len(list_items) == 1:
-                try:
-                    name_el = list_items[0].find_element(By.CSS_SELECTOR, ".name")
-                    self.js_click(name_el)
-                except:
-                    self.js_click(list_items[0])
-                time.sleep(0.5)
-                self.log(f"TC ile arama: tek sonuc bulundu ve tiklandi")
-                name_clicked = True
-            elif is_tc_search and len(list_items) > 1:
-                # TC ile birden fazla sonuc geldiyse ilkine tikla
+        # 3. Hasta İsmine Tıkla
+        name_clicked = False
+        # TC mi yoksa isim mi kontrol et
+        is_tc_search = len(patient_name) == 11 and patient_name.isdigit()
+        # Türkçe karakter normalizasyonu ile karşılaştır
+        patient_name_normalized = normalize_tr(patient_name)
+
+        # Arama sonuçlarını bekle
+        list_items = []
+        for attempt in range(5):
+            list_items = self.driver.find_elements(By.CSS_SELECTOR, ".list-item.ng-star-inserted, .list-item")
+            if len(list_items) > 0:
+                break
+            time.sleep(0.5)
+
+        # TC ile arama yapildiysa ve tek sonuc varsa direkt tikla
+        if is_tc_search and len(list_items) == 1:
+            try:
+                name_el = list_items[0].find_element(By.CSS_SELECTOR, ".name")
+                self.js_click(name_el)
+            except:
+                self.js_click(list_items[0])
+            self.waiter.settled("hasta_ac", legacy=0.5)
+            self.log(f"TC ile arama: tek sonuc bulundu ve tiklandi")
+            name_clicked = True
+        elif is_tc_search and len(list_items) > 1:
+            # TC ile birden fazla sonuc geldiyse ilkine tikla
+            try:
+                name_el = list_items[0].find_element(By.CSS_SELECTOR, ".name")
+                self.js_click(name_el)
+            except:
+                self.js_click(list_items[0])
+            self.waiter.settled("hasta_ac", legacy=0.5)
+            self.log(f"TC ile arama: ilk sonuca tiklandi")
+            name_clicked = True
+        else:
+            # Isim ile arama - eski mantik
+            for item in list_items:
                 try:
-                    name_el = list_items[0].find_element(By.CSS_SELECTOR, ".name")
-                    self.js_click(name_el)
+                    item_text_normalized = normalize_tr(item.text)
+                    if patient_name_normalized in item_text_normalized:
+                        try:
+                            name_el = item.find_element(By.CSS_SELECTOR, ".name")
+                            self.js_click(name_el)
+                        except:
+                            self.js_click(item)
+
+                        self.waiter.settled("hasta_ac", legacy=0.5)
+                        self.log(f"Dogru hasta bulundu ve tiklandi: {patient_name}")
+                        name_clicked = True
+                        break
                 except:
+                    continue
+
+            if not name_clicked:
+                if len(list_items) == 1:
                     self.js_click(list_items[0])
-                time.sleep(0.5)
-                self.log(f"TC ile arama: ilk sonuca tiklandi")
-                name_clicked = True
-            else:
-                # Isim ile arama - eski mantik
-                for item in list_items:
-                    try:
-                        item_text_normalized = normalize_tr(item.text)
-                        if patient_name_normalized in item_text_normalized:
-                            try:
-                                name_el = item.find_element(By.CSS_SELECTOR, ".name")
-                                self.js_click(name_el)
-                            except:
-                                self.js_click(item)
+                    self.waiter.settled("hasta_ac", legacy=0.5)
+                    self.log(f"Tek sonuc bulundu, tiklandi: {patient_name}")
+                    name_clicked = True
+                else:
+                    self.log(f"UYARI: {patient_name} arama sonuclarinda bulunamadi!", "WARNING")
 
-                            time.sleep(0.5)
-                            self.log(f"Dogru hasta bulundu ve tiklandi: {patient_name}")
-                            name_clicked = True
-                            break
-                    except:
-                        continue
+        if not name_clicked:
+            self.log("Hasta ismi/karti bulunamadi!", "WARNING")
+            return False
 
-                if not name_clicked:
-                    if len(list_items) == 1:
-                        self.js_click(list_items[0])
-                        time.sleep(0.5)
-                        self.log(f"Tek sonuc bulundu, tiklandi: {patient_name}")
-                        name_clicked = True
-                    else:
-                        self.log(f"UYARI: {patient_name} arama sonuclarinda bulunamadi!", "WARNING")
+        self.check_error_page()
+        return True
 
-            if not name_clicked:
-                self.log("Hasta ismi/karti bulunamadi!", "WARNING")
-                return False
+    def _process_patient(self, patient_name: str) -> bool:
+        """Tek bir hastayi isle"""
+        start_time = time.time()
 
-            self.check_error_page()
+        # Hasta bilgilerini kaydet (gebelik kontrolu ve bildirimler icin)
+        self.current_patient_name = patient_name
+        self.current_patient_tc = None
+        if self.capture is not None:
+            self.capture.add_name(patient_name)
+
+        try:
+            # TC mi yoksa isim mi?
+            is_tc_input = len(patient_name) == 11 and patient_name.isdigit()
+            if not self._open_patient(patient_name):
+                return False
 
             # ============================================================
             # TC NUMARASINI VE HASTA ADINI AL
@@ -2020,54 +2086,80 @@ class HYPAutomation:
                     break
                 
                 card = yapilabilir[0]
-                self.log(f"Kart isleniyor ({deneme+1}): {card['baslik']} ({card['hyp_tip']})")
+
+                # Paralel modda hedef slotu ayır (diğer tarayıcılar doldurduysa atla)
+                if not self._reserve_target(card["hyp_tip"]):
+                    islenen_kartlar.add(card["hyp_tip"])
+                    continue
+
+                slot_open = True  # ayrilan hedef slotu commit/release edilmedi
+                try:
+                    self.log(f"Kart isleniyor ({deneme+1}): {card['baslik']} ({card['hyp_tip']})")
                 
-                result = self._process_single_card(card, islenen_kartlar)
+                    card_start = time.time()
+                    self._flow_last_page = ""
+                    self._chain_seconds = 0.0
+                    result = self._process_single_card(card, islenen_kartlar)
+                    # Sol panel zinciri kendi kart olaylarini yazar; sureleri burada sayilmaz
+                    self._card_event(
+                        card["hyp_tip"],
+                        "sms_skip" if result == "SMS_SKIP" else ("ok" if result is True else "fail"),
+                        time.time() - card_start - self._chain_seconds,
+                    )
                 
-                # SMS KAPALI - TUM KARTLARI ATLA
-                if result == "SMS_SKIP":
-                    self.log(f"   [SMS KAPALI] Hastanin tum HYP'leri atlaniyor!", "WARNING")
-                    # Tum kartlari islenmis olarak isaretle
-                    for c in yapilabilir:
-                        islenen_kartlar.add(c["hyp_tip"])
-                    break  # Donguyu kir, sonraki hastaya gec
+                    # SMS KAPALI - TUM KARTLARI ATLA
+                    if result == "SMS_SKIP":
+                        self._release_target(card["hyp_tip"])
+                        slot_open = False
+                        self.log(f"   [SMS KAPALI] Hastanin tum HYP'leri atlaniyor!", "WARNING")
+                        # Tum kartlari islenmis olarak isaretle
+                        for c in yapilabilir:
+                            islenen_kartlar.add(c["hyp_tip"])
+                        break  # Donguyu kir, sonraki hastaya gec
                 
-                success = result if isinstance(result, bool) else False
-                islenen_kartlar.add(card["hyp_tip"])
+                    success = result if isinstance(result, bool) else False
+                    islenen_kartlar.add(card["hyp_tip"])
                 
-                if success:
-                    self.session_stats["basarili"] += 1
-                    # Hedef takibi için session sayacını artır
-                    self.increment_completed(card["hyp_tip"])
-                    if card["hyp_tip"] in self.monthly_stats:
-                        self.monthly_stats[card["hyp_tip"]] += 1
+                    if success:
+                        self.session_stats["basarili"] += 1
+                        # Hedef takibi için session sayacını artır
+                        self.increment_completed(card["hyp_tip"])
+                        slot_open = False
+                        if card["hyp_tip"] in self.monthly_stats:
+                            self.monthly_stats[card["hyp_tip"]] += 1
+                        else:
+                            self.monthly_stats[card["hyp_tip"]] = 1
+                        if self.stats_callback:
+                            self.stats_callback(self.monthly_stats, {})
+                        # Cache'e kaydet (başarılı)
+                        self.mark_hyp_as_processed(
+                            self.current_patient_tc,
+                            self.current_patient_name or "",
+                            card["hyp_tip"],
+                            "BASARILI"
+                        )
                     else:
-                        self.monthly_stats[card["hyp_tip"]] = 1
-                    if self.stats_callback:
-                        self.stats_callback(self.monthly_stats, {})
-                    # Cache'e kaydet (başarılı)
-                    self.mark_hyp_as_processed(
-                        self.current_patient_tc,
-                        self.current_patient_name or "",
-                        card["hyp_tip"],
-                        "BASARILI"
-                    )
-                else:
-                    self.session_stats["basarisiz"] += 1
-                    # Başarısız HYP'yi kaydet
-                    self.failed_hyps.append({
-                        "hasta": self.current_patient_name or "Bilinmeyen",
-                        "hyp_tip": card["hyp_tip"],
-                        "hyp_ad": card.get("baslik", card["hyp_tip"]),
-                        "neden": "İşlem tamamlanamadı"
-                    })
-                    # Cache'e kaydet (iptal/başarısız)
-                    self.mark_hyp_as_processed(
-                        self.current_patient_tc,
-                        self.current_patient_name or "",
-                        card["hyp_tip"],
-                        "IPTAL"
-                    )
+                        self.session_stats["basarisiz"] += 1
+                        self._release_target(card["hyp_tip"])
+                        slot_open = False
+                        # Başarısız HYP'yi kaydet
+                        self.failed_hyps.append({
+                            "hasta": self.current_patient_name or "Bilinmeyen",
+                            "hyp_tip": card["hyp_tip"],
+                            "hyp_ad": card.get("baslik", card["hyp_tip"]),
+                            "neden": "İşlem tamamlanamadı"
+                        })
+                        # Cache'e kaydet (iptal/başarısız)
+                        self.mark_hyp_as_processed(
+                            self.current_patient_tc,
+                            self.current_patient_name or "",
+                            card["hyp_tip"],
+                            "IPTAL"
+                        )
+                finally:
+                    # Kart islenirken hata olursa slot diger tarayicilar icin bosa cikar
+                    if slot_open:
+                        self._release_target(card["hyp_tip"])
 
                 time.sleep(0.3)  # 1 -> 0.3 (OPTIMIZE)
                 self._go_back_to_patient_cards()
@@ -2094,13 +2186,14 @@ class HYPAutomation:
 
             # Görüntüle butonuna tıkla
             self.js_click(card["element"])
-            time.sleep(1)  # Sayfa yuklensin
+            self.waiter.settled("goruntule", legacy=1)  # Sayfa yuklensin
 
             # ============================================================
             # SMS ONAYI POPUP KONTROLÜ - KRITIK!
             # Görüntüle sonrası SMS onay popup'u çıkarsa bu hasta atlanır
             # ============================================================
-            if self._check_sms_onay_popup():
+            snap = self.take_snapshot()
+            if self._check_sms_onay_popup(snap):
                 self.log(f"   [!] SMS ONAYI GEREKLİ - Hasta atlanıyor!", "WARNING")
                 # Popup'u kapat
                 self._close_sms_popup_and_skip()
@@ -2121,10 +2214,14 @@ class HYPAutomation:
                 return "SMS_SKIP"  # Tum kartlari atla
 
             # Popup kontrolü - sadece bilgi popup'larini kapat, devam et
-            self.kill_popups()
+            if self.kill_popups(snap):
+                snap = self.take_snapshot()
 
             # Gercek yetki hatasi kontrolu
-            page_text = self.get_page_text()
+            if snap.ok:
+                page_text = snap.text
+            else:
+                page_text = self.get_page_text()
             if "YETKİ" in page_text and "HATA" in page_text:
                 self.log("Yetki hatasi, kart atlanıyor.", "WARNING")
                 return False
@@ -2270,168 +2367,124 @@ class HYPAutomation:
         9: "Terminal - Yaşam beklentisi < 6 ay"
     }
 
-    def _detect_diy_page(self) -> str:
-        """Diyabet sayfasını URL veya başlıktan tanı"""
-        url = self.driver.current_url
-
-        # URL bazlı hızlı tanıma
-        if '/anamnez' in url:
-            return "ANAMNEZ"
-        elif '/risk' in url:
-            return "RISK"
-        elif '/kansekeri' in url or '/kan-sekeri' in url:
-            return "KAN_SEKERI"
-        elif '/semptom' in url:
-            return "SEMPTOM"
-        elif '/kirilganlik' in url or '/frailty' in url:
-            return "KIRILGANLIK"
-        elif '/tani' in url:
-            return "TANI"
-        elif '/yasamtarzi' in url or '/yasam' in url:
-            return "YASAM"
-        elif '/tetkik' in url:
-            return "TETKIK"
-        elif '/ilac' in url:
-            return "ILAC"
-        elif '/ozet' in url:
-            return "OZET"
-
-        # Sayfa text'inden tanıma
-        page = self.get_page_text()
-        if "SONLANDIRILMASI" in page:
-            return "OZET"
-        elif "KAN ŞEKERİ" in page or "KAN SEKERI" in page:
-            return "KAN_SEKERI"
-        elif "RİSK FAKTÖR" in page or "RISK FAKTOR" in page:
-            return "RISK"
-        elif "KIRILGANLIK" in page or "KLİNİK KIRILGANLIK" in page or "KLINIK KIRILGANLIK" in page:
-            return "KIRILGANLIK"
-        elif "İLAÇ TEDAVİSİ" in page or "ILAC TEDAVISI" in page:
-            return "ILAC"
-        elif "SEMPTOM" in page:
-            return "SEMPTOM"
-        elif "TANI KONULMASI" in page:
-            return "TANI"
-        elif "YAŞAM TARZI" in page or "YASAM TARZI" in page:
-            return "YASAM"
-
-        return "UNKNOWN"
+    def _detect_diy_page(self, snap: PageSnapshot = None) -> str:
+        """Diyabet sayfasını URL veya başlıktan tanı (snapshot üzerinden)"""
+        if snap is None or not snap.ok:
+            snap = self.take_snapshot()
+        return classify_diy(snap)
+
+    def _gebe_cevabi(self) -> str:
+        """Gebe listesine göre gebelik sorusunun cevabı ('EVET' / 'HAYIR')"""
+        if self.pregnancy_checker and self.current_patient_name:
+            if self.pregnancy_checker.is_pregnant(
+                tc=self.current_patient_tc,
+                ad_soyad=self.current_patient_name
+            ):
+                self.log("      [!] GEBE HASTA TESPIT EDILDI!", "WARNING")
+                return 'EVET'
+        return 'HAYIR'
+
+    def _screen_pregnancies(self, patients: List[Dict]):
+        """Günün listesindeki gebe hastaları baştan bildir"""
+        checker = self.pregnancy_checker
+        if not checker or not checker.pregnant_patients or not patients:
+            return
+        flags = checker.is_pregnant_many(patients)
+        names = [p.get('ad_soyad', '') for p, flag in zip(patients, flags) if flag]
+        if names:
+            self.log(f"🤰 Listede {len(names)} gebe hasta: {', '.join(names)}")
+
+    def _run_flow(self, spec: FlowSpec) -> bool:
+        """Protokol akış tablosunu çalıştır (page_flow.PageFlow)"""
+        flow = PageFlow(self, spec)
+        try:
+            return flow.run()
+        finally:
+            if flow.last_run is not None:
+                self._flow_last_page = f"{spec.name}/{flow.last_run.page}"
+
+    # ------------------------------------------------------------
+    # Ortak adımlar (akış tablolarında kullanılır)
+    # ------------------------------------------------------------
+    def _step_sonlandir(self, run: FlowRun) -> str:
+        """OZET: Sonlandır tıklanamazsa sonraki adımda tekrar denenir"""
+        return FLOW_DONE if self._click_sonlandir() else FLOW_NEXT
+
+    def _step_ilerle(self, run: FlowRun) -> str:
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_tetkik(self, run: FlowRun) -> str:
+        """Tetkik tiklerini kaldır, kaldırılamazsa HYP iptal"""
+        if not self._uncheck_tetkik_boxes():
+            self.log("   HYP iptal edildi, sonraki HYP'ye geciliyor", "WARNING")
+            return FLOW_FAIL
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_ilac(self, run: FlowRun) -> str:
+        self._handle_medication_page()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_tani_kaydet(self, run: FlowRun) -> str:
+        if self.check_exists("//button[contains(., 'Kaydet')]", 1):
+            self.click_element("//button[contains(., 'Kaydet')]")
+        else:
+            self._click_ilerle()
+        return FLOW_NEXT
+
+    # ------------------------------------------------------------
+    # Diyabet
+    # ------------------------------------------------------------
+    def _step_diy_anamnez(self, run: FlowRun) -> str:
+        self._fill_anamnez_fields()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_diy_risk(self, run: FlowRun) -> str:
+        # AKILLI GEBELIK KONTROLU - Gebe listesinden kontrol et
+        self._answer_pregnancy_question(self._gebe_cevabi())
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_diy_kan_sekeri(self, run: FlowRun) -> str:
+        # ONEMLI: Gebelik sorusu bu sayfada da olabilir!
+        self._answer_pregnancy_question(self._gebe_cevabi())
+        # Tetkik checkbox'larini temizle
+        return self._step_tetkik(run)
+
+    def _step_diy_kirilganlik(self, run: FlowRun) -> str:
+        self._fill_kirilganlik_olcegi()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _diyabet_flow(self) -> FlowSpec:
+        return FlowSpec(
+            name="Diyabet",
+            classify=self._detect_diy_page,
+            pages={
+                "OZET": PageRule("   Sonlandırılıyor...", self._step_sonlandir),
+                "ANAMNEZ": PageRule("   Anamnez - alanlar dolduruluyor...", self._step_diy_anamnez),
+                "RISK": PageRule("   Risk Faktörleri...", self._step_diy_risk),
+                "KAN_SEKERI": PageRule("   Kan Şekeri Değerlendirme...", self._step_diy_kan_sekeri),
+                "SEMPTOM": PageRule("   Semptom Değerlendirme...", self._step_ilerle),
+                "KIRILGANLIK": PageRule("   65+ Yaş Kırılganlık Ölçeği (Clinical Frailty Scale)...", self._step_diy_kirilganlik),
+                "TETKIK": PageRule("   Tetkik - checkboxlar kaldırılıyor...", self._step_tetkik),
+                "ILAC": PageRule("   İlaç - kullanım durumu kontrol ediliyor...", self._step_ilac),
+                "TANI": PageRule("   Tanı sayfası...", self._step_tani_kaydet),
+                "YASAM": PageRule("   Yaşam Tarzı Önerileri...", self._step_ilerle),
+            },
+            fallback=PageRule("   Bilinmeyen sayfa - ilerle deneniyor...", self._step_ilerle),
+            success_message="Diyabet tamamlandı!",
+            max_steps=self.MAX_STEPS,
+        )
 
     def _process_diyabet(self) -> bool:
         """Diyabet Tarama/İzlem - AKILLI SAYFA TANIMA"""
         self.log(">> Diyabet protokolü başladı")
         # NOT: _start_process() artik _process_single_card'da cagiriliyor!
-
-        is_finished = False
-        step = 0
-        same_page_count = 0
-        last_page = None
-
-        while not is_finished and step < self.MAX_STEPS:
-            step += 1
-            self.keep_alive()
-            self.check_error_page()
-            self._close_dialogs()
-
-            current_page = self._detect_diy_page()
-            self.log(f"   Adım {step}: Sayfa={current_page}", "DEBUG")
-
-            # Aynı sayfada takılı kalma kontrolü
-            if current_page == last_page:
-                same_page_count += 1
-                if same_page_count >= 3:
-                    self.log(f"   ⚠️ {current_page} sayfasında 3 kez takılı kaldı, HYP atlanıyor", "ERROR")
-                    return False
-            else:
-                same_page_count = 0
-            last_page = current_page
-
-            # SAYFAYA GÖRE İŞLEM
-            if current_page == "OZET":
-                self.log("   Sonlandırılıyor...")
-                is_finished = self._click_sonlandir()
-
-            elif current_page == "ANAMNEZ":
-                self.log("   Anamnez - alanlar dolduruluyor...")
-                self._fill_anamnez_fields()
-                self._click_ilerle()
-
-            elif current_page == "RISK":
-                self.log("   Risk Faktörleri...")
-                # AKILLI GEBELIK KONTROLU - Gebe listesinden kontrol et
-                gebe_cevap = 'HAYIR'  # Varsayilan
-                if self.pregnancy_checker and self.current_patient_name:
-                    if self.pregnancy_checker.is_pregnant(
-                        tc=self.current_patient_tc,
-                        ad_soyad=self.current_patient_name
-                    ):
-                        gebe_cevap = 'EVET'
-                        self.log("      [!] GEBE HASTA TESPIT EDILDI!", "WARNING")
-                # Gebe sorusunu cevapla (toggle button veya radio)
-                self._answer_pregnancy_question(gebe_cevap)
-                self._click_ilerle()
-
-            elif current_page == "KAN_SEKERI":
-                self.log("   Kan Şekeri Değerlendirme...")
-                # ONEMLI: Gebelik sorusu bu sayfada da olabilir!
-                gebe_cevap = 'HAYIR'
-                if self.pregnancy_checker and self.current_patient_name:
-                    if self.pregnancy_checker.is_pregnant(
-                        tc=self.current_patient_tc,
-                        ad_soyad=self.current_patient_name
-                    ):
-                        gebe_cevap = 'EVET'
-                        self.log("      [!] GEBE HASTA TESPIT EDILDI!", "WARNING")
-                self._answer_pregnancy_question(gebe_cevap)
-                # Tetkik checkbox'larini temizle
-                tetkik_ok = self._uncheck_tetkik_boxes()
-                if not tetkik_ok:
-                    self.log("   HYP iptal edildi, sonraki HYP'ye geciliyor", "WARNING")
-                    return False
-                self._click_ilerle()
-
-            elif current_page == "SEMPTOM":
-                self.log("   Semptom Değerlendirme...")
-                self._click_ilerle()
-
-            elif current_page == "KIRILGANLIK":
-                self.log("   65+ Yaş Kırılganlık Ölçeği (Clinical Frailty Scale)...")
-                self._fill_kirilganlik_olcegi()
-                self._click_ilerle()
-
-            elif current_page == "TETKIK":
-                self.log("   Tetkik - checkboxlar kaldırılıyor...")
-                tetkik_ok = self._uncheck_tetkik_boxes()
-                if not tetkik_ok:
-                    self.log("   HYP iptal edildi, sonraki HYP'ye geciliyor", "WARNING")
-                    return False
-                self._click_ilerle()
-
-            elif current_page == "ILAC":
-                self.log("   İlaç - kullanım durumu kontrol ediliyor...")
-                self._handle_medication_page()
-                self._click_ilerle()
-
-            elif current_page == "TANI":
-                self.log("   Tanı sayfası...")
-                if self.check_exists("//button[contains(., 'Kaydet')]", 1):
-                    self.click_element("//button[contains(., 'Kaydet')]")
-                else:
-                    self._click_ilerle()
-
-            elif current_page == "YASAM":
-                self.log("   Yaşam Tarzı Önerileri...")
-                self._click_ilerle()
-
-            else:
-                self.log(f"   Bilinmeyen sayfa - ilerle deneniyor...")
-                self._click_ilerle()
-
-            time.sleep(0.5)  # 1.5 -> 0.5 saniye (optimize)
-
-        if is_finished:
-            self.log("Diyabet tamamlandı!", "SUCCESS")
-        return is_finished
+        return self._run_flow(self._diyabet_flow())
 
 
     # ============================================================
@@ -2450,114 +2503,51 @@ class HYPAutomation:
         "OZET": "//div[contains(text(), 'SONLANDIRILMASI')]"
     }
 
-    def _detect_ht_page(self) -> str:
-        """HT sayfasını başlık veya URL'den tanı"""
-        url = self.driver.current_url
-
-        # URL bazlı hızlı tanıma
-        if '/anamnez' in url:
-            return "ANAMNEZ"
-        elif '/tetkik' in url:
-            return "TETKIK"
-        elif '/kvh' in url and 'hesaplama' in url:
-            return "KVH_HESAPLAMA"
-        elif '/kvh' in url and 'tani' in url:
-            return "KVH_TANI"
-        elif '/kvh' in url and 'hedef' in url:
-            return "HEDEF"
-        elif '/ilac' in url:
-            return "ILAC"
-        elif '/yasamtarzi' in url:
-            return "YASAM_TARZI"
-        elif '/ozet' in url:
-            return "OZET"
-
-        # Sayfa text'inden tanıma
-        page_text = self.get_page_text()
-        if "SONLANDIRILMASI" in page_text:
-            return "OZET"
-        elif "TANI KONULMASI" in page_text:
-            return "TANI"
-
-        return "UNKNOWN"
+    def _detect_ht_page(self, snap: PageSnapshot = None) -> str:
+        """HT sayfasını başlık veya URL'den tanı (snapshot üzerinden)"""
+        if snap is None or not snap.ok:
+            snap = self.take_snapshot()
+        return classify_ht(snap)
+
+    def _step_ht_anamnez(self, run: FlowRun) -> str:
+        self._fill_anamnez_fields()
+        # HT_TARAMA: Normotansif riskli sorusu ANAMNEZ sayfasinda da olabilir!
+        self._select_normotansif_hayir()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_ht_tani(self, run: FlowRun) -> str:
+        # "Normotansif hastayı riskli değerlendiriyor musunuz?" - HAYIR sec
+        self._select_normotansif_hayir()
+        return self._step_tani_kaydet(run)
+
+    def _hipertansiyon_flow(self) -> FlowSpec:
+        tani = PageRule("   Tanı sayfası...", self._step_ht_tani)
+        gec = PageRule("   {page} - ilerle...", self._step_ilerle)
+        return FlowSpec(
+            name="Hipertansiyon",
+            classify=self._detect_ht_page,
+            pages={
+                "OZET": PageRule("   Sonlandırılıyor...", self._step_sonlandir),
+                "ANAMNEZ": PageRule("   Anamnez - alanlar dolduruluyor...", self._step_ht_anamnez),
+                "TETKIK": PageRule("   Tetkik - tikler kaldırılıyor...", self._step_tetkik),
+                "ILAC": PageRule("   İlaç - kullanım durumu kontrol ediliyor...", self._step_ilac),
+                "TANI": tani,
+                "KVH_TANI": tani,
+                "KVH_HESAPLAMA": gec,
+                "HEDEF": gec,
+                "YASAM_TARZI": gec,
+            },
+            fallback=PageRule("   Bilinmeyen sayfa - ilerle deneniyor...", self._step_ilerle),
+            success_message="Hipertansiyon tamamlandı!",
+            max_steps=self.MAX_STEPS,
+        )
 
     def _process_hipertansiyon(self) -> bool:
         """Hipertansiyon Tarama/İzlem - AKILLI SAYFA TANIMA"""
         self.log(">> Hipertansiyon protokolü başladı")
         # NOT: _start_process() artik _process_single_card'da cagiriliyor, burada TEKRAR cagirmiyoruz!
-
-        is_finished = False
-        step = 0
-        same_page_count = 0
-        last_page = None
-
-        while not is_finished and step < self.MAX_STEPS:
-            step += 1
-            self.keep_alive()
-            self.check_error_page()
-            self._close_dialogs()
-
-            current_page = self._detect_ht_page()
-            self.log(f"   Adım {step}: Sayfa={current_page}", "DEBUG")
-
-            # Aynı sayfada takılı kalma kontrolü
-            if current_page == last_page:
-                same_page_count += 1
-                if same_page_count >= 3:
-                    self.log(f"   ⚠️ {current_page} sayfasında 3 kez takılı kaldı, HYP atlanıyor", "ERROR")
-                    return False
-            else:
-                same_page_count = 0
-            last_page = current_page
-
-            # SAYFAYA GÖRE İŞLEM
-            if current_page == "OZET":
-                self.log("   Sonlandırılıyor...")
-                is_finished = self._click_sonlandir()
-
-            elif current_page == "ANAMNEZ":
-                self.log("   Anamnez - alanlar dolduruluyor...")
-                self._fill_anamnez_fields()
-                # HT_TARAMA: Normotansif riskli sorusu ANAMNEZ sayfasinda da olabilir!
-                self._select_normotansif_hayir()
-                self._click_ilerle()
-
-            elif current_page == "TETKIK":
-                self.log("   Tetkik - tikler kaldırılıyor...")
-                tetkik_ok = self._uncheck_tetkik_boxes()
-                if not tetkik_ok:
-                    # HYP iptal edildi, donguden cik
-                    self.log("   HYP iptal edildi, sonraki HYP'ye geciliyor", "WARNING")
-                    return False
-                self._click_ilerle()
-
-            elif current_page == "ILAC":
-                self.log("   İlaç - kullanım durumu kontrol ediliyor...")
-                self._handle_medication_page()
-                self._click_ilerle()
-
-            elif current_page in ["TANI", "KVH_TANI"]:
-                self.log("   Tanı sayfası...")
-                # "Normotansif hastayı riskli değerlendiriyor musunuz?" - HAYIR sec
-                self._select_normotansif_hayir()
-                if self.check_exists("//button[contains(., 'Kaydet')]", 1):
-                    self.click_element("//button[contains(., 'Kaydet')]")
-                else:
-                    self._click_ilerle()
-
-            elif current_page in ["KVH_HESAPLAMA", "HEDEF", "YASAM_TARZI"]:
-                self.log(f"   {current_page} - ilerle...")
-                self._click_ilerle()
-
-            else:
-                self.log(f"   Bilinmeyen sayfa - ilerle deneniyor...")
-                self._click_ilerle()
-
-            time.sleep(0.5)  # 1.5 -> 0.5 saniye (optimize)
-
-        if is_finished:
-            self.log("Hipertansiyon tamamlandı!", "SUCCESS")
-        return is_finished
+        return self._run_flow(self._hipertansiyon_flow())
 
 
     def _select_normotansif_hayir(self):
@@ -2700,47 +2690,11 @@ class HYPAutomation:
         "OZET": "//div[contains(text(), 'SONLANDIRILMASI')]"
     }
 
-    def _detect_obe_page(self) -> str:
-        """Obezite sayfasını URL veya başlıktan tanı (OBE_TARAMA ve OBE_IZLEM)"""
-        url = self.driver.current_url
-
-        # URL bazlı hızlı tanıma - ONEMLI: /ilac kontrolu /tetkik'ten once olmali!
-        if '/obezite/anamnez' in url or '/anamnez' in url:
-            return "ANAMNEZ"
-        elif '/obezite/oyku' in url or '/oyku' in url:
-            return "OYKU"
-        elif '/obezite/tetkik' in url:
-            return "TETKIK"
-        elif '/obezite/ilac' in url or '/ilac' in url:
-            # ILAC sayfasi - /ilac genel kontrolu eklendi
-            return "ILAC"
-        elif '/obezite/eslikedenhastalik' in url or '/evre' in url:
-            return "EVRE"
-        elif '/obezite/yasamtarzi' in url or '/yasamtarzi' in url:
-            return "YASAM"
-        elif '/tetkik' in url:
-            return "TETKIK"
-        elif '/ozet' in url:
-            return "OZET"
-
-        # Sayfa text'inden tanıma
-        page = self.get_page_text()
-        if "SONLANDIRILMASI" in page:
-            return "OZET"
-        elif "EDMONTON" in page or "EŞLİK EDEN" in page or "ESLIK EDEN" in page:
-            return "EVRE"
-        elif "AĞIRLIK ARTIŞINA" in page or "AGIRLIK ARTISINA" in page:
-            return "ILAC"
-        elif "TETKİK" in page or "TETKIK" in page:
-            return "TETKIK"
-        elif "OBEZİTE ÖYKÜSÜ" in page or "OBEZITE OYKUSU" in page:
-            return "OYKU"
-        elif "YAŞAM TARZI" in page or "YASAM TARZI" in page:
-            return "YASAM"
-        elif "ANAMNEZ" in page:
-            return "ANAMNEZ"
-
-        return "UNKNOWN"
+    def _detect_obe_page(self, snap: PageSnapshot = None) -> str:
+        """Obezite sayfasını URL veya başlıktan tanı (OBE_TARAMA ve OBE_IZLEM, snapshot üzerinden)"""
+        if snap is None or not snap.ok:
+            snap = self.take_snapshot()
+        return classify_obe(snap)
 
     def _answer_pregnancy_question(self, answer: str = 'HAYIR') -> bool:
         """
@@ -3071,6 +3025,76 @@ class HYPAutomation:
             self.log(f"      İzlem zamanı seçim hatası: {str(e)[:40]}", "DEBUG")
             return True
 
+    def _step_obe_anamnez(self, run: FlowRun) -> str:
+        # OBE_TARAMA: "Obezite Tanısı" zorunlu alanını doldur
+        # Dropdown "Seçiniz" ise "E66.9 - Obezite, tanımlanmamış" sec
+        self._select_obezite_tanisi()
+
+        # AKILLI GEBELIK KONTROLU - Gebe sorusunu cevapla (toggle button veya radio)
+        self._answer_pregnancy_question(self._gebe_cevabi())
+
+        # OBE_IZLEM: ng-invalid bos alanlari doldur (Sistolik, Diyastolik, Nabiz)
+        self._fill_anamnez_ng_invalid()
+
+        # Olcum alanlari bossa doldur
+        self._fill_anamnez_fields()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_obe_tetkik(self, run: FlowRun) -> str:
+        # GUNCELLEME: _uncheck_tetkik_boxes kullan (dis lab sonucu dahil)
+        if self._uncheck_tetkik_boxes():
+            self._click_ilerle()
+            return FLOW_NEXT
+
+        # TETKIK sorunu - OBE_IZLEM pas gecilecek
+        self.log("   [X] TETKIK HATASI - OBE_IZLEM pas geciliyor!", "ERROR")
+
+        # Kullaniciya bildirim ekle
+        notification = {
+            'hasta': self.current_patient_name,
+            'hyp_tip': 'OBE_IZLEM',
+            'sebep': 'Tetkik tikleri kaldirilamadi',
+            'tarih': time.strftime('%d.%m.%Y %H:%M')
+        }
+        self.skipped_hyp_notifications.append(notification)
+
+        # Geri don ve diger HYP'leri dene
+        try:
+            self.driver.back()
+            time.sleep(1)
+        except:
+            pass
+        return FLOW_FAIL  # OBE_IZLEM basarisiz
+
+    def _step_obe_evre(self, run: FlowRun) -> str:
+        # ZORUNLU: İzlem zamanı seç (3 Ay veya 6 Ay)
+        self._select_izlem_zamani()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _obezite_flow(self) -> FlowSpec:
+        return FlowSpec(
+            name="Obezite",
+            classify=self._detect_obe_page,
+            pages={
+                "OZET": PageRule("   Sonlandırılıyor...", self._step_sonlandir),
+                "ANAMNEZ": PageRule("   Anamnez sayfası...", self._step_obe_anamnez),
+                # Genellikle önceki değerler seçili, direkt ilerle
+                "OYKU": PageRule("   Obezite Öyküsü sayfası...", self._step_ilerle),
+                "TETKIK": PageRule("   Tetkik Degerlendirme sayfasi...", self._step_obe_tetkik),
+                # Reçete tarihine göre aktif kullanım belirlenir
+                "ILAC": PageRule("   Ağırlık Artışına Sebep Olan İlaçlar sayfası...", self._step_ilac),
+                "EVRE": PageRule("   Edmonton Evresi sayfası...", self._step_obe_evre),
+                "YASAM": PageRule("   Yaşam Tarzı Önerileri...", self._step_ilerle),
+            },
+            fallback=PageRule("   Bilinmeyen sayfa - ilerle deneniyor...", self._step_ilerle),
+            success_message="Obezite tamamlandı!",
+            max_steps=self.MAX_STEPS,
+            # Obezite akışında takılma kontrolü yok (eski davranış)
+            max_same_page=None,
+        )
+
     def _process_obezite(self) -> bool:
         """Obezite Tarama/İzlem - AKILLI SAYFA TANIMA (V2)
 
@@ -3090,109 +3114,7 @@ class HYPAutomation:
             self.waist_optimization_enabled = False
 
         # NOT: _start_process() artik _process_single_card'da cagiriliyor!
-
-        is_finished = False
-        step = 0
-
-        while not is_finished and step < self.MAX_STEPS:
-            step += 1
-            self.keep_alive()
-            self.check_error_page()
-            self._close_dialogs()
-
-            current_page = self._detect_obe_page()
-            self.log(f"   Adım {step}: Sayfa={current_page}", "DEBUG")
-
-            # SAYFAYA GÖRE İŞLEM
-            if current_page == "OZET":
-                self.log("   Sonlandırılıyor...")
-                is_finished = self._click_sonlandir()
-
-            elif current_page == "ANAMNEZ":
-                self.log("   Anamnez sayfası...")
-
-                # OBE_TARAMA: "Obezite Tanısı" zorunlu alanını doldur
-                # Dropdown "Seçiniz" ise "E66.9 - Obezite, tanımlanmamış" sec
-                self._select_obezite_tanisi()
-
-                # AKILLI GEBELIK KONTROLU - Gebe listesinden kontrol et
-                gebe_cevap = 'HAYIR'  # Varsayilan
-                if self.pregnancy_checker and self.current_patient_name:
-                    if self.pregnancy_checker.is_pregnant(
-                        tc=self.current_patient_tc,
-                        ad_soyad=self.current_patient_name
-                    ):
-                        gebe_cevap = 'EVET'
-                        self.log("      [!] GEBE HASTA TESPIT EDILDI!", "WARNING")
-
-                # Gebe sorusunu cevapla (toggle button veya radio)
-                self._answer_pregnancy_question(gebe_cevap)
-
-                # OBE_IZLEM: ng-invalid bos alanlari doldur (Sistolik, Diyastolik, Nabiz)
-                self._fill_anamnez_ng_invalid()
-
-                # Olcum alanlari bossa doldur
-                self._fill_anamnez_fields()
-                self._click_ilerle()
-
-            elif current_page == "OYKU":
-                self.log("   Obezite Öyküsü sayfası...")
-                # Genellikle önceki değerler seçili, direkt ilerle
-                self._click_ilerle()
-
-            elif current_page == "TETKIK":
-                self.log("   Tetkik Degerlendirme sayfasi...")
-                # GUNCELLEME: _uncheck_tetkik_boxes kullan (dis lab sonucu dahil)
-                tetkik_success = self._uncheck_tetkik_boxes()
-
-                if not tetkik_success:
-                    # TETKIK sorunu - OBE_IZLEM pas gecilecek
-                    self.log("   [X] TETKIK HATASI - OBE_IZLEM pas geciliyor!", "ERROR")
-
-                    # Kullaniciya bildirim ekle
-                    notification = {
-                        'hasta': self.current_patient_name,
-                        'hyp_tip': 'OBE_IZLEM',
-                        'sebep': 'Tetkik tikleri kaldirilamadi',
-                        'tarih': time.strftime('%d.%m.%Y %H:%M')
-                    }
-                    self.skipped_hyp_notifications.append(notification)
-
-                    # Geri don ve diger HYP'leri dene
-                    try:
-                        self.driver.back()
-                        time.sleep(1)
-                    except:
-                        pass
-                    return False  # OBE_IZLEM basarisiz
-
-                self._click_ilerle()
-
-            elif current_page == "ILAC":
-                self.log("   Ağırlık Artışına Sebep Olan İlaçlar sayfası...")
-                # Reçete tarihine göre aktif kullanım belirlenir
-                self._handle_medication_page()
-                self._click_ilerle()
-
-            elif current_page == "EVRE":
-                self.log("   Edmonton Evresi sayfası...")
-                # ZORUNLU: İzlem zamanı seç (3 Ay veya 6 Ay)
-                self._select_izlem_zamani()
-                self._click_ilerle()
-
-            elif current_page == "YASAM":
-                self.log("   Yaşam Tarzı Önerileri...")
-                self._click_ilerle()
-
-            else:
-                self.log(f"   Bilinmeyen sayfa - ilerle deneniyor...")
-                self._click_ilerle()
-
-            time.sleep(0.5)  # 1.5 -> 0.5 saniye (optimize)
-
-        if is_finished:
-            self.log("Obezite tamamlandı!", "SUCCESS")
-        return is_finished
+        return self._run_flow(self._obezite_flow())
 
     def _select_obezite_tanisi(self):
         """
@@ -3262,6 +3184,88 @@ class HYPAutomation:
     # ============================================================
     # KVR MODÜLÜ
     # ============================================================
+    def _step_kvr_ozet(self, run: FlowRun) -> str:
+        if self._click_sonlandir():
+            return FLOW_DONE
+        self.log("Sonlandır butonu tıklanamadı!", "WARNING")
+        return FLOW_FAIL
+
+    def _step_kvr_tetkik(self, run: FlowRun) -> str:
+        if not self._uncheck_tetkik_boxes():
+            self.log("   !!! TETKIK tikleri kaldirilamadi - HYP pas geciliyor!", "ERROR")
+            return FLOW_FAIL
+        # Tikler degisti - butonlar icin snapshot'i yenile
+        run.snap = self.take_snapshot()
+        return self._step_kvr_buttons(run)
+
+    def _step_kvr_buttons(self, run: FlowRun) -> str:
+        """Sayfadaki butonlara göre: İzlem Başlat / Sonlandır / İlerle"""
+        btn_texts = run.snap.button_texts
+        self.log(f"   Butonlar={btn_texts[:5]}", "DEBUG")
+
+        # IZLEM BASLAT BUTONU - KVR_IZLEM icin ozel
+        if any('İzlem Başlat' in t and 'Yüz Yüze' in t for t in btn_texts):
+            for b in self.driver.find_elements(By.TAG_NAME, 'button'):
+                txt = b.text.strip()
+                if 'İzlem Başlat' in txt and 'Yüz Yüze' in txt:
+                    self.log("   İzlem Başlat (Yüz Yüze) butonu tıklanıyor...")
+                    try:
+                        self.js_click(b)
+                        time.sleep(0.5)
+                        return FLOW_NEXT
+                    except Exception as e:
+                        self.log(f"   İzlem Başlat tıklanamadı: {e}", "WARNING")
+                    break
+
+        # Sonlandır varsa tıkla ve bitir
+        if any('Sonlandır' in t for t in btn_texts):
+            self.log("   Sonlandırılıyor...")
+            return self._step_kvr_ozet(run)
+
+        # İlerle varsa tıkla
+        if any('İlerle' in t for t in btn_texts):
+            if self._click_ilerle():
+                self.log(f"   İlerle tıklandı (adım {run.step})", "DEBUG")
+                time.sleep(0.3)
+                return FLOW_NEXT
+            self.log("İlerle butonu tıklanamadı!", "WARNING")
+            return FLOW_FAIL
+
+        # Buton bulunamazsa biraz bekle ve tekrar dene
+        self.log(f"   Buton bulunamadı, bekleniyor... (adım {run.step})", "DEBUG")
+        time.sleep(0.5)
+        btn_texts = self.take_snapshot().button_texts
+
+        if any('Sonlandır' in t for t in btn_texts):
+            return FLOW_DONE if self._click_sonlandir() else FLOW_NEXT
+        if any('İlerle' in t for t in btn_texts):
+            self._click_ilerle()
+            return FLOW_NEXT
+        self.log("İlerle veya Sonlandır butonu bulunamadı!", "WARNING")
+        return FLOW_FAIL
+
+    def _kvr_flow(self) -> FlowSpec:
+        return FlowSpec(
+            name="KVR",
+            classify=classify_kvr,
+            pages={
+                "OZET": PageRule("   OZET sayfası - Sonlandırılıyor...", self._step_kvr_ozet),
+                "TETKIK": PageRule("   TETKIK sayfasi - tikler kaldiriliyor...", self._step_kvr_tetkik),
+            },
+            fallback=PageRule("", self._step_kvr_buttons),
+            success_message="KVR protokolü tamamlandı!",
+            max_steps=19,
+            max_same_page=4,
+            stuck_key="url",
+            settle_first=True,
+            on_stuck=lambda run: self._cancel_current_hyp(reason="KVR protokolünde sayfa takılması"),
+            on_max_steps=self._kvr_max_steps,
+        )
+
+    def _kvr_max_steps(self, run: FlowRun):
+        self.log("Maksimum adım sayısına ulaşıldı - HYP iptal ediliyor!", "WARNING")
+        self._cancel_current_hyp(reason="KVR protokolünde maksimum adım aşıldı")
+
     def _process_kvr(self) -> bool:
         """KVR Tarama/İzlem - Tetkik Handling ile Akış
 
@@ -3280,119 +3284,7 @@ class HYPAutomation:
         """
         self.log(">> KVR protokolü başladı")
         # NOT: _start_process() artik _process_single_card'da cagiriliyor!
-
-        last_url = None
-        same_url_count = 0
-        MAX_SAME_URL = 4  # Aynı URL'de maksimum kalma sayısı
-
-        for step in range(1, 20):  # Maksimum 20 adım (artırıldı)
-            self.keep_alive()
-            self.check_error_page()
-            self._close_dialogs()
-
-            time.sleep(0.5)
-
-            current_url = self.driver.current_url
-            page_text = self.get_page_text()
-
-            # Aynı sayfada takılı kalma kontrolü
-            if current_url == last_url:
-                same_url_count += 1
-                if same_url_count >= MAX_SAME_URL:
-                    self.log(f"   !!! Aynı sayfada {MAX_SAME_URL} kez takıldı - HYP iptal ediliyor!", "ERROR")
-                    self._cancel_current_hyp(reason="KVR protokolünde sayfa takılması")
-                    return False
-            else:
-                same_url_count = 0
-                last_url = current_url
-
-            # =====================================================
-            # OZET SAYFASI - SONLANDIR
-            # =====================================================
-            if '/ozet' in current_url or 'SONLANDIRILMASI' in page_text:
-                self.log("   OZET sayfası - Sonlandırılıyor...")
-                if self._click_sonlandir():
-                    self.log("KVR protokolü tamamlandı!", "SUCCESS")
-                    return True
-                else:
-                    self.log("Sonlandır butonu tıklanamadı!", "WARNING")
-                    return False
-
-            # =====================================================
-            # TETKIK SAYFASI - OZEL ISLEM
-            # =====================================================
-            if '/tetkik' in current_url:
-                self.log("   TETKIK sayfasi - tikler kaldiriliyor...")
-                tetkik_ok = self._uncheck_tetkik_boxes()
-                if not tetkik_ok:
-                    self.log("   !!! TETKIK tikleri kaldirilamadi - HYP pas geciliyor!", "ERROR")
-                    return False
-
-            # Mevcut butonları kontrol et
-            buttons = self.driver.find_elements(By.TAG_NAME, 'button')
-            btn_texts = [b.text.strip() for b in buttons if b.text.strip()]
-
-            self.log(f"   Adım {step}: URL={current_url.split('/')[-1]}, Butonlar={btn_texts[:5]}", "DEBUG")
-
-            # =====================================================
-            # IZLEM BASLAT BUTONU - KVR_IZLEM icin ozel
-            # =====================================================
-            izlem_baslat_btn = None
-            for b in buttons:
-                txt = b.text.strip()
-                if 'İzlem Başlat' in txt and 'Yüz Yüze' in txt:
-                    izlem_baslat_btn = b
-                    break
-
-            if izlem_baslat_btn:
-                self.log("   İzlem Başlat (Yüz Yüze) butonu tıklanıyor...")
-                try:
-                    self.js_click(izlem_baslat_btn)
-                    time.sleep(0.5)
-                    continue
-                except Exception as e:
-                    self.log(f"   İzlem Başlat tıklanamadı: {e}", "WARNING")
-
-            # Sonlandır varsa tıkla ve bitir
-            if any('Sonlandır' in t for t in btn_texts):
-                self.log("   Sonlandırılıyor...")
-                if self._click_sonlandir():
-                    self.log("KVR protokolü tamamlandı!", "SUCCESS")
-                    return True
-                else:
-                    self.log("Sonlandır butonu tıklanamadı!", "WARNING")
-                    return False
-
-            # İlerle varsa tıkla
-            if any('İlerle' in t for t in btn_texts):
-                if self._click_ilerle():
-                    self.log(f"   İlerle tıklandı (adım {step})", "DEBUG")
-                    time.sleep(0.3)
-                else:
-                    self.log("İlerle butonu tıklanamadı!", "WARNING")
-                    return False
-            else:
-                # Buton bulunamazsa biraz bekle ve tekrar dene
-                self.log(f"   Buton bulunamadı, bekleniyor... (adım {step})", "DEBUG")
-                time.sleep(0.5)
-                # Tekrar butonlari kontrol et
-                buttons = self.driver.find_elements(By.TAG_NAME, 'button')
-                btn_texts = [b.text.strip() for b in buttons if b.text.strip()]
-
-                if any('Sonlandır' in t for t in btn_texts):
-                    if self._click_sonlandir():
-                        self.log("KVR protokolü tamamlandı!", "SUCCESS")
-                        return True
-                elif any('İlerle' in t for t in btn_texts):
-                    self._click_ilerle()
-                    continue
-                else:
-                    self.log("İlerle veya Sonlandır butonu bulunamadı!", "WARNING")
-                    return False
-
-        self.log("Maksimum adım sayısına ulaşıldı - HYP iptal ediliyor!", "WARNING")
-        self._cancel_current_hyp(reason="KVR protokolünde maksimum adım aşıldı")
-        return False
+        return self._run_flow(self._kvr_flow())
 
     # ============================================================
     # YAŞLI SAĞLIĞI MODÜLÜ
@@ -3494,37 +3386,11 @@ class HYPAutomation:
         # 5 veya daha fazla kronik ilaç = Polifarmasi
         return len(kronik_ilaclar) >= 5
 
-    def _detect_yasli_page(self) -> str:
-        """Yaşlı İzlem sayfasını URL'den tanı"""
-        url = self.driver.current_url
-
-        if '/anamnezfizikmuayene' in url or '/anamnez' in url:
-            return "ANAMNEZ"
-        elif '/ilac' in url:
-            return "ILAC"
-        elif '/birincilgeriatrik' in url or '/geriatrik' in url:
-            return "GERIATRIK"
-        elif '/tetkik' in url:
-            return "TETKIK"
-        elif '/geneldurumdegerlendirme' in url or '/planlama' in url:
-            return "PLANLAMA"
-        elif '/ozet' in url:
-            return "OZET"
-
-        # Sayfa text'inden tanıma
-        page = self.get_page_text()
-        if "SONLANDIRILMASI" in page or "ÖZET" in page:
-            return "OZET"
-        elif "GERİATRİK" in page or "GERIATRIK" in page:
-            return "GERIATRIK"
-        elif "İLAÇ" in page or "ILAC" in page:
-            return "ILAC"
-        elif "TETKİK" in page:
-            return "TETKIK"
-        elif "PLANLAMA" in page or "İZLEM SIKLIĞI" in page:
-            return "PLANLAMA"
-
-        return "UNKNOWN"
+    def _detect_yasli_page(self, snap: PageSnapshot = None) -> str:
+        """Yaşlı İzlem sayfasını URL'den tanı (snapshot üzerinden)"""
+        if snap is None or not snap.ok:
+            snap = self.take_snapshot()
+        return classify_yasli(snap)
 
     def _fill_yasli_ilac_page(self) -> bool:
         """
@@ -3953,6 +3819,57 @@ class HYPAutomation:
             self.log(f"   Planlama sayfa hatasi: {str(e)[:50]}", "WARNING")
             return True
 
+    def _step_yasli_fill(self, fill: Callable) -> Callable:
+        """Doldur + İlerle adımı üret"""
+        def step(run: FlowRun) -> str:
+            fill()
+            self._click_ilerle()
+            return FLOW_NEXT
+        return step
+
+    def _step_yasli_tetkik(self, run: FlowRun) -> str:
+        # Yasli akisinda tetkik tikleri kaldirilamasa da devam edilir
+        self._uncheck_tetkik_boxes()
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _step_yasli_unknown(self, run: FlowRun) -> str:
+        # Izlem Baslat butonu hala varsa tikla - SADECE ILK ADIMDA kontrol et (OPTIMIZE)
+        if not run.data.get("izlem_baslat_checked"):
+            run.data["izlem_baslat_checked"] = True
+            try:
+                # Hizli XPath ile kontrol et (find_elements yerine)
+                izlem_xpath = "//button[contains(., 'İzlem Başlat') and contains(., 'Yüz Yüze')]"
+                if self.click_element(izlem_xpath, timeout=0.5):
+                    self.log("   İzlem Başlat butonu tıklandı")
+                    time.sleep(0.5)
+                    return FLOW_RETRY
+            except:
+                pass
+
+        self.log(f"   Bilinmeyen sayfa - ilerle deneniyor...")
+        self._click_ilerle()
+        return FLOW_NEXT
+
+    def _yasli_flow(self) -> FlowSpec:
+        return FlowSpec(
+            name="Yasli",
+            classify=self._detect_yasli_page,
+            pages={
+                "OZET": PageRule("   Sonlandırılıyor...", self._step_sonlandir),
+                # Ağırlık alanı zorunlu - doldur
+                "ANAMNEZ": PageRule("   Anamnez sayfası...", self._step_yasli_fill(self._fill_anamnez_fields)),
+                "ILAC": PageRule("   İlaç Tedavisi sayfası...", self._step_yasli_fill(self._fill_yasli_ilac_page)),
+                "GERIATRIK": PageRule("   Geriatrik Değerlendirme sayfası...", self._step_yasli_fill(self._fill_yasli_geriatrik_page)),
+                "TETKIK": PageRule("   Tetkik sayfası - tikler kaldırılıyor...", self._step_yasli_tetkik),
+                "PLANLAMA": PageRule("   Planlama sayfası...", self._step_yasli_fill(self._fill_yasli_planlama_page)),
+            },
+            fallback=PageRule("", self._step_yasli_unknown),
+            success_message="Yaşlı Sağlığı İzlem tamamlandı!",
+            max_steps=self.MAX_STEPS,
+            max_same_page=3,
+        )
+
     def _process_yasli(self) -> bool:
         """
         Yaşlı Sağlığı İzlem - AKILLI SAYFA TANIMA
@@ -3973,86 +3890,7 @@ class HYPAutomation:
         """
         self.log(">> Yaşlı Sağlığı İzlem protokolü başladı (hemsire verileri mevcut)")
         # NOT: _start_process() artik _process_single_card'da cagiriliyor!
-
-        is_finished = False
-        step = 0
-        last_page = None
-        same_page_count = 0
-        MAX_SAME_PAGE = 3  # Aynı sayfada maksimum kalma sayısı
-        izlem_baslat_checked = False  # Sadece 1 kere kontrol et
-
-        while not is_finished and step < self.MAX_STEPS:
-            step += 1
-            self.keep_alive()
-            self.check_error_page()
-            self._close_dialogs()
-
-            current_page = self._detect_yasli_page()
-            self.log(f"   Adım {step}: Sayfa={current_page}", "DEBUG")
-
-            # Aynı sayfada takılı kalma kontrolü
-            if current_page == last_page:
-                same_page_count += 1
-                if same_page_count >= MAX_SAME_PAGE:
-                    self.log(f"   !!! {current_page} sayfasında {MAX_SAME_PAGE} kez takıldı - atlanıyor", "ERROR")
-                    return False
-            else:
-                same_page_count = 0
-                last_page = current_page
-
-            # Izlem Baslat butonu hala varsa tikla - SADECE ILK ADIMDA kontrol et (OPTIMIZE)
-            if not izlem_baslat_checked and current_page == "UNKNOWN":
-                izlem_baslat_checked = True
-                try:
-                    # Hizli XPath ile kontrol et (find_elements yerine)
-                    izlem_xpath = "//button[contains(., 'İzlem Başlat') and contains(., 'Yüz Yüze')]"
-                    if self.click_element(izlem_xpath, timeout=0.5):
-                        self.log("   İzlem Başlat butonu tıklandı")
-                        time.sleep(0.5)
-                        continue
-                except:
-                    pass
-
-            # SAYFAYA GÖRE İŞLEM
-            if current_page == "OZET":
-                self.log("   Sonlandırılıyor...")
-                is_finished = self._click_sonlandir()
-
-            elif current_page == "ANAMNEZ":
-                self.log("   Anamnez sayfası...")
-                # Ağırlık alanı zorunlu - doldur
-                self._fill_anamnez_fields()
-                self._click_ilerle()
-
-            elif current_page == "ILAC":
-                self.log("   İlaç Tedavisi sayfası...")
-                self._fill_yasli_ilac_page()
-                self._click_ilerle()
-
-            elif current_page == "GERIATRIK":
-                self.log("   Geriatrik Değerlendirme sayfası...")
-                self._fill_yasli_geriatrik_page()
-                self._click_ilerle()
-
-            elif current_page == "TETKIK":
-                self.log("   Tetkik sayfası - tikler kaldırılıyor...")
-                self._uncheck_tetkik_boxes()
-                self._click_ilerle()
-
-            elif current_page == "PLANLAMA":
-                self.log("   Planlama sayfası...")
-                self._fill_yasli_planlama_page()
-                self._click_ilerle()
-
-            else:
-                self.log(f"   Bilinmeyen sayfa - ilerle deneniyor...")
-                self._click_ilerle()
-
-            time.sleep(0.5)  # 1.5 -> 0.5 (optimize)
-
-        if is_finished:
-            self.log("Yaşlı Sağlığı İzlem tamamlandı!", "SUCCESS")
-        return is_finished
+        return self._run_flow(self._yasli_flow())
 
     # ============================================================
     # YARDIMCI FONKSİYONLAR
@@ -4080,12 +3918,9 @@ class HYPAutomation:
             self.log("   [DEBUG] Ilerle/Kaydet butonu bulunamadi!", "WARNING")
             return False
 
-        # Biraz bekle ve URL kontrolu yap
-        time.sleep(0.3)  # OPTIMIZE: 1 -> 0.3 saniye
-        url_after = self.driver.current_url
-
-        # URL degisti mi?
-        if url_before != url_after:
+        # URL degisene (veya sayfa durulasana) kadar bekle
+        if self.waiter.url_change("ilerle", url_before, legacy=0.3):
+            url_after = self.driver.current_url
             self.log(f"   Sayfa degisti: {url_after.split('/')[-1]}", "DEBUG")
             return True
 
@@ -4932,11 +4767,8 @@ class HYPAutomation:
         # Sayfadan eski degeri olan testi bul (ONCELIK SIRASINA GORE)
         for test in diyabet_zorunlu_testler:
             for page_test, page_val in old_values.items():
-                page_test_lower = page_test.lower()
-                test_lower = test.lower()
-
                 # Tam veya kismi eslesme
-                if test_lower in page_test_lower or page_test_lower in test_lower:
+                if same_test(test, page_test):
                     if page_val and page_val != '-':
                         diyabet_test_found = page_test  # Sayfadaki GERCEK ismi kullan
                         diyabet_test_value = page_val
@@ -5078,87 +4910,36 @@ class HYPAutomation:
             self.log(f"   Dis lab girisi hatasi: {e}", "ERROR")
             return False
 
+    def _scan_tetkik_panel(self) -> TetkikScan:
+        """Tetkik panelindeki tum checkbox'lari tek execute_script ile tara"""
+        scan = scan_tetkik_panel(self.driver)
+        if not scan.ok:
+            self.log("   Tetkik paneli taranamadi", "DEBUG")
+        return scan
+
+    def get_tetkik_checkboxes(self) -> List[Dict]:
+        """
+        Tetkik panelindeki checkbox'lar (tek WebDriver cagrisi).
+
+        Returns:
+            list: [{'test_name': 'HDL', 'checked': True, 'old_value': '39', 'disabled': False}, ...]
+        """
+        return checkbox_rows(self._scan_tetkik_panel())
+
     def _collect_all_checkbox_info_from_page(self) -> dict:
         """
         Sayfadaki TUM checkbox bilgilerini (label + deger) topla.
         Bu fonksiyon "Tumunu kaldir" TIKLANMADAN ONCE cagrilmali!
-        OPTIMIZE: implicit wait=0
+        OPTIMIZE: tek execute_script (tetkik_scanner)
 
         Returns:
             dict: {'APG': '95', 'HbA1c': '5.2', 'Glukoz': '102', ...}
         """
-        tests = {}
-        original_wait = self.driver.timeouts.implicit_wait
-        self.driver.implicitly_wait(0)
-
         try:
-            # Sayfadaki tum metni al
-            page_text = self.driver.find_element(By.TAG_NAME, 'body').text
-
-            # Bilinen test adlari ve varyasyonlari
-            known_tests = [
-                'APG', 'TKG', 'OGTT', 'HbA1c', 'Glukoz', 'Glikoz',
-                'Kolesterol', 'HDL', 'LDL', 'non-HDL', 'Trigliserit',
-                'Kreatinin', 'eGFR', 'Albumin', 'Sodyum', 'Potasyum',
-                'ALT', 'AST', 'GGT', 'ALP', 'Bilirubin',
-                'TSH', 'T4', 'T3', 'Hemoglobin', 'Hb', 'WBC', 'PLT'
-            ]
-
-            import re
-
-            for test in known_tests:
-                # Pattern: test adi + : veya bosluk + sayi
-                patterns = [
-                    rf'{re.escape(test)}\s*[:=]?\s*(\d+[.,]?\d*)',  # "APG: 95" veya "APG 95"
-                    rf'{re.escape(test)}.*?(\d+[.,]\d+)',  # "APG sonucu: 95.5"
-                ]
-
-                for pattern in patterns:
-                    match = re.search(pattern, page_text, re.IGNORECASE)
-                    if match:
-                        value = match.group(1).replace(',', '.')
-                        try:
-                            num_val = float(value)
-                            # Mantikli deger araliklarini kontrol et
-                            if 0 < num_val < 10000:
-                                tests[test] = value
-                                break
-                        except:
-                            pass
-
-            # Ek olarak: Sayfadaki input[type="number"] veya deger gosterim elementlerini tara
-            try:
-                value_elements = self.driver.find_elements(By.CSS_SELECTOR,
-                    '.son-deger, .test-value, .result-value, [class*="value"], input[type="number"]')
-
-                for el in value_elements:
-                    try:
-                        # Parent'tan label bulmaya calis
-                        parent = el.find_element(By.XPATH, './ancestor::*[3]')
-                        parent_text = parent.text
-
-                        for test in known_tests:
-                            if test.lower() in parent_text.lower():
-                                # Deger varsa al
-                                val = el.get_attribute('value') or el.text
-                                if val and val.strip():
-                                    try:
-                                        num_val = float(val.replace(',', '.'))
-                                        if 0 < num_val < 10000 and test not in tests:
-                                            tests[test] = val.strip()
-                                    except:
-                                        pass
-                    except:
-                        pass
-            except:
-                pass
-
+            return collect_test_values(self._scan_tetkik_panel())
         except Exception as e:
             self.log(f"   Checkbox bilgi toplama hatasi: {e}", "DEBUG")
-        finally:
-            self.driver.implicitly_wait(original_wait)
-
-        return tests
+            return {}
 
     def _read_old_values_from_tetkik_page(self) -> dict:
         """
@@ -5172,69 +4953,14 @@ class HYPAutomation:
         original_wait = self.driver.timeouts.implicit_wait
         self.driver.implicitly_wait(0)
 
-        # Bilinen test adlari
-        # ONEMLI: non-HDL, HDL'den ONCE olmali! (substring match sorunu)
-        known_tests = [
-            'APG', 'TKG', 'OGTT', 'HbA1c', 'Glukoz', 'Glikoz',
-            'Kolesterol', 'non-HDL', 'Non-HDL', 'HDL', 'LDL', 'Trigliserit',
-            'Kreatinin', 'eGFR', 'Sodyum', 'Potasyum',
-            'ALT', 'AST', 'GGT', 'ALP', 'Bilirubin',
-            'TSH', 'T4', 'T3', 'Hemoglobin', 'Hb', 'WBC', 'PLT',
-            'Albumin', 'Albümin', 'AKO', 'PKO', 'Protein'
-        ]
-
         try:
-            # Sayfadaki tum metni satirlara bol
             body = self.driver.find_element(By.TAG_NAME, 'body')
-            lines = body.text.split('\n')
-            lines = [l.strip() for l in lines if l.strip()]
-
-            self.log(f"   Sayfada {len(lines)} satir okundu", "DEBUG")
-
-            # Her test adini ara
-            for i, line in enumerate(lines):
-                line_lower = line.lower()
-                for test in known_tests:
-                    test_lower = test.lower()
-                    # Satir test adini iceriyor mu? (tam veya kismi eslesme)
-                    if test_lower == line_lower or (test_lower in line_lower and len(line) < 50):
-                        # HDL/non-HDL ozel kontrolu
-                        if test_lower == 'hdl' and 'non-hdl' in line_lower:
-                            continue  # non-HDL satirini HDL olarak eslestirme
-
-                        # ============================================================
-                        # KRITIK DUZELTME: Eger bu test icin zaten GECERLI bir deger
-                        # bulunmussa (yani "-" degilse), uzerine YAZMA!
-                        # Sayfada ayni test adi birden fazla yerde gecebilir.
-                        # ============================================================
-                        if test in old_values and old_values[test] != '-':
-                            break  # Bu test icin zaten gecerli deger var, sonrakine gec
-
-                        # Sonraki satir eski deger olmali
-                        if i + 1 < len(lines):
-                            next_line = lines[i + 1].strip()
-
-                            # Eski deger: sayi veya "-"
-                            if next_line == '-':
-                                # Sadece daha once deger bulunmadiysa "-" yaz
-                                if test not in old_values:
-                                    old_values[test] = '-'
-                                    self.log(f"   {test}: ESKI DEGER YOK (-)", "DEBUG")
-                            else:
-                                # Sayi mi kontrol et
-                                try:
-                                    # Virgulu noktaya cevir ve float dene
-                                    test_val = next_line.replace(',', '.')
-                                    # Bazen "92 mg/dL" gibi birim de olabilir, sadece sayiyi al
-                                    import re
-                                    match = re.match(r'^(\d+\.?\d*)', test_val)
-                                    if match:
-                                        old_values[test] = match.group(1)
-                                        self.log(f"   {test}: {old_values[test]}", "DEBUG")
-                                except:
-                                    pass
-                        break  # Bu test bulundu, sonrakine gec
-
+            old_values = parse_old_values(body.text)
+            for test, value in old_values.items():
+                if value == '-':
+                    self.log(f"   {test}: ESKI DEGER YOK (-)", "DEBUG")
+                else:
+                    self.log(f"   {test}: {value}", "DEBUG")
             self.log(f"   Toplam {len(old_values)} test degeri okundu", "DEBUG")
 
         except Exception as e:
@@ -5291,15 +5017,10 @@ class HYPAutomation:
             # Son care: Sayfadaki tum test adlarini tara
             page_text = self.driver.find_element(By.TAG_NAME, 'body').text
 
-            # Bilinen test adlari
-            known_tests = ['non-HDL', 'Non-HDL', 'NON-HDL', 'Kolesterol', 'HDL', 'LDL',
-                           'Trigliserit', 'HbA1c', 'APG', 'TKG', 'OGTT', 'Glukoz']
-
-            for test in known_tests:
-                if test.lower() in page_text.lower():
-                    # Bu test sayfada var mi ve tikli mi kontrol et
-                    self.log(f"   Olasi tikli test: {test}", "DEBUG")
-                    return test
+            test = TEST_MATCHER.find(page_text)
+            if test:
+                self.log(f"   Olasi tikli test: {test}", "DEBUG")
+                return test
 
         except Exception as e:
             self.log(f"   Test adi bulma hatasi: {e}", "DEBUG")
@@ -5312,136 +5033,24 @@ class HYPAutomation:
 
         "Tumunu kaldir" tiklandi ama bazi checkbox'lar KALDIRILAMADIĞINDA kullanilir.
         Cache'i filtrelemek icin kullanilir.
+        OPTIMIZE: tek execute_script, eslestirme Python'da (tetkik_scanner)
 
         Returns:
             set: Tikli kalan checkbox isimleri, ornek: {'Glukoz', 'Trigliserit', 'Kreatinin'}
         """
         remaining_names = set()
 
-        # Bilinen test adlari - _collect_all_checkbox_info_from_page ile ayni liste
-        # ONEMLI: non-HDL, HDL'den ONCE olmali! (substring match sorunu)
-        known_tests = [
-            'APG', 'TKG', 'OGTT', 'HbA1c', 'Glukoz', 'Glikoz',
-            'Kolesterol', 'non-HDL', 'Non-HDL', 'HDL', 'LDL', 'Trigliserit',
-            'Kreatinin', 'eGFR', 'Albumin', 'Sodyum', 'Potasyum',
-            'ALT', 'AST', 'GGT', 'ALP', 'Bilirubin',
-            'TSH', 'T4', 'T3', 'Hemoglobin', 'Hb', 'WBC', 'PLT',
-            'Urea', 'BUN', 'Idrar', 'idrarda albumin'
-        ]
-
         try:
-            # TUM tikli checkbox'lari bul (PrimeNG)
-            active_boxes = self.driver.find_elements(By.CSS_SELECTOR, '.ui-chkbox-box.ui-state-active')
+            active_boxes = self._scan_tetkik_panel().checked_boxes
             self.log(f"   {len(active_boxes)} tikli checkbox elementi bulundu", "DEBUG")
 
             for i, box in enumerate(active_boxes):
-                test_name = None
-                container_text = ""
-
-                # YONTEM 1: En yakin buyuk container'in text'ini al
-                try:
-                    # Farkli parent seviyelerini dene
-                    for ancestor_level in range(1, 8):
-                        try:
-                            parent = box.find_element(By.XPATH, f'./ancestor::*[{ancestor_level}]')
-                            parent_text = parent.text.strip()
-
-                            # Eger parent text'i yeterince uzunsa ve test adi iceriyorsa
-                            if parent_text and len(parent_text) > 3 and len(parent_text) < 500:
-                                container_text = parent_text
-                                # Bilinen test adlarindan birini iceriyor mu?
-                                parent_lower = parent_text.lower()
-                                for known in known_tests:
-                                    known_lower = known.lower()
-                                    if known_lower in parent_lower:
-                                        # HDL/non-HDL ozel kontrolu
-                                        if known_lower == 'hdl' and 'non-hdl' in parent_lower:
-                                            continue  # non-HDL ise HDL'i atla
-                                        test_name = known
-                                        self.log(f"   Checkbox {i+1}: Parent text'ten bulundu: {test_name}", "DEBUG")
-                                        break
-
-                            if test_name:
-                                break
-                        except:
-                            pass
-                except Exception as e:
-                    self.log(f"   Checkbox {i+1} parent text alma hatasi: {e}", "DEBUG")
-
-                # YONTEM 2: Onceki sibling veya label elementlerini kontrol et
-                if not test_name:
-                    try:
-                        # Onceki kardes elementleri kontrol et
-                        prev_siblings = box.find_elements(By.XPATH, './preceding-sibling::*')
-                        for sib in prev_siblings[:3]:  # Ilk 3 onceki kardes
-                            sib_text = sib.text.strip()
-                            sib_lower = sib_text.lower()
-                            for known in known_tests:
-                                known_lower = known.lower()
-                                if known_lower in sib_lower:
-                                    # HDL/non-HDL ozel kontrolu
-                                    if known_lower == 'hdl' and 'non-hdl' in sib_lower:
-                                        continue
-                                    test_name = known
-                                    self.log(f"   Checkbox {i+1}: Sibling'den bulundu: {test_name}", "DEBUG")
-                                    break
-                            if test_name:
-                                break
-                    except:
-                        pass
-
-                # YONTEM 3: p-checkbox parent'i uzerinden label ara
-                if not test_name:
-                    try:
-                        p_checkbox = box.find_element(By.XPATH, './ancestor::p-checkbox[1]')
-                        # Parent div'in tum text'ini al
-                        parent_div = p_checkbox.find_element(By.XPATH, './..')
-                        full_text = parent_div.text.strip()
-                        full_lower = full_text.lower()
-
-                        for known in known_tests:
-                            known_lower = known.lower()
-                            if known_lower in full_lower:
-                                # HDL/non-HDL ozel kontrolu
-                                if known_lower == 'hdl' and 'non-hdl' in full_lower:
-                                    continue
-                                test_name = known
-                                self.log(f"   Checkbox {i+1}: p-checkbox parent'tan bulundu: {test_name}", "DEBUG")
-                                break
-                    except:
-                        pass
-
-                # YONTEM 4: Row/item class'li parent'tan
-                if not test_name:
-                    try:
-                        row_parent = box.find_element(By.XPATH,
-                            './ancestor::*[contains(@class, "row") or contains(@class, "item") or contains(@class, "test") or contains(@class, "tetkik")][1]')
-                        row_text = row_parent.text.strip()
-                        row_lower = row_text.lower()
-
-                        for known in known_tests:
-                            known_lower = known.lower()
-                            if known_lower in row_lower:
-                                # HDL/non-HDL ozel kontrolu
-                                if known_lower == 'hdl' and 'non-hdl' in row_lower:
-                                    continue
-                                test_name = known
-                                self.log(f"   Checkbox {i+1}: Row/item'dan bulundu: {test_name}", "DEBUG")
-                                break
-                    except:
-                        pass
-
+                test_name = resolve_remaining_name(box)
                 if test_name:
                     remaining_names.add(test_name)
+                    self.log(f"   Checkbox {i+1}: {test_name}", "DEBUG")
                 else:
-                    # Son care: container text'in ilk satirini kullan
-                    if container_text:
-                        first_line = container_text.split('\n')[0].strip()
-                        if first_line and len(first_line) < 50:
-                            remaining_names.add(first_line)
-                            self.log(f"   Checkbox {i+1}: Fallback - ilk satir: {first_line}", "DEBUG")
-                    else:
-                        self.log(f"   Checkbox {i+1}: Test adi BULUNAMADI", "DEBUG")
+                    self.log(f"   Checkbox {i+1}: Test adi BULUNAMADI", "DEBUG")
 
         except Exception as e:
             self.log(f"   Tikli checkbox isimlerini alma hatasi: {e}", "DEBUG")
@@ -5452,6 +5061,7 @@ class HYPAutomation:
     def _get_all_remaining_checkbox_tests(self) -> dict:
         """
         TUM kaldirilamayan checkbox'larin test adlarini ve degerlerini bul.
+        OPTIMIZE: etiketler tek execute_script ile okunur (tetkik_scanner)
 
         Returns:
             dict: {'non-HDL': '143', 'LDL': '120', 'HDL': '45', ...}
@@ -5460,122 +5070,16 @@ class HYPAutomation:
         tests = {}
 
         try:
-            # TUM tikli checkbox'lari bul (PrimeNG)
-            active_boxes = self.driver.find_elements(By.CSS_SELECTOR, '.ui-chkbox-box.ui-state-active')
+            active_boxes = self._scan_tetkik_panel().checked_boxes
             self.log(f"   {len(active_boxes)} tikli checkbox bulundu", "DEBUG")
 
             for i, box in enumerate(active_boxes):
-                test_name = None
-                test_value = None
-
-                # ============================================================
-                # YONTEM 1: p-checkbox > label iliskisi (PrimeNG standart yapisi)
-                # ============================================================
-                try:
-                    # p-checkbox elementini bul (parent'lardan)
-                    p_checkbox = box.find_element(By.XPATH, './ancestor::p-checkbox[1]')
-
-                    # Label genellikle p-checkbox'in hemen yaninda veya icinde
-                    label_candidates = []
-
-                    # Following sibling label
-                    try:
-                        label_candidates.extend(p_checkbox.find_elements(By.XPATH, './following-sibling::label[1]'))
-                    except:
-                        pass
-
-                    # Preceding sibling span/label
-                    try:
-                        label_candidates.extend(p_checkbox.find_elements(By.XPATH, './preceding-sibling::*[1]'))
-                    except:
-                        pass
-
-                    # Parent'in icindeki diger elementler
-                    try:
-                        parent_div = p_checkbox.find_element(By.XPATH, './..')
-                        label_candidates.extend(parent_div.find_elements(By.CSS_SELECTOR, 'label, span.test-name, span.label, .tetkik-adi'))
-                    except:
-                        pass
-
-                    for lbl in label_candidates:
-                        text = lbl.text.strip()
-                        if text and len(text) < 60 and not text.isdigit():
-                            # Checkbox text'i degil (genellikle "Evet", "Hayir" vs.)
-                            if text.lower() not in ['evet', 'hayir', 'hayır', 'var', 'yok']:
-                                test_name = text.split(':')[0].strip() if ':' in text else text
-                                self.log(f"   [YONTEM1] Checkbox {i+1}: {test_name}", "DEBUG")
-                                break
-                except:
-                    pass
-
-                # ============================================================
-                # YONTEM 2: Checkbox'in bulundugu satir/row elementinden al
-                # ============================================================
-                if not test_name:
-                    try:
-                        # Daha genis parent arama
-                        parent_selectors = [
-                            './ancestor::*[contains(@class, "p-col") or contains(@class, "col-")][1]',
-                            './ancestor::*[contains(@class, "grid")]//*[contains(@class, "col")]',
-                            './ancestor::div[contains(@class, "row")][1]',
-                            './ancestor::div[contains(@class, "flex")][1]',
-                            './ancestor::tr[1]',
-                            './ancestor::li[1]',
-                            './ancestor::*[4]',  # 4 ust parent (genellikle row elementi)
-                        ]
-
-                        for selector in parent_selectors:
-                            try:
-                                parent = box.find_element(By.XPATH, selector)
-                                text = parent.text.strip()
-
-                                if text and len(text) < 150:
-                                    lines = text.split('\n')
-                                    for line in lines:
-                                        line = line.strip()
-                                        # Checkbox degil, test adi olmali
-                                        if line and len(line) < 50 and line.lower() not in ['evet', 'hayir', 'hayır', 'var', 'yok', '']:
-                                            # Sayi veya tarih degilse test adi
-                                            if not line.replace('.', '').replace(',', '').isdigit():
-                                                if ':' in line:
-                                                    test_name = line.split(':')[0].strip()
-                                                else:
-                                                    test_name = line
-                                                self.log(f"   [YONTEM2] Checkbox {i+1}: {test_name}", "DEBUG")
-                                                break
-                                    if test_name:
-                                        break
-                            except:
-                                continue
-                    except:
-                        pass
-
-                # ============================================================
-                # YONTEM 3: Formcontrolname veya name attribute'undan al
-                # ============================================================
-                if not test_name:
-                    try:
-                        # Checkbox'in input elementini bul
-                        input_el = box.find_element(By.XPATH, './ancestor::p-checkbox//input | ./preceding-sibling::input | ./following-sibling::input')
-
-                        # formcontrolname, name veya id attribute'lari
-                        for attr in ['formcontrolname', 'name', 'id']:
-                            val = input_el.get_attribute(attr)
-                            if val and len(val) < 50:
-                                # camelCase veya snake_case'i insan okunur hale getir
-                                import re
-                                test_name = re.sub(r'([a-z])([A-Z])', r'\1 \2', val)
-                                test_name = test_name.replace('_', ' ').title()
-                                self.log(f"   [YONTEM3] Checkbox {i+1}: {test_name} (attr={attr})", "DEBUG")
-                                break
-                    except:
-                        pass
+                test_name = resolve_label_name(box)
+                if test_name:
+                    self.log(f"   Checkbox {i+1}: {test_name}", "DEBUG")
 
-                # ============================================================
                 # Test adi bulunduysa degeri sayfadan al
-                # ============================================================
                 if test_name and test_name not in tests:
-                    # Oncelikle sayfadan eski degeri bul
                     test_value = self._get_test_value_from_page(test_name)
 
                     if test_value:
@@ -5615,31 +5119,12 @@ class HYPAutomation:
             test_name_lower = test_name.lower().strip()
 
             # ============================================================
-            # YONTEM 1: Regex ile sayfa metninden degeri bul
+            # YONTEM 1: Sayfa metninden degeri bul (derlenmis tek regex)
             # ============================================================
-            patterns = [
-                # Pattern: "Test Adı: 123" veya "Test Adı : 123"
-                rf'{re.escape(test_name)}[:\s]+(\d+[.,]?\d*)',
-                # Pattern: "Test Adı = 123"
-                rf'{test_name}\s*[:=]\s*(\d+[.,]?\d*)',
-                # Pattern: "Test Adı ... 123.5" (araya baska seyler girebilir)
-                rf'{test_name}[^\d]{{0,30}}(\d+[.,]\d+)',
-                # Pattern: "Test Adı ... 123" (tam sayi)
-                rf'{test_name}[^\d]{{0,30}}(\d{{2,4}})',
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    value = match.group(1).replace(',', '.')
-                    # Gecerli deger mi kontrol et (0'dan buyuk ve mantikli aralik)
-                    try:
-                        float_val = float(value)
-                        if 0 < float_val < 10000:  # Mantikli deger araligi
-                            self.log(f"   {test_name} degeri (regex): {value}", "SUCCESS")
-                            return value
-                    except:
-                        pass
+            value = TEST_MATCHER.value_for(test_name, page_text)
+            if value:
+                self.log(f"   {test_name} degeri (regex): {value}", "SUCCESS")
+                return value
 
             # ============================================================
             # YONTEM 2: Tablo satirlarindan deger bul
@@ -6086,34 +5571,14 @@ class HYPAutomation:
             tests_without_value = []
 
             for remaining in remaining_names:
-                remaining_lower = remaining.lower().strip()
-                found_value = None
-
-                # Eski degerler icinde bu testi ara
-                for test_name, test_value in old_values.items():
-                    test_lower = test_name.lower().strip()
-
-                    # Tam eslesme (EN GUVENILIR)
-                    if test_lower == remaining_lower:
-                        found_value = test_value
-                        break
-
-                    # non-HDL vs HDL OZEL DURUMU (KRITIK!)
-                    # remaining="non-HDL" ise, sadece "non-HDL" veya "non-hdl" eslesmeli
-                    # remaining="HDL" ise, "non-HDL" veya "non-hdl" eslesmeMELI
-                    if 'non' in remaining_lower:
-                        # remaining non-HDL ise, test_name de non icermeli
-                        if 'non' not in test_lower:
-                            continue
-                    else:
-                        # remaining HDL ise, test_name non icerMEMELI
-                        if 'hdl' in remaining_lower and 'non' in test_lower:
-                            continue
-
-                    # Kismi eslesme (dikkatli kullan)
-                    if remaining_lower in test_lower or test_lower in remaining_lower:
-                        found_value = test_value
-                        break
+                # Eski degerler icinde bu testi ara: once tam eslesme, sonra
+                # non-HDL / HDL kuralli kismi eslesme (tetkik_scanner.same_test)
+                found_value = old_values.get(TEST_MATCHER.canonical(remaining) or remaining)
+                if found_value is None:
+                    for test_name, test_value in old_values.items():
+                        if same_test(remaining, test_name):
+                            found_value = test_value
+                            break
 
                 if found_value and found_value != '-':
                     tests_to_enter[remaining] = found_value
@@ -6125,7 +5590,7 @@ class HYPAutomation:
                     # Cache'den dene (fallback)
                     if hasattr(self, '_cached_checkbox_data') and self._cached_checkbox_data:
                         for cached_name, cached_value in self._cached_checkbox_data.items():
-                            if remaining_lower in cached_name.lower() or cached_name.lower() in remaining_lower:
+                            if same_test(remaining, cached_name):
                                 tests_to_enter[remaining] = cached_value
                                 self.log(f"   {remaining}: {cached_value} (cache'den)", "DEBUG")
                                 break
@@ -6267,11 +5732,8 @@ class HYPAutomation:
 
                             if test_name_normalized in parent_text:
                                 # HDL vs non-HDL kontrolu
-                                if 'hdl' in test_name_normalized:
-                                    is_looking_for_non = 'non' in test_name_normalized
-                                    row_has_non = 'non' in parent_text
-                                    if is_looking_for_non != row_has_non:
-                                        continue
+                                if not hdl_compatible(test_name_normalized, parent_text):
+                                    continue
 
                                 input_type = inp.get_attribute('type') or ''
                                 if input_type not in ['date', 'hidden', 'checkbox', 'radio']:
@@ -6661,8 +6123,10 @@ class HYPAutomation:
         return True
 
 
-    def _close_dialogs(self) -> bool:
+    def _close_dialogs(self, snap: PageSnapshot = None) -> bool:
         """Acik dialoglari kapat"""
+        if snap is not None and snap.ok and not has_tamam_dialog(snap):
+            return False
         try:
             tamam = self.driver.find_element(By.XPATH, "//button[contains(., 'Tamam')]")
             if tamam.is_displayed():
@@ -6697,12 +6161,9 @@ class HYPAutomation:
 
         text_lower = text.lower()
 
-        # Türkçe karakter normalizasyonu (İ -> i, ı -> i)
-        text_normalized = text_lower.replace('i̇', 'i').replace('ı', 'i')
-
         # 1. "İlk fırsatta" kontrolü - HEMEN YAP
         # Not: "fırsatta" kelimesi yeterli çünkü sadece bu bağlamda kullanılıyor
-        if "firsatta" in text_normalized or "fırsatta" in text_lower:
+        if "FIRSATTA" in normalize_tr(text):
             self.log(f"   'İlk fırsatta' bulundu - YAPILABILIR", "DEBUG")
             return True
 
@@ -6913,80 +6374,108 @@ class HYPAutomation:
                 break
 
             card = yapilabilir[0]
-            self.log(f"Sol panel kartı işleniyor: {card['hyp_tip']}")
-
-            # Karta tıkla - hastalık sayfasına git
-            try:
-                self.js_click(card["element"])
-                time.sleep(1.5)  # Sayfa yuklenene kadar bekle (arttirildi)
-                self.log(f"   URL: {self.driver.current_url}", "DEBUG")
-            except:
-                self.log("Sol panel kartına tıklanamadı!", "WARNING")
-                break
-
-            # Tarama/İzlem başlat - birkaç deneme yap
-            started = False
-            for attempt in range(5):  # 3 -> 5 deneme
-                if self._start_process():
-                    started = True
-                    break
-                time.sleep(0.8)  # Buton yuklenmesi icin bekle (arttirildi)
 
-            if not started:
-                self.log("Sol panel - Başlat butonu bulunamadı!", "WARNING")
+            # Paralel modda hedef slotu ayır (diğer tarayıcılar doldurduysa atla)
+            if not self._reserve_target(card["hyp_tip"]):
                 islenen_kartlar.add(card["hyp_tip"])
                 continue
 
-            time.sleep(0.3)
+            slot_open = True  # ayrilan hedef slotu commit/release edilmedi
+            outcome = "fail"
+            card_start = time.time()
+            main_page, self._flow_last_page = self._flow_last_page, ""
+            try:
+                self.log(f"Sol panel kartı işleniyor: {card['hyp_tip']}")
 
-            # Modüle göre işle
-            hyp_tip = card["hyp_tip"]
-            success = False
+                # Karta tıkla - hastalık sayfasına git
+                try:
+                    self.js_click(card["element"])
+                    self.waiter.settled("sidebar_kart", legacy=1.5)  # Sayfa yuklenene kadar bekle
+                    self.log(f"   URL: {self.driver.current_url}", "DEBUG")
+                except:
+                    self.log("Sol panel kartına tıklanamadı!", "WARNING")
+                    self._release_target(card["hyp_tip"])
+                    slot_open = False
+                    break
 
-            if "DIY" in hyp_tip:
-                success = self._process_diyabet()
-            elif "HT" in hyp_tip:
-                success = self._process_hipertansiyon()
-            elif "OBE" in hyp_tip:
-                success = self._process_obezite()
-            elif "KVR" in hyp_tip:
-                success = self._process_kvr()
-            elif "YAS" in hyp_tip:
-                success = self._process_yasli()
+                # Tarama/İzlem başlat - birkaç deneme yap
+                started = False
+                for attempt in range(5):  # 3 -> 5 deneme
+                    if self._start_process():
+                        started = True
+                        break
+                    time.sleep(0.8)  # Buton yuklenmesi icin bekle (arttirildi)
 
-            islenen_kartlar.add(hyp_tip)
+                if not started:
+                    self.log("Sol panel - Başlat butonu bulunamadı!", "WARNING")
+                    self._release_target(card["hyp_tip"])
+                    slot_open = False
+                    islenen_kartlar.add(card["hyp_tip"])
+                    continue
 
-            if success:
-                islenen += 1
-                self.session_stats["basarili"] += 1
-                self.increment_completed(hyp_tip)
+                time.sleep(0.3)
 
-                # ============================================================
-                # CANLI İLERLEME GÜNCELLEMESİ - GUI'ye bildir (sidebar kartları için)
-                # ============================================================
-                if self.on_hyp_success_callback:
-                    try:
-                        self.on_hyp_success_callback(hyp_tip, self.current_patient_name)
-                    except Exception as e:
-                        self.log(f"GUI callback hatası (sidebar): {e}", "DEBUG")
+                # Modüle göre işle
+                hyp_tip = card["hyp_tip"]
+                success = False
+
+                if "DIY" in hyp_tip:
+                    success = self._process_diyabet()
+                elif "HT" in hyp_tip:
+                    success = self._process_hipertansiyon()
+                elif "OBE" in hyp_tip:
+                    success = self._process_obezite()
+                elif "KVR" in hyp_tip:
+                    success = self._process_kvr()
+                elif "YAS" in hyp_tip:
+                    success = self._process_yasli()
 
-                # ============================================================
-                # KVR HEDEF AŞIMI KONTROLÜ
-                # HT_IZLEM zorunlu olarak KVR_IZLEM yapıyor, hedef aşıldıysa sil
-                # ============================================================
-                if hyp_tip == "KVR_IZLEM" and self.is_kvr_target_reached():
-                    self.check_and_handle_kvr_overflow(self.current_patient_name)
-            else:
-                self.session_stats["basarisiz"] += 1
-                # Başarısız HYP'yi kaydet
-                self.failed_hyps.append({
-                    "hasta": self.current_patient_name or "Bilinmeyen",
-                    "hyp_tip": hyp_tip,
-                    "hyp_ad": card.get("baslik", hyp_tip),
-                    "neden": "Protokol tamamlanamadı"
-                })
+                islenen_kartlar.add(hyp_tip)
 
-            time.sleep(1)
+                if success:
+                    outcome = "ok"
+                    islenen += 1
+                    self.session_stats["basarili"] += 1
+                    self.increment_completed(hyp_tip)
+                    slot_open = False
+
+                    # ============================================================
+                    # CANLI İLERLEME GÜNCELLEMESİ - GUI'ye bildir (sidebar kartları için)
+                    # ============================================================
+                    if self.on_hyp_success_callback:
+                        try:
+                            self.on_hyp_success_callback(hyp_tip, self.current_patient_name)
+                        except Exception as e:
+                            self.log(f"GUI callback hatası (sidebar): {e}", "DEBUG")
+
+                    # ============================================================
+                    # KVR HEDEF AŞIMI KONTROLÜ
+                    # HT_IZLEM zorunlu olarak KVR_IZLEM yapıyor, hedef aşıldıysa sil
+                    # ============================================================
+                    if hyp_tip == "KVR_IZLEM" and self.is_kvr_target_reached():
+                        self.check_and_handle_kvr_overflow(self.current_patient_name)
+                else:
+                    self.session_stats["basarisiz"] += 1
+                    self._release_target(hyp_tip)
+                    slot_open = False
+                    # Başarısız HYP'yi kaydet
+                    self.failed_hyps.append({
+                        "hasta": self.current_patient_name or "Bilinmeyen",
+                        "hyp_tip": hyp_tip,
+                        "hyp_ad": card.get("baslik", hyp_tip),
+                        "neden": "Protokol tamamlanamadı"
+                    })
+            finally:
+                # Kart islenirken hata olursa slot diger tarayicilar icin bosa cikar
+                if slot_open:
+                    self._release_target(card["hyp_tip"])
+                # Zincir kartlari da sure/basari modeline girsin (scheduler.TimingModel)
+                seconds = time.time() - card_start
+                self._chain_seconds += seconds
+                self._card_event(card["hyp_tip"], outcome, seconds)
+                self._flow_last_page = main_page
+
+            self.waiter.settled("sidebar_sonu", legacy=1)
 
         return islenen
 
@@ -7111,6 +6600,120 @@ class HYPAutomation:
             self.log("   UYARI: Sayfa hala ozet'te!", "WARNING")
             return False
 
+    # ============================================================
+    # HASTA ÖN TARAMASI (work_plan.py)
+    # ============================================================
+    def _scan_patient_cards(self):
+        """
+        Açık hasta sayfasındaki kartlar ve sol panel, TEK execute_script ile.
+        Returns: (cache TC anahtarı, [{"hyp_tip", "yapilabilir", ...}])
+        """
+        data = self.driver.execute_script(CARD_SCAN_JS) or {}
+        cards = []
+        for text in data.get("cards") or []:
+            info = self._analyze_card(text, None)
+            if info:
+                cards.append(info)
+        for box in data.get("sidebar") or []:
+            text = box.get("text") or ""
+            hyp_tip = sidebar_hyp_type(box.get("cls"), text)
+            if hyp_tip:
+                islem_tipi = "IZLEM" if hyp_tip.endswith("_IZLEM") else "TARAMA"
+                cards.append({"hyp_tip": hyp_tip, "yapilabilir": self._check_date_threshold(text, islem_tipi)})
+        return cache_key(data.get("tc") or ""), cards
+
+    def plan_patients(self, patients: List[Dict]) -> List[Dict]:
+        """
+        İşlemeden önce iş planı çıkar (config.PRESCREEN_MODE).
+        İşi olmayan hastalar atlanır (atlanan sayılır), kalanlar kalan hedefi
+        en çok kapatandan başlayarak sıralanır.
+        """
+        mode = getattr(config, "PRESCREEN_MODE", "auto")
+        # Geçmiş kart süreleri (event_log) - sıralama ve tahmini bitiş için
+        self._timing_model = TimingModel.load()
+        planner = WorkPlanner(
+            self.get_remaining_target, self.is_hyp_already_processed,
+            self.enabled_hyp_types, self.session_completed.keys(),
+            model=self._timing_model, time_budget=time_budget_seconds(),
+        )
+        entries = [PlanEntry(p, cache_key(p.get("tc_mask", ""))) for p in patients]
+        candidates = planner.prefilter(entries)
+
+        # Kart taraması her aday için bir arama + açma maliyetinde; sadece hedef
+        # kısıtlıyken (sıralama önemliyken) yapılır
+        total_remaining = planner.total_remaining()
+        scan = bool(candidates) and (mode == "on" or (mode == "auto" and total_remaining < len(candidates)))
+        if scan:
+            self.log(f"🔎 Ön tarama: {len(candidates)} hasta, kalan hedef {total_remaining}")
+            for entry in candidates:
+                if self.should_stop:
+                    break
+                try:
+                    # Açılamayan hasta taranmamış kalır, normal sırada işlenir
+                    if self._open_patient(entry.name):
+                        tc, cards = self._scan_patient_cards()
+                        planner.apply_scan(entry, tc, cards)
+                except Exception as e:
+                    self.log(f"   Ön tarama hatası ({entry.name}): {str(e)[:60]}", "DEBUG")
+
+        ordered = planner.order(entries)
+        skipped = [e for e in entries if e.skip_reason]
+        for entry in skipped:
+            self.session_stats["atlanan"] += 1
+            self._event("patient", patient=patient_key(entry.name), outcome="prescreen_skip", seconds=0)
+            if entry.skip_reason != TARGETS_DONE:
+                self.skipped_hyp_notifications.append({
+                    'hasta': entry.name or 'Bilinmiyor',
+                    'tc': entry.tc,
+                    'hyp_tip': 'TÜMÜ',
+                    'sebep': f"Ön tarama: {entry.skip_reason}",
+                    'tarih': time.strftime('%d.%m.%Y %H:%M')
+                })
+        for entry in ordered:
+            if entry.scanned:
+                entry.patient["plan_hyp"] = sorted(entry.gains)
+
+        if skipped or scan:
+            self.log(f"📝 İş planı: {len(ordered)} hasta işlenecek, {len(skipped)} hasta atlandı"
+                     f"{' (kartlar tarandı)' if scan else ''}")
+        self._event("plan", patients=len(patients), planned=len(ordered), skipped=len(skipped), scanned=scan)
+        planned = [e.patient for e in ordered]
+        projection = self.report_schedule(planned)
+        if projection and projection["remaining"]:
+            self.log(f"🕒 Tahmin: {projection['closes']}/{projection['remaining']} hedef, "
+                     f"~{projection['seconds'] / 60:.0f} dk (bitiş {projection['finish'].strftime('%H:%M')})")
+        return planned
+
+    def report_schedule(self, patients: List[Dict], parallel: int = 1) -> Optional[Dict]:
+        """Kalan plan için tahmini bitişi hesapla ve GUI'ye bildir"""
+        if self._timing_model is None:
+            return None
+        remaining = {
+            t: self.get_remaining_target(t) for t in self.session_completed
+            if self.enabled_hyp_types is None or t in self.enabled_hyp_types
+        }
+        projection = project(patients, remaining, self._timing_model, parallel=parallel)
+        if self.on_schedule_callback:
+            try:
+                self.on_schedule_callback(projection)
+            except Exception as e:
+                self.log(f"Tahmin callback hatası: {e}", "DEBUG")
+        return projection
+
+    def plan_still_useful(self, patient: Dict) -> bool:
+        """
+        Ön taramada bulunan HYP'lerden hedefi hâlâ açık olan var mı?
+        (Önceki hastalar hedefi doldurduysa hasta hiç açılmadan atlanır)
+        """
+        planned = patient.get("plan_hyp")
+        if not planned:
+            return True
+        if any(self.get_remaining_target(t) > 0 for t in planned):
+            return True
+        self.log(f"⏭️ {patient.get('ad_soyad', '')}: planlanan HYP hedefleri doldu ({', '.join(planned)}), ATLANIYOR")
+        self.session_stats["atlanan"] += 1
+        return False
+
     # ============================================================
     # ANA ÇALIŞTIRICI
     # ============================================================
@@ -7133,6 +6736,13 @@ class HYPAutomation:
             if not self.setup_driver(debug_mode):
                 return
 
+            # Ilac/gebe listeleri giris beklenirken arka planda yuklensin
+            if DRUG_ANALYZER_AVAILABLE:
+                analyzer_registry.warm_up()
+
+            self._session_started = time.time()
+            self._event("session_start", mode="debug" if debug_mode else "normal")
+
             if not self.login(auto_pin=auto_pin):
                 return
 
@@ -7166,6 +6776,15 @@ class HYPAutomation:
             if not patients:
                 self.log("Hasta bulunamadı!", "ERROR")
                 return
+
+            self._screen_pregnancies(patients)
+
+            # Ön tarama: işi olmayan hastaları ele, kalan hedefi en çok kapatanları öne al
+            patients = self.plan_patients(patients)
+            if not patients:
+                self.log("Ön tarama sonrası işlenecek hasta kalmadı.", "WARNING")
+                self._print_summary()
+                return
             
             # Her hastayı işle
             for idx, patient in enumerate(patients, 1):
@@ -7176,8 +6795,10 @@ class HYPAutomation:
                 self.log(f"\n{'='*50}")
                 self.log(f"📋 HASTA {idx}/{len(patients)}")
                 self.log(f"{'='*50}")
-                
-                self.process_patient(patient['ad_soyad'])
+
+                if self.plan_still_useful(patient):
+                    self.process_patient(patient['ad_soyad'])
+                self.report_schedule(patients[idx:])
             
             # Özet
             self._print_summary()
@@ -7188,6 +6809,12 @@ class HYPAutomation:
 
     def _print_summary(self):
         """İşlem özetini yazdır"""
+        self._event(
+            "session_end",
+            basarili=self.session_stats['basarili'], basarisiz=self.session_stats['basarisiz'],
+            atlanan=self.session_stats['atlanan'],
+            seconds=round(time.time() - self._session_started, 1),
+        )
         self.log("\n" + "="*50)
         self.log("📊 OTURUM ÖZETİ")
         self.log("="*50)
@@ -7195,6 +6822,23 @@ class HYPAutomation:
         self.log(f"❌ Başarısız: {self.session_stats['basarisiz']}")
         self.log(f"⏭️ Atlanan: {self.session_stats['atlanan']}")
         self.log(f"⏱️ Toplam Süre: {self.session_stats['toplam_sure']:.1f}sn")
+        wait_lines = self.waiter.summary_lines()
+        if wait_lines:
+            self.log(f"⏳ Bekleme kazancı (eski sabit beklemelere göre): {self.waiter.total_saved():.1f}sn")
+            for line in wait_lines:
+                self.log(f"   {line}", "DEBUG")
+        flow_lines = self.flow_stats.summary_lines()
+        if flow_lines:
+            self.log("🧭 Protokol adım süreleri:")
+            for line in flow_lines:
+                self.log(f"   {line}", "DEBUG")
+        if self.profiler is not None:
+            path = self.profiler.finish()
+            self.log("🔬 WebDriver profili (en pahalı metotlar):")
+            for line in self.profiler.summary_lines():
+                self.log(f"   {line}")
+            if path:
+                self.log(f"   Flame graph: {path}")
         self.log("="*50)
 
     def stop(self):
@@ -7239,6 +6883,10 @@ class HYPAutomation:
         """Başarısız HYP'leri döndür (protokol hatası vb.)"""
         return self.failed_hyps.copy()
 
+    def get_profile_summary(self) -> list:
+        """WebDriver profil özeti (profil kapalıysa boş liste)"""
+        return self.profiler.summary_lines() if self.profiler is not None else []
+
     def print_cancelled_hyps(self):
         """
         Oturum sonunda iptal edilen HYP'leri kullaniciya bildir.
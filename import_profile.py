@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+ACILIS IMPORT OLCUMU
+====================
+`python -X importtime -c "import gui_app"` ciktisini ayri bir surecte alir,
+modulleri toplam (cumulative) sureye gore siralar ve butceyi kontrol eder.
+
+Kontroller (biri asilirsa cikis kodu 1, build_release oncesi calistirilabilir):
+- Toplam import suresi IMPORT_BUDGET_MS'i asmamali
+- DEFERRED_MODULES pencere acilirken yuklenmemeli (Selenium, pandas,
+  hyp_automation, hyp_calculator, guncelleme indirme/urllib); bunlar ilk
+  kullanildiklari yerde import edilir
+
+Kullanim:
+    python import_profile.py [modul] [--repeat 3] [--top 25] [--budget-ms 700]
+
+Ayni kontroller tests/test_import_budget.py ile pytest'te de calisir.
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, NamedTuple, Tuple
+
+
+# Pencere acilmadan once gereken importlarin toplam butcesi (ms)
+IMPORT_BUDGET_MS = 700
+# Acilista yuklenmemesi gereken moduller (ilk kullanimda import edilir)
+DEFERRED_MODULES = (
+    "selenium",
+    "webdriver_manager",
+    "pandas",
+    "hyp_automation",
+    "drug_analyzer",
+    "hyp_calculator",
+    "urllib.request",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def run_importtime(module: str) -> Tuple[List[ImportEntry], str]:
+    """Modulu temiz bir surecte import et; (kayitlar, hata metni)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    entries, other = [], []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            entries.append(ImportEntry(m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+        elif not line.startswith("import time:"):
+            other.append(line)
+    error = "\n".join(other[-5:]) if proc.returncode != 0 else ""
+    return entries, error
+
+
+def total_ms(entries: List[ImportEntry]) -> float:
+    """En ust seviye importlarin toplami (ic ice olanlar zaten icinde)"""
+    return sum(e.cumulative_us for e in entries if e.depth == 0) / 1000
+
+
+def deferred_violations(entries: List[ImportEntry], target: str = "") -> List[str]:
+    """Yuklenmis ertelenen moduller (olculen modulun kendisi haric)"""
+    loaded = {e.module for e in entries}
+    return [
+        name for name in DEFERRED_MODULES
+        if name != target and any(m == name or m.startswith(name + ".") for m in loaded)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acilis import suresi ve butce kontrolu")
+    parser.add_argument("module", nargs="?", default="gui_app")
+    parser.add_argument("--repeat", type=int, default=3, help="En iyi sonuc icin tekrar sayisi")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    best: List[ImportEntry] = []
+    best_total = None
+    for _ in range(max(1, args.repeat)):
+        entries, error = run_importtime(args.module)
+        if error:
+            print(f"HATA: '{args.module}' import edilemedi:\n{error}")
+            return 2
+        total = total_ms(entries)
+        if best_total is None or total < best_total:
+            best, best_total = entries, total
+
+    print(f"import {args.module}: {best_total:.0f} ms ({len(best)} modul, en iyi {args.repeat} deneme)")
+    print()
+    print(f"{'toplam ms':>10} {'kendi ms':>9}  modul")
+    # Ayni modul ic ice birden fazla gorunmez; en pahali N tanesi
+    by_module: Dict[str, ImportEntry] = {e.module: e for e in best}
+    for e in sorted(by_module.values(), key=lambda e: e.cumulative_us, reverse=True)[:args.top]:
+        print(f"{e.cumulative_us / 1000:>10.1f} {e.self_us / 1000:>9.1f}  {e.module}")
+    print()
+
+    failed = False
+    violations = deferred_violations(best, args.module)
+    if violations:
+        failed = True
+        print(f"❌ Acilista yuklenmemesi gereken moduller: {', '.join(violations)}")
+    if best_total > args.budget_ms:
+        failed = True
+        print(f"❌ Butce asildi: {best_total:.0f} ms > {args.budget_ms:.0f} ms")
+    if not failed:
+        print(f"✅ Butce icinde ({best_total:.0f} / {args.budget_ms:.0f} ms), ertelenen moduller yuklenmedi")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+GUI LOG HATTI
+=============
+HYPAutomation (worker thread) -> sinirli kuyruk -> Tk timer'i ile toplu bosaltma.
+
+- LogQueue.put() her thread'den cagrilabilir; sadece deque.append yapar
+  (GIL altinda atomik, kilit yok). Kuyruk doluysa en eski mesaj duser.
+- Tk tarafi drain() ile mesajlari toplu alir; her mesaj bir kez
+  siniflandirilir (classify_log), widget'a toplu eklenir.
+- Detayli log kaydi da sinirli bir halka tampondur (detailed_log_buffer).
+"""
+
+from collections import deque, namedtuple
+from typing import List, Optional
+
+
+# Kuyrukta bekleyebilecek en fazla mesaj (GUI takilirsa en eskiler duser)
+QUEUE_LIMIT = 5000
+# Detayli log penceresinde tutulan en fazla satir
+DETAILED_LOG_LIMIT = 20000
+# Log widget'inda tutulan en fazla satir (fazlasi bastan silinir)
+WIDGET_MAX_LINES = 3000
+# Timer araligi ve her turda islenecek en fazla mesaj
+DRAIN_INTERVAL_MS = 100
+DRAIN_BATCH = 500
+
+
+LogEntry = namedtuple("LogEntry", ["message", "minimal", "tag"])
+
+
+# Minimal modda gosterilecek mesajlar
+_IMPORTANT_PATTERNS = (
+    "HASTA", "ISLENIYOR:", "İŞLENİYOR:",  # Hasta başlangıcı
+    "tamamlandı", "TAMAMLANDI",  # Başarılı
+    "başarısız", "BASARISIZ", "HATA", "hata",  # Hata
+    "✅", "❌", "⚠️",  # Emoji ile işaretli önemli mesajlar
+    "OTOMASYON", "OTURUM",  # Özet mesajları
+    "==", "──",  # Ayraçlar
+    "iptal", "İPTAL", "atlanan", "ATLANAN",  # İptal/atlama
+    "Eksik", "eksik",  # Eksik tetkik
+    "protokolü başladı", "protokolü tamamlandı",  # Protokol
+    "🎯", "📊", "📋", "🏁",  # Önemli emojiler
+)
+_HEADER_MARKS = ("═", "╔", "╠", "╚", "==")
+
+
+def _shown_in_minimal(message: str) -> bool:
+    # Debug mesajları her zaman gizle
+    if "🔧" in message or "[DEBUG]" in message:
+        return False
+    # Teknik detaylar gizle
+    if "Adım" in message and "Sayfa=" in message:
+        return False
+    if "Bulunan butonlar" in message:
+        return False
+    lower = message.lower()
+    if "xpath" in lower or "element" in lower:
+        return False
+    if "tiklan" in lower and "buton" not in lower:
+        return False
+    # Önemli pattern içeriyorsa göster
+    return any(p in message for p in _IMPORTANT_PATTERNS)
+
+
+def _tag_for(message: str, level: Optional[str]) -> Optional[str]:
+    if "✅" in message:
+        return "hyp_complete" if "tamamlandı" in message.lower() else "success"
+    if "❌" in message or level == "ERROR":
+        return "error"
+    if "⚠️" in message or level == "WARNING":
+        return "warning"
+    if "🔧" in message:
+        return "debug"
+    if "ISLENIYOR:" in message or "İŞLENİYOR:" in message:
+        return "patient"
+    if any(mark in message for mark in _HEADER_MARKS):
+        return "header"
+    return None
+
+
+def classify_log(message: str, level: Optional[str] = None) -> LogEntry:
+    """Mesaji bir kez siniflandir: minimal modda gorunur mu, hangi renk etiketi"""
+    minimal = _shown_in_minimal(message) or level in ("ERROR", "WARNING")
+    return LogEntry(message, minimal, _tag_for(message, level))
+
+
+class LogQueue:
+    """Coklu ureticili, tek tuketicili sinirli log kuyrugu"""
+
+    def __init__(self, limit: int = QUEUE_LIMIT):
+        self._items = deque(maxlen=limit)
+        self.dropped = 0
+
+    def put(self, message: str, level: Optional[str] = None):
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append((message, level))
+
+    def drain(self, limit: int = DRAIN_BATCH) -> List[tuple]:
+        batch = []
+        pop = self._items.popleft
+        for _ in range(limit):
+            try:
+                batch.append(pop())
+            except IndexError:
+                break
+        return batch
+
+    def __len__(self):
+        return len(self._items)
+
+
+def detailed_log_buffer(limit: int = DETAILED_LOG_LIMIT) -> deque:
+    """Detayli loglar icin halka tampon (list gibi append/len/iter/clear)"""
+    return deque(maxlen=limit)
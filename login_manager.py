@@ -20,6 +20,9 @@ import hmac
 from pathlib import Path
 from datetime import datetime
 
+from history_store import MONTH_PAGE_SIZE, open_history_store
+from settings_writer import SettingsWriter
+
 
 # ============================================================
 # GUVENLI PIN SIFRELEME MODULU
@@ -307,6 +310,19 @@ class SettingsManager:
         # Alternatif kayıt konumu (eğer ana konum çalışmazsa)
         self.backup_settings_file = os.path.join(os.path.expanduser("~"), "hyp_settings_backup.json")
         self.settings = self.load_settings()
+        self._writer = SettingsWriter(self.settings_file, self.backup_settings_file)
+        # Oturum/ay gecmisi ayri SQLite dosyasinda (history_store) - ilk kullanimda acilir
+        self._history = None
+        if "session_history" in self.settings or "monthly_history" in self.settings:
+            if self.history.migrate_from_settings(self.settings):
+                self.save_settings()
+
+    @property
+    def history(self):
+        """Gecmis deposu (hyp_history.db)"""
+        if self._history is None:
+            self._history = open_history_store(self.settings_file, os.path.dirname(self.backup_settings_file))
+        return self._history
     
     def load_settings(self):
         """Ayarlari yukle"""
@@ -331,38 +347,17 @@ class SettingsManager:
         return self.get_default_settings()
     
     def save_settings(self):
-        """Ayarlari kaydet"""
-        import time
-        max_retries = 3
-        retry_delay = 0.5
-
-        # Önce ana konuma kaydetmeyi dene
-        for attempt in range(max_retries):
-            try:
-                with open(self.settings_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.settings, f, indent=4, ensure_ascii=False)
-                return True
-            except PermissionError:
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    # Ana konum başarısız, yedek konumu dene
-                    break
-            except Exception as e:
-                print(f"HATA: Ayarlar kaydedilemedi: {e}")
-                break
+        """
+        Ayarlari kaydet (bloklamaz).
+        Yazma arka plandaki SettingsWriter'a birakilir; kisa surede gelen
+        kayitlar tek yazmada birlestirilir. Diske yazilmasini beklemek icin flush().
+        """
+        self._writer.schedule(self.settings)
+        return True
 
-        # Ana konum başarısız olduysa, yedek konuma kaydet
-        try:
-            with open(self.backup_settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-            print(f"BILGI: Ayarlar yedek konuma kaydedildi: {self.backup_settings_file}")
-            return True
-        except Exception as e:
-            print(f"UYARI: Ayarlar hiçbir konuma kaydedilemedi: {e}")
-            print("Ayarlar bu oturum için sadece bellekte tutulacak.")
-            return False
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Bekleyen ayar yazmasini hemen diske yaz (cikista cagrilir)"""
+        return self._writer.flush(timeout)
     
     def get_default_settings(self):
         """Varsayilan ayarlar"""
@@ -421,26 +416,14 @@ class SettingsManager:
         return self.settings.get("current_counts", self.get_default_settings()["current_counts"])
 
     def save_current_counts(self, counts):
-        """Yapilan sayilari kaydet - hem current_counts hem de monthly_history guncellenir"""
+        """Yapilan sayilari kaydet - hem current_counts hem de aylik gecmis guncellenir"""
         self.settings["current_counts"] = counts
 
-        # Aylik gecmisi de guncelle
+        # Aylik gecmisi de guncelle (sadece bu ayin satiri)
         current_month = get_current_month_key()
-        if "monthly_history" not in self.settings:
-            self.settings["monthly_history"] = {}
-
-        if current_month not in self.settings["monthly_history"]:
+        if not self.history.update_month(current_month, current_counts=counts):
             # Yeni ay icin kayit olustur
-            self.settings["monthly_history"][current_month] = {
-                "targets": self.get_monthly_targets(),
-                "current_counts": counts,
-                "deferred_counts": self.get_deferred_counts(),
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M")
-            }
-        else:
-            # Mevcut ay kaydini guncelle
-            self.settings["monthly_history"][current_month]["current_counts"] = counts
-            self.settings["monthly_history"][current_month]["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+            self.history.put_month(current_month, self.get_monthly_targets(), counts, self.get_deferred_counts())
 
         self.save_settings()
 
@@ -449,14 +432,11 @@ class SettingsManager:
         return self.settings.get("deferred_counts", self.get_default_settings()["deferred_counts"])
 
     def save_deferred_counts(self, counts):
-        """Devreden sayilari kaydet - hem deferred_counts hem de monthly_history guncellenir"""
+        """Devreden sayilari kaydet - hem deferred_counts hem de aylik gecmis guncellenir"""
         self.settings["deferred_counts"] = counts
 
-        # Aylik gecmisi de guncelle
-        current_month = get_current_month_key()
-        if "monthly_history" in self.settings and current_month in self.settings["monthly_history"]:
-            self.settings["monthly_history"][current_month]["deferred_counts"] = counts
-            self.settings["monthly_history"][current_month]["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Aylik gecmisi de guncelle (bu ay kaydi varsa)
+        self.history.update_month(get_current_month_key(), deferred_counts=counts)
 
         self.save_settings()
 
@@ -466,12 +446,9 @@ class SettingsManager:
 
     def save_session_history(self, stats: dict, cancelled_list: list = None, skipped_list: list = None, failed_list: list = None):
         """
-        Tamamlanan oturum verilerini gecmise kaydet.
-        En fazla 50 oturum saklanir (eski olanlar silinir).
+        Tamamlanan oturum verilerini gecmise kaydet (hyp_history.db).
+        En fazla SESSION_HISTORY_LIMIT oturum saklanir (eski olanlar silinir).
         """
-        if "session_history" not in self.settings:
-            self.settings["session_history"] = []
-        
         session_data = {
             "tarih": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "basarili": stats.get("basarili", 0),
@@ -483,23 +460,27 @@ class SettingsManager:
             "basarisizlar": failed_list or []
         }
         
-        # Basa ekle (en yeni en ustte)
-        self.settings["session_history"].insert(0, session_data)
-        
-        # En fazla 50 oturum sakla
-        if len(self.settings["session_history"]) > 50:
-            self.settings["session_history"] = self.settings["session_history"][:50]
-        
-        self.save_settings()
+        self.history.add_session(session_data)
+
+    def get_session_history(self, limit: int = None, offset: int = 0, details: bool = True) -> list:
+        """
+        Kayitli oturum gecmisini dondur (en yeni en ustte).
+        limit/offset ile sayfa sayfa okunur; details=False iken hasta listeleri
+        yuklenmez (get_session ile tek oturum alinir).
+        """
+        return self.history.get_sessions(limit, offset, details)
+
+    def count_session_history(self) -> int:
+        """Kayitli oturum sayisi"""
+        return self.history.count_sessions()
 
-    def get_session_history(self) -> list:
-        """Kayitli oturum gecmisini dondur."""
-        return self.settings.get("session_history", [])
+    def get_session(self, session_id: int):
+        """Tek oturumun tum verisi (hasta listeleri dahil)"""
+        return self.history.get_session(session_id)
 
     def clear_session_history(self):
         """Tum oturum gecmisini temizle."""
-        self.settings["session_history"] = []
-        self.save_settings()
+        self.history.clear_sessions()
 
     # ============================================================
     # KVR HEDEF ASIMI AYARI (KALICI)
@@ -542,6 +523,29 @@ class SettingsManager:
         self.settings["waist_optimization"] = value
         self.save_settings()
 
+    # ============================================================
+    # PARALEL TARAYICI SAYISI
+    # ============================================================
+
+    def get_parallel_workers(self) -> int:
+        """
+        Otomasyonda paralel calisacak Chrome oturumu sayisi.
+        Returns: 1 (tek tarayici, varsayilan) - 4
+        """
+        try:
+            return max(1, min(4, int(self.settings.get("parallel_workers", 1))))
+        except (TypeError, ValueError):
+            return 1
+
+    def set_parallel_workers(self, value: int):
+        """
+        Paralel Chrome oturumu sayisini kaydet.
+        Args:
+            value: 1 - 4
+        """
+        self.settings["parallel_workers"] = max(1, min(4, int(value)))
+        self.save_settings()
+
     # Eski fonksiyonlar - geriye uyumluluk icin (artik kullanilmiyor)
     def get_kvr_overflow_decision(self):
         """DEPRECATED: Artik get_auto_delete_kvr() kullaniliyor"""
@@ -557,28 +561,26 @@ class SettingsManager:
 
     def get_monthly_history(self):
         """Tum aylarin gecmisini al"""
-        return self.settings.get("monthly_history", {})
+        return dict(self.history.get_months())
+
+    def get_monthly_history_page(self, limit: int, offset: int = 0) -> list:
+        """Aylar en yeniden eskiye, sayfa sayfa: [(ay_anahtari, ay_verisi), ...]"""
+        return self.history.get_months(limit, offset)
+
+    def count_monthly_history(self) -> int:
+        """Kayitli ay sayisi"""
+        return self.history.count_months()
 
     def get_month_data(self, month_key=None):
         """Belirli bir ayin verilerini al"""
         if month_key is None:
             month_key = get_current_month_key()
 
-        history = self.get_monthly_history()
-        return history.get(month_key, None)
+        return self.history.get_month(month_key)
 
     def save_month_data(self, month_key, targets, current_counts, deferred_counts):
         """Belirli bir ayin verilerini kaydet"""
-        if "monthly_history" not in self.settings:
-            self.settings["monthly_history"] = {}
-
-        self.settings["monthly_history"][month_key] = {
-            "targets": targets,
-            "current_counts": current_counts,
-            "deferred_counts": deferred_counts,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
-        self.save_settings()
+        self.history.put_month(month_key, targets, current_counts, deferred_counts)
 
     def is_current_month_configured(self):
         """Mevcut ay icin hedefler girilmis mi?"""
@@ -594,13 +596,7 @@ class SettingsManager:
 
     def get_last_configured_month(self):
         """En son yapilandirilan ayi bul"""
-        history = self.get_monthly_history()
-        if not history:
-            return None
-
-        # Tarihe gore sirala, en son ayi dondur
-        sorted_months = sorted(history.keys(), reverse=True)
-        return sorted_months[0] if sorted_months else None
+        return self.history.latest_month_key()
 
     def migrate_current_to_month(self):
         """Mevcut verileri ay bazli sisteme tasi (ilk kurulum icin)"""
@@ -618,9 +614,10 @@ class SettingsManager:
         # Ay bazli sisteme kaydet
         self.save_month_data(current_month, targets, current, deferred)
 
-    def calculate_month_performance(self, month_key):
-        """Bir ayin performansini hesapla"""
-        month_data = self.get_month_data(month_key)
+    def calculate_month_performance(self, month_key, month_data=None):
+        """Bir ayin performansini hesapla (month_data verilirse tekrar okunmaz)"""
+        if month_data is None:
+            month_data = self.get_month_data(month_key)
         if not month_data:
             return None
 
@@ -707,8 +704,10 @@ class SettingsManager:
         self.save_settings()
     
     def clear_settings(self):
-        """Ayarlari sifirla"""
+        """Ayarlari sifirla (gecmis dahil)"""
         self.settings = self.get_default_settings()
+        self.history.clear_sessions()
+        self.history.clear_months()
         self.save_settings()
 
 
@@ -1318,10 +1317,12 @@ class MonthlyHistoryWindow(ctk.CTkToplevel):
         self.scroll_frame = ctk.CTkScrollableFrame(self, corner_radius=10)
         self.scroll_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
-        # Ay verilerini al ve sirala
-        history = self.settings_manager.get_monthly_history()
+        # Ay verilerini sayfa sayfa yukle (yeniden eskiye)
+        self.total_months = self.settings_manager.count_monthly_history()
+        self.loaded_months = 0
+        self.more_button = None
 
-        if not history:
+        if not self.total_months:
             ctk.CTkLabel(
                 self.scroll_frame,
                 text="Henuz gecmis ay verisi yok.\nOtomasyon calistikca veriler burada gorunecek.",
@@ -1329,13 +1330,7 @@ class MonthlyHistoryWindow(ctk.CTkToplevel):
                 text_color="#95a5a6"
             ).pack(pady=50)
         else:
-            # Tarihe gore sirala (yeniden eskiye)
-            sorted_months = sorted(history.keys(), reverse=True)
-
-            for month_key in sorted_months:
-                perf = self.settings_manager.calculate_month_performance(month_key)
-                if perf:
-                    self.create_month_card(perf)
+            self.load_more_months()
 
         # Kapat butonu
         ctk.CTkButton(
@@ -1349,6 +1344,31 @@ class MonthlyHistoryWindow(ctk.CTkToplevel):
             hover_color="#2c3e50"
         ).pack(pady=15)
 
+    def load_more_months(self):
+        """Sonraki sayfadaki aylarin kartlarini ekle"""
+        if self.more_button is not None:
+            self.more_button.destroy()
+            self.more_button = None
+
+        page = self.settings_manager.get_monthly_history_page(MONTH_PAGE_SIZE, self.loaded_months)
+        self.loaded_months += len(page)
+        for month_key, month_data in page:
+            perf = self.settings_manager.calculate_month_performance(month_key, month_data)
+            if perf:
+                self.create_month_card(perf)
+
+        if page and self.loaded_months < self.total_months:
+            self.more_button = ctk.CTkButton(
+                self.scroll_frame,
+                text=f"Daha fazla goster ({self.total_months - self.loaded_months})",
+                command=self.load_more_months,
+                height=30,
+                font=ctk.CTkFont(size=12),
+                fg_color="#5d6d7e",
+                hover_color="#4a5a6a"
+            )
+            self.more_button.pack(pady=10)
+
     def create_month_card(self, perf):
         """Bir ay icin kart olustur"""
         card = ctk.CTkFrame(self.scroll_frame, corner_radius=10)
@@ -1982,6 +2002,37 @@ class SettingsWindow(ctk.CTkToplevel):
         if self.settings_manager.get_waist_optimization():
             self.waist_optimization_switch.select()
 
+        # Paralel Tarayıcı Sayısı
+        workers_frame = ctk.CTkFrame(self.automation_section, fg_color="transparent")
+        workers_frame.pack(fill="x", padx=20, pady=10)
+
+        workers_label_frame = ctk.CTkFrame(workers_frame, fg_color="transparent")
+        workers_label_frame.pack(side="left", fill="x", expand=True)
+
+        ctk.CTkLabel(
+            workers_label_frame,
+            text="Paralel tarayıcı sayısı",
+            font=ctk.CTkFont(size=12),
+            anchor="w"
+        ).pack(anchor="w")
+
+        ctk.CTkLabel(
+            workers_label_frame,
+            text="Birden fazla Chrome aynı anda farklı hastaları işler.\nHer tarayıcı için ayrı e-İmza girişi yapılır.",
+            font=ctk.CTkFont(size=10),
+            text_color="#95a5a6",
+            anchor="w",
+            justify="left"
+        ).pack(anchor="w")
+
+        self.parallel_workers_selector = ctk.CTkSegmentedButton(
+            workers_frame,
+            values=["1", "2", "3", "4"],
+            command=self.change_parallel_workers
+        )
+        self.parallel_workers_selector.pack(side="right", padx=10)
+        self.parallel_workers_selector.set(str(self.settings_manager.get_parallel_workers()))
+
         # DİĞER İŞLEMLER BÖLÜMÜ
         self.other_section = ctk.CTkFrame(self.main_frame, corner_radius=10)
         self.other_section.pack(fill="x", pady=10)
@@ -2106,19 +2157,10 @@ class SettingsWindow(ctk.CTkToplevel):
             self.settings_manager.settings["current_counts"] = new_current
             self.settings_manager.settings["deferred_counts"] = new_deferred
 
-            # Ay bazli sisteme de ekle
-            current_month = get_current_month_key()
-            if "monthly_history" not in self.settings_manager.settings:
-                self.settings_manager.settings["monthly_history"] = {}
-
-            self.settings_manager.settings["monthly_history"][current_month] = {
-                "targets": new_targets,
-                "current_counts": new_current,
-                "deferred_counts": new_deferred,
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M")
-            }
+            # Ay bazli sisteme de ekle (gecmis veritabani)
+            self.settings_manager.save_month_data(get_current_month_key(), new_targets, new_current, new_deferred)
 
-            # Tek seferde dosyaya yaz
+            # Ayarlari tek seferde dosyaya yaz
             self.settings_manager.save_settings()
 
             self.save_targets_button.configure(text="✅ Kaydedildi!", fg_color="#2ecc71")
@@ -2160,6 +2202,10 @@ class SettingsWindow(ctk.CTkToplevel):
         value = self.waist_optimization_switch.get()
         self.settings_manager.set_waist_optimization(value)
 
+    def change_parallel_workers(self, value):
+        """Paralel tarayıcı sayısını değiştir"""
+        self.settings_manager.set_parallel_workers(int(value))
+
     def toggle_pin_visibility(self):
         """PIN görünürlüğünü değiştir"""
         if self.pin_visible:
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+normalize_tr MIKRO OLCUMU
+=========================
+Eski str.replace zinciri ile tr_text.normalize_tr'yi ayni metin uzerinde
+karsilastirir ve sonuclarin ayni oldugunu dogrular.
+
+Metin kaynagi:
+- capture_dir verilirse session_capture kayitlarinin gorunen metni
+  (gercek sayfa satirlari)
+- verilmezse istatistik sayfasi / hasta listesi / kart metni ornekleri
+
+Kullanim:
+    python normalize_benchmark.py [capture_dir] [--repeat 20]
+"""
+
+import re
+import sys
+import time
+import argparse
+from typing import List
+
+from tr_text import normalize_tr
+
+
+def legacy_normalize_tr(text: str) -> str:
+    """Eski uygulama (karsilastirma icin birebir kopya)"""
+    if not text:
+        return ""
+    mapping = {
+        'İ': 'I', 'ı': 'I', 'I': 'I', 'i': 'I',
+        'Ş': 'S', 'ş': 'S', 'Ğ': 'G', 'ğ': 'G',
+        'Ü': 'U', 'ü': 'U', 'Ö': 'O', 'ö': 'O',
+        'Ç': 'C', 'ç': 'C',
+        # Bozuk encoding
+        'Ä°': 'I', 'Ä±': 'I', 'Åž': 'S', 'ÅŸ': 'S',
+        'Äž': 'G', 'ÄŸ': 'G', 'Ãœ': 'U', 'Ã¼': 'U',
+        'Ã–': 'O', 'Ã¶': 'O', 'Ã‡': 'C', 'Ã§': 'C',
+    }
+    for tr, en in mapping.items():
+        text = text.replace(tr, en)
+    return text.upper().strip()
+
+
+SAMPLE_LINES = [
+    "Takip İşlemi İstatistikleri", "Hipertansiyon Tarama", "124", "Hipertansiyon İzlem", "87",
+    "Obezite Tarama", "56", "Obezite İzlem (Aile Hekimi)", "31", "Diyabet Tarama", "142",
+    "Diyabet İzlem", "64", "Kardiyovasküler Risk Tarama", "48", "Kardiyovasküler Risk İzlem", "12",
+    "Yaşlı Değerlendirme İzlem", "9", "AYŞE YILMAZ", "Çağrı Öztürk", "ŞÜKRÜ GÜNDOĞDU",
+    "Hipertansiyon İzlem Son: 12.03.2025 Sonraki: İlk fırsatta",
+    "Diyabet Tarama Son: 01.02.2024 Sonraki: 14.11.2025",
+    "Kardiyovasküler Risk Tarama Sonraki Takip Tarihi: 21.10.2025",
+    "Ä°zlem Ã–zet ÅŸablon",
+]
+
+
+def _visible_text(html: str) -> str:
+    html = re.sub(r'(?is)<(script|style)\b.*?</\1>', ' ', html)
+    return re.sub(r'<[^>]+>', '\n', html)
+
+
+def lines_from_capture(capture_dir: str) -> List[str]:
+    from session_capture import load_capture
+    lines = []
+    for entry in load_capture(capture_dir):
+        lines.extend(line.strip() for line in _visible_text(entry["html"]).split('\n') if line.strip())
+    return lines
+
+
+def _time(fn, lines: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            fn(line)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="normalize_tr eski/yeni karsilastirmasi")
+    parser.add_argument("capture_dir", nargs="?")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    lines = lines_from_capture(args.capture_dir) if args.capture_dir else SAMPLE_LINES * 50
+    if not lines:
+        print("Metin bulunamadi")
+        return 1
+
+    mismatches = [line for line in set(lines) if legacy_normalize_tr(line) != normalize_tr(line)]
+    for line in mismatches[:5]:
+        print(f"FARKLI: {line!r}: {legacy_normalize_tr(line)!r} != {normalize_tr(line)!r}")
+
+    uncached = normalize_tr.__wrapped__
+    legacy = _time(legacy_normalize_tr, lines, args.repeat)
+    table = _time(uncached, lines, args.repeat)
+    normalize_tr.cache_clear()
+    cached = _time(normalize_tr, lines, args.repeat)
+
+    calls = len(lines) * args.repeat
+    print(f"{len(lines)} satir x {args.repeat} tekrar ({calls} cagri)")
+    print(f"  eski replace zinciri : {legacy * 1e6 / calls:7.2f} us/cagri")
+    print(f"  translate tablosu    : {table * 1e6 / calls:7.2f} us/cagri  ({legacy / table:.1f}x)")
+    print(f"  translate + LRU      : {cached * 1e6 / calls:7.2f} us/cagri  ({legacy / cached:.1f}x)")
+    print(f"  sonuc farki          : {len(mismatches)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
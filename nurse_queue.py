@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+HEMSIRE KUYRUGU TASIYICISI
+==========================
+Hemsire paneli (hemsire_app.py) TC gonderir, doktor uygulamasi (gui_app.py)
+TC'leri alip isler ve sonucu bildirim olarak geri yollar.
+
+Iki tasiyici (ayni arayuz):
+
+- FolderTransport (varsayilan): paylasimli klasorde <tc>.tc ve
+  <tc>_<saat>.bildirim dosyalari (eski dosya formati aynen korunur).
+  Klasor surekli listelenmez:
+    * watchdog kuruluysa isletim sistemi bildirimi (Windows
+      ReadDirectoryChangesW / Linux inotify) ile aninda uyanir
+    * degilse sadece klasorun degisim zamani (stat) kontrol edilir;
+      bos gecen her kontrolde aralik ikiye katlanir (POLL_MIN -> POLL_MAX),
+      degisiklik gorulunce tekrar POLL_MIN'e doner
+    * her iki durumda da SAFETY_RESCAN saniyede bir tam listeleme yapilir
+      (ag paylasiminda kacan bildirim/ mtime guncellemesi icin)
+- SqliteTransport: klasordeki hyp_queue.db tablolari. Degisiklik kontrolu
+  PRAGMA data_version ile yapilir (listeleme yok). Yerel/hizli klasorler icin;
+  SMB uzerinde SQLite kilitleri guvenilir degildir.
+
+Kullanim:
+    transport = get_transport(folder)           # "folder" veya "sqlite"
+    while aktif:
+        if transport.wait(1.0):
+            tcs = transport.pending_tcs()
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+TC_SUFFIX = ".tc"
+NOTIFICATION_SUFFIX = ".bildirim"
+QUEUE_DB_FILE = "hyp_queue.db"
+
+# Uyarlamali yoklama araliklari (saniye)
+POLL_MIN = 0.1
+POLL_MAX = 1.0
+# Bildirim kacirilmasina karsi tam listeleme araligi (saniye)
+SAFETY_RESCAN = 60.0
+
+
+def is_valid_tc(tc: str) -> bool:
+    return len(tc) == 11 and tc.isdigit()
+
+
+class _AdaptivePoll:
+    """Bos gecen her kontrolde bekleme suresini ikiye katlar"""
+
+    def __init__(self, minimum: float = POLL_MIN, maximum: float = POLL_MAX):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = minimum
+
+    def idle(self) -> float:
+        delay = self.interval
+        self.interval = min(self.interval * 2, self.maximum)
+        return delay
+
+    def reset(self):
+        self.interval = self.minimum
+
+
+# ============================================================
+# KLASOR TASIYICISI
+# ============================================================
+class FolderTransport:
+    """Paylasimli klasorde .tc / .bildirim dosyalari"""
+
+    backend = "folder"
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.listings = 0          # olcum icin: kac kez listelendi
+        self._poll = _AdaptivePoll()
+        self._last_mtime = None
+        self._last_rescan = float('-inf')
+        self._events = None        # watchdog varsa threading.Event
+        self._observer = None
+        self._start_native_watch()
+
+    # ---------------- izleme ----------------
+
+    def _start_native_watch(self):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return
+        if not os.path.isdir(self.folder):
+            return
+
+        events = threading.Event()
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                events.set()
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), self.folder, recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            print(f"[QUEUE] Klasor izleme baslatilamadi, yoklamaya geciliyor: {e}")
+            return
+        self._events = events
+        self._observer = observer
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> bool:
+        """
+        En fazla timeout saniye bekle; klasor degismis olabilirse True.
+        True donunce cagiran listeler (pending_tcs / take_notifications).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now - self._last_rescan >= SAFETY_RESCAN:
+                self._last_rescan = now
+                self._last_mtime = self._mtime()
+                return True
+
+            if self._events is not None:
+                if self._events.wait(max(0.0, deadline - now)):
+                    self._events.clear()
+                    return True
+                return False
+
+            mtime = self._mtime()
+            if mtime != self._last_mtime:
+                self._last_mtime = mtime
+                self._poll.reset()
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._poll.idle(), remaining))
+
+    def _list(self, suffix: str) -> List[str]:
+        if not os.path.isdir(self.folder):
+            return []
+        self.listings += 1
+        return sorted(f for f in os.listdir(self.folder) if f.endswith(suffix))
+
+    def close(self):
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+            self._observer = None
+            self._events = None
+
+    # ---------------- TC kuyrugu ----------------
+
+    def submit_tc(self, tc: str) -> bool:
+        """TC'yi kuyruga ekle. Zaten kuyruktaysa False."""
+        os.makedirs(self.folder, exist_ok=True)
+        tc_file = os.path.join(self.folder, f"{tc}{TC_SUFFIX}")
+        if os.path.exists(tc_file):
+            return False
+        with open(tc_file, 'w', encoding='utf-8') as f:
+            f.write(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        return True
+
+    def pending_tcs(self) -> List[str]:
+        tcs = [f[:-len(TC_SUFFIX)] for f in self._list(TC_SUFFIX)]
+        return [tc for tc in tcs if is_valid_tc(tc)]
+
+    def take_tc(self) -> Optional[str]:
+        """Siradaki TC'yi al ve kuyruktan sil (baska alici aldiysa siradakine gec)"""
+        for tc in self.pending_tcs():
+            try:
+                os.remove(os.path.join(self.folder, f"{tc}{TC_SUFFIX}"))
+            except OSError:
+                continue
+            return tc
+        return None
+
+    # ---------------- bildirimler ----------------
+
+    def send_notification(self, tc: str, notification: Dict):
+        name = f"{tc}_{datetime.now().strftime('%H%M%S')}{NOTIFICATION_SUFFIX}"
+        with open(os.path.join(self.folder, name), 'w', encoding='utf-8') as f:
+            json.dump(notification, f, ensure_ascii=False, indent=2)
+
+    def take_notifications(self) -> List[Dict]:
+        """Bekleyen bildirimleri oku ve sil (bozuk dosyalar da silinir)"""
+        notifications = []
+        for filename in self._list(NOTIFICATION_SUFFIX):
+            filepath = os.path.join(self.folder, filename)
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    notifications.append(json.load(f))
+            except Exception as e:
+                print(f"Bildirim okuma hatasi: {e}")
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+        return notifications
+
+
+# ============================================================
+# SQLITE TASIYICISI
+# ============================================================
+_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tc_queue (
+    tc TEXT PRIMARY KEY,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tc TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+class SqliteTransport:
+    """Klasordeki hyp_queue.db uzerinden kuyruk (yerel klasorler icin)"""
+
+    backend = "sqlite"
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.listings = 0
+        os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(folder, QUEUE_DB_FILE), timeout=5,
+            check_same_thread=False, isolation_level=None,
+        )
+        self._conn.executescript(_QUEUE_SCHEMA)
+        self._poll = _AdaptivePoll()
+        self._last_version = None
+
+    def _data_version(self) -> int:
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            version = self._data_version()
+            if version != self._last_version:
+                self._last_version = version
+                self._poll.reset()
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._poll.idle(), remaining))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def submit_tc(self, tc: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO tc_queue (tc, created) VALUES (?, ?)",
+                (tc, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+        return cur.rowcount > 0
+
+    def pending_tcs(self) -> List[str]:
+        self.listings += 1
+        with self._lock:
+            rows = self._conn.execute("SELECT tc FROM tc_queue ORDER BY created, tc").fetchall()
+        return [row[0] for row in rows if is_valid_tc(row[0])]
+
+    def take_tc(self) -> Optional[str]:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute("SELECT tc FROM tc_queue ORDER BY created, tc LIMIT 1").fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("DELETE FROM tc_queue WHERE tc = ?", (row[0],))
+        return row[0]
+
+    def send_notification(self, tc: str, notification: Dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO notifications (tc, payload) VALUES (?, ?)",
+                (tc, json.dumps(notification, ensure_ascii=False)),
+            )
+
+    def take_notifications(self) -> List[Dict]:
+        self.listings += 1
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                rows = self._conn.execute("SELECT id, payload FROM notifications ORDER BY id").fetchall()
+                if rows:
+                    self._conn.execute("DELETE FROM notifications WHERE id <= ?", (rows[-1][0],))
+        notifications = []
+        for _, payload in rows:
+            try:
+                notifications.append(json.loads(payload))
+            except ValueError as e:
+                print(f"Bildirim okuma hatasi: {e}")
+        return notifications
+
+
+# ============================================================
+# PAYLASILAN TASIYICILAR
+# ============================================================
+TRANSPORTS = {
+    "folder": FolderTransport,
+    "sqlite": SqliteTransport,
+}
+
+_transports: Dict[tuple, object] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(folder: str, backend: str = "folder"):
+    """Ayni klasor/tasiyici icin process genelinde tek nesne"""
+    key = (os.path.abspath(folder), backend)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = TRANSPORTS.get(backend, FolderTransport)(folder)
+            _transports[key] = transport
+        return transport
+
+
+def drop_transport(folder: str, backend: str = "folder"):
+    """Klasor degisince eski tasiyiciyi kapat"""
+    key = (os.path.abspath(folder), backend)
+    with _transports_lock:
+        transport = _transports.pop(key, None)
+    if transport is not None:
+        transport.close()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+PROTOKOL AKIS MOTORU
+====================
+Diyabet / HT / Obezite / KVR / Yasli protokollerinin ortak dongusu.
+
+Her protokol bir FlowSpec tablosu ile tanimlanir:
+    sayfa siniflandirici -> sayfa kurali (log mesaji + handler) -> sonuc
+
+Handler sonuclari:
+    NEXT  - adim tamam, adim sonu beklemesi + sonraki adim
+    RETRY - adim sonu beklemesi olmadan tekrar (ornegin Izlem Baslat tiklandi)
+    DONE  - protokol tamamlandi (hemen cikilir, bekleme yok)
+    FAIL  - HYP basarisiz (hemen cikilir)
+
+Takilma kontrolu, maksimum adim, adim sureleri ve sayfa bazli sure
+butceleri (config.PAGE_TIME_BUDGETS) tek yerde, bu modulde uygulanir.
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import config
+
+
+NEXT = "NEXT"
+RETRY = "RETRY"
+DONE = "DONE"
+FAIL = "FAIL"
+
+
+@dataclass
+class PageRule:
+    """Tek bir sayfa icin yapilacak is"""
+    message: str
+    handler: Callable[["FlowRun"], str]
+
+
+@dataclass
+class FlowSpec:
+    """Bir HYP protokolunun tablo halinde tanimi"""
+    name: str
+    classify: Callable
+    pages: Dict[str, PageRule]
+    fallback: PageRule
+    success_message: str = ""
+    max_steps: int = 25
+    # None: takilma kontrolu yok
+    max_same_page: Optional[int] = 3
+    # "page": sayfa adi, "url": tam URL ayni kalirsa takilma sayilir
+    stuck_key: str = "page"
+    # True: ilk adimdan once de adim sonu beklemesi yapilir
+    settle_first: bool = False
+    on_stuck: Optional[Callable[["FlowRun"], None]] = None
+    on_max_steps: Optional[Callable[["FlowRun"], None]] = None
+
+
+@dataclass
+class FlowRun:
+    """Calisan akisin durumu (handler'lara verilir)"""
+    spec: FlowSpec
+    step: int = 0
+    page: str = ""
+    snap: object = None
+    last_key: Optional[str] = None
+    same_count: int = 0
+    # Handler'larin akis boyunca tuttugu durum (ornegin "izlem_baslat_checked")
+    data: Dict = field(default_factory=dict)
+
+
+class FlowTelemetry:
+    """Akis/sayfa bazli adim sureleri (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # "Diyabet/TETKIK" -> {"count", "total", "max", "over"}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, flow: str, page: str, seconds: float, over_budget: bool):
+        key = f"{flow}/{page}"
+        with self._lock:
+            s = self.stats.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0, "over": 0})
+            s["count"] += 1
+            s["total"] += seconds
+            s["max"] = max(s["max"], seconds)
+            if over_budget:
+                s["over"] += 1
+
+    def summary_lines(self, top: int = 8) -> List[str]:
+        """En cok sure harcanan sayfalar"""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: kv[1]["total"], reverse=True)
+        lines = []
+        for key, s in items[:top]:
+            avg = s["total"] / s["count"] if s["count"] else 0
+            lines.append(
+                f"{key}: {int(s['count'])}x, toplam {s['total']:.1f}sn, "
+                f"ort {avg:.1f}sn, max {s['max']:.1f}sn, bütçe aşımı {int(s['over'])}"
+            )
+        return lines
+
+
+def page_budget(flow: str, page: str) -> float:
+    """config.PAGE_TIME_BUDGETS: "Akis.SAYFA" > "SAYFA" > "default" """
+    budgets = getattr(config, "PAGE_TIME_BUDGETS", {})
+    for key in (f"{flow}.{page}", page, "default"):
+        if key in budgets:
+            return budgets[key]
+    return 0
+
+
+class PageFlow:
+    """
+    FlowSpec'i HYPAutomation uzerinde calistirir.
+
+    Kullanilan automation arayuzu: log, keep_alive, _begin_step, waiter,
+    flow_stats ve (varsa) _event (olay kaydi)
+    """
+
+    def __init__(self, automation, spec: FlowSpec):
+        self.auto = automation
+        self.spec = spec
+        # Son calisma (cagiran, akis bittikten sonra hangi sayfada kalindigini okur)
+        self.last_run: Optional[FlowRun] = None
+
+    def _record_step(self, run: FlowRun, result: str, seconds: float = 0.0):
+        record = getattr(self.auto, "_event", None)
+        if record is not None:
+            record("step", flow=self.spec.name, page=run.page, result=result, seconds=round(seconds, 2))
+
+    def _settle(self):
+        self.auto.waiter.settled("adim_sonu", legacy=0.5)
+
+    def _is_stuck(self, run: FlowRun) -> bool:
+        """Ayni sayfa/URL art arda max_same_page kez gelirse True"""
+        key = run.snap.url if self.spec.stuck_key == "url" else run.page
+        if key == run.last_key:
+            run.same_count += 1
+        else:
+            run.same_count = 0
+            run.last_key = key
+        limit = self.spec.max_same_page
+        return limit is not None and run.same_count >= limit
+
+    def _timed(self, run: FlowRun, rule: PageRule) -> str:
+        start = time.time()
+        result = rule.handler(run)
+        elapsed = time.time() - start
+
+        budget = page_budget(self.spec.name, run.page)
+        over = bool(budget) and elapsed > budget
+        if over:
+            self.auto.log(
+                f"   ⏱️ {run.page} adımı {elapsed:.1f}sn sürdü (bütçe {budget:.0f}sn)", "WARNING"
+            )
+        stats = getattr(self.auto, "flow_stats", None)
+        if stats is not None:
+            stats.record(self.spec.name, run.page, elapsed, over)
+        self._record_step(run, result, elapsed)
+        return result
+
+    def run(self) -> bool:
+        spec = self.spec
+        run = FlowRun(spec=spec)
+        self.last_run = run
+
+        if spec.settle_first:
+            self._settle()
+
+        while run.step < spec.max_steps:
+            run.step += 1
+            self.auto.keep_alive()
+            run.snap = self.auto._begin_step()
+            run.page = spec.classify(run.snap)
+            self.auto.log(f"   Adım {run.step}: Sayfa={run.page}", "DEBUG")
+
+            if self._is_stuck(run):
+                self.auto.log(
+                    f"   ⚠️ {run.page} sayfasında {spec.max_same_page} kez takılı kaldı, HYP atlanıyor",
+                    "ERROR",
+                )
+                self._record_step(run, "STUCK")
+                if spec.on_stuck:
+                    spec.on_stuck(run)
+                return False
+
+            rule = spec.pages.get(run.page, spec.fallback)
+            if rule.message:
+                self.auto.log(rule.message.format(page=run.page))
+
+            result = self._timed(run, rule)
+            if result == DONE:
+                if spec.success_message:
+                    self.auto.log(spec.success_message, "SUCCESS")
+                return True
+            if result == FAIL:
+                return False
+            if result != RETRY:
+                self._settle()
+
+        self._record_step(run, "MAX_STEPS")
+        if spec.on_max_steps:
+            spec.on_max_steps(run)
+        return False
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+SAYFA SNAPSHOT MODULU
+=====================
+Tek bir execute_script cagrisi ile sayfanin kompakt bir ozetini alir:
+URL, gorunur metin (buyuk harf), buton etiketleri, checkbox durumlari,
+acik dialog metinleri ve giris ekrani isaretleri.
+
+Sayfa tanima (_detect_*_page), popup ve dialog kontrolleri bu snapshot
+uzerinde saf Python ile yapilir; boylece her protokol adimi 5-10 yerine
+tek WebDriver round trip'i ile siniflandirilir.
+"""
+
+from typing import Dict, List, Optional
+
+
+# Sayfadan kompakt ozet cikaran script (tek round trip)
+SNAPSHOT_JS = """
+var maxText = arguments[0] || 60000;
+function visible(el) {
+    if (!el) return false;
+    var r = el.getBoundingClientRect();
+    if (r.width === 0 && r.height === 0) return false;
+    var st = window.getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none';
+}
+var body = document.body;
+var text = body ? (body.innerText || '') : '';
+var buttons = [];
+document.querySelectorAll('button').forEach(function(b) {
+    buttons.push({
+        text: (b.innerText || '').trim(),
+        cls: b.className || '',
+        visible: visible(b),
+        enabled: !b.disabled
+    });
+});
+var checkboxes = [];
+document.querySelectorAll('.ui-chkbox-box').forEach(function(box) {
+    var row = box.closest('p-checkbox') || box.parentElement;
+    var label = '';
+    var lbl = row ? row.querySelector('label, .ui-chkbox-label') : null;
+    if (lbl) label = (lbl.innerText || '').trim();
+    checkboxes.push({
+        label: label,
+        checked: box.classList.contains('ui-state-active'),
+        disabled: box.classList.contains('ui-state-disabled')
+    });
+});
+var dialogs = [];
+document.querySelectorAll('.ui-dialog, .p-dialog, [role="dialog"], .modal-content').forEach(function(d) {
+    if (visible(d)) dialogs.push((d.innerText || '').trim().slice(0, 1000));
+});
+var links = [];
+document.querySelectorAll('a').forEach(function(a) {
+    var t = (a.innerText || '').trim();
+    if (t && t.length < 60) links.push(t);
+});
+return {
+    url: location.href,
+    text: text.slice(0, maxText),
+    buttons: buttons,
+    checkboxes: checkboxes,
+    dialogs: dialogs,
+    links: links,
+    flags: {
+        pin_input: !!document.getElementById('popupPinCode_Password'),
+        login_button: !!document.querySelector('#header div div button'),
+        eimza_tab: !!document.querySelector("a[href='#e-imza']"),
+        user_name: !!document.querySelector("span[class*='user-name']")
+    }
+};
+"""
+
+
+class PageSnapshot:
+    """execute_script sonucunu saran, sorgulari saf Python ile yapan nesne"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.url: str = data.get("url") or ""
+        self.raw_text: str = data.get("text") or ""
+        # get_page_text() ile ayni: buyuk harf
+        self.text: str = self.raw_text.upper()
+        self.buttons: List[Dict] = data.get("buttons") or []
+        self.checkboxes: List[Dict] = data.get("checkboxes") or []
+        self.dialogs: List[str] = data.get("dialogs") or []
+        self.links: List[str] = data.get("links") or []
+        self.flags: Dict[str, bool] = data.get("flags") or {}
+        self.ok = bool(data)
+
+    # ============================================================
+    # SORGULAR
+    # ============================================================
+    def url_has(self, *parts: str) -> bool:
+        return any(p in self.url for p in parts)
+
+    def text_has(self, *needles: str) -> bool:
+        return any(n in self.text for n in needles)
+
+    @property
+    def button_texts(self) -> List[str]:
+        """Gorunur ve bos olmayan buton etiketleri"""
+        return [b["text"] for b in self.buttons if b.get("visible") and b.get("text")]
+
+    def has_button(self, *labels: str, visible_only: bool = True) -> bool:
+        """Etiketi verilen parcalardan birini iceren buton var mi"""
+        for b in self.buttons:
+            if visible_only and not b.get("visible"):
+                continue
+            txt = b.get("text", "")
+            if any(label in txt for label in labels):
+                return True
+        return False
+
+    def has_button_exact(self, label: str, visible_only: bool = False) -> bool:
+        for b in self.buttons:
+            if visible_only and not b.get("visible"):
+                continue
+            if b.get("text", "").strip() == label:
+                return True
+        return False
+
+    def has_button_class(self, cls: str) -> bool:
+        return any(cls in b.get("cls", "") for b in self.buttons)
+
+    def has_link(self, label: str) -> bool:
+        return any(label in t for t in self.links)
+
+    @property
+    def has_dialog(self) -> bool:
+        return bool(self.dialogs)
+
+    def dialog_has(self, *needles: str) -> bool:
+        for d in self.dialogs:
+            up = d.upper()
+            if any(n in up for n in needles):
+                return True
+        return False
+
+    @property
+    def active_checkbox_count(self) -> int:
+        return sum(1 for c in self.checkboxes if c.get("checked"))
+
+
+# ============================================================
+# SAYFA SINIFLANDIRICILARI (saf Python)
+# ============================================================
+def classify_login_state(snap: PageSnapshot, hyp_host: str) -> str:
+    """_detect_current_page ile ayni sonuclar"""
+    url = snap.url.lower()
+    if hyp_host not in url:
+        return "other"
+    if "dashboard" in url:
+        return "dashboard"
+    if snap.has_link("Hasta Listesi") or snap.has_link("Fizik Muayene") or snap.flags.get("user_name"):
+        return "hyp_loggedin"
+    if snap.flags.get("pin_input"):
+        return "pin_popup"
+    if snap.flags.get("login_button") or snap.flags.get("eimza_tab"):
+        return "login_page"
+    return "other"
+
+
+def classify_diy(snap: PageSnapshot) -> str:
+    url = snap.url
+    if '/anamnez' in url:
+        return "ANAMNEZ"
+    elif '/risk' in url:
+        return "RISK"
+    elif '/kansekeri' in url or '/kan-sekeri' in url:
+        return "KAN_SEKERI"
+    elif '/semptom' in url:
+        return "SEMPTOM"
+    elif '/kirilganlik' in url or '/frailty' in url:
+        return "KIRILGANLIK"
+    elif '/tani' in url:
+        return "TANI"
+    elif '/yasamtarzi' in url or '/yasam' in url:
+        return "YASAM"
+    elif '/tetkik' in url:
+        return "TETKIK"
+    elif '/ilac' in url:
+        return "ILAC"
+    elif '/ozet' in url:
+        return "OZET"
+
+    if snap.text_has("SONLANDIRILMASI"):
+        return "OZET"
+    elif snap.text_has("KAN ŞEKERİ", "KAN SEKERI"):
+        return "KAN_SEKERI"
+    elif snap.text_has("RİSK FAKTÖR", "RISK FAKTOR"):
+        return "RISK"
+    elif snap.text_has("KIRILGANLIK"):
+        return "KIRILGANLIK"
+    elif snap.text_has("İLAÇ TEDAVİSİ", "ILAC TEDAVISI"):
+        return "ILAC"
+    elif snap.text_has("SEMPTOM"):
+        return "SEMPTOM"
+    elif snap.text_has("TANI KONULMASI"):
+        return "TANI"
+    elif snap.text_has("YAŞAM TARZI", "YASAM TARZI"):
+        return "YASAM"
+    return "UNKNOWN"
+
+
+def classify_ht(snap: PageSnapshot) -> str:
+    url = snap.url
+    if '/anamnez' in url:
+        return "ANAMNEZ"
+    elif '/tetkik' in url:
+        return "TETKIK"
+    elif '/kvh' in url and 'hesaplama' in url:
+        return "KVH_HESAPLAMA"
+    elif '/kvh' in url and 'tani' in url:
+        return "KVH_TANI"
+    elif '/kvh' in url and 'hedef' in url:
+        return "HEDEF"
+    elif '/ilac' in url:
+        return "ILAC"
+    elif '/yasamtarzi' in url:
+        return "YASAM_TARZI"
+    elif '/ozet' in url:
+        return "OZET"
+
+    if snap.text_has("SONLANDIRILMASI"):
+        return "OZET"
+    elif snap.text_has("TANI KONULMASI"):
+        return "TANI"
+    return "UNKNOWN"
+
+
+def classify_obe(snap: PageSnapshot) -> str:
+    url = snap.url
+    # ONEMLI: /ilac kontrolu /tetkik'ten once olmali!
+    if '/obezite/anamnez' in url or '/anamnez' in url:
+        return "ANAMNEZ"
+    elif '/obezite/oyku' in url or '/oyku' in url:
+        return "OYKU"
+    elif '/obezite/tetkik' in url:
+        return "TETKIK"
+    elif '/obezite/ilac' in url or '/ilac' in url:
+        return "ILAC"
+    elif '/obezite/eslikedenhastalik' in url or '/evre' in url:
+        return "EVRE"
+    elif '/obezite/yasamtarzi' in url or '/yasamtarzi' in url:
+        return "YASAM"
+    elif '/tetkik' in url:
+        return "TETKIK"
+    elif '/ozet' in url:
+        return "OZET"
+
+    if snap.text_has("SONLANDIRILMASI"):
+        return "OZET"
+    elif snap.text_has("EDMONTON", "EŞLİK EDEN", "ESLIK EDEN"):
+        return "EVRE"
+    elif snap.text_has("AĞIRLIK ARTIŞINA", "AGIRLIK ARTISINA"):
+        return "ILAC"
+    elif snap.text_has("TETKİK", "TETKIK"):
+        return "TETKIK"
+    elif snap.text_has("OBEZİTE ÖYKÜSÜ", "OBEZITE OYKUSU"):
+        return "OYKU"
+    elif snap.text_has("YAŞAM TARZI", "YASAM TARZI"):
+        return "YASAM"
+    elif snap.text_has("ANAMNEZ"):
+        return "ANAMNEZ"
+    return "UNKNOWN"
+
+
+def classify_yasli(snap: PageSnapshot) -> str:
+    url = snap.url
+    if '/anamnezfizikmuayene' in url or '/anamnez' in url:
+        return "ANAMNEZ"
+    elif '/ilac' in url:
+        return "ILAC"
+    elif '/birincilgeriatrik' in url or '/geriatrik' in url:
+        return "GERIATRIK"
+    elif '/tetkik' in url:
+        return "TETKIK"
+    elif '/geneldurumdegerlendirme' in url or '/planlama' in url:
+        return "PLANLAMA"
+    elif '/ozet' in url:
+        return "OZET"
+
+    if snap.text_has("SONLANDIRILMASI", "ÖZET"):
+        return "OZET"
+    elif snap.text_has("GERİATRİK", "GERIATRIK"):
+        return "GERIATRIK"
+    elif snap.text_has("İLAÇ", "ILAC"):
+        return "ILAC"
+    elif snap.text_has("TETKİK"):
+        return "TETKIK"
+    elif snap.text_has("PLANLAMA", "İZLEM SIKLIĞI"):
+        return "PLANLAMA"
+    return "UNKNOWN"
+
+
+def has_killable_popup(snap: PageSnapshot) -> bool:
+    """kill_popups'in kapatacagi bir Hayir/kapat butonu var mi"""
+    return (
+        snap.has_button_exact("Hayır")
+        or snap.has_button("Hayır", visible_only=False)
+        or snap.has_button_class("ui-dialog-titlebar-close")
+    )
+
+
+def has_tamam_dialog(snap: PageSnapshot) -> bool:
+    """_close_dialogs'un kapatacagi gorunur 'Tamam' butonu var mi"""
+    return snap.has_button("Tamam")
+
+
+def is_error_page(snap: PageSnapshot) -> bool:
+    head = snap.text[:500]
+    return "INVALID-API-RESP" in head or "HATA KODU" in head
+
+
+def classify_kvr(snap: PageSnapshot) -> str:
+    """KVR: OZET / TETKIK, digerleri URL'nin son parcasi (ANAMNEZ, HESAPLAMA, ...)"""
+    url = snap.url
+    if '/ozet' in url or snap.text_has("SONLANDIRILMASI"):
+        return "OZET"
+    if '/tetkik' in url:
+        return "TETKIK"
+    last = url.split('?')[0].rstrip('/').split('/')[-1]
+    return last.upper() if last else "UNKNOWN"
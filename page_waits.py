@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+OLAY TABANLI BEKLEME MODULU
+===========================
+Sabit time.sleep() yerine somut bir kosul saglanana kadar bekler ve
+kosul saglandigi anda doner.
+
+Kosullar:
+- url_change:     URL degisti (veya sayfa degismeden durulastı)
+- angular_stable: Angular zone stabil (getAllAngularTestabilities)
+- network_idle:   Bekleyen XHR/fetch yok ve son istekten beri "quiet" sn gecti
+- dom_settled:    Son DOM mutasyonundan beri "quiet" sn gecti
+- element:        CSS selector sayfada var
+
+Her bekleme tek bir execute_script ile probe edilir; probe script'i
+sayfaya XHR/fetch sayaci ve MutationObserver'i bir kez yerlestirir.
+
+Telemetri: Her bekleme noktasi icin gercek bekleme suresi ile eski sabit
+bekleme (legacy) karsilastirilir, kazanilan sure raporlanir.
+
+config.EVENT_WAITS_ENABLED = False ise eski sabit beklemeler kullanilir.
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+import config
+
+
+# Sayfaya bir kez yerlesen sayaclar + durum raporu (tek round trip)
+_PROBE_JS = """
+var w = window.__hypWait;
+if (!w) {
+    w = window.__hypWait = {pending: 0, lastNet: Date.now(), lastMut: Date.now()};
+    try {
+        var origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function() {
+            w.pending++; w.lastNet = Date.now();
+            this.addEventListener('loadend', function() {
+                w.pending = Math.max(0, w.pending - 1); w.lastNet = Date.now();
+            });
+            return origSend.apply(this, arguments);
+        };
+    } catch (e) {}
+    try {
+        if (window.fetch) {
+            var origFetch = window.fetch;
+            window.fetch = function() {
+                w.pending++; w.lastNet = Date.now();
+                var done = function() { w.pending = Math.max(0, w.pending - 1); w.lastNet = Date.now(); };
+                var p = origFetch.apply(this, arguments);
+                p.then(done, done);
+                return p;
+            };
+        }
+    } catch (e) {}
+    try {
+        new MutationObserver(function() { w.lastMut = Date.now(); }).observe(
+            document.documentElement,
+            {childList: true, subtree: true, attributes: true, characterData: true}
+        );
+    } catch (e) {}
+}
+var stable = true;
+try {
+    if (window.getAllAngularTestabilities) {
+        stable = window.getAllAngularTestabilities().every(function(t) { return t.isStable(); });
+    }
+} catch (e) {}
+var now = Date.now();
+var sel = arguments[0];
+return {
+    url: location.href,
+    ready: document.readyState,
+    stable: stable,
+    pending: w.pending,
+    netQuiet: (now - w.lastNet) / 1000.0,
+    domQuiet: (now - w.lastMut) / 1000.0,
+    found: sel ? document.querySelector(sel) !== null : null
+};
+"""
+
+
+class PageWaiter:
+    """Kosul bazli bekleme + eski sabit beklemelere gore telemetri"""
+
+    def __init__(self, driver_getter: Callable, log_callback=None):
+        self._driver_getter = driver_getter
+        self.log_callback = log_callback
+        self._lock = threading.Lock()
+        # nokta adi -> {"count", "waited", "legacy", "timeouts"}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        # Her bekleme bittikten sonra cagrilir: on_wait(nokta_adi) (oturum kaydi icin)
+        self.on_wait: Optional[Callable[[str], None]] = None
+
+    # ============================================================
+    # YARDIMCILAR
+    # ============================================================
+    @staticmethod
+    def _cfg(condition: str) -> dict:
+        defaults = {"timeout": 5.0, "poll": 0.05, "quiet": 0.15}
+        cfg = dict(defaults)
+        cfg.update(getattr(config, "WAIT_CONDITIONS", {}).get(condition, {}))
+        return cfg
+
+    @staticmethod
+    def enabled() -> bool:
+        return getattr(config, "EVENT_WAITS_ENABLED", True)
+
+    def probe(self, selector: str = None) -> Optional[dict]:
+        """Sayfa durumunu tek execute_script ile oku (hata olursa None)"""
+        try:
+            driver = self._driver_getter()
+            if driver is None:
+                return None
+            return driver.execute_script(_PROBE_JS, selector)
+        except Exception:
+            return None
+
+    def _record(self, name: str, waited: float, legacy: float, timed_out: bool):
+        with self._lock:
+            s = self.stats.setdefault(name, {"count": 0, "waited": 0.0, "legacy": 0.0, "timeouts": 0})
+            s["count"] += 1
+            s["waited"] += waited
+            s["legacy"] += legacy
+            if timed_out:
+                s["timeouts"] += 1
+        if self.on_wait is not None:
+            try:
+                self.on_wait(name)
+            except Exception:
+                pass
+
+    def _is_settled(self, p: dict, quiet: float) -> bool:
+        return (
+            p.get("ready") == "complete"
+            and p.get("stable", True)
+            and p.get("pending", 0) == 0
+            and p.get("netQuiet", 0) >= quiet
+            and p.get("domQuiet", 0) >= quiet
+        )
+
+    def until(self, name: str, predicate: Callable[[dict], bool], condition: str,
+              legacy: float, selector: str = None, timeout: float = None) -> bool:
+        """
+        predicate(probe) True olana kadar bekle.
+
+        Args:
+            name: Telemetri icin bekleme noktasi adi
+            condition: WAIT_CONDITIONS anahtari (timeout/poll/quiet)
+            legacy: Bu noktada onceden kullanilan sabit bekleme (sn)
+        Returns:
+            True: Kosul saglandi, False: Zaman asimi veya probe yapilamadi
+        """
+        if not self.enabled():
+            time.sleep(legacy)
+            self._record(name, legacy, legacy, False)
+            return True
+
+        cfg = self._cfg(condition)
+        timeout = cfg["timeout"] if timeout is None else timeout
+        start = time.time()
+        deadline = start + timeout
+
+        while True:
+            p = self.probe(selector)
+            if p is None:
+                # Probe calismiyorsa (alert acik, driver yok) eski davranisa don
+                remaining = legacy - (time.time() - start)
+                if remaining > 0:
+                    time.sleep(remaining)
+                self._record(name, time.time() - start, legacy, True)
+                return False
+            if predicate(p):
+                self._record(name, time.time() - start, legacy, False)
+                return True
+            if time.time() >= deadline:
+                self._record(name, time.time() - start, legacy, True)
+                self.log(f"   [WAIT] {name}: {timeout:.1f}sn zaman asimi", "DEBUG")
+                return False
+            time.sleep(cfg["poll"])
+
+    def log(self, message: str, level: str = "INFO"):
+        if self.log_callback:
+            try:
+                self.log_callback(message, level)
+            except Exception:
+                pass
+
+    # ============================================================
+    # KOSULLAR
+    # ============================================================
+    def settled(self, name: str, legacy: float) -> bool:
+        """Angular stabil + ag bosta + DOM durgun"""
+        quiet = self._cfg("dom_settled")["quiet"]
+        return self.until(name, lambda p: self._is_settled(p, quiet), "dom_settled", legacy)
+
+    def angular_stable(self, name: str, legacy: float) -> bool:
+        return self.until(name, lambda p: p.get("ready") == "complete" and p.get("stable", True),
+                          "angular_stable", legacy)
+
+    def network_idle(self, name: str, legacy: float) -> bool:
+        quiet = self._cfg("network_idle")["quiet"]
+        return self.until(name, lambda p: p.get("pending", 0) == 0 and p.get("netQuiet", 0) >= quiet,
+                          "network_idle", legacy)
+
+    def element(self, name: str, css: str, legacy: float) -> bool:
+        """CSS selector sayfada gorunene kadar bekle"""
+        return self.until(name, lambda p: bool(p.get("found")), "element", legacy, selector=css)
+
+    def url_change(self, name: str, url_before: str, legacy: float) -> bool:
+        """
+        URL degisene kadar bekle. Sayfa URL degismeden durulasirsa
+        (ornegin validasyon hatasi) beklemeyi bitirir.
+
+        Returns:
+            True: URL degisti, False: degismedi
+        """
+        quiet = self._cfg("url_change")["quiet"]
+        state = {"changed": False}
+
+        def predicate(p):
+            if p.get("url") != url_before:
+                state["changed"] = True
+                return True
+            return self._is_settled(p, quiet)
+
+        self.until(name, predicate, "url_change", legacy)
+        return state["changed"]
+
+    def after_navigation(self, name: str, url_before: str, legacy: float) -> bool:
+        """Tiklama sonrasi: URL degisimi + yeni sayfanin durulasmasi"""
+        if not self.enabled():
+            return self.until(name, lambda p: True, "url_change", legacy)
+        changed = self.url_change(name + ":url", url_before, 0.0)
+        self.settled(name, legacy)
+        return changed
+
+    # ============================================================
+    # TELEMETRI
+    # ============================================================
+    def total_saved(self) -> float:
+        with self._lock:
+            return sum(s["legacy"] - s["waited"] for s in self.stats.values())
+
+    def summary_lines(self, top: int = 8) -> List[str]:
+        """Bekleme noktalarini kazanilan sureye gore sirali ozetle"""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: kv[1]["legacy"] - kv[1]["waited"], reverse=True)
+        lines = []
+        for name, s in items[:top]:
+            lines.append(
+                f"{name}: {int(s['count'])}x, bekleme {s['waited']:.1f}sn "
+                f"(eski {s['legacy']:.1f}sn), zaman asimi {int(s['timeouts'])}"
+            )
+        return lines
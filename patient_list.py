@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+HASTA LISTESI TOPLU OKUMA
+=========================
+Fizik Muayene listesindeki satirlari sayfa basina TEK execute_script ile okur.
+
+Eskiden her .list-item satiri icin ayri row.text cagrisi yapiliyordu (satir
+basina bir WebDriver round trip) ve sadece ilk sayfa (en fazla 100 satir)
+okunuyordu; cok gunluk secimlerde sonraki sayfalardaki hastalar kayboluyordu.
+
+Simdi:
+- PATIENT_PAGE_JS gorunen sayfanin tum satir metinlerini ve paginator
+  durumunu dondurur, istenirse ayni cagrida "sonraki sayfa"ya tiklar
+- Sonraki cagri sayfa imzasi (satir sayisi, ilk ve son satir) degismediyse
+  (yeni sayfa henuz cizilmedi) {stale: true} doner; Python kisa
+  araliklarla tekrar sorar
+- Satirlar Python'da ayristirilir (ad soyad, maskeli TC, tarih, durum);
+  tarih filtresi set kesisimi ile yapilir
+
+Kullanim:
+    rows = read_patient_list(driver)
+    patients = filter_by_dates(rows, {"01.03.2025", "02.03.2025"})
+"""
+
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+# Bir sayfanin cizilmesi icin en fazla bekleme (saniye)
+PAGE_TIMEOUT = 5.0
+PAGE_POLL = 0.1
+# Sonsuz donguye karsi ust sinir (100 satir x 50 sayfa)
+MAX_PAGES = 50
+
+ROW_SELECTOR = ".list-item.ng-star-inserted"
+
+_DATE_RE = re.compile(r"\b\d{2}\.\d{2}\.\d{4}\b")
+# 11 hane, ortasi yildizli olabilir: 123*****890 veya 12345678901
+_TC_RE = re.compile(r"\b\d[\d*]{9}\d\b")
+
+
+# ============================================================
+# JS OKUYUCU (sayfa basina tek round trip)
+# ============================================================
+PATIENT_PAGE_JS = """
+var prevSignature = arguments[0], advance = arguments[1];
+var rows = [];
+document.querySelectorAll('%s').forEach(function(row) {
+    rows.push((row.innerText || '').trim());
+});
+// Imza sadece satir iceriginden: sunucu tarafli sayfalamada aktif sayfa
+// etiketi tiklamayla hemen degisir, satirlar ise istek donunce
+var signature = rows.length + '|' + (rows[0] || '') + '|' + (rows[rows.length - 1] || '');
+if (prevSignature !== null && signature === prevSignature) {
+    return {stale: true};
+}
+var active = document.querySelector('.ui-paginator-page.ui-state-active');
+var page = active ? (active.innerText || '').trim() : '';
+var next = document.querySelector('.hyp-paginator .ui-paginator-next') || document.querySelector('.ui-paginator-next');
+var hasNext = !!next && !next.classList.contains('ui-state-disabled') && !next.disabled;
+var clicked = false;
+if (advance && hasNext && rows.length) {
+    next.click();
+    clicked = true;
+}
+return {stale: false, rows: rows, page: page, signature: signature, has_next: hasNext, clicked: clicked};
+""" % ROW_SELECTOR
+
+
+# ============================================================
+# SATIR AYRISTIRMA (saf Python)
+# ============================================================
+def parse_row(text: str) -> Optional[Dict]:
+    """
+    Satir metninden hasta kaydi. Baslik satiri ("Adı ...") veya bos satir
+    icin None. "tarihler" satirdaki tum tarihler (filtre bunlarla yapilir).
+    """
+    parts = [p.strip() for p in (text or "").split('\n') if p.strip()]
+    if not parts or "Adı" in parts[0]:
+        return None
+
+    dates = _DATE_RE.findall(text)
+    tc_match = _TC_RE.search(text)
+    # Ad, TC ve tarih disinda kalan metin (durum / islem bilgisi)
+    rest = [_TC_RE.sub('', _DATE_RE.sub('', p)).strip() for p in parts[1:]]
+    rest = [p for p in rest if p]
+    return {
+        "ad_soyad": parts[0],
+        "tc_mask": tc_match.group(0) if tc_match else "",
+        "tarih": dates[0] if dates else "",
+        "tarihler": dates,
+        "durum": " | ".join(rest),
+    }
+
+
+def read_patient_list(driver, max_pages: int = MAX_PAGES,
+                      log: Optional[Callable[[str, str], None]] = None) -> List[Dict]:
+    """
+    Listenin tum sayfalarini oku (dokuman sirasinda). Sayfa sayfa ilerler;
+    yeni sayfa PAGE_TIMEOUT icinde cizilmezse o ana kadar okunanlar doner.
+    """
+    records: List[Dict] = []
+    prev_signature = None
+    pages = 0
+    deadline = time.monotonic() + PAGE_TIMEOUT
+
+    while pages < max_pages:
+        data = driver.execute_script(PATIENT_PAGE_JS, prev_signature, True) or {}
+        if data.get("stale"):
+            if time.monotonic() > deadline:
+                if log:
+                    log(f"Sonraki sayfa yüklenmedi, {pages} sayfa ile devam ediliyor", "WARNING")
+                break
+            time.sleep(PAGE_POLL)
+            continue
+
+        pages += 1
+        for text in data.get("rows") or []:
+            record = parse_row(text)
+            if record is not None:
+                records.append(record)
+
+        if not data.get("clicked"):
+            break
+        prev_signature = data.get("signature")
+        deadline = time.monotonic() + PAGE_TIMEOUT
+
+    if log:
+        log(f"Hasta listesi: {pages} sayfa, {len(records)} satır", "DEBUG")
+    return records
+
+
+def filter_by_dates(records: Iterable[Dict], date_strings: Set[str],
+                    unique_names: bool = False) -> List[Dict]:
+    """
+    Tarihlerinden biri date_strings icinde olan kayitlar; "tarih" eslesen
+    tarihe ayarlanir. unique_names=True ise ayni ad ikinci kez alinmaz.
+    """
+    patients = []
+    seen = set()
+    for record in records:
+        matched = next((d for d in record["tarihler"] if d in date_strings), None)
+        if matched is None:
+            continue
+        if unique_names:
+            if record["ad_soyad"] in seen:
+                continue
+            seen.add(record["ad_soyad"])
+        patient = {k: v for k, v in record.items() if k != "tarihler"}
+        patient["tarih"] = matched
+        patients.append(patient)
+    return patients
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+ISLENMIS HASTA CACHE MODULU
+===========================
+processed_patients.json icin bellekte tutulan, oturum boyunca bir kez
+yuklenen cache.
+
+- Okuma: TC -> HYP tipi sozlugu uzerinden O(1), dosya I/O yok
+- Yazma: Her degisiklik processed_patients.journal dosyasina tek satir
+  (JSONL) olarak eklenir, tum dosya yeniden yazilmaz
+- Compact: Journal belli bir boyutu gecince arka planda snapshot
+  (processed_patients.json) yeniden yazilir ve journal sifirlanir
+
+processed_patients.json formati degismedi:
+    {tc: {"ad_soyad": str, "hypler": {hyp_tipi: {"durum", "tarih", "saat"}}}}
+"""
+
+import os
+import json
+import copy
+import atexit
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+
+class ProcessedPatientCache:
+    """Islenmis hasta/HYP kayitlari icin thread-safe, journal destekli cache"""
+
+    # Journal bu kadar kayda ulasinca arka planda compact yapilir
+    COMPACT_THRESHOLD = 200
+
+    def __init__(self, cache_path: str, journal_path: str = None, log_callback=None):
+        self.cache_path = cache_path
+        self.journal_path = journal_path or os.path.splitext(cache_path)[0] + '.journal'
+        self.log_callback = log_callback
+
+        self._lock = threading.RLock()
+        self._data: Dict[str, dict] = {}
+        self._journal_file = None
+        self._journal_count = 0
+        self._compact_thread: Optional[threading.Thread] = None
+
+        self._load()
+
+    # ============================================================
+    # YUKLEME
+    # ============================================================
+    def _log(self, message: str, level: str = "DEBUG"):
+        if self.log_callback:
+            try:
+                self.log_callback(message, level)
+            except Exception:
+                pass
+
+    def _rotated_journal_path(self) -> str:
+        return self.journal_path + '.old'
+
+    def _load(self):
+        """Snapshot'i oku ve uzerine journal kayitlarini uygula"""
+        data = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    data = {}
+            except Exception as e:
+                self._log(f"Cache okunamadi, bos baslatiliyor: {e}", "WARNING")
+                data = {}
+        self._data = data
+
+        # Yarida kalmis compact'tan kalan journal once, guncel journal sonra
+        replayed = 0
+        for path in (self._rotated_journal_path(), self.journal_path):
+            replayed += self._replay_journal(path)
+        self._journal_count = replayed
+
+    def _replay_journal(self, path: str) -> int:
+        """Journal dosyasindaki kayitlari sirayla uygula"""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Yarim yazilmis son satir (crash) - atla
+                        continue
+                    self._apply(entry)
+                    count += 1
+        except Exception as e:
+            self._log(f"Cache journal okunamadi: {e}", "WARNING")
+        return count
+
+    def _apply(self, entry: dict):
+        """Tek bir journal kaydini bellekteki veriye uygula"""
+        op = entry.get("op")
+        tc = entry.get("tc")
+        if not tc:
+            return
+        if op == "mark":
+            patient = self._data.setdefault(tc, {"ad_soyad": "", "hypler": {}})
+            patient["ad_soyad"] = entry.get("ad_soyad", patient.get("ad_soyad", ""))
+            patient.setdefault("hypler", {})[entry["hyp"]] = entry.get("data", {})
+        elif op == "remove":
+            hyp_tipi = entry.get("hyp")
+            if tc not in self._data:
+                return
+            if hyp_tipi:
+                hypler = self._data[tc].get("hypler", {})
+                hypler.pop(hyp_tipi, None)
+                if not hypler:
+                    del self._data[tc]
+            else:
+                del self._data[tc]
+
+    # ============================================================
+    # OKUMA
+    # ============================================================
+    def contains(self, tc: str, hyp_tipi: str) -> bool:
+        """Bu hasta icin bu HYP tipi cache'de var mi"""
+        patient = self._data.get(tc)
+        return bool(patient) and hyp_tipi in patient.get("hypler", {})
+
+    def snapshot(self) -> dict:
+        """Cache'in bagimsiz bir kopyasini dondur (GUI icin)"""
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "total_patients": len(self._data),
+                "total_hyps": sum(len(p.get("hypler", {})) for p in self._data.values()),
+            }
+
+    # ============================================================
+    # YAZMA (JOURNAL)
+    # ============================================================
+    def _append(self, entry: dict):
+        """Kaydi uygula ve journal'a ekle (lock altinda cagrilir)"""
+        self._apply(entry)
+        try:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._journal_file.flush()
+            self._journal_count += 1
+        except Exception as e:
+            self._log(f"Cache journal yazma hatasi: {e}", "WARNING")
+            return
+
+        if self._journal_count >= self.COMPACT_THRESHOLD:
+            self.compact(background=True)
+
+    def mark(self, tc: str, ad_soyad: str, hyp_tipi: str, durum: str = "BASARILI"):
+        """HYP'yi islenmis olarak kaydet"""
+        if not tc:
+            return
+        now = datetime.now()
+        with self._lock:
+            self._append({
+                "op": "mark",
+                "tc": tc,
+                "ad_soyad": ad_soyad,
+                "hyp": hyp_tipi,
+                "data": {
+                    "durum": durum,
+                    "tarih": now.strftime("%Y-%m-%d"),
+                    "saat": now.strftime("%H:%M"),
+                },
+            })
+
+    def remove(self, tc: str, hyp_tipi: str = None) -> bool:
+        """Hastayi veya hastanin belirli HYP kaydini sil. Silindiyse True."""
+        if not tc:
+            return False
+        with self._lock:
+            patient = self._data.get(tc)
+            if not patient:
+                return False
+            if hyp_tipi and hyp_tipi not in patient.get("hypler", {}):
+                return False
+            self._append({"op": "remove", "tc": tc, "hyp": hyp_tipi})
+            return True
+
+    def cleanup_older_than(self, days: int = 30) -> int:
+        """Belirtilen gunden eski kayitlari sil, silinen kayit sayisini dondur"""
+        threshold = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        removed_count = 0
+        with self._lock:
+            for tc in list(self._data.keys()):
+                hypler = self._data[tc].get("hypler", {})
+                old = [h for h, d in hypler.items() if d.get("tarih", "2099-01-01") < threshold]
+                for hyp_tipi in old:
+                    del hypler[hyp_tipi]
+                    removed_count += 1
+                if not hypler:
+                    del self._data[tc]
+
+            if removed_count > 0:
+                # Toplu degisiklik - journal yerine dogrudan snapshot yaz
+                self.compact(background=False)
+        return removed_count
+
+    # ============================================================
+    # COMPACT (SNAPSHOT YENIDEN YAZMA)
+    # ============================================================
+    def compact(self, background: bool = True):
+        """
+        Snapshot'i yeniden yaz ve journal'i sifirla.
+
+        Lock altinda sadece veri kopyalanir ve journal dondurulur;
+        dosya yazma isi (background=True ise) ayri thread'de yapilir.
+        """
+        with self._lock:
+            if self._compact_thread is not None and self._compact_thread.is_alive():
+                if background:
+                    return
+                self._compact_thread.join()
+
+            data = copy.deepcopy(self._data)
+
+            # Mevcut journal'i .old'a dondur, yeni kayitlar bos journal'a gitsin
+            if self._journal_file is not None:
+                try:
+                    self._journal_file.close()
+                except Exception:
+                    pass
+                self._journal_file = None
+            rotated = self._rotated_journal_path()
+            try:
+                if os.path.exists(self.journal_path):
+                    if os.path.exists(rotated):
+                        # Onceki compact yarim kalmis - eski kayitlari birlestir
+                        with open(rotated, 'a', encoding='utf-8') as dst, \
+                                open(self.journal_path, 'r', encoding='utf-8') as src:
+                            dst.write(src.read())
+                        os.remove(self.journal_path)
+                    else:
+                        os.replace(self.journal_path, rotated)
+            except Exception as e:
+                self._log(f"Cache journal dondurulemedi: {e}", "WARNING")
+                return
+            self._journal_count = 0
+
+            if background:
+                self._compact_thread = threading.Thread(
+                    target=self._write_snapshot, args=(data,), daemon=True
+                )
+                self._compact_thread.start()
+                return
+
+        self._write_snapshot(data)
+
+    def _write_snapshot(self, data: dict):
+        """Snapshot'i temp dosyaya yaz, atomik olarak degistir, .old journal'i sil"""
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            rotated = self._rotated_journal_path()
+            if os.path.exists(rotated):
+                os.remove(rotated)
+        except Exception as e:
+            self._log(f"Cache kaydetme hatasi: {e}", "WARNING")
+
+    def flush(self):
+        """Bekleyen compact'i tamamla ve journal'i snapshot'a yaz (cikista)"""
+        with self._lock:
+            if self._journal_count > 0:
+                self.compact(background=False)
+            elif self._compact_thread is not None:
+                self._compact_thread.join()
+
+
+# ============================================================
+# PROCESS GENELI PAYLASIM
+# ============================================================
+_caches: Dict[str, ProcessedPatientCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_processed_cache(cache_path: str, log_callback=None) -> ProcessedPatientCache:
+    """
+    Ayni dosya icin process genelinde tek bir cache dondur.
+
+    GUI her kuyruk/TC icin yeni HYPAutomation olusturdugu icin cache
+    sadece ilk seferde diskten yuklenir.
+    """
+    key = os.path.abspath(cache_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ProcessedPatientCache(key, log_callback=log_callback)
+            _caches[key] = cache
+            atexit.register(cache.flush)
+        elif log_callback is not None:
+            cache.log_callback = log_callback
+        return cache
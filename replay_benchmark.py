@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+KAYIT UZERINDEN PERFORMANS OLCUMU
+=================================
+session_capture.py ile kaydedilmis bir oturumu replay_server.py uzerinden
+headless Chrome'da bastan sona calistirir (process_patient -> _process_* ->
+_click_ilerle) ve sunlari raporlar:
+
+- Hasta basina sure (sn)
+- HYP basina WebDriver cagrisi sayisi
+- Toplam time.sleep suresi (ve en cok uyuyan fonksiyonlar)
+
+Canli site ve e-Imza gerekmez; sicak yollardaki gerilemeler offline yakalanir.
+
+Kullanim:
+    python replay_benchmark.py <capture_dir> [--patients "HASTA 1,HASTA 2"]
+                               [--repeat 3] [--json sonuc.json]
+                               [--baseline onceki.json] [--show]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import config
+
+
+# ============================================================
+# OLCUCULER
+# ============================================================
+class WebDriverCallCounter:
+    """
+    driver.execute'u sarar; WebElement komutlari da buradan gectigi icin
+    tum WebDriver round trip'leri sayilir.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.total = 0
+        self.by_command: Counter = Counter()
+        self._lock = threading.Lock()
+        self._original = driver.execute
+
+        def counted(command, params=None):
+            with self._lock:
+                self.total += 1
+                self.by_command[command] += 1
+            return self._original(command, params)
+
+        driver.execute = counted
+
+    def uninstall(self):
+        self.driver.execute = self._original
+
+
+class SleepMeter:
+    """time.sleep'i sarar; toplam ve cagiran fonksiyon bazinda uyuma suresi"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.by_caller: Dict[str, float] = defaultdict(float)
+        self._original = None
+
+    def __enter__(self):
+        self._original = time.sleep
+        original = self._original
+
+        def metered(seconds):
+            frame = sys._getframe(1)
+            caller = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+            self.total += seconds
+            self.by_caller[caller] += seconds
+            return original(seconds)
+
+        time.sleep = metered
+        return self
+
+    def __exit__(self, *exc):
+        time.sleep = self._original
+        return False
+
+
+# ============================================================
+# CALISTIRMA
+# ============================================================
+def patients_in_capture(entries: List[Dict]) -> List[str]:
+    """Kayitta gecen anonim hasta adlari (ilk gorulme sirasiyla)"""
+    seen = []
+    for entry in entries:
+        for name in re.findall(r'HASTA \d+', entry.get("html", "")):
+            if name not in seen:
+                seen.append(name)
+    return seen
+
+
+def _instrument_cards(automation, counter: WebDriverCallCounter, per_hyp: Dict[str, List[int]]):
+    """_process_single_card'i sararak HYP basina WebDriver cagrisini olc"""
+    original = automation._process_single_card
+
+    def measured(card, *args, **kwargs):
+        before = counter.total
+        try:
+            return original(card, *args, **kwargs)
+        finally:
+            per_hyp[card.get('hyp_tip', '?')].append(counter.total - before)
+
+    automation._process_single_card = measured
+
+
+def run_benchmark(capture_dir: str, patients: Optional[List[str]] = None, repeat: int = 1,
+                  headless: bool = True, verbose: bool = False) -> Dict:
+    """Kaydi oynatarak olcum yap, sonuc sozlugunu dondur"""
+    from replay_server import ReplayServer
+    from hyp_automation import HYPAutomation
+    from processed_cache import ProcessedPatientCache
+    from event_log import get_event_log
+
+    server = ReplayServer(capture_dir).start()
+    work_dir = tempfile.mkdtemp(prefix="hyp_replay_")
+    original_url = config.HYP_URL
+    config.HYP_URL = server.url
+
+    patients = patients or patients_in_capture(server.state.entries)
+    log_lines = []
+
+    def log_callback(message):
+        log_lines.append(message)
+        if verbose:
+            print(message, flush=True)
+
+    automation = HYPAutomation(log_callback=log_callback)
+    automation.headless = True if headless else False
+    automation.chrome_profile_dir = os.path.join(work_dir, "profile")
+    automation._processed_cache = ProcessedPatientCache(os.path.join(work_dir, "processed.json"))
+    # Kalici ciktilar da gecici klasore: replay olaylari gercek gecmis sanilmasin
+    # (scheduler.TimingModel, event_query), SMS listesi ve oturum kaydi dokunulmasin
+    automation.events = get_event_log(os.path.join(work_dir, "event_logs"))
+    automation.sms_kapali_file = os.path.join(work_dir, "sms_kapali_hastalar.json")
+    automation.sms_kapali_hastalar = set()
+    automation.capture = None
+    automation.waiter.on_wait = None
+
+    result = {
+        "capture": os.path.abspath(capture_dir),
+        "pages": len(server.state.entries),
+        "patients": [],
+        "per_hyp_calls": {},
+        "sleep_total": 0.0,
+        "sleep_by_caller": {},
+        "webdriver_calls": 0,
+        "webdriver_by_command": {},
+    }
+
+    try:
+        if not automation.setup_driver(debug_mode=False):
+            raise RuntimeError("Chrome baslatilamadi")
+        counter = WebDriverCallCounter(automation.driver)
+        per_hyp: Dict[str, List[int]] = defaultdict(list)
+        _instrument_cards(automation, counter, per_hyp)
+
+        with SleepMeter() as sleeps:
+            for run_no in range(repeat):
+                server.state.reset()
+                automation.driver.get(server.url + "dashboard")
+                for name in patients:
+                    calls_before = counter.total
+                    sleep_before = sleeps.total
+                    start = time.time()
+                    ok = automation.process_patient(name)
+                    result["patients"].append({
+                        "run": run_no + 1,
+                        "name": name,
+                        "ok": bool(ok),
+                        "seconds": round(time.time() - start, 3),
+                        "webdriver_calls": counter.total - calls_before,
+                        "sleep": round(sleeps.total - sleep_before, 3),
+                    })
+                    # Tekrarli calismalarda cache hastalari atlatmasin
+                    automation._processed_cache = ProcessedPatientCache(
+                        os.path.join(work_dir, f"processed_{run_no}_{len(result['patients'])}.json")
+                    )
+
+        result["sleep_total"] = round(sleeps.total, 3)
+        result["sleep_by_caller"] = dict(sorted(
+            ((k, round(v, 3)) for k, v in sleeps.by_caller.items()), key=lambda kv: -kv[1]
+        ))
+        result["webdriver_calls"] = counter.total
+        result["webdriver_by_command"] = dict(counter.by_command.most_common())
+        result["per_hyp_calls"] = {
+            hyp: {"count": len(calls), "avg": round(sum(calls) / len(calls), 1), "max": max(calls)}
+            for hyp, calls in per_hyp.items() if calls
+        }
+    finally:
+        try:
+            if automation.driver:
+                automation.driver.quit()
+        except Exception:
+            pass
+        if automation.events is not None:
+            automation.events.close()
+        config.HYP_URL = original_url
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    seconds = [p["seconds"] for p in result["patients"]]
+    result["seconds_per_patient"] = round(sum(seconds) / len(seconds), 3) if seconds else 0
+    return result
+
+
+# ============================================================
+# RAPOR
+# ============================================================
+def compare(result: Dict, baseline: Dict, tolerance: float = 0.10) -> List[str]:
+    """Onceki sonuca gore %tolerance'tan fazla kotulesen metrikler"""
+    regressions = []
+    for key in ("seconds_per_patient", "webdriver_calls", "sleep_total"):
+        old, new = baseline.get(key) or 0, result.get(key) or 0
+        if old and new > old * (1 + tolerance):
+            regressions.append(f"{key}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    for hyp, stats in result.get("per_hyp_calls", {}).items():
+        old = baseline.get("per_hyp_calls", {}).get(hyp, {}).get("avg")
+        if old and stats["avg"] > old * (1 + tolerance):
+            regressions.append(f"{hyp} WebDriver cagrisi: {old} -> {stats['avg']}")
+    return regressions
+
+
+def print_report(result: Dict):
+    print("=" * 60)
+    print(f"KAYIT: {result['capture']} ({result['pages']} sayfa)")
+    print("=" * 60)
+    for p in result["patients"]:
+        durum = "OK " if p["ok"] else "HATA"
+        print(f"[{durum}] #{p['run']} {p['name']}: {p['seconds']:.2f}sn, "
+              f"{p['webdriver_calls']} WebDriver cagrisi, uyku {p['sleep']:.2f}sn")
+    print("-" * 60)
+    print(f"Hasta basina sure : {result['seconds_per_patient']:.2f}sn")
+    print(f"WebDriver cagrisi : {result['webdriver_calls']}")
+    for hyp, stats in sorted(result["per_hyp_calls"].items()):
+        print(f"   {hyp}: {stats['count']} kart, ort {stats['avg']} / max {stats['max']} cagri")
+    print(f"Toplam sleep      : {result['sleep_total']:.2f}sn")
+    for caller, secs in list(result["sleep_by_caller"].items())[:8]:
+        print(f"   {caller}: {secs:.2f}sn")
+    print("=" * 60)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kaydedilmis HYP oturumu ile performans olcumu")
+    parser.add_argument("capture_dir")
+    parser.add_argument("--patients", help="Virgulle ayrilmis hasta adlari (varsayilan: kayittan)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", dest="json_out", help="Sonucu JSON olarak kaydet")
+    parser.add_argument("--baseline", help="Karsilastirilacak onceki JSON sonucu")
+    parser.add_argument("--show", action="store_true", help="Chrome penceresini goster")
+    parser.add_argument("--verbose", action="store_true", help="Otomasyon loglarini yazdir")
+    args = parser.parse_args(argv)
+
+    patients = [p.strip() for p in args.patients.split(',')] if args.patients else None
+    result = run_benchmark(args.capture_dir, patients, repeat=args.repeat,
+                           headless=not args.show, verbose=args.verbose)
+    print_report(result)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(result, json.load(f))
+        if regressions:
+            print("GERILEME:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("Gerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+KAYIT OYNATMA SUNUCUSU
+======================
+session_capture.py ile kaydedilmis sayfalari yerel HTTP uzerinden sunar;
+HYPAutomation config.HYP_URL bu sunucuya yonlendirilerek canli site ve
+e-Imza olmadan calistirilabilir.
+
+Oynatma mantigi:
+- Kayitlar sirali bir listedir, sunucu bir "imlec" tutar
+- GET /<yol>: imlecten itibaren bu yola ait ilk kayit sunulur
+- Checkbox ve "Tumunu kaldir" tiklamalari sayfada yerel olarak uygulanir
+- Sayfaya enjekte edilen script buton/link/liste tiklamalarini ve
+  input'ta Enter'i yakalar, POST /__replay/advance ile sonraki kayda gecer:
+    * Sonraki kaydin URL'i farkliysa tarayici o URL'e gider
+    * Ayni URL ise sayfa govdesi yerinde degistirilir (SPA gibi)
+
+Kullanim:
+    python replay_server.py <capture_dir> [--port 8765]
+"""
+
+import os
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from session_capture import load_capture
+
+
+# Tiklama/Enter -> sonraki kayit (senkron XHR, WebDriver click'i ile ayni sirada)
+REPLAY_JS = """
+<script>
+(function() {
+    function advance(label) {
+        var xhr = new XMLHttpRequest();
+        xhr.open('POST', '/__replay/advance', false);
+        xhr.setRequestHeader('Content-Type', 'application/json');
+        xhr.send(JSON.stringify({label: label, url: location.pathname}));
+        if (xhr.status !== 200) return;
+        var r = JSON.parse(xhr.responseText);
+        if (r.navigate) {
+            location.href = r.navigate;
+        } else if (r.body !== undefined) {
+            document.body.innerHTML = r.body;
+        }
+    }
+    // Checkbox ve "Tumunu kaldir" yerel olarak uygulanir, kayit ilerlemez
+    function localToggle(el) {
+        var box = el.closest('.ui-chkbox-box');
+        if (box) { box.classList.toggle('ui-state-active'); return true; }
+        var t = (el.innerText || '').toLowerCase();
+        if (el.tagName === 'SPAN' && t.indexOf('kald') !== -1) {
+            document.querySelectorAll('.ui-chkbox-box.ui-state-active').forEach(function(b) {
+                if (!b.classList.contains('ui-state-disabled')) b.classList.remove('ui-state-active');
+            });
+            return true;
+        }
+        return false;
+    }
+    var NAVIGATES = 'button, a, .list-item, .name, [role="button"]';
+    document.addEventListener('click', function(e) {
+        var target = e.target;
+        if (!target || !target.closest) return;
+        if (localToggle(target)) { e.preventDefault(); return; }
+        var el = target.closest(NAVIGATES);
+        if (!el) return;
+        e.preventDefault();
+        advance((el.innerText || '').trim().slice(0, 60));
+    }, true);
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && e.target && e.target.tagName === 'INPUT') advance('ENTER');
+    }, true);
+})();
+</script>
+"""
+
+
+def _path_of(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.path or '/').rstrip('/') or '/'
+
+
+def _body_of(html: str) -> str:
+    lower = html.lower()
+    start = lower.find('<body')
+    if start == -1:
+        return html
+    start = lower.find('>', start) + 1
+    end = lower.rfind('</body>')
+    return html[start:end if end != -1 else len(html)]
+
+
+class ReplayState:
+    """Kayit listesi uzerinde imlec (thread-safe)"""
+
+    def __init__(self, entries: list):
+        self.entries = entries
+        self.cursor = 0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.advances = 0
+
+    def page_for(self, path: str):
+        """Imlecten itibaren yola uyan ilk kayit; yoksa bastan ara"""
+        with self.lock:
+            self.requests += 1
+            order = list(range(self.cursor, len(self.entries))) + list(range(0, self.cursor))
+            for idx in order:
+                if _path_of(self.entries[idx]["url"]) == path:
+                    self.cursor = idx
+                    return self.entries[idx]
+            return None
+
+    def advance(self, current_path: str) -> dict:
+        with self.lock:
+            self.advances += 1
+            if self.cursor + 1 >= len(self.entries):
+                return {}
+            self.cursor += 1
+            entry = self.entries[self.cursor]
+            if _path_of(entry["url"]) != current_path:
+                return {"navigate": _path_of(entry["url"])}
+            return {"body": _body_of(entry["html"])}
+
+    def reset(self):
+        with self.lock:
+            self.cursor = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    state: ReplayState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = _path_of(self.path)
+        if path == '/__replay/status':
+            s = self.state
+            body = json.dumps({"cursor": s.cursor, "total": len(s.entries),
+                               "requests": s.requests, "advances": s.advances})
+            return self._send(200, body.encode('utf-8'), 'application/json')
+
+        entry = self.state.page_for(path)
+        if entry is None:
+            return self._send(404, b'<html><body>Kayit yok</body></html>', 'text/html; charset=utf-8')
+        html = entry["html"]
+        idx = html.lower().rfind('</body>')
+        html = html[:idx] + REPLAY_JS + html[idx:] if idx != -1 else html + REPLAY_JS
+        self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            payload = {}
+        if _path_of(self.path) == '/__replay/advance':
+            result = self.state.advance(_path_of(payload.get("url") or "/"))
+            return self._send(200, json.dumps(result).encode('utf-8'), 'application/json')
+        if _path_of(self.path) == '/__replay/reset':
+            self.state.reset()
+            return self._send(200, b'{}', 'application/json')
+        self._send(404, b'{}', 'application/json')
+
+
+class ReplayServer:
+    """Arka planda calisan oynatma sunucusu"""
+
+    def __init__(self, capture_dir: str, host: str = '127.0.0.1', port: int = 0):
+        self.state = ReplayState(load_capture(capture_dir))
+        handler = type('ReplayHandler', (_Handler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or not os.path.isdir(sys.argv[1]):
+        print("Kullanim: python replay_server.py <capture_dir> [--port 8765]")
+        sys.exit(1)
+    port = 8765
+    if '--port' in sys.argv:
+        port = int(sys.argv[sys.argv.index('--port') + 1])
+    server = ReplayServer(sys.argv[1], port=port)
+    print(f"{len(server.state.entries)} kayit sunuluyor: {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+HEDEF ODAKLI ZAMANLAYICI
+========================
+On taramada (work_plan.py) kartlari okunan hastalar icin:
+
+- Beklenen deger: hastanin kapatacagi, hedefi hala acik HYP'lerin basari
+  olasiliklari toplami (sol panel zinciriyle acilan kartlar dahil)
+- Beklenen sure: hasta acma suresi + HYP tipi basina ortalama kart suresi
+
+Sureler ve basari oranlari olay kaydindan (event_log.py) okunur
+(TimingModel.load); kayit yoksa varsayilanlar kullanilir.
+
+Siralama acgozludur: her adimda "beklenen deger / sure" orani en yuksek
+hasta secilir ve tipleri simule edilen kalan hedeften dusulur (degerler bu
+yuzden her adimda yeniden hesaplanir; iki hasta ayni son slotu paylasamaz).
+SCHEDULE_TIME_BUDGET_MINUTES verilirse kalan sureye sigmayan hastalar atlanir
+ve sure dolunca durulur.
+
+project() kalan plan icin tahmini bitis zamanini hesaplar (GUI'de gosterilir).
+"""
+
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import config
+
+
+# Olay kaydi yoksa kullanilan varsayilanlar (saniye)
+DEFAULT_CARD_SECONDS = 60.0
+DEFAULT_OPEN_SECONDS = 20.0
+DEFAULT_SUCCESS_RATE = 0.9
+# Bu kadar gunluk olay kaydi okunur
+HISTORY_DAYS = 60
+
+
+class TimingModel:
+    """HYP tipi basina ortalama kart suresi/basari orani ve hasta acma suresi"""
+
+    def __init__(self, card_seconds: Optional[Dict[str, float]] = None,
+                 success_rate: Optional[Dict[str, float]] = None,
+                 open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 patient_seconds: Optional[float] = None,
+                 hyp_per_patient: Optional[float] = None):
+        self.card_seconds = card_seconds or {}
+        self.success = success_rate or {}
+        self.open_seconds = open_seconds
+        # Taranmamis hastalar icin: ortalama hasta suresi ve hasta basina tamamlanan HYP
+        self.patient_seconds = patient_seconds
+        self.hyp_per_patient = hyp_per_patient
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict]) -> "TimingModel":
+        """Olaylardan tek geciste model olustur"""
+        card_total = defaultdict(float)
+        card_ok = defaultdict(int)
+        card_fail = defaultdict(int)
+        # (oturum, hasta) -> o hastanin kart sureleri toplami
+        patient_cards = defaultdict(float)
+        overhead_total, overhead_count = 0.0, 0
+        patient_total, patient_count, ok_total = 0.0, 0, 0
+
+        for e in events:
+            kind = e.get("type")
+            if kind == "card":
+                hyp = e.get("hyp")
+                seconds = e.get("seconds") or 0
+                patient_cards[(e.get("session"), e.get("patient"))] += seconds
+                if e.get("outcome") == "ok":
+                    card_total[hyp] += seconds
+                    card_ok[hyp] += 1
+                    ok_total += 1
+                elif e.get("outcome") == "fail":
+                    card_fail[hyp] += 1
+            elif kind == "patient" and e.get("outcome") != "prescreen_skip":
+                seconds = e.get("seconds") or 0
+                patient_total += seconds
+                patient_count += 1
+                cards = patient_cards.pop((e.get("session"), e.get("patient")), 0.0)
+                if e.get("outcome") != "error":
+                    overhead_total += max(0.0, seconds - cards)
+                    overhead_count += 1
+
+        return cls(
+            card_seconds={h: card_total[h] / n for h, n in card_ok.items()},
+            success_rate={h: card_ok[h] / (card_ok[h] + card_fail[h]) for h in set(card_ok) | set(card_fail)},
+            open_seconds=overhead_total / overhead_count if overhead_count else DEFAULT_OPEN_SECONDS,
+            patient_seconds=patient_total / patient_count if patient_count else None,
+            hyp_per_patient=ok_total / patient_count if patient_count else None,
+        )
+
+    @classmethod
+    def load(cls, days: int = HISTORY_DAYS) -> "TimingModel":
+        """Son `days` gunun olay kaydindan (okunamazsa varsayilanlar)"""
+        try:
+            from event_log import iter_events
+            return cls.from_events(iter_events(since=time.time() - days * 86400))
+        except Exception as e:
+            print(f"[SCHEDULER] Olay kaydi okunamadi, varsayilan sureler kullanilacak: {e}")
+            return cls()
+
+    def card_time(self, hyp_tip: str) -> float:
+        return self.card_seconds.get(hyp_tip, DEFAULT_CARD_SECONDS)
+
+    def success_rate(self, hyp_tip: str) -> float:
+        return self.success.get(hyp_tip, DEFAULT_SUCCESS_RATE)
+
+    def duration(self, hyp_types: Iterable[str]) -> float:
+        return self.open_seconds + sum(self.card_time(t) for t in hyp_types)
+
+    def unscanned_estimate(self):
+        """Kartlari bilinmeyen hasta icin (sure, beklenen HYP sayisi)"""
+        seconds = self.patient_seconds or (self.open_seconds + DEFAULT_CARD_SECONDS)
+        return seconds, (self.hyp_per_patient if self.hyp_per_patient is not None else 1.0)
+
+
+# ============================================================
+# SIRALAMA
+# ============================================================
+def _marginal(gains: Set[str], budget: Dict[str, float]) -> List[str]:
+    """Hedefi (simulasyonda) hala acik olan tipler"""
+    return [t for t in gains if budget.get(t, 0) > 0]
+
+
+def _value(types: List[str], model: TimingModel) -> float:
+    return sum(model.success_rate(t) for t in types)
+
+
+def schedule(items: List, gains_of: Callable, budget: Dict[str, int], model: TimingModel,
+             time_budget: Optional[float] = None):
+    """
+    items'i sirala. gains_of(item) -> HYP tipleri kumesi.
+    Returns: (sirali, yedek) - yedekler hedefleri oncekiler dolduracagi icin
+    (veya kalan zaman butcesine sigmadigi icin) sona birakilanlar
+    """
+    budget = dict(budget)
+    pending = list(items)
+    time_left = time_budget if time_budget else float("inf")
+
+    ordered = []
+    while pending:
+        best, best_ratio, best_seconds = None, 0.0, 0.0
+        for item in pending:
+            types = _marginal(gains_of(item), budget)
+            if not types:
+                continue
+            seconds = model.duration(types)
+            if seconds > time_left:
+                continue
+            ratio = _value(types, model) / seconds
+            if ratio > best_ratio:
+                best, best_ratio, best_seconds = item, ratio, seconds
+        if best is None:
+            break
+        pending.remove(best)
+        ordered.append(best)
+        time_left -= best_seconds
+        for t in _marginal(gains_of(best), budget):
+            budget[t] -= 1
+    return ordered, pending
+
+
+# ============================================================
+# TAHMINI BITIS
+# ============================================================
+def project(patients: List[Dict], remaining: Dict[str, int], model: TimingModel,
+            now: Optional[datetime] = None, parallel: int = 1) -> Dict:
+    """
+    Kalan plan sirayla islenirse hedefler ne zaman kapanir?
+    patients: sirali hasta sozlukleri ("plan_hyp" on taramadan, yoksa bilinmiyor)
+    parallel: es zamanli tarayici sayisi (worker_pool), sure buna bolunur
+    Returns: {"seconds", "finish", "closes", "remaining", "complete"}
+    """
+    now = now or datetime.now()
+    budget = {t: float(n) for t, n in remaining.items() if n > 0}
+    total = sum(budget.values())
+    seconds = 0.0
+    unscanned_seconds, unscanned_hyp = model.unscanned_estimate()
+
+    for patient in patients:
+        if sum(budget.values()) <= 0:
+            break
+        planned = patient.get("plan_hyp")
+        if planned is None:
+            # Kartlari bilinmiyor: gecmis ortalamasi kadar HYP, acik tiplere orantili
+            seconds += unscanned_seconds
+            open_total = sum(budget.values())
+            share = min(unscanned_hyp, open_total)
+            for t in budget:
+                budget[t] = max(0.0, budget[t] - share * budget[t] / open_total)
+            continue
+        types = [t for t in planned if budget.get(t, 0) > 0]
+        if not types:
+            continue  # plan_still_useful acmadan atlar
+        seconds += model.duration(types)
+        for t in types:
+            budget[t] = max(0.0, budget[t] - model.success_rate(t))
+
+    left = sum(budget.values())
+    seconds /= max(1, parallel)
+    return {
+        "seconds": seconds,
+        "finish": now + timedelta(seconds=seconds),
+        "closes": int(round(total - left)),
+        "remaining": int(round(total)),
+        "complete": left < 0.5,
+    }
+
+
+def time_budget_seconds() -> Optional[float]:
+    minutes = getattr(config, "SCHEDULE_TIME_BUDGET_MINUTES", None)
+    return minutes * 60 if minutes else None
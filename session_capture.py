@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+OTURUM KAYIT MODULU
+===================
+Gercek bir calisma sirasinda gorulen sayfalari (URL + DOM) diske kaydeder.
+Kayitlar replay_server.py ile yerel olarak tekrar oynatilir ve
+replay_benchmark.py ile performans olculur.
+
+Kayit formati (capture_dir altinda):
+    index.jsonl   - {"seq", "url", "label", "file", "time"} satirlari
+    0001.html ... - Anonimlestirilmis DOM (script'ler cikarilmis)
+
+Anonimlestirme:
+- 11 haneli TC'ler sabit sahte TC'lere cevrilir (oturum icinde tutarli)
+- add_name() ile bildirilen hasta adlari "HASTA 1", "HASTA 2" ... olur
+- Cep telefonu numaralari ve kullanici adi maskelenir
+Gercek TC/ad eslesme tablosu diske YAZILMAZ.
+
+TC ve telefonlar yazarken maskelenir. Adlar cogu zaman sayfa kaydedildikten
+sonra ogrenilir; finalize() (atexit ve GUI kapanisi, finalize_all) tum
+HTML'leri ve index.jsonl URL'lerini son ad listesiyle yeniden yazar.
+
+Acmak icin: config.SESSION_CAPTURE_DIR veya HYP_CAPTURE_DIR ortam degiskeni.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import hashlib
+import itertools
+import threading
+from typing import Dict, Optional
+
+import config
+
+
+# Kapanista yeniden anonimlestirilecek kayitlar (os._exit atexit'i calistirmaz)
+_active = []
+_active_lock = threading.Lock()
+# Ayni saniyede olusan kayitlar (paralel worker'lar, GUI gruplari) ayri klasore
+_dir_counter = itertools.count(1)
+
+
+# DOM'u kopyalayip script'leri temizleyen, form degerlerini attribute'a yazan script
+CAPTURE_JS = """
+var src = document.documentElement;
+var clone = src.cloneNode(true);
+// Canli form degerlerini attribute olarak sakla (klonda .value kaybolur)
+var live = src.querySelectorAll('input, textarea, select');
+var copy = clone.querySelectorAll('input, textarea, select');
+for (var i = 0; i < live.length && i < copy.length; i++) {
+    var el = live[i];
+    if (el.type === 'checkbox' || el.type === 'radio') {
+        if (el.checked) copy[i].setAttribute('checked', 'checked'); else copy[i].removeAttribute('checked');
+    } else if (el.tagName === 'SELECT') {
+        copy[i].setAttribute('data-value', el.value);
+    } else {
+        copy[i].setAttribute('value', el.value || '');
+    }
+}
+clone.querySelectorAll('script, noscript, iframe, base').forEach(function(e) { e.remove(); });
+clone.querySelectorAll("span[class*='user-name']").forEach(function(e) { e.textContent = 'DR. TEST KULLANICI'; });
+return {url: location.href, html: '<!DOCTYPE html>' + clone.outerHTML};
+"""
+
+_TC_RE = re.compile(r'(?<!\d)[1-9]\d{10}(?!\d)')
+_PHONE_RE = re.compile(r'(?<!\d)0?5\d{2}[\s-]?\d{3}[\s-]?\d{2}[\s-]?\d{2}(?!\d)')
+
+
+def _tr_upper(text: str) -> str:
+    return text.replace('i', 'İ').replace('ı', 'I').upper()
+
+
+class SessionCapture:
+    """Calisma sirasinda sayfa kayitlarini tutar (thread-safe)"""
+
+    def __init__(self, capture_dir: str, log_callback=None):
+        self.capture_dir = capture_dir
+        self.log_callback = log_callback
+        os.makedirs(capture_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._last_digest = None
+        self._tc_map: Dict[str, str] = {}
+        self._name_map: Dict[str, str] = {}
+        self._name_re: Optional[re.Pattern] = None
+        self._index_path = os.path.join(capture_dir, 'index.jsonl')
+
+    @classmethod
+    def from_config(cls, log_callback=None) -> Optional["SessionCapture"]:
+        """Kayit acik degilse None"""
+        capture_dir = os.environ.get("HYP_CAPTURE_DIR") or getattr(config, "SESSION_CAPTURE_DIR", None)
+        if not capture_dir:
+            return None
+        # Her HYPAutomation kendi kaydini tutar; klasor adi surec ve sayacla tekil
+        session_dir = os.path.join(
+            capture_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_dir_counter)}"
+        )
+        capture = cls(session_dir, log_callback=log_callback)
+        # Sonradan ogrenilen adlar onceki kayitlara da uygulansin
+        atexit.register(capture.finalize)
+        with _active_lock:
+            _active.append(capture)
+        return capture
+
+    def _log(self, message: str, level: str = "DEBUG"):
+        if self.log_callback:
+            try:
+                self.log_callback(message, level)
+            except Exception:
+                pass
+
+    # ============================================================
+    # ANONIMLESTIRME
+    # ============================================================
+    def add_name(self, name: str):
+        """Bu adi kayitlarda 'HASTA n' olarak degistir"""
+        name = (name or '').strip()
+        if not name or name.isdigit():
+            return
+        with self._lock:
+            if name in self._name_map:
+                return
+            alias = f"HASTA {len(self._name_map) + 1}"
+            for variant in {name, name.upper(), _tr_upper(name), name.title()}:
+                self._name_map[variant] = alias
+            # Uzun adlar once (ad soyad, sonra tek kelimeler cakismasin)
+            keys = sorted(self._name_map, key=len, reverse=True)
+            self._name_re = re.compile('|'.join(re.escape(k) for k in keys))
+
+    def _fake_tc(self, match) -> str:
+        tc = match.group(0)
+        fake = self._tc_map.get(tc)
+        if fake is None:
+            fake = f"{10000000000 + len(self._tc_map) + 1}"
+            self._tc_map[tc] = fake
+        return fake
+
+    def anonymize(self, text: str) -> str:
+        text = _TC_RE.sub(self._fake_tc, text)
+        text = _PHONE_RE.sub('05000000000', text)
+        return self._anonymize_names(text)
+
+    def _anonymize_names(self, text: str) -> str:
+        if self._name_re is not None:
+            text = self._name_re.sub(lambda m: self._name_map[m.group(0)], text)
+        return text
+
+    def _rewrite(self, path: str):
+        """Dosyayi son ad listesiyle yeniden yaz (TC'ler yazarken maskelendi)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        cleaned = self._anonymize_names(text)
+        if cleaned != text:
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(cleaned)
+            os.replace(tmp_path, path)
+
+    # ============================================================
+    # KAYIT
+    # ============================================================
+    def record(self, driver, label: str = "") -> bool:
+        """Sayfanin o anki halini kaydet (degismediyse atla)"""
+        if driver is None:
+            return False
+        try:
+            data = driver.execute_script(CAPTURE_JS)
+        except Exception as e:
+            self._log(f"Sayfa kaydedilemedi: {str(e)[:60]}")
+            return False
+
+        with self._lock:
+            url = self.anonymize(data.get("url") or "")
+            html = self.anonymize(data.get("html") or "")
+            digest = hashlib.sha1((url + html).encode('utf-8')).hexdigest()
+            if digest == self._last_digest:
+                return False
+            self._last_digest = digest
+
+            self._seq += 1
+            file_name = f"{self._seq:04d}.html"
+            with open(os.path.join(self.capture_dir, file_name), 'w', encoding='utf-8') as f:
+                f.write(html)
+            entry = {"seq": self._seq, "url": url, "label": label, "file": file_name, "time": time.time()}
+            with open(self._index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return True
+
+    def finalize(self):
+        """
+        Tum kayitlari (HTML'ler ve index.jsonl) son ad listesiyle yeniden
+        anonimlestir. Hasta listesi sayfasi, adlar listeden okunmadan once
+        kaydedilir. Birden fazla cagrilabilir.
+        """
+        with self._lock:
+            if self._name_re is None or not os.path.exists(self._index_path):
+                return
+            for name in sorted(os.listdir(self.capture_dir)):
+                if not (name.endswith('.html') or name == 'index.jsonl'):
+                    continue
+                try:
+                    self._rewrite(os.path.join(self.capture_dir, name))
+                except Exception as e:
+                    self._log(f"Kayit anonimlestirilemedi ({name}): {e}", "WARNING")
+
+
+def finalize_all():
+    """Acik tum kayitlari yeniden anonimlestir (GUI kapanisi, os._exit oncesi)"""
+    with _active_lock:
+        captures = list(_active)
+    for capture in captures:
+        capture.finalize()
+
+
+def load_capture(capture_dir: str) -> list:
+    """index.jsonl kayitlarini sirayla oku (html dahil)"""
+    entries = []
+    with open(os.path.join(capture_dir, 'index.jsonl'), 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            with open(os.path.join(capture_dir, entry["file"]), 'r', encoding='utf-8') as hf:
+                entry["html"] = hf.read()
+            entries.append(entry)
+    return entries
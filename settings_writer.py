@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+AYAR DOSYASI YAZICISI
+=====================
+SettingsManager.save_settings() artik diske yazmaz, sadece yazici thread'e
+"ayarlar degisti" der ve hemen doner. Yazici:
+
+- Kisa bir bekleme penceresindeki (SAVE_DEBOUNCE_SECONDS) tum degisiklikleri
+  tek yazmada birlestirir
+- Dosyayi gecici dosya + os.replace ile yazar (yarim dosya kalmaz)
+- PermissionError'da (antivirus/OneDrive kilidi) arka planda tekrar dener,
+  olmazsa yedek konuma yazar
+
+Cikista flush() cagrilir (os._exit atexit'i atladigi icin GUI acikca cagirir).
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from typing import Dict, Optional
+
+
+# Ayni pencere icindeki kayitlar tek yazmada birlestirilir (saniye)
+SAVE_DEBOUNCE_SECONDS = 0.5
+PERMISSION_RETRIES = 3
+PERMISSION_RETRY_DELAY = 0.5
+
+
+def write_json_atomic(path: str, text: str):
+    """Gecici dosyaya yaz, diske indir, sonra tek adimda yerine koy"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SettingsWriter:
+    """Tek dosya icin arka planda, birlestirerek yazan yazici"""
+
+    def __init__(self, path: str, backup_path: Optional[str] = None, delay: float = SAVE_DEBOUNCE_SECONDS):
+        self.path = path
+        self.backup_path = backup_path
+        self.delay = delay
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._data: Optional[Dict] = None
+        self._pending = False
+        self._writing = False
+        self._due = 0.0
+        self._thread = None
+
+    def schedule(self, data: Dict):
+        """Yazmayi planla; pencere icindeki sonraki cagrilar ayni yazmaya katilir"""
+        with self._cond:
+            self._data = data
+            if not self._pending:
+                self._pending = True
+                self._due = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SettingsWriter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Bekleyen yazmayi hemen yap ve bitmesini bekle"""
+        with self._cond:
+            if not self._pending and not self._writing:
+                return True
+            self._due = 0.0
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                while True:
+                    remaining = self._due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data = self._data
+                self._pending = False
+                self._writing = True
+            try:
+                self._write(data)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    @staticmethod
+    def _serialize(data: Dict) -> str:
+        # GUI thread ayni anda anahtar ekleyip silebilir; o durumda kisa bir sure sonra tekrar dene
+        for _ in range(5):
+            try:
+                return json.dumps(data, indent=4, ensure_ascii=False)
+            except RuntimeError:
+                time.sleep(0.01)
+        return json.dumps(dict(data), indent=4, ensure_ascii=False)
+
+    def _write(self, data: Dict) -> bool:
+        try:
+            text = self._serialize(data)
+        except Exception as e:
+            print(f"HATA: Ayarlar kaydedilemedi: {e}")
+            return False
+
+        # Önce ana konuma kaydetmeyi dene
+        for attempt in range(PERMISSION_RETRIES):
+            try:
+                write_json_atomic(self.path, text)
+                self.writes += 1
+                return True
+            except PermissionError:
+                if attempt < PERMISSION_RETRIES - 1:
+                    time.sleep(PERMISSION_RETRY_DELAY)
+            except Exception as e:
+                print(f"HATA: Ayarlar kaydedilemedi: {e}")
+                break
+
+        # Ana konum başarısız olduysa, yedek konuma kaydet
+        if self.backup_path:
+            try:
+                write_json_atomic(self.backup_path, text)
+                self.writes += 1
+                print(f"BILGI: Ayarlar yedek konuma kaydedildi: {self.backup_path}")
+                return True
+            except Exception as e:
+                print(f"UYARI: Ayarlar hiçbir konuma kaydedilemedi: {e}")
+        print("Ayarlar bu oturum için sadece bellekte tutulacak.")
+        return False
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Acilis import butcesi (import_profile.py): pencere acilmadan once yuklenenler"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_profile import (  # noqa: E402
+    IMPORT_BUDGET_MS, deferred_violations, run_importtime, total_ms,
+)
+
+# gui_app bunlar olmadan import edilemez (Windows + GUI ortami)
+for _module in ("customtkinter", "PIL", "infi.systray", "winreg"):
+    pytest.importorskip(_module)
+
+
+def test_gui_import_within_budget():
+    # Soguk disk etkisi olmasin: import_profile gibi uc denemenin en iyisi
+    totals = []
+    for _ in range(3):
+        entries, error = run_importtime("gui_app")
+        assert not error, error
+        totals.append(total_ms(entries))
+    assert min(totals) <= IMPORT_BUDGET_MS
+
+
+def test_deferred_modules_not_loaded_at_startup():
+    entries, error = run_importtime("gui_app")
+    assert not error, error
+    assert deferred_violations(entries, "gui_app") == []
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""scheduler siralama testleri (olay kaydi olmadan, varsayilan surelerle)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime  # noqa: E402
+
+from scheduler import DEFAULT_OPEN_SECONDS, TimingModel, project, schedule  # noqa: E402
+
+
+PATIENTS = [("A", {"DM"}), ("B", {"DM"}), ("C", {"HT"})]
+
+
+def _gains(item):
+    return item[1]
+
+
+def _names(items):
+    return [name for name, _ in items]
+
+
+def test_greedy_skips_patients_whose_quota_is_already_filled():
+    ordered, backup = schedule(PATIENTS, _gains, {"DM": 1, "HT": 1}, TimingModel())
+    assert _names(ordered) == ["A", "C"]
+    assert _names(backup) == ["B"]
+
+
+def test_time_budget_respects_shared_quota():
+    # Her hasta 80 sn (20 acma + 60 kart); butce iki hastaya yetiyor
+    ordered, backup = schedule(PATIENTS, _gains, {"DM": 1, "HT": 1}, TimingModel(), time_budget=160)
+    assert _names(ordered) == ["A", "C"]
+    assert _names(backup) == ["B"]
+
+
+def test_time_budget_stops_when_full():
+    ordered, backup = schedule(PATIENTS, _gains, {"DM": 2, "HT": 1}, TimingModel(), time_budget=100)
+    assert len(ordered) == 1
+    assert len(backup) == 2
+
+
+def _card(patient, hyp, outcome, seconds, session="s1"):
+    return {"type": "card", "session": session, "patient": patient, "hyp": hyp,
+            "outcome": outcome, "seconds": seconds}
+
+
+def _patient(patient, outcome, seconds, session="s1"):
+    return {"type": "patient", "session": session, "patient": patient,
+            "outcome": outcome, "seconds": seconds}
+
+
+def test_timing_model_from_events():
+    model = TimingModel.from_events([
+        # Ana kart + sol panel zinciriyle acilan iki kart
+        _card("p1", "HT_IZLEM", "ok", 40),
+        _card("p1", "KVR_IZLEM", "ok", 30),
+        _card("p1", "DIY_IZLEM", "fail", 20),
+        _patient("p1", "processed", 110),
+        _card("p2", "HT_IZLEM", "ok", 60),
+        _patient("p2", "processed", 70),
+        # On tarama atlamalari sure ortalamasina girmez
+        _patient("p3", "prescreen_skip", 0),
+    ])
+    assert model.card_time("HT_IZLEM") == 50
+    assert model.card_time("KVR_IZLEM") == 30
+    assert model.success_rate("HT_IZLEM") == 1.0
+    assert model.success_rate("DIY_IZLEM") == 0.0
+    # Acma suresi: hasta suresi - kart sureleri -> (20 + 10) / 2
+    assert model.open_seconds == 15
+    assert model.patient_seconds == 90
+    assert model.hyp_per_patient == 1.5
+
+
+def test_timing_model_defaults_without_events():
+    model = TimingModel.from_events([])
+    assert model.open_seconds == DEFAULT_OPEN_SECONDS
+    assert model.unscanned_estimate() == (DEFAULT_OPEN_SECONDS + 60.0, 1.0)
+
+
+def test_project_counts_only_open_targets():
+    model = TimingModel(card_seconds={"HT": 40, "DM": 20}, success_rate={"HT": 1.0, "DM": 1.0},
+                        open_seconds=10)
+    now = datetime(2026, 1, 31, 9, 0)
+    patients = [{"plan_hyp": ["HT", "DM"]}, {"plan_hyp": ["HT"]}, {"plan_hyp": ["DM"]}]
+    result = project(patients, {"HT": 1, "DM": 1}, model, now=now)
+    # Ilk hasta iki hedefi de kapatir, digerleri acilmadan atlanir
+    assert result["seconds"] == 70
+    assert result["finish"] == datetime(2026, 1, 31, 9, 1, 10)
+    assert (result["closes"], result["remaining"], result["complete"]) == (2, 2, True)
+
+
+def test_project_incomplete_and_parallel():
+    model = TimingModel(card_seconds={"HT": 50}, success_rate={"HT": 1.0}, open_seconds=10)
+    result = project([{"plan_hyp": ["HT"]}], {"HT": 3}, model, parallel=2)
+    assert result["seconds"] == 30
+    assert (result["closes"], result["remaining"], result["complete"]) == (1, 3, False)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""tetkik_scanner eslestirici testleri (tarayicisiz)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tetkik_scanner import TEST_MATCHER, parse_old_values  # noqa: E402
+
+
+def test_uppercase_turkish_names():
+    assert TEST_MATCHER.find("KREATİNİN") == "Kreatinin"
+    assert TEST_MATCHER.find("TRİGLİSERİT") == "Trigliserit"
+    assert TEST_MATCHER.find("BİLİRUBİN") == "Bilirubin"
+    assert TEST_MATCHER.find("ALBÜMİN") == "Albümin"
+    assert TEST_MATCHER.find_all("İdrarda albumin") == ["idrarda albumin"]
+    assert TEST_MATCHER.values("KREATİNİN: 0,9\nTRİGLİSERİT 180") == {
+        "Kreatinin": "0.9", "Trigliserit": "180",
+    }
+    assert parse_old_values("BİLİRUBİN\n1.2\nALBÜMİN\n-") == {"Bilirubin": "1.2", "Albümin": "-"}
+
+
+def test_value_on_next_line():
+    assert TEST_MATCHER.value_for("non-HDL", "non-HDL\n143") == "143"
+    assert TEST_MATCHER.value_for("APG", "APG: 95 mg/dL") == "95"
+    assert TEST_MATCHER.values("non-HDL\n143") == {"non-HDL": "143"}
+
+
+def test_name_inside_longer_word_is_not_matched():
+    assert TEST_MATCHER.values("HbA1c\n5.2") == {"HbA1c": "5.2"}
+    assert TEST_MATCHER.values("HbA1c") == {}
+
+
+def test_value_does_not_cross_non_blank_line():
+    assert TEST_MATCHER.value_for("APG", "APG\n-\nHbA1c 5.2") is None
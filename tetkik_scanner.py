@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+TETKIK CHECKBOX TARAYICI
+========================
+Tetkik sayfasindaki tum PrimeNG checkbox'lari TEK execute_script ile okur.
+
+Eskiden her tikli checkbox icin 7 ust seviye, kardes, p-checkbox ve satir
+elementleri ayri ayri WebDriver cagrilari ile geziliyordu
+(checkbox x ata sayisi kadar round trip). Simdi script her checkbox icin
+aday metinleri tek seferde toplar; bilinen test adi eslestirmesi
+(non-HDL / HDL kurali dahil) Python'da, tek seferde derlenen
+TEST_MATCHER ile bu sonuc uzerinde yapilir.
+
+Kullanim:
+    scan = scan_tetkik_panel(driver)
+    rows = checkbox_rows(scan)   # [{test_name, checked, old_value, disabled}]
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+# ============================================================
+# BILINEN TEST ADLARI
+# ============================================================
+# Liste sirasi = oncelik (bir metinde birden fazla test geciyorsa
+# listede once gelen secilir). Ayni konumdaki cakismalarda en uzun ad
+# kazanir: "non-HDL" metninde "HDL", "HbA1c" metninde "Hb" eslesmez.
+KNOWN_TESTS = [
+    'APG', 'TKG', 'OGTT', 'HbA1c', 'Glukoz', 'Glikoz',
+    'Kolesterol', 'non-HDL', 'HDL', 'LDL', 'Trigliserit',
+    'Kreatinin', 'eGFR', 'Albumin', 'Albümin', 'Sodyum', 'Potasyum',
+    'ALT', 'AST', 'GGT', 'ALP', 'Bilirubin',
+    'TSH', 'T4', 'T3', 'Hemoglobin', 'Hb', 'WBC', 'PLT',
+    'Urea', 'BUN', 'Idrar', 'idrarda albumin', 'AKO', 'PKO', 'Protein'
+]
+
+# Sayi: 95, 5.2 veya 5,2
+_NUMBER = r'(\d+(?:[.,]\d+)?)'
+# Ad ile deger arasi: ayni satirda en fazla 30 rakam olmayan karakter,
+# ardindan bosluk/satir sonu ('APG: 95', 'non-HDL\n143')
+_GAP = r'[^\d\n]{0,30}?\s*'
+# Adin bittigi yer harf/rakam devam etmemeli ('HbA1c' icinde 'Hb' degil)
+_NAME_END = r'(?![^\W_])'
+
+
+class TestNameMatcher:
+    """
+    Bilinen test adlari icin tek seferde derlenen eslestirici.
+
+    Tum adlar uzundan kisaya siralanmis tek bir alternation regex'inde
+    toplanir (her ad kendi grubunda); metin tek geciste taranir ve her
+    eslesme, eslesen grubun sirasindan kanonik ada (KNOWN_TESTS'teki yazim)
+    cevrilir. Eslesen metin anahtar olarak kullanilmaz: IGNORECASE ile
+    eslesen 'İ' kucuk harfe 'i̇' (iki karakter) olarak doner.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        # kucuk harf -> (oncelik, kanonik ad)
+        self._canonical: Dict[str, tuple] = {}
+        for idx, name in enumerate(self.names):
+            self._canonical.setdefault(name.lower(), (idx, name))
+        # Grup sirasi (1'den baslar) -> (oncelik, kanonik ad)
+        keys = sorted(self._canonical, key=len, reverse=True)
+        self._by_group = [self._canonical[k] for k in keys]
+        alternation = '|'.join(f'({re.escape(k)})' for k in keys)
+        self._name_re = re.compile(alternation, re.IGNORECASE)
+        # Ad + ayirici + sayi (sayi grubu ad gruplarindan sonra gelir)
+        self._name_value_re = re.compile(
+            rf'(?:{alternation}){_NAME_END}{_GAP}{_NUMBER}', re.IGNORECASE
+        )
+        self._value_group = len(keys) + 1
+
+    def _hit(self, m) -> tuple:
+        """Eslesen ad grubunun (oncelik, kanonik ad) bilgisi"""
+        return self._by_group[m.lastindex - 1]
+
+    def canonical(self, name: str) -> Optional[str]:
+        hit = self._canonical.get((name or '').strip().lower())
+        return hit[1] if hit else None
+
+    def find_all(self, text: str) -> List[str]:
+        """Metindeki tum test adlari (metin sirasinda, tekrarsiz)"""
+        found = []
+        for m in self._name_re.finditer(text or ''):
+            name = self._hit(m)[1]
+            if name not in found:
+                found.append(name)
+        return found
+
+    def find(self, text: str) -> Optional[str]:
+        """Metinde gecen en oncelikli test adi"""
+        best = None
+        for m in self._name_re.finditer(text or ''):
+            hit = self._hit(m)
+            if best is None or hit[0] < best[0]:
+                best = hit
+                if best[0] == 0:
+                    break
+        return best[1] if best else None
+
+    def find_line(self, line: str) -> Optional[str]:
+        """Kisa satir (test basligi) icin test adi; uzun satirlar eslesmez"""
+        line = (line or '').strip()
+        if not line or len(line) >= 50:
+            return self.canonical(line)
+        return self.find(line)
+
+    def values(self, text: str) -> Dict[str, str]:
+        """Tek geciste {test: ilk gecerli deger} ('APG: 95' -> {'APG': '95'})"""
+        result: Dict[str, str] = {}
+        for m in self._name_value_re.finditer(text or ''):
+            # lastindex sayi grubudur; eslesen ad grubu ondan once tek dolu grup
+            name = next(
+                self._by_group[i - 1][1] for i in range(1, self._value_group) if m.group(i) is not None
+            )
+            if name in result:
+                continue
+            value = m.group(self._value_group).replace(',', '.')
+            if _in_range(value):
+                result[name] = value
+        return result
+
+    def value_for(self, test_name: str, text: str) -> Optional[str]:
+        """Verilen test adindan sonra (ayni veya sonraki satirdaki) ilk gecerli deger"""
+        for m in _value_pattern(test_name).finditer(text or ''):
+            value = m.group(1).replace(',', '.')
+            if _in_range(value):
+                return value
+        return None
+
+
+def _in_range(value: str) -> bool:
+    try:
+        return 0 < float(value) < 10000
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=256)
+def _value_pattern(test_name: str):
+    """Bilinmeyen etiketler icin (dis lab) ad + deger regex'i, bir kez derlenir"""
+    name_end = _NAME_END if test_name[-1:].isalnum() else ''
+    return re.compile(rf'{re.escape(test_name)}{name_end}{_GAP}{_NUMBER}', re.IGNORECASE)
+
+
+def hdl_compatible(test_name: str, text: str) -> bool:
+    """
+    HDL / non-HDL karisikligi kontrolu: HDL aranirken non-HDL metni,
+    non-HDL aranirken sadece HDL metni kabul edilmez.
+    """
+    test_lower = test_name.lower()
+    if 'hdl' not in test_lower:
+        return True
+    return ('non' in test_lower) == ('non' in text.lower())
+
+
+def same_test(a: str, b: str) -> bool:
+    """Iki test etiketi ayni testi mi gosteriyor (tam, sonra HDL-duyarli kismi eslesme)"""
+    a_lower, b_lower = a.lower().strip(), b.lower().strip()
+    if a_lower == b_lower:
+        return True
+    if not hdl_compatible(a, b):
+        return False
+    return a_lower in b_lower or b_lower in a_lower
+
+
+# Tum tetkik ve dis lab kod yollari bu eslestiriciyi kullanir
+TEST_MATCHER = TestNameMatcher(KNOWN_TESTS)
+
+# Checkbox'in kendi etiketi olabilecek, test adi olmayan metinler
+NON_TEST_LABELS = ['evet', 'hayir', 'hayır', 'var', 'yok']
+
+
+# ============================================================
+# JS TARAYICI (tek round trip)
+# ============================================================
+CHECKBOX_SCAN_JS = """
+function txt(el) { return el ? (el.innerText || '').trim() : null; }
+function clsHas(el, parts) {
+    var c = (el && typeof el.className === 'string') ? el.className : '';
+    for (var i = 0; i < parts.length; i++) { if (c.indexOf(parts[i]) !== -1) return true; }
+    return false;
+}
+function upTo(el, test) {
+    var p = el ? el.parentElement : null;
+    while (p) { if (test(p)) return p; p = p.parentElement; }
+    return null;
+}
+function outermost(el, test) {
+    var found = null, p = el ? el.parentElement : null;
+    while (p) { if (test(p)) found = p; p = p.parentElement; }
+    return found;
+}
+function tag(name) { return function(e) { return e.tagName && e.tagName.toLowerCase() === name; }; }
+
+var boxes = [];
+document.querySelectorAll('.ui-chkbox-box').forEach(function(box) {
+    // 1..7. ust seviye metinleri (500+ karakter ise bos)
+    var ancestors = [], p = box.parentElement;
+    for (var i = 0; i < 7; i++) {
+        var t = p ? txt(p) : '';
+        ancestors.push(t && t.length < 500 ? t : '');
+        p = p ? p.parentElement : null;
+    }
+    // Onceki kardesler (dokuman sirasi, ilk 3)
+    var siblings = [], s = box.parentElement ? box.parentElement.firstElementChild : null;
+    while (s && s !== box) { siblings.push(txt(s)); s = s.nextElementSibling; }
+
+    var pcb = box.closest('p-checkbox');
+    var pcbParent = pcb ? pcb.parentElement : null;
+    var row = upTo(box, function(e) { return clsHas(e, ['row', 'item', 'test', 'tetkik']); });
+
+    // p-checkbox etiket adaylari
+    var labels = [];
+    if (pcb) {
+        var n = pcb.nextElementSibling;
+        while (n && !tag('label')(n)) n = n.nextElementSibling;
+        if (n) labels.push(txt(n));
+        if (pcb.previousElementSibling) labels.push(txt(pcb.previousElementSibling));
+        if (pcbParent) {
+            pcbParent.querySelectorAll('label, span.test-name, span.label, .tetkik-adi').forEach(function(l) {
+                labels.push(txt(l));
+            });
+        }
+    }
+
+    // Satir/kolon adaylari (eski XPath sirasi ile)
+    var grid = outermost(box, function(e) { return clsHas(e, ['grid']); });
+    var cols = [
+        upTo(box, function(e) { return clsHas(e, ['p-col', 'col-']); }),
+        grid ? grid.querySelector('[class*="col"]') : null,
+        upTo(box, function(e) { return tag('div')(e) && clsHas(e, ['row']); }),
+        upTo(box, function(e) { return tag('div')(e) && clsHas(e, ['flex']); }),
+        upTo(box, tag('tr')),
+        upTo(box, tag('li')),
+        box.parentElement && box.parentElement.parentElement && box.parentElement.parentElement.parentElement
+            ? box.parentElement.parentElement.parentElement.parentElement : null
+    ].map(function(e) { return e ? txt(e) : null; });
+
+    // input attribute'lari
+    var input = (pcb && pcb.querySelector('input')) || null;
+    if (!input && box.parentElement) {
+        input = Array.prototype.filter.call(box.parentElement.children, function(c) {
+            return c !== box && tag('input')(c);
+        })[0] || null;
+    }
+    var attrs = {};
+    if (input) {
+        ['formcontrolname', 'name', 'id'].forEach(function(a) { attrs[a] = input.getAttribute(a); });
+    }
+
+    boxes.push({
+        checked: box.classList.contains('ui-state-active'),
+        disabled: box.classList.contains('ui-state-disabled'),
+        ancestors: ancestors,
+        siblings: siblings.slice(0, 3),
+        pcheckbox_parent: txt(pcbParent),
+        row: txt(row),
+        labels: labels,
+        cols: cols,
+        attrs: attrs
+    });
+});
+
+// Deger gosteren elementler + 3. ust seviye metni
+var values = [];
+document.querySelectorAll('.son-deger, .test-value, .result-value, [class*="value"], input[type="number"]').forEach(function(el) {
+    var v = (el.value !== undefined && el.value !== null && el.value !== '') ? String(el.value) : el.getAttribute('value');
+    if (!v) v = txt(el);
+    var a = el.parentElement && el.parentElement.parentElement ? el.parentElement.parentElement.parentElement : null;
+    values.push({value: v || '', context: a ? txt(a) : ''});
+});
+
+return {text: document.body ? (document.body.innerText || '') : '', boxes: boxes, values: values};
+"""
+
+
+class TetkikScan:
+    """CHECKBOX_SCAN_JS sonucu"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.text: str = data.get("text") or ""
+        self.boxes: List[Dict] = data.get("boxes") or []
+        self.values: List[Dict] = data.get("values") or []
+        self.ok = bool(data)
+
+    @property
+    def checked_boxes(self) -> List[Dict]:
+        return [b for b in self.boxes if b.get("checked")]
+
+
+def scan_tetkik_panel(driver) -> TetkikScan:
+    """Tetkik panelini tek execute_script ile tara (hata olursa bos sonuc)"""
+    try:
+        return TetkikScan(driver.execute_script(CHECKBOX_SCAN_JS))
+    except Exception:
+        return TetkikScan()
+
+
+# ============================================================
+# ESLESTIRME (saf Python)
+# ============================================================
+def resolve_remaining_name(box: Dict, matcher: TestNameMatcher = TEST_MATCHER) -> Optional[str]:
+    """
+    Tikli checkbox'in test adi (_get_remaining_checkbox_names yontemleri):
+    1. ust seviyeler, 2. onceki kardesler, 3. p-checkbox parent'i,
+    4. row/item satiri, son care: container metninin ilk satiri
+    """
+
+    container_text = ""
+    for text in box.get("ancestors") or []:
+        if text and len(text) > 3:
+            container_text = text
+            name = matcher.find(text)
+            if name:
+                return name
+
+    for text in box.get("siblings") or []:
+        name = matcher.find(text)
+        if name:
+            return name
+
+    for text in (box.get("pcheckbox_parent"), box.get("row")):
+        name = matcher.find(text)
+        if name:
+            return name
+
+    if container_text:
+        first_line = container_text.split('\n')[0].strip()
+        if first_line and len(first_line) < 50:
+            return first_line
+    return None
+
+
+def _is_number_like(line: str) -> bool:
+    return line.replace('.', '').replace(',', '').isdigit()
+
+
+def resolve_label_name(box: Dict) -> Optional[str]:
+    """
+    Tikli checkbox'in etiketi (_get_all_remaining_checkbox_tests yontemleri):
+    1. p-checkbox etiketleri, 2. satir/kolon metinleri, 3. input attribute'u
+    """
+    for text in box.get("labels") or []:
+        if text and len(text) < 60 and not text.isdigit():
+            if text.lower() not in NON_TEST_LABELS:
+                return text.split(':')[0].strip() if ':' in text else text
+
+    for text in box.get("cols") or []:
+        if not text or len(text) >= 150:
+            continue
+        for line in text.split('\n'):
+            line = line.strip()
+            if line and len(line) < 50 and line.lower() not in NON_TEST_LABELS:
+                if not _is_number_like(line):
+                    return line.split(':')[0].strip() if ':' in line else line
+
+    attrs = box.get("attrs") or {}
+    for attr in ('formcontrolname', 'name', 'id'):
+        val = attrs.get(attr)
+        if val and len(val) < 50:
+            # camelCase veya snake_case'i insan okunur hale getir
+            name = re.sub(r'([a-z])([A-Z])', r'\1 \2', val)
+            return name.replace('_', ' ').title()
+    return None
+
+
+def parse_old_values(page_text: str, matcher: TestNameMatcher = TEST_MATCHER) -> Dict[str, str]:
+    """
+    Sayfa metninde 'Test adi' satirindan sonraki satiri eski deger olarak oku.
+
+    Returns:
+        dict: {'Glukoz': '92', 'HDL': '39', 'Albumin': '-', ...}
+    """
+    old_values: Dict[str, str] = {}
+    lines = [l.strip() for l in page_text.split('\n') if l.strip()]
+
+    for i, line in enumerate(lines):
+        test = matcher.find_line(line)
+        if not test or i + 1 >= len(lines):
+            continue
+        # Bu test icin zaten GECERLI bir deger varsa uzerine YAZMA
+        if old_values.get(test, '-') != '-':
+            continue
+        next_line = lines[i + 1]
+        if next_line == '-':
+            old_values.setdefault(test, '-')
+        else:
+            # Bazen "92 mg/dL" gibi birim de olabilir, sadece sayiyi al
+            match = re.match(r'^(\d+\.?\d*)', next_line.replace(',', '.'))
+            if match:
+                old_values[test] = match.group(1)
+
+    return old_values
+
+
+def collect_test_values(scan: TetkikScan, matcher: TestNameMatcher = TEST_MATCHER) -> Dict[str, str]:
+    """
+    "Tumunu kaldir" oncesi sayfadaki test degerleri (metin + deger elementleri).
+
+    Returns:
+        dict: {'APG': '95', 'HbA1c': '5.2', ...}
+    """
+    tests = matcher.values(scan.text)
+
+    for item in scan.values:
+        val = (item.get("value") or "").strip()
+        if not val or not _in_range(val.replace(',', '.')):
+            continue
+        for test in matcher.find_all(item.get("context") or ""):
+            tests.setdefault(test, val)
+
+    return tests
+
+
+def checkbox_rows(scan: TetkikScan, matcher: TestNameMatcher = TEST_MATCHER) -> List[Dict]:
+    """
+    Panel ozeti: [{test_name, checked, old_value, disabled}]
+    old_value sayfadaki eski deger ('-' = yok, None = bulunamadi)
+    """
+    old_values = parse_old_values(scan.text, matcher)
+    rows = []
+    for box in scan.boxes:
+        name = resolve_remaining_name(box, matcher)
+        rows.append({
+            "test_name": name,
+            "checked": bool(box.get("checked")),
+            "old_value": old_values.get(name) if name else None,
+            "disabled": bool(box.get("disabled")),
+        })
+    return rows
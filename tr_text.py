@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+TURKCE METIN NORMALIZASYONU
+===========================
+Sayfa metinlerini karsilastirmak icin ortak normalizasyon:
+Turkce harfler ASCII'ye, bozuk encoding (mojibake) dizileri duzeltilerek,
+buyuk harfe cevrilir.
+
+    normalize_tr("Takip İşlemi İstatistikleri") -> "TAKIP ISLEMI ISTATISTIKLERI"
+
+Tek karakterler onceden hesaplanmis bir str.maketrans tablosu ile tek
+geciste cevrilir; mojibake dizileri (ornegin 'Ä°', 'ÅŸ') yalnizca metinde
+bu dizilerin ilk karakteri varsa regex ile duzeltilir. Ayni metinler
+(hasta adi, istatistik satirlari, kart metinleri) tekrar tekrar geldigi icin
+sonuclar LRU cache'te tutulur.
+
+Olcum: python normalize_benchmark.py [capture_dir]
+"""
+
+import re
+from functools import lru_cache
+
+
+# Tek karakter -> ASCII buyuk harf
+_FOLD_TABLE = str.maketrans({
+    'İ': 'I', 'ı': 'I', 'i': 'I',
+    'Ş': 'S', 'ş': 'S', 'Ğ': 'G', 'ğ': 'G',
+    'Ü': 'U', 'ü': 'U', 'Ö': 'O', 'ö': 'O',
+    'Ç': 'C', 'ç': 'C',
+})
+
+# UTF-8 metnin Latin-1/cp1252 olarak okunmasiyla olusan diziler
+_MOJIBAKE = {
+    'Ä°': 'I', 'Ä±': 'I', 'Åž': 'S', 'ÅŸ': 'S',
+    'Äž': 'G', 'ÄŸ': 'G', 'Ãœ': 'U', 'Ã¼': 'U',
+    'Ã–': 'O', 'Ã¶': 'O', 'Ã‡': 'C', 'Ã§': 'C',
+}
+_MOJIBAKE_RE = re.compile('|'.join(re.escape(k) for k in _MOJIBAKE))
+_MOJIBAKE_LEADS = frozenset(k[0] for k in _MOJIBAKE)
+
+
+def _fix_mojibake(text: str) -> str:
+    if _MOJIBAKE_LEADS.isdisjoint(text):
+        return text
+    return _MOJIBAKE_RE.sub(lambda m: _MOJIBAKE[m.group(0)], text)
+
+
+@lru_cache(maxsize=4096)
+def normalize_tr(text: str) -> str:
+    """Türkçe karakterleri normalize et"""
+    if not text:
+        return ""
+    return _fix_mojibake(text).translate(_FOLD_TABLE).upper().strip()
+
+
+def normalize_tr_words(text: str) -> str:
+    """normalize_tr + bosluklar tek bosluga (ad soyad karsilastirmasi)"""
+    return ' '.join(normalize_tr(text).split())
@@ -10,8 +10,6 @@ import sys
 import subprocess
 import tempfile
 import threading
-import urllib.request
-import urllib.error
 from typing import Optional, Callable, Dict, Any
 
 # Mevcut versiyon
@@ -70,6 +68,10 @@ def check_for_updates(timeout: int = 10) -> Dict[str, Any]:
             - download_url: str
             - error: str (hata varsa)
     """
+    # urllib.request (http.client, ssl, email) sadece kontrol sirasinda yuklenir
+    import urllib.request
+    import urllib.error
+
     result = {
         "has_update": False,
         "current_version": CURRENT_VERSION,
@@ -121,6 +123,8 @@ def check_for_updates(timeout: int = 10) -> Dict[str, Any]:
 
 def _check_github_releases(timeout: int = 10) -> Dict[str, Any]:
     """GitHub Releases API'den son sürümü kontrol et"""
+    import urllib.request
+
     result = {
         "has_update": False,
         "current_version": CURRENT_VERSION,
@@ -183,6 +187,8 @@ def download_update(url: str, progress_callback: Optional[Callable[[int, int], N
         İndirilen dosyanın yolu veya hata durumunda None
     """
     import ssl
+    import urllib.request
+    import urllib.error
 
     try:
         temp_dir = tempfile.gettempdir()
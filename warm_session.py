@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+SICAK TARAYICI OTURUMU (hemsire kuyrugu icin)
+=============================================
+Hemsire kuyrugundan gelen her TC grubu icin Chrome'u yeniden acip e-imza ile
+giris yapmak yerine tek bir girisli HYPAutomation acik tutulur:
+
+- acquire(): hazir oturum varsa ve hala girisliyse hemen doner; yoksa
+  Chrome'u baslatir ve giris yapar
+- release(): oturum kapatilmaz, bosta bekler
+- Bostayken arka plan thread'i HEARTBEAT saniyede bir Chrome'a dogrudan
+  kucuk bir script gonderir (cevap yoksa oturum olu sayilir ve kapatilir),
+  REFRESH saniyede bir dashboard'u yeniden yukler (sunucu oturumu da canli
+  kalsin); IDLE_TIMEOUT dolunca kapatir. Tarayici cagrilari kilit disinda
+  yapilir; acquire() bu sirada yoklamanin bitmesini bekler
+- shutdown(): Chrome'u kapat (normal otomasyon ayni Chrome profilini
+  kullanacagi icin baslamadan once, ve uygulama kapanirken cagrilir).
+  Tk thread'inden cagrildigi icin kilidi en fazla SHUTDOWN_LOCK_SECONDS bekler
+"""
+
+import time
+import threading
+from typing import Callable, Optional
+
+import config
+
+
+HEARTBEAT_SECONDS = 60
+REFRESH_SECONDS = 10 * 60
+SHUTDOWN_LOCK_SECONDS = 2
+
+
+class WarmBrowserSession:
+    """Tek bir girisli HYPAutomation'i TC gruplari arasinda acik tutar"""
+
+    def __init__(self, factory: Callable, log: Callable[[str], None],
+                 idle_timeout: Optional[float] = None):
+        self.factory = factory
+        self.log = log
+        self.idle_timeout = idle_timeout if idle_timeout is not None else \
+            getattr(config, "NURSE_WARM_IDLE_MINUTES", 30) * 60
+        self.automation = None
+        self.reused = 0            # sicak oturumun kac kez tekrar kullanildigi
+        self._lock = threading.RLock()
+        self._probe_done = threading.Condition(self._lock)
+        self._probing = False      # heartbeat kilit disinda tarayiciyla konusuyor
+        self._busy = False
+        self._last_used = 0.0
+        self._last_refresh = 0.0
+        self._heartbeat = None
+
+    # ============================================================
+    # KULLANIM
+    # ============================================================
+    def acquire(self, debug_mode: bool = False, auto_pin: bool = True):
+        """Girisli HYPAutomation dondur (baslatilamaz/giris yapilamazsa None)"""
+        with self._lock:
+            while self._probing:
+                self._probe_done.wait()
+            self._busy = True
+            try:
+                automation = self._ready_automation(debug_mode, auto_pin)
+            except Exception:
+                self._busy = False
+                raise
+            if automation is None:
+                self._busy = False
+            return automation
+
+    def _ready_automation(self, debug_mode: bool, auto_pin: bool):
+        if self.automation is not None and not self._driver_alive():
+            self._close_driver()
+
+        if self.automation is not None:
+            if self._is_logged_in():
+                self.reused += 1
+                self.log("🔥 Açık Chrome oturumu kullanılıyor (başlatma/giriş atlandı)")
+                self._reset_run_state()
+                return self.automation
+        else:
+            automation = self.factory()
+            self.log("🌐 Chrome başlatılıyor...")
+            if not automation.setup_driver(debug_mode=debug_mode):
+                self.log("❌ Chrome başlatılamadı!")
+                return None
+            self.automation = automation
+            self._start_heartbeat()
+
+        # Yeni Chrome veya oturumu dusmus Chrome: giris yap
+        # (basarisizsa Chrome acik kalir, elle giris yapilirsa sonraki grupta kullanilir)
+        self.log("🔐 HYP'ye giriş yapılıyor...")
+        if not self.automation.login(auto_pin=auto_pin):
+            self.log("❌ Login başarısız! Lütfen manuel giriş yapın.")
+            self._last_used = time.time()
+            return None
+
+        self.log("✅ HYP'ye giriş başarılı!")
+        self._last_refresh = time.time()
+        self._reset_run_state()
+        return self.automation
+
+    def release(self):
+        """Is bitti; oturum acik kalir"""
+        with self._lock:
+            self._busy = False
+            self._last_used = time.time()
+
+    def discard(self):
+        """Hata sonrasi: oturumu kapat, sonraki acquire yeniden baslatir"""
+        with self._lock:
+            self._close_driver()
+            self._busy = False
+
+    def shutdown(self) -> bool:
+        """Chrome'u kapat. Acik bir oturum varsa True."""
+        # Giris suruyorsa kilit uzun sure tutulabilir; UI'yi bekletmeden kapat
+        locked = self._lock.acquire(timeout=SHUTDOWN_LOCK_SECONDS)
+        try:
+            had_session = self.automation is not None
+            self._close_driver()
+            self._busy = False
+            return had_session
+        finally:
+            if locked:
+                self._lock.release()
+
+    @property
+    def is_warm(self) -> bool:
+        return self.automation is not None
+
+    # ============================================================
+    # IC ISLER
+    # ============================================================
+    def _reset_run_state(self):
+        """Onceki gruptan kalan durdurma/iptal kayitlarini temizle"""
+        automation = self.automation
+        automation.should_stop = False
+        automation.cancelled_hyps = []
+        automation.failed_hyps = []
+
+    def _driver_alive(self) -> bool:
+        try:
+            self.automation.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _is_logged_in(self) -> bool:
+        try:
+            return self.automation._detect_current_page() in ("dashboard", "hyp_loggedin")
+        except Exception:
+            return False
+
+    def _close_driver(self):
+        automation, self.automation = self.automation, None
+        if automation is not None and automation.driver is not None:
+            try:
+                automation.driver.quit()
+                self.log("🔒 Chrome kapatıldı")
+            except Exception as e:
+                print(f"Chrome kapatma hatasi (sicak oturum): {e}")
+
+    def _start_heartbeat(self):
+        if self._heartbeat is not None and self._heartbeat.is_alive():
+            return
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="WarmSessionHeartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            with self._lock:
+                if self.automation is None:
+                    return
+                if self._busy:
+                    continue
+                now = time.time()
+                if now - self._last_used > self.idle_timeout:
+                    self.log("💤 Hemşire kuyruğu boşta, Chrome kapatılıyor")
+                    self._close_driver()
+                    return
+                automation = self.automation
+                refresh = now - self._last_refresh > REFRESH_SECONDS
+                self._probing = True
+
+            # Tarayici cagrilari kilit disinda (shutdown sayfa yuklemesini beklemesin)
+            error = None
+            try:
+                if refresh:
+                    automation.driver.get(automation._hyp_url("dashboard"))
+                else:
+                    # keep_alive hatalari yutar; canliligi dogrudan kontrol et
+                    automation.driver.execute_script("return 1;")
+                automation.last_activity_time = time.time()
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                self._probing = False
+                self._probe_done.notify_all()
+                if self.automation is not automation:
+                    # bu sirada kapatildi (yeni oturum acildiysa onu izlemeye devam)
+                    if self.automation is None:
+                        return
+                    continue
+                if error is not None:
+                    # Chrome elle kapatilmis olabilir
+                    print(f"[WARM] Oturum kapandi: {error}")
+                    self._close_driver()
+                    return
+                if refresh:
+                    self._last_refresh = now
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+WEBDRIVER PROFILER
+==================
+Istege bagli olcum katmani: HYPAutomation'in driver'i uzerinden giden her
+WebDriver komutunu (findElement(s), executeScript, getElementText,
+getCurrentUrl, getPageSource, ...) ve her time.sleep cagrisini suresiyle ve
+cagiran HYPAutomation metoduyla birlikte kaydeder.
+
+Cikti:
+    profile_YYYYMMDD_HHMMSS.folded - flame graph icin "collapsed stack"
+        formati (flamegraph.pl, speedscope, inferno). Agirlik: mikrosaniye.
+    summary_lines()                - en pahali metotlar (GUI ozet popup'i)
+
+Acmak icin: config.WEBDRIVER_PROFILE = True veya HYP_PROFILE=1 ortam degiskeni.
+Kapaliyken hicbir sey sarilmaz, ek maliyet yoktur.
+
+Not: WebElement komutlari da element._parent.execute -> driver.execute
+uzerinden gectigi icin tek noktadan sarmak yeterlidir.
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+
+# Yigin cikarilirken dikkate alinan moduller (digerleri atlanir)
+PROFILED_MODULES = {
+    "hyp_automation.py",
+    "page_flow.py",
+    "page_waits.py",
+    "page_snapshot.py",
+    "tetkik_scanner.py",
+    "worker_pool.py",
+}
+_OWNER_MODULE = "hyp_automation.py"
+
+SLEEP_LEAF = "time.sleep"
+
+
+# ============================================================
+# time.sleep SARMALAYICI (thread bazli)
+# ============================================================
+# Paralel modda her worker kendi thread'inde calisir; uyku, o thread'e
+# kayitli profiler'a yazilir. Kayitli profiler kalmayinca orijinal geri konur.
+_sleep_lock = threading.Lock()
+_sleep_profilers: Dict[int, "DriverProfiler"] = {}
+_real_sleep = time.sleep
+
+
+def _profiled_sleep(seconds):
+    profiler = _sleep_profilers.get(threading.get_ident())
+    if profiler is None:
+        return _real_sleep(seconds)
+    start = time.perf_counter()
+    try:
+        return _real_sleep(seconds)
+    finally:
+        profiler.record(SLEEP_LEAF, time.perf_counter() - start)
+
+
+def _register_sleep(profiler: "DriverProfiler"):
+    global _real_sleep
+    with _sleep_lock:
+        if not _sleep_profilers and time.sleep is not _profiled_sleep:
+            _real_sleep = time.sleep
+            time.sleep = _profiled_sleep
+        _sleep_profilers[threading.get_ident()] = profiler
+
+
+def _unregister_sleep(profiler: "DriverProfiler"):
+    with _sleep_lock:
+        for ident in [i for i, p in _sleep_profilers.items() if p is profiler]:
+            del _sleep_profilers[ident]
+        if not _sleep_profilers and time.sleep is _profiled_sleep:
+            time.sleep = _real_sleep
+
+
+# ============================================================
+# PROFILER
+# ============================================================
+class DriverProfiler:
+    """Tek bir HYPAutomation (tek Chrome) icin WebDriver/sleep profili"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._driver = None
+        self._original_execute = None
+        # (cerceve1, cerceve2, ..., yaprak) -> [adet, saniye]
+        self.stacks: Dict[Tuple[str, ...], List[float]] = {}
+        # HYPAutomation metodu -> {"calls", "webdriver", "sleep"}
+        self.methods: Dict[str, Dict[str, float]] = {}
+        self.total_webdriver = 0.0
+        self.total_sleep = 0.0
+        self.total_calls = 0
+
+    @classmethod
+    def from_config(cls) -> Optional["DriverProfiler"]:
+        """Profil kapaliysa None"""
+        enabled = os.environ.get("HYP_PROFILE", "").strip() not in ("", "0") \
+            or getattr(config, "WEBDRIVER_PROFILE", False)
+        if not enabled:
+            return None
+        output_dir = getattr(config, "WEBDRIVER_PROFILE_DIR", None) or \
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+        return cls(output_dir)
+
+    # ============================================================
+    # SARMA
+    # ============================================================
+    def install(self, driver):
+        """driver.execute ve (bu thread icin) time.sleep'i sar"""
+        if driver is None or driver is self._driver:
+            return
+        self.uninstall()
+        original = driver.execute
+
+        def profiled_execute(command, params=None):
+            start = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                self.record(command, time.perf_counter() - start)
+
+        self._driver = driver
+        self._original_execute = original
+        driver.execute = profiled_execute
+        _register_sleep(self)
+
+    def uninstall(self):
+        if self._driver is not None:
+            try:
+                self._driver.execute = self._original_execute
+            except Exception:
+                pass
+        self._driver = None
+        self._original_execute = None
+        _unregister_sleep(self)
+
+    # ============================================================
+    # KAYIT
+    # ============================================================
+    @staticmethod
+    def _stack() -> Tuple[str, ...]:
+        """Proje modullerindeki cagri yigini (distan ice)"""
+        names = []
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            module = os.path.basename(code.co_filename)
+            if module in PROFILED_MODULES:
+                if module == _OWNER_MODULE:
+                    names.append(code.co_name)
+                else:
+                    names.append(f"{module[:-3]}.{code.co_name}")
+            frame = frame.f_back
+        names.reverse()
+        return tuple(names)
+
+    @staticmethod
+    def _owner(stack: Tuple[str, ...]) -> str:
+        """Cagriyi yapan en icteki HYPAutomation metodu"""
+        for name in reversed(stack):
+            if '.' not in name:
+                return name
+        return stack[-1] if stack else "?"
+
+    def record(self, leaf: str, seconds: float):
+        stack = self._stack()
+        owner = self._owner(stack)
+        is_sleep = leaf == SLEEP_LEAF
+        with self._lock:
+            entry = self.stacks.setdefault(stack + (leaf,), [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+            m = self.methods.setdefault(owner, {"calls": 0, "webdriver": 0.0, "sleep": 0.0})
+            if is_sleep:
+                m["sleep"] += seconds
+                self.total_sleep += seconds
+            else:
+                m["calls"] += 1
+                m["webdriver"] += seconds
+                self.total_webdriver += seconds
+                self.total_calls += 1
+
+    # ============================================================
+    # CIKTI
+    # ============================================================
+    def write_flamegraph(self, path: Optional[str] = None) -> Optional[str]:
+        """Collapsed stack dosyasi yaz (agirlik: mikrosaniye)"""
+        with self._lock:
+            items = list(self.stacks.items())
+        if not items:
+            return None
+        if path is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started))
+            path = os.path.join(self.output_dir, f"profile_{stamp}_{id(self) % 10000:04d}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, (_, seconds) in sorted(items):
+                micros = int(seconds * 1_000_000)
+                if micros > 0:
+                    # ';' ve bosluk collapsed formatta ayiricidir
+                    frames = [s.replace(';', ':').replace(' ', '_') for s in stack]
+                    f.write(f"{';'.join(frames)} {micros}\n")
+        return path
+
+    def summary_lines(self, top: int = 10) -> List[str]:
+        return summary_lines_for([self], top)
+
+    def finish(self) -> Optional[str]:
+        """Sarmalari kaldir, flame graph dosyasini yaz"""
+        self.uninstall()
+        try:
+            return self.write_flamegraph()
+        except Exception:
+            return None
+
+
+def summary_lines_for(profilers: List[DriverProfiler], top: int = 10) -> List[str]:
+    """Bir veya birden fazla profilin (paralel mod) birlesik ozeti"""
+    merged: Dict[str, Dict[str, float]] = {}
+    calls = webdriver = sleep = 0.0
+    for p in profilers:
+        with p._lock:
+            calls += p.total_calls
+            webdriver += p.total_webdriver
+            sleep += p.total_sleep
+            for name, m in p.methods.items():
+                t = merged.setdefault(name, {"calls": 0, "webdriver": 0.0, "sleep": 0.0})
+                for k in t:
+                    t[k] += m[k]
+    if not merged:
+        return []
+
+    lines = [f"WebDriver: {int(calls)} çağrı, {webdriver:.1f}sn | sleep: {sleep:.1f}sn"]
+    ranked = sorted(merged.items(), key=lambda kv: kv[1]["webdriver"] + kv[1]["sleep"], reverse=True)
+    for name, m in ranked[:top]:
+        lines.append(
+            f"{name}: {m['webdriver'] + m['sleep']:.1f}sn "
+            f"({int(m['calls'])} çağrı {m['webdriver']:.1f}sn, sleep {m['sleep']:.1f}sn)"
+        )
+    return lines
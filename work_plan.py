@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+HASTA ON TARAMASI VE IS PLANI
+=============================
+Eskiden her hasta sirayla acilip process_patient icinde ancak kartlar
+okununca "hepsi yaklasan", "hepsi cache'de" veya "hedefler dolu" oldugu
+anlasiliyordu; her biri tam bir arama + acma + kart okuma dongusuydu.
+
+On tarama iki asamalidir:
+
+1. Tarayicisiz (hic round trip yok):
+   - Kalan hedefi olan aktif HYP tipi yoksa plan bostur
+   - Listedeki maskeli TC ile tum acik tipler cache'de ise hasta atlanir
+2. Kart taramasi (hedef kisitliysa, PRESCREEN_MODE):
+   - Hasta acilir, kartlar ve sol panel TEK execute_script ile okunur
+     (CARD_SCAN_JS), durum _analyze_card / _check_date_threshold ile belirlenir
+   - Yapilabilir + acik + cache'de olmayan tipler "kazanc" sayilir
+   - Plan scheduler.py ile siralanir (beklenen hedef degeri / beklenen sure);
+     kazanci kalmayanlar sona eklenir, isleme sirasinda hedef hala aciksa
+     islenir
+
+Kullanim (HYPAutomation.plan_patients):
+    planner = WorkPlanner(remaining, is_processed)
+    entries = [PlanEntry(p, tc) for p in patients]
+    ordered = planner.order(entries)
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from scheduler import TimingModel, schedule
+
+
+# "auto": hedef toplam kalani hasta sayisindan azsa kart taramasi yapilir
+# "on": her zaman, "off": sadece tarayicisiz on eleme
+PRESCREEN_MODES = ("auto", "on", "off")
+
+TARGETS_DONE = "Tüm hedefler tutturuldu"
+
+_CACHE_TC_RE = re.compile(r"\d{2}\*+\d{2}")
+
+
+def cache_key(tc_text: str) -> Optional[str]:
+    """Listedeki/sayfadaki TC metninden processed cache anahtari (12*******34)"""
+    m = _CACHE_TC_RE.search(tc_text or "")
+    return m.group(0) if m else None
+
+
+# ============================================================
+# KART TARAYICI (hasta sayfasinda tek round trip)
+# ============================================================
+CARD_SCAN_JS = """
+var KEYS = ['HIPERTANSIYON', 'DIYABET', 'OBEZITE', 'KARDIYOVASKULER'];
+function up(t) { return (t || '').toUpperCase(); }
+function norm(t) { return up(t).replace(/İ/g, 'I').replace(/Ü/g, 'U'); }
+function keyCount(t) {
+    var n = norm(t), c = 0;
+    KEYS.forEach(function(k) { if (n.indexOf(k) !== -1) c++; });
+    return c;
+}
+var cards = [];
+document.querySelectorAll('button').forEach(function(btn) {
+    var label = btn.querySelector('span');
+    if (!label || (label.innerText || '').trim() !== 'Görüntüle') return;
+    // get_patient_cards ile ayni: en fazla 5 ust seviye, tek kart basligi iceren ilk kap
+    var p = btn, text = '';
+    for (var i = 0; i < 5 && p.parentElement; i++) {
+        p = p.parentElement;
+        var c = keyCount(p.innerText);
+        if (c === 1) { text = up(p.innerText); break; }
+        if (c > 1) break;
+    }
+    if (!text) {
+        var box = btn.closest('div[style*="background"], .hyp-card');
+        if (!box && btn.parentElement && btn.parentElement.parentElement) box = btn.parentElement.parentElement.parentElement;
+        text = box ? up(box.innerText) : '';
+    }
+    if (text) cards.push(text);
+});
+var sidebar = [];
+document.querySelectorAll('div[class*="disease-box"]').forEach(function(el) {
+    sidebar.push({cls: el.className || '', text: el.innerText || ''});
+});
+var tc = (document.body ? (document.body.innerText || '') : '').match(/\\d{2}\\*+\\d{2}/);
+return {cards: cards, sidebar: sidebar, tc: tc ? tc[0] : null};
+"""
+
+# Sol panel kutusu sinifi -> HYP on eki (get_sidebar_cards ile ayni)
+SIDEBAR_PREFIXES = {
+    "disease-box-hypertension": "HT",
+    "disease-box-diabetes": "DIY",
+    "disease-box-cvdrisk": "KVR",
+    "disease-box-obesity": "OBE",
+    "disease-box-elderly": "YAS",
+}
+
+
+def sidebar_hyp_type(cls: str, text: str) -> Optional[str]:
+    """Sol panel kutusunun HYP tipi (bilinmiyorsa None)"""
+    prefix = next((p for c, p in SIDEBAR_PREFIXES.items() if c in (cls or "")), None)
+    if prefix is None:
+        return None
+    if prefix == "YAS":
+        return "YAS_IZLEM"
+    return f"{prefix}_IZLEM" if "izlem" in (text or "").lower() else f"{prefix}_TARAMA"
+
+
+# ============================================================
+# PLAN
+# ============================================================
+class PlanEntry:
+    """Bir aday hasta: kazanc tipleri ve (atlanacaksa) sebebi"""
+
+    def __init__(self, patient: Dict, tc: Optional[str] = None):
+        self.patient = patient
+        self.tc = tc
+        self.scanned = False                 # kartlari okundu mu
+        self.gains: Set[str] = set()         # islenirse kapatacagi HYP tipleri
+        self.skip_reason: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.patient.get("ad_soyad", "")
+
+
+class WorkPlanner:
+    """Kalan hedefe ve cache'e gore hasta eleme ve siralama"""
+
+    def __init__(self, remaining: Callable[[str], int], is_processed: Callable[[str, str], bool],
+                 enabled_types: Optional[Iterable[str]] = None, hyp_types: Iterable[str] = (),
+                 model: Optional[TimingModel] = None, time_budget: Optional[float] = None):
+        self.remaining = remaining
+        self.is_processed = is_processed
+        self.enabled_types = set(enabled_types) if enabled_types is not None else None
+        self.hyp_types = list(hyp_types)
+        self.model = model or TimingModel()
+        self.time_budget = time_budget
+
+    def open_types(self) -> Set[str]:
+        """Aktif ve kalan hedefi olan HYP tipleri"""
+        return {
+            t for t in self.hyp_types
+            if (self.enabled_types is None or t in self.enabled_types) and self.remaining(t) > 0
+        }
+
+    def total_remaining(self) -> int:
+        return sum(self.remaining(t) for t in self.open_types())
+
+    def prefilter(self, entries: List[PlanEntry]) -> List[PlanEntry]:
+        """Tarayicisiz eleme: acik tiplerin hepsi cache'de olanlari isaretle"""
+        open_types = self.open_types()
+        for entry in entries:
+            if not open_types:
+                entry.skip_reason = TARGETS_DONE
+            elif entry.tc and all(self.is_processed(entry.tc, t) for t in open_types):
+                entry.skip_reason = f"Açık HYP'lerin hepsi daha önce yapılmış ({len(open_types)} adet cache'de)"
+        return [e for e in entries if e.skip_reason is None]
+
+    def apply_scan(self, entry: PlanEntry, tc: Optional[str], cards: List[Dict]):
+        """
+        Kart taramasi sonucunu isle. cards: [{"hyp_tip", "yapilabilir"}]
+        (ana sayfa kartlari ve sol panel birlikte; ayni tip biri yapilabilirse yeterli)
+        """
+        entry.scanned = True
+        entry.tc = tc or entry.tc
+        open_types = self.open_types()
+        doable = {c["hyp_tip"] for c in cards if c.get("yapilabilir")}
+        entry.gains = {
+            t for t in doable & open_types
+            if not (entry.tc and self.is_processed(entry.tc, t))
+        }
+        if not entry.gains:
+            if not cards:
+                entry.skip_reason = "İşlenecek HYP kartı bulunamadı"
+            elif not doable:
+                entry.skip_reason = "Yapılabilir kart yok (yaklaşan/tamamlanmış)"
+            else:
+                entry.skip_reason = "Yapılabilir kartlar cache'de veya hedefleri tutturulmuş"
+
+    def order(self, entries: List[PlanEntry]) -> List[PlanEntry]:
+        """
+        Taranan hastalar scheduler.schedule ile siralanir (beklenen deger /
+        beklenen sure, zaman butcesi varsa butce dolunca durur). Taranmamis hastalar
+        sona, liste sirasinda eklenir.
+        """
+        scanned = [e for e in entries if e.scanned and e.skip_reason is None]
+        unscanned = [e for e in entries if not e.scanned and e.skip_reason is None]
+        budget = {t: self.remaining(t) for t in self.open_types()}
+
+        ordered, backup = schedule(scanned, lambda e: e.gains, budget, self.model, self.time_budget)
+
+        # Yedekler: hedeflerini oncekiler dolduracak gibi gorunenler (veya zaman
+        # butcesine sigmayanlar); onceki kartlar basarisiz olursa hedef acik
+        # kalir ve isleme sirasinda alinirlar
+        return ordered + backup + unscanned
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+PARALEL TARAYICI HAVUZU
+=======================
+Hasta listesini N bagimsiz Chrome oturumunda paralel isler.
+
+- Her worker kendi HYPAutomation nesnesi ve kendi Chrome profili ile calisir
+  (~/.hyp_chrome_profile_w1, ~/.hyp_chrome_profile_w2, ...)
+- Hastalar ortak bir queue.Queue uzerinden dagitilir
+- Hedef sayaclari (session_completed) SharedTargetLedger ile ortaktir;
+  kart baslamadan once slot ayrilir, boylece hedef hic asilmaz
+- e-Imza girisleri ayni anda yapilmaz, sirayla yapilir
+
+Test icin config.HYP_URL yerel bir mock sunucuya yonlendirilebilir ve
+automation_factory ile worker olusturma degistirilebilir.
+"""
+
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List
+
+import config
+
+
+class SharedTargetLedger:
+    """Worker'lar arasi ortak hedef sayaci (thread-safe)"""
+
+    def __init__(self, hyp_types=None):
+        self._lock = threading.Lock()
+        hyp_types = hyp_types or config.MONTHLY_TARGETS.keys()
+        # Tum worker'larin session_completed'i bu sozluge isaret eder
+        self.completed: Dict[str, int] = {t: 0 for t in hyp_types}
+        self.reserved: Dict[str, int] = {t: 0 for t in hyp_types}
+
+    def reserve(self, hyp_tip: str, limit: int) -> bool:
+        """Tamamlanan + devam eden < limit ise bir slot ayir"""
+        with self._lock:
+            if hyp_tip not in self.completed:
+                return True
+            if self.completed[hyp_tip] + self.reserved[hyp_tip] >= limit:
+                return False
+            self.reserved[hyp_tip] += 1
+            return True
+
+    def release(self, hyp_tip: str):
+        """Ayrilan slotu geri birak (kart basarisiz/atlandi)"""
+        with self._lock:
+            if self.reserved.get(hyp_tip, 0) > 0:
+                self.reserved[hyp_tip] -= 1
+
+    def commit(self, hyp_tip: str):
+        """Kart basariyla tamamlandi: slot -> tamamlanan"""
+        with self._lock:
+            if hyp_tip not in self.completed:
+                return
+            if self.reserved[hyp_tip] > 0:
+                self.reserved[hyp_tip] -= 1
+            self.completed[hyp_tip] += 1
+
+    def decrement(self, hyp_tip: str):
+        """Tamamlanan sayisini bir azalt (fazla KVR silindi)"""
+        with self._lock:
+            if self.completed.get(hyp_tip, 0) > 0:
+                self.completed[hyp_tip] -= 1
+
+
+class ParallelAutomationPool:
+    """
+    N tarayicili HYP otomasyonu.
+
+    GUI'nin tek HYPAutomation icin kullandigi arayuzu saglar
+    (session_stats, monthly_stats, get_cancelled_hyps, stop, ...),
+    boylece run_thread icinde dogrudan yerine kullanilabilir.
+    """
+
+    def __init__(self, worker_count: int = 2, log_callback=None, stats_callback=None,
+                 automation_factory: Callable = None, profile_root: str = None):
+        self.worker_count = max(1, int(worker_count))
+        self.log_callback = log_callback
+        self.stats_callback = stats_callback
+        self.profile_root = profile_root or os.path.expanduser("~")
+
+        if automation_factory is None:
+            from hyp_automation import HYPAutomation
+            automation_factory = HYPAutomation
+        self.automation_factory = automation_factory
+
+        # GUI'den ayarlanan degerler (HYPAutomation ile ayni isimler)
+        self.selected_date = None
+        self.selected_dates = None
+        self.target_percentage = 100
+        self.enabled_hyp_types = None
+        self.on_hyp_success_callback = None
+        self.on_counts_fetched_callback = None
+        self.on_schedule_callback = None
+        self.get_kvr_decision_callback = None
+
+        self.ledger = SharedTargetLedger()
+        self.workers = []
+        self._should_stop = False
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._login_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.monthly_stats: Dict[str, int] = {}
+
+        # Olay kaydinda tum worker'lar tek oturum olarak gorunur
+        from event_log import new_session_id
+        self.session_id = new_session_id()
+        self._session_started = time.time()
+
+    # ============================================================
+    # LOG
+    # ============================================================
+    def log(self, message: str, level: str = "INFO"):
+        msg = f"[{time.strftime('%H:%M:%S')}] [HAVUZ] {message}"
+        try:
+            print(msg, flush=True)
+        except Exception:
+            pass
+        if self.log_callback:
+            try:
+                self.log_callback(msg)
+            except Exception:
+                pass
+
+    def _worker_log_callback(self, worker_no: int):
+        """Worker log satirlarina [W1] gibi on ek koy"""
+        def callback(message):
+            if self.log_callback:
+                self.log_callback(f"[W{worker_no}] {message}")
+        return callback
+
+    def _merged_stats_callback(self, monthly_stats, extra):
+        """Worker'larin monthly_stats'ini birlestirip GUI'ye tek sozluk gonder"""
+        with self._stats_lock:
+            merged = {}
+            for w in self.workers:
+                for k, v in w.monthly_stats.items():
+                    merged[k] = merged.get(k, 0) + v
+            self.monthly_stats = merged
+        if self.stats_callback:
+            self.stats_callback(merged, extra)
+
+    # ============================================================
+    # WORKER OLUSTURMA
+    # ============================================================
+    def _create_worker(self, worker_no: int):
+        worker = self.automation_factory(
+            log_callback=self._worker_log_callback(worker_no),
+            stats_callback=self._merged_stats_callback,
+        )
+        worker.chrome_profile_dir = os.path.join(self.profile_root, f".hyp_chrome_profile_w{worker_no}")
+        worker.session_id = self.session_id
+        worker.target_ledger = self.ledger
+        worker.session_completed = self.ledger.completed
+        worker.target_percentage = self.target_percentage
+        worker.enabled_hyp_types = self.enabled_hyp_types
+        worker.on_hyp_success_callback = self.on_hyp_success_callback
+        worker.on_counts_fetched_callback = self.on_counts_fetched_callback
+        worker.on_schedule_callback = self.on_schedule_callback
+        worker.get_kvr_decision_callback = self.get_kvr_decision_callback
+        return worker
+
+    def _start_worker(self, worker, auto_pin: bool) -> bool:
+        """Chrome'u baslat ve giris yap (e-Imza girisleri sirayla)"""
+        if not os.path.exists(worker.chrome_profile_dir):
+            os.makedirs(worker.chrome_profile_dir)
+        if not worker.setup_driver(debug_mode=False):
+            return False
+        with self._login_lock:
+            if self.should_stop:
+                return False
+            return worker.login(auto_pin=auto_pin)
+
+    def _fetch_patients(self, worker) -> List[Dict]:
+        """Hasta listesini ilk worker ile al (run_automation ile ayni mantik)"""
+        if self.selected_dates:
+            return worker.get_patients_for_dates(self.selected_dates)
+        return worker.get_todays_patients(self.selected_date)
+
+    # ============================================================
+    # CALISTIRMA
+    # ============================================================
+    def _worker_loop(self, worker, worker_no: int, total: int):
+        while not self.should_stop and not worker.should_stop:
+            try:
+                idx, patient = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.log(f"\n{'='*50}")
+                worker.log(f"📋 HASTA {idx}/{total} (Tarayıcı {worker_no})")
+                worker.log(f"{'='*50}")
+                if worker.plan_still_useful(patient):
+                    worker.process_patient(patient['ad_soyad'])
+            except Exception as e:
+                worker.log(f"Hasta işleme hatası: {e}", "ERROR")
+            finally:
+                self._queue.task_done()
+            self._report_schedule()
+
+    def _report_schedule(self):
+        """Kuyrukta kalan hastalar icin tahmini bitis (model ilk worker'da)"""
+        try:
+            remaining = [patient for _, patient in list(self._queue.queue)]
+            active = sum(1 for w in self.workers if w.driver is not None and not w.should_stop)
+            self.workers[0].report_schedule(remaining, parallel=active)
+        except Exception as e:
+            self.log(f"Tahmin hatası: {e}")
+
+    def _run_worker(self, worker, worker_no: int, ready: threading.Event, total_ref: list, auto_pin: bool):
+        try:
+            if not self._start_worker(worker, auto_pin):
+                self.log(f"Tarayıcı {worker_no} başlatılamadı, havuzdan çıkarıldı")
+                return
+            # Kuyruk ilk worker tarafindan doldurulana kadar bekle
+            ready.wait()
+            self._worker_loop(worker, worker_no, total_ref[0])
+        except Exception as e:
+            self.log(f"Tarayıcı {worker_no} hatası: {e}")
+            traceback.print_exc()
+        finally:
+            # Ek tarayicilar havuz bitince/durunca kapatilir (ilk tarayici acik kalir)
+            self._quit_worker(worker, worker_no)
+
+    def _quit_worker(self, worker, worker_no: int):
+        driver, worker.driver = worker.driver, None
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            self.log(f"Tarayıcı {worker_no} kapatılamadı: {e}")
+
+    def run_automation(self, debug_mode: bool = False, auto_pin: bool = True):
+        """
+        Paralel otomasyon. debug_mode desteklenmez (tek debug portu var).
+        """
+        if debug_mode:
+            self.log("DEBUG modu paralel çalışmayı desteklemiyor, tek tarayıcı kullanılıyor")
+            self.worker_count = 1
+
+        self.workers = [self._create_worker(i + 1) for i in range(self.worker_count)]
+        first = self.workers[0]
+
+        try:
+            if not first._check_startup_files():
+                return
+            first._cleanup_old_cache()
+
+            if not self._start_worker(first, auto_pin):
+                return
+
+            self._session_started = time.time()
+            first._event("session_start", mode=f"parallel_{self.worker_count}")
+
+            first.fetch_completed_counts()
+            first.print_target_status()
+
+            ready = threading.Event()
+            total_ref = [0]
+            threads = []
+            for i, worker in enumerate(self.workers[1:], start=2):
+                t = threading.Thread(
+                    target=self._run_worker,
+                    args=(worker, i, ready, total_ref, auto_pin),
+                    daemon=True,
+                )
+                t.start()
+                threads.append(t)
+
+            patients = self._fetch_patients(first)
+            # On tarama ilk worker ile (digerleri giris yaparken)
+            patients = first.plan_patients(patients)
+            for idx, patient in enumerate(patients, 1):
+                self._queue.put((idx, patient))
+            total_ref[0] = len(patients)
+            ready.set()
+
+            if not patients:
+                self.log("Hasta bulunamadı!")
+                self.stop()
+            else:
+                self.log(f"{len(patients)} hasta {self.worker_count} tarayıcıya dağıtılıyor")
+                self._worker_loop(first, 1, len(patients))
+
+            for t in threads:
+                t.join()
+
+            self._print_summary()
+        except Exception as e:
+            self.log(f"Kritik hata: {e}")
+            traceback.print_exc()
+
+    @property
+    def should_stop(self) -> bool:
+        return self._should_stop
+
+    @should_stop.setter
+    def should_stop(self, value: bool):
+        # GUI kapanirken dogrudan should_stop = True atar; worker'lara da ilet
+        self._should_stop = value
+        for worker in self.workers:
+            worker.should_stop = value
+
+    def stop(self):
+        self._should_stop = True
+        for worker in self.workers:
+            try:
+                worker.stop()
+            except Exception:
+                pass
+
+    # ============================================================
+    # SONUCLAR (HYPAutomation ile ayni arayuz)
+    # ============================================================
+    @property
+    def session_stats(self) -> Dict:
+        merged = {"basarili": 0, "basarisiz": 0, "atlanan": 0, "toplam_sure": 0}
+        for w in self.workers:
+            for k in merged:
+                merged[k] += w.session_stats.get(k, 0)
+        return merged
+
+    @property
+    def session_completed(self) -> Dict[str, int]:
+        return self.ledger.completed
+
+    def _collect(self, getter: str) -> list:
+        items = []
+        for w in self.workers:
+            items.extend(getattr(w, getter)())
+        return items
+
+    def get_cancelled_hyps(self) -> list:
+        return self._collect('get_cancelled_hyps')
+
+    def get_skipped_notifications(self) -> list:
+        return self._collect('get_skipped_notifications')
+
+    def get_failed_hyps(self) -> list:
+        return self._collect('get_failed_hyps')
+
+    def _profilers(self) -> list:
+        return [w.profiler for w in self.workers if getattr(w, 'profiler', None) is not None]
+
+    def get_profile_summary(self) -> list:
+        from webdriver_profiler import summary_lines_for
+        return summary_lines_for(self._profilers())
+
+    def remove_from_cache(self, tc: str, hyp_tipi: str = None):
+        # Cache process genelinde ortak, herhangi bir worker yeterli
+        if self.workers:
+            self.workers[0].remove_from_cache(tc, hyp_tipi)
+
+    def _print_summary(self):
+        stats = self.session_stats
+        if self.workers:
+            self.workers[0]._event(
+                "session_end", basarili=stats['basarili'], basarisiz=stats['basarisiz'],
+                atlanan=stats['atlanan'], seconds=round(time.time() - self._session_started, 1),
+            )
+        self.log("=" * 50)
+        self.log(f"📊 PARALEL OTURUM ÖZETİ ({self.worker_count} tarayıcı)")
+        self.log(f"✅ Başarılı: {stats['basarili']}")
+        self.log(f"❌ Başarısız: {stats['basarisiz']}")
+        self.log(f"⏭️ Atlanan: {stats['atlanan']}")
+        self.log(f"⏱️ Toplam Hasta Süresi: {stats['toplam_sure']:.1f}sn")
+        profilers = self._profilers()
+        if profilers:
+            paths = [p for p in (prof.finish() for prof in profilers) if p]
+            self.log("🔬 WebDriver profili (en pahalı metotlar):")
+            for line in self.get_profile_summary():
+                self.log(f"   {line}")
+            for path in paths:
+                self.log(f"   Flame graph: {path}")
+        self.log("=" * 50)